@@ -1,19 +1,26 @@
 import os
 
-from typing import List, Dict
+from typing import List, Dict, Any
+from nexus.keywords import CompiledKeywordMap
 from .config import settings
 
 class ExpertRouter:
     def __init__(self):
         self.state = {"trust": {name: 0.5 for name in settings.experts.get("capsules", {}).keys()}}
+        # compiled from router.yaml keyword_map; recompiled when the map changes
+        self._matcher = CompiledKeywordMap()
+
+    def rank(self, messages: List[Dict[str,str]]) -> List[Dict[str, Any]]:
+        text = " ".join([m.get("content","") for m in messages if m.get("role")=="user"])
+        capsules = settings.experts.get("capsules", {})
+        ranked = self._matcher.get(settings.router.get("keyword_map", {})).rank(text)
+        return [item for item in ranked if capsules.get(item["capsule"], {}).get("enabled", True)]
 
     def route(self, messages: List[Dict[str,str]]) -> str:
         # Plane-aware simple heuristic: pick expert by keyword mapping
-        text = " ".join([m.get("content","") for m in messages if m.get("role")=="user"]).lower()
-        mapping = settings.router.get("keyword_map", {})
-        for expert, keywords in mapping.items():
-            if any(kw.lower() in text for kw in keywords) and settings.experts["capsules"].get(expert,{}).get("enabled", True):
-                return expert
+        ranked = self.rank(messages)
+        if ranked:
+            return ranked[0]["capsule"]
         # Default
         return settings.router.get("default_expert", "conversationalist")
 
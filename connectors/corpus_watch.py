@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+from .fs import iter_files
+
+try:  # optional: inotify/FSEvents/ReadDirectoryChanges via watchdog, polling otherwise
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except Exception:  # pragma: no cover - exercised only when watchdog is missing
+    FileSystemEventHandler = object  # type: ignore[assignment,misc]
+    Observer = None
+
+log = logging.getLogger("corpus_watch")
+
+_FOREVER = 10 * 365 * 86400
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+@dataclass(frozen=True)
+class FileChange:
+    kind: str  # "upsert" | "delete"
+    path: str
+    size: int = 0
+    mtime_ns: int = 0
+
+
+class CorpusManifest:
+    """Per-file manifest: path -> {size, mtime_ns, sha256, ingested_at}."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._files: dict[str, dict[str, Any]] = {}
+        self._dirty = False
+        if self.path.exists():
+            try:
+                payload = json.loads(self.path.read_text(encoding="utf-8"))
+                self._files = dict(payload.get("files", {}))
+            except Exception:
+                log.warning("manifest %s unreadable; starting empty", self.path)
+
+    def get(self, path: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._files.get(path)
+            return dict(entry) if entry else None
+
+    def paths(self) -> set[str]:
+        with self._lock:
+            return set(self._files)
+
+    def put(self, path: str, entry: dict[str, Any]) -> None:
+        with self._lock:
+            self._files[path] = entry
+            self._dirty = True
+
+    def remove(self, path: str) -> None:
+        with self._lock:
+            if self._files.pop(path, None) is not None:
+                self._dirty = True
+
+    def save(self) -> bool:
+        with self._lock:
+            if not self._dirty:
+                return False
+            payload = json.dumps({"version": 1, "files": self._files}, sort_keys=True)
+            self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, self.path)
+        return True
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._files)
+
+
+class RetrievalSink:
+    name = "retrieval"
+
+    def __init__(self, retrieval: Any, *, artifact_mode: str = "none"):
+        self.retrieval = retrieval
+        self.artifact_mode = artifact_mode
+
+    def upsert(self, path: str, text: str) -> None:
+        self.retrieval.bulk_ingest(
+            [{"source": path, "title": Path(path).name, "text": text, "metadata": {"path": path}}],
+            workers=1,
+            artifact_mode=self.artifact_mode,
+            replace_sources=True,
+        )
+
+    def delete(self, path: str) -> None:
+        self.retrieval.delete_sources([path])
+
+
+class TemporalSink:
+    """Feeds `temporal.tkg`; a changed file retracts its previous facts before re-extraction."""
+
+    name = "temporal"
+
+    def __init__(self, graph: Any | None = None, extract: Any | None = None, clock=time.time):
+        if graph is None:
+            from temporal import tkg as graph
+        if extract is None:
+            from temporal.atomic_extractor import extract_facts as extract
+        self.graph = graph
+        self.extract = extract
+        self.clock = clock
+
+    def upsert(self, path: str, text: str) -> None:
+        now = int(self.clock())
+        self.graph.retract_source(path, now)
+        facts = self.extract(text)
+        if not facts:
+            facts = [{"s": path, "p": "contains", "o": text[:40]}]
+        for fact in facts:
+            self.graph.upsert_fact(fact["s"], fact["p"], fact["o"], path, now, now + _FOREVER)
+
+    def delete(self, path: str) -> None:
+        self.graph.retract_source(path, int(self.clock()))
+
+
+class _DirtyPaths(FileSystemEventHandler):  # type: ignore[misc,valid-type]
+    def __init__(self, daemon: "IncrementalIngestDaemon"):
+        super().__init__()
+        self.daemon = daemon
+
+    def on_any_event(self, event) -> None:
+        for attr in ("src_path", "dest_path"):
+            path = getattr(event, attr, None)
+            if path:
+                self.daemon.mark_dirty(os.fsdecode(path))
+
+
+class IncrementalIngestDaemon:
+    """Keeps `sinks` in sync with a corpus directory, one file's work per changed file.
+
+    Detection only stats files; a file is hashed and read by the worker when its size or
+    mtime moved, and touched-but-identical files just refresh their manifest stat.
+    Changes flow through a bounded queue so a burst of edits applies backpressure to the
+    watcher instead of growing memory.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        manifest_path: str | Path,
+        sinks: Iterable[Any],
+        patterns: Iterable[str] = ("*.txt",),
+        queue_size: int = 64,
+        poll_interval_seconds: float = 2.0,
+        full_rescan_seconds: float = 300.0,
+        checkpoint_every: int = 256,
+        use_watchdog: bool = True,
+    ):
+        self.root = Path(root)
+        self.manifest = CorpusManifest(manifest_path)
+        self.sinks = list(sinks)
+        self.patterns = tuple(patterns)
+        self.poll_interval_seconds = max(float(poll_interval_seconds), 0.05)
+        self.full_rescan_seconds = max(float(full_rescan_seconds), self.poll_interval_seconds)
+        self.checkpoint_every = max(int(checkpoint_every), 1)
+        self.use_watchdog = bool(use_watchdog) and Observer is not None
+        self.queue: queue.Queue[FileChange | None] = queue.Queue(maxsize=max(int(queue_size), 1))
+        self.stats = {"scans": 0, "upserts": 0, "deletes": 0, "unchanged": 0, "errors": 0}
+        self._abs_root = Path(os.path.abspath(self.root))
+        self._lock = threading.Lock()
+        self._queued: set[str] = set()
+        self._dirty: set[str] = set()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._observer = None
+        self._since_checkpoint = 0
+
+    def scan(self, paths: Iterable[str] | None = None) -> list[FileChange]:
+        self.stats["scans"] += 1
+        if paths is None:
+            seen = dict(iter_files(str(self.root), self.patterns))
+            candidates = set(seen) | self.manifest.paths()
+        else:
+            seen, candidates = {}, set()
+            for raw in paths:
+                path = self._key(raw)
+                prefix = path.rstrip(os.sep) + os.sep
+                if Path(path).is_dir():
+                    found = dict(iter_files(path, self.patterns))
+                    seen.update(found)
+                    candidates |= set(found) | {p for p in self.manifest.paths() if p.startswith(prefix)}
+                elif not self._matches(path):
+                    # a removed directory only reports its own path
+                    if not Path(path).exists():
+                        candidates |= {p for p in self.manifest.paths() if p.startswith(prefix)}
+                else:
+                    candidates.add(path)
+                    try:
+                        seen[path] = Path(path).stat()
+                    except OSError:
+                        pass
+        changes = []
+        for path in sorted(candidates):
+            entry = self.manifest.get(path)
+            st = seen.get(path)
+            if st is None:
+                if entry is not None:
+                    changes.append(FileChange("delete", path))
+            elif entry is None or entry["size"] != st.st_size or entry["mtime_ns"] != st.st_mtime_ns:
+                changes.append(FileChange("upsert", path, st.st_size, st.st_mtime_ns))
+        return changes
+
+    def run_once(self) -> dict[str, Any]:
+        changes = self.scan()
+        for change in changes:
+            self._apply(change)
+        self.manifest.save()
+        return {"changes": len(changes), "files": len(self.manifest), **self.stats}
+
+    def mark_dirty(self, path: str) -> None:
+        with self._lock:
+            self._dirty.add(path)
+        self._wake.set()
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stop.clear()
+        if self.use_watchdog:
+            self._observer = Observer()
+            self._observer.schedule(_DirtyPaths(self), str(self.root), recursive=True)
+            self._observer.start()
+        self._threads = [
+            threading.Thread(target=self._watch_loop, name="corpus-watch", daemon=True),
+            threading.Thread(target=self._worker_loop, name="corpus-ingest", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout)
+            self._observer = None
+        for thread in self._threads:
+            if thread.name == "corpus-ingest":
+                self.queue.put(None)
+            thread.join(timeout)
+        self._threads = []
+        self.manifest.save()
+
+    def _watch_loop(self) -> None:
+        last_full = float("-inf")
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if not self.use_watchdog or now - last_full >= self.full_rescan_seconds:
+                with self._lock:
+                    self._dirty.clear()
+                changes = self.scan()
+                last_full = now
+            else:
+                with self._lock:
+                    dirty, self._dirty = self._dirty, set()
+                changes = self.scan(dirty) if dirty else []
+            for change in changes:
+                self._enqueue(change)
+            self._wake.wait(self.poll_interval_seconds)
+            self._wake.clear()
+
+    def _enqueue(self, change: FileChange) -> None:
+        with self._lock:
+            if change.path in self._queued:
+                return
+            self._queued.add(change.path)
+        while not self._stop.is_set():
+            try:
+                self.queue.put(change, timeout=self.poll_interval_seconds)
+                return
+            except queue.Full:
+                continue
+        with self._lock:
+            self._queued.discard(change.path)
+
+    def _worker_loop(self) -> None:
+        while True:
+            change = self.queue.get()
+            if change is None:
+                return
+            self._apply(change)
+            with self._lock:
+                self._queued.discard(change.path)
+            self._since_checkpoint += 1
+            if self.queue.empty() or self._since_checkpoint >= self.checkpoint_every:
+                self.manifest.save()
+                self._since_checkpoint = 0
+
+    def _apply(self, change: FileChange) -> None:
+        try:
+            if change.kind == "delete" or not Path(change.path).exists():
+                for sink in self.sinks:
+                    sink.delete(change.path)
+                self.manifest.remove(change.path)
+                self.stats["deletes"] += 1
+                return
+            raw = Path(change.path).read_bytes()
+            st = Path(change.path).stat()
+            digest = _sha256(raw)
+            entry = self.manifest.get(change.path)
+            if entry is None or entry["sha256"] != digest:
+                text = raw.decode("utf-8", errors="ignore")
+                for sink in self.sinks:
+                    sink.upsert(change.path, text)
+                self.stats["upserts"] += 1
+                ingested_at = time.time()
+            else:
+                self.stats["unchanged"] += 1
+                ingested_at = entry.get("ingested_at", time.time())
+            self.manifest.put(
+                change.path,
+                {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest, "ingested_at": ingested_at},
+            )
+        except Exception:
+            # leave the manifest entry as-is so the next scan retries this file
+            self.stats["errors"] += 1
+            log.exception("ingest failed for %s", change.path)
+
+    def _key(self, path: str) -> str:
+        absolute = Path(os.path.abspath(path))
+        try:
+            return str(self.root / absolute.relative_to(self._abs_root))
+        except ValueError:
+            return str(path)
+
+    def _matches(self, path: str) -> bool:
+        name = Path(path).name
+        return any(fnmatch.fnmatch(name, pattern) for pattern in self.patterns)
@@ -1,7 +1,18 @@
 import pathlib, mimetypes
-def scan_dir(path:str, patterns=['*.md','*.txt','*.py']):
-    p=pathlib.Path(path)
+def iter_files(path:str, patterns=['*.md','*.txt','*.py']):
+    "Lazily yield (path, os.stat_result) for matching files without reading them."
+    p=pathlib.Path(path); seen=set()
     for pattern in patterns:
         for f in p.rglob(pattern):
+            key=str(f)
+            if key in seen: continue
+            seen.add(key)
+            try:
+                st=f.stat()
+            except OSError:
+                continue
             if f.is_file():
-                yield str(f), f.read_text(errors='ignore')
\ No newline at end of file
+                yield key, st
+def scan_dir(path:str, patterns=['*.md','*.txt','*.py']):
+    for f, _ in iter_files(path, patterns):
+        yield f, pathlib.Path(f).read_text(errors='ignore')
@@ -1,14 +1,157 @@
-
 from __future__ import annotations
+import hashlib, os, pickle, threading
+from collections import OrderedDict
+from typing import Any, Optional, Sequence
 try:
     from llama_cpp import Llama
 except Exception:
     Llama = None
 
+# relative spill dirs (e.g. runtime/cache/llamacpp_prefix) live under the project, not the working directory
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_MANIFEST = "prefix_cache.manifest"  # names of the state files this cache spilled, one per line
+
+
+def _common_prefix(a: Sequence[int], b: Sequence[int]) -> int:
+    n = min(len(a), len(b)); i = 0
+    while i < n and a[i] == b[i]: i += 1
+    return i
+
+
+def _state_tokens(state: Any) -> tuple:
+    return tuple(int(t) for t in state.input_ids[:state.n_tokens])
+
+
+def _state_size(state: Any) -> int:
+    return int(getattr(state, "llama_state_size", 0) or len(getattr(state, "llama_state", b"")))
+
+
+class PrefixStateCache:
+    """Saved llama.cpp evaluation states, looked up by longest common token prefix.
+
+    Restoring a state leaves the model's context at the stored tokens; llama.cpp then evaluates
+    only the part of the new prompt past the shared prefix. Memory is bounded by state bytes with
+    LRU eviction; evicted states spill to `disk_dir` (bounded by `disk_capacity_mb`) when set.
+    A relative `disk_dir` is resolved against the project root.
+    """
+
+    def __init__(self, capacity_mb: float = 512, disk_dir: Optional[str] = None, disk_capacity_mb: float = 2048, min_prefix_tokens: int = 32):
+        self.capacity_bytes = int(capacity_mb * (1 << 20))
+        self.disk_capacity_bytes = int(disk_capacity_mb * (1 << 20))
+        self.min_prefix_tokens = max(int(min_prefix_tokens), 1)
+        self.disk_dir = os.path.join(_PROJECT_ROOT, disk_dir) if disk_dir else None
+        self._mem: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._disk: "OrderedDict[tuple, tuple]" = OrderedDict()  # tokens -> (path, size)
+        self._bytes = 0; self._disk_bytes = 0
+        self.stats = {"requests": 0, "prompt_tokens": 0, "reused_tokens": 0, "prefix_hits": 0, "live_hits": 0,
+                      "disk_hits": 0, "misses": 0, "saves": 0, "evictions": 0, "spills": 0}
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            self._clear_previous_spills()
+
+    def _clear_previous_spills(self) -> None:
+        """Remove states a previous process spilled (they may belong to another model); other files are left alone."""
+        manifest = os.path.join(self.disk_dir, _MANIFEST)
+        try:
+            with open(manifest, encoding="utf-8") as f: names = f.read().split()
+        except OSError:
+            names = []
+        for name in names:
+            if os.path.basename(name) == name and name.endswith(".llstate"):
+                try: os.remove(os.path.join(self.disk_dir, name))
+                except OSError: pass
+        open(manifest, "w", encoding="utf-8").close()
+
+    def _best(self, tokens: Sequence[int]):
+        best, best_n, where = None, 0, None
+        for source, entries in (("mem", self._mem), ("disk", self._disk)):
+            for key in entries:
+                n = _common_prefix(key, tokens)
+                if n > best_n: best, best_n, where = key, n, source
+        return best, best_n, where
+
+    def restore(self, llm: Any, tokens: Sequence[int]) -> int:
+        """Load the stored state sharing the longest prefix with `tokens`; returns the reusable prefix length."""
+        self.stats["requests"] += 1; self.stats["prompt_tokens"] += len(tokens)
+        live = _common_prefix(tuple(int(t) for t in llm.input_ids[:llm.n_tokens]), tokens)
+        key, n, where = self._best(tokens)
+        if key is not None and n >= self.min_prefix_tokens and n > live:
+            if where == "mem":
+                state = self._mem[key]; self._mem.move_to_end(key)
+            else:
+                state = self._load_spilled(key); self.stats["disk_hits"] += 1
+            llm.load_state(state)
+            self.stats["prefix_hits"] += 1; self.stats["reused_tokens"] += n
+            return n
+        if live >= self.min_prefix_tokens:
+            self.stats["live_hits"] += 1; self.stats["reused_tokens"] += live
+            return live
+        self.stats["misses"] += 1
+        return 0
+
+    def save(self, llm: Any, new_prompt_tokens: int) -> None:
+        """Snapshot the model's current context unless the prompt added too little beyond the reused prefix."""
+        if new_prompt_tokens < self.min_prefix_tokens: return
+        state = llm.save_state(); key = _state_tokens(state); size = _state_size(state)
+        if size > self.capacity_bytes: return
+        # a stored state whose tokens are a prefix of this one is fully covered by it
+        for old in [k for k in self._mem if len(k) <= len(key) and key[:len(k)] == k]:
+            self._bytes -= _state_size(self._mem.pop(old))
+        for old in [k for k in self._disk if len(k) <= len(key) and key[:len(k)] == k]:
+            self._drop_spilled(old)
+        self._mem[key] = state; self._bytes += size; self.stats["saves"] += 1
+        while self._bytes > self.capacity_bytes and self._mem:
+            old, old_state = self._mem.popitem(last=False)
+            self._bytes -= _state_size(old_state); self.stats["evictions"] += 1
+            if self.disk_dir: self._spill(old, old_state)
+
+    def _spill(self, key: tuple, state: Any) -> None:
+        size = _state_size(state)
+        if size > self.disk_capacity_bytes: return
+        path = os.path.join(self.disk_dir, hashlib.sha1(repr(key).encode()).hexdigest() + ".llstate")
+        with open(os.path.join(self.disk_dir, _MANIFEST), "a", encoding="utf-8") as f: f.write(os.path.basename(path) + "\n")
+        with open(path, "wb") as f: pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._disk[key] = (path, size); self._disk_bytes += size; self.stats["spills"] += 1
+        while self._disk_bytes > self.disk_capacity_bytes and self._disk:
+            self._drop_spilled(next(iter(self._disk)))
+
+    def _drop_spilled(self, key: tuple) -> None:
+        path, size = self._disk.pop(key); self._disk_bytes -= size
+        try: os.remove(path)
+        except OSError: pass
+
+    def _load_spilled(self, key: tuple) -> Any:
+        path, size = self._disk[key]
+        with open(path, "rb") as f: state = pickle.load(f)
+        self._drop_spilled(key)
+        self._mem[key] = state; self._bytes += size
+        while self._bytes > self.capacity_bytes and len(self._mem) > 1:
+            old, old_state = self._mem.popitem(last=False)
+            self._bytes -= _state_size(old_state); self.stats["evictions"] += 1
+            self._spill(old, old_state)
+        return state
+
+    def summary(self) -> dict:
+        s = dict(self.stats)
+        s.update(entries=len(self._mem), bytes=self._bytes, disk_entries=len(self._disk), disk_bytes=self._disk_bytes,
+                 hit_rate=round((s["prefix_hits"] + s["live_hits"]) / s["requests"], 4) if s["requests"] else 0.0,
+                 reuse_ratio=round(s["reused_tokens"] / s["prompt_tokens"], 4) if s["prompt_tokens"] else 0.0)
+        return s
+
+
 class LlamaCppEngine:
-    def __init__(self, gguf_path: str, n_ctx: int = 4096):
+    def __init__(self, gguf_path: str, n_ctx: int = 4096, prefix_cache: Optional[dict] = None):
         if Llama is None: raise RuntimeError("llama-cpp-python not installed")
-        self.llm = Llama(model_path=gguf_path, n_ctx=n_ctx)
+        self.llm = Llama(model_path=gguf_path, n_ctx=n_ctx, verbose=False)
+        cfg = prefix_cache if prefix_cache is not None else {}
+        self.cache = PrefixStateCache(**{k: v for k, v in cfg.items() if k != "enabled"}) if cfg.get("enabled", True) else None
+        self._lock = threading.Lock()  # one context per model; calls must not interleave
     def generate(self, prompt: str, **kw) -> str:
-        out = self.llm(prompt, max_tokens=kw.get("max_new_tokens",256), temperature=kw.get("temperature",0.7))
+        with self._lock:
+            tokens = self.llm.tokenize(prompt.encode("utf-8"), add_bos=True, special=True)
+            reused = self.cache.restore(self.llm, tokens) if self.cache else 0
+            out = self.llm(tokens, max_tokens=kw.get("max_new_tokens",256), temperature=kw.get("temperature",0.7))
+            if self.cache: self.cache.save(self.llm, len(tokens) - reused)
         return out.get("choices",[{}])[0].get("text","")
+    def cache_stats(self) -> dict:
+        return self.cache.summary() if self.cache else {}
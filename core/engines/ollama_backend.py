@@ -14,7 +14,7 @@ class OllamaEngine(BaseEngine):
     def generate(self, prompt: str, **kw) -> str:
         if not self.live:
             return f"[ollama:dry] {prompt}"
-        j = post_json(self.base + "/api/generate", {"model": self.model, "prompt": prompt}, timeout=3, retries=2)
+        j = post_json(self.base + "/api/generate", {"model": self.model, "prompt": prompt}, timeout=3, retries=2, cancelled=kw.get("cancelled"))
         if isinstance(j, dict) and "response" in j:
             return j["response"]
         return f"[ollama] {prompt}"
@@ -1,21 +1,36 @@
 
 from __future__ import annotations
-import os, time, yaml, threading
+import os, random, time, yaml, threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import Tuple, Dict
 
-_latency = { "transformers": 0.6, "ollama": 0.7, "vllm": 0.5, "tgi": 0.55 }
-_last = 0.0
+ENGINES = ["transformers","ollama","vllm","tgi"]
+_PRIOR_LATENCY = { "transformers": 0.6, "ollama": 0.7, "vllm": 0.5, "tgi": 0.55 }
 _lock = threading.Lock()
+_STICKY = {}   # sid -> engine
+_policy_cache = {"mtime": None, "policy": None}
+
+_DEFAULT_POLICY = {"weights":{"latency":0.4,"cost":0.3,"capability":0.25,"gpu":0.05},
+                   "capabilities":{"transformers":0.7,"ollama":0.6,"vllm":0.9,"tgi":0.85},
+                   "cost":{"transformers":1.0,"ollama":1.0,"vllm":0.9,"tgi":0.8}}
 
 def _load_policy():
+    # re-read only when the file changes; score_engines runs on the request path
     path = os.path.join("runtime","config","engines.yaml")
     try:
-        with open(path,"r",encoding="utf-8") as f:
-            return yaml.safe_load(f)
-    except Exception:
-        return {"weights":{"latency":0.4,"cost":0.3,"capability":0.25,"gpu":0.05},
-                "capabilities":{"transformers":0.7,"ollama":0.6,"vllm":0.9,"tgi":0.85},
-                "cost":{"transformers":1.0,"ollama":1.0,"vllm":0.9,"tgi":0.8}}
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return _DEFAULT_POLICY
+    with _lock:
+        if _policy_cache["mtime"] != (path, mtime):
+            try:
+                with open(path,"r",encoding="utf-8") as f:
+                    _policy_cache["policy"] = yaml.safe_load(f) or _DEFAULT_POLICY
+            except Exception:
+                _policy_cache["policy"] = _DEFAULT_POLICY
+            _policy_cache["mtime"] = (path, mtime)
+        return _policy_cache["policy"]
 
 def _gpu_available():
     try:
@@ -24,34 +39,190 @@ def _gpu_available():
     except Exception:
         return 0.0
 
+
+class LatencyStats:
+    """EWMA plus windowed p50/p95/p99 of observed latencies, in-flight count and error rate for one engine."""
+
+    def __init__(self, prior: float = 0.8, alpha: float = 0.2, window: int = 512):
+        self.ewma = prior; self.alpha = alpha
+        self.samples: deque = deque(maxlen=window)
+        self._sorted: list | None = None
+        self.count = 0; self.errors = 0; self.error_rate = 0.0; self.in_flight = 0
+
+    def observe(self, seconds: float, ok: bool = True):
+        self.error_rate = (1 - self.alpha) * self.error_rate + self.alpha * (0.0 if ok else 1.0)
+        if not ok:
+            self.errors += 1; return
+        self.ewma = seconds if self.count == 0 else (1 - self.alpha) * self.ewma + self.alpha * seconds
+        self.samples.append(seconds); self._sorted = None; self.count += 1
+
+    def percentile(self, q: float) -> float | None:
+        if not self.samples: return None
+        if self._sorted is None: self._sorted = sorted(self.samples)
+        return self._sorted[min(int(len(self._sorted) * q / 100.0), len(self._sorted) - 1)]
+
+    def expected(self) -> float:
+        """Load-adjusted expected latency used to compare two candidates."""
+        return self.ewma * (self.in_flight + 1) / max(0.05, 1.0 - self.error_rate)
+
+    def snapshot(self) -> dict:
+        return {"ewma": round(self.ewma, 6), "p50": self.percentile(50), "p95": self.percentile(95), "p99": self.percentile(99),
+                "count": self.count, "errors": self.errors, "error_rate": round(self.error_rate, 4), "in_flight": self.in_flight}
+
+
+class Balancer:
+    """Power-of-two-choices routing on load-adjusted EWMA latency, with hedged duplicates.
+
+    `run(call)` sends the request to one engine; if it has not answered after that engine's
+    `hedge_percentile` latency, a duplicate goes to a second engine and whichever answers first
+    wins. The loser's cancel event is set (callers that can abort should check it) and its
+    result is discarded. Hedges are capped at `hedge_max_ratio` of requests. `weights` (the
+    engines.yaml policy scores without their latency term, which the expected latency already
+    measures) divide each candidate's expected latency when comparing.
+    """
+
+    def __init__(self, engines=None, ewma_alpha: float = 0.2, window: int = 512, hedge: dict | None = None,
+                 rng: random.Random | None = None, executor: ThreadPoolExecutor | None = None):
+        hedge = hedge or {}
+        self.engines = list(engines or ENGINES)
+        self.stats = {e: LatencyStats(_PRIOR_LATENCY.get(e, 0.8), ewma_alpha, window) for e in self.engines}
+        self.hedge_enabled = bool(hedge.get("enabled", True))
+        self.hedge_percentile = float(hedge.get("percentile", 95))
+        self.hedge_min_delay = float(hedge.get("min_delay_ms", 50)) / 1000.0
+        self.hedge_initial_delay = float(hedge.get("initial_delay_ms", 1000)) / 1000.0
+        self.hedge_min_samples = int(hedge.get("min_samples", 20))
+        self.hedge_max_ratio = float(hedge.get("max_ratio", 0.1))
+        self.counters = {"requests": 0, "hedges": 0, "hedge_wins": 0, "failovers": 0, "cancelled": 0}
+        self._rng = rng or random.Random()
+        self._executor = executor
+        self._lock = threading.Lock()
+
+    def _stat(self, engine: str) -> LatencyStats:
+        st = self.stats.get(engine)
+        if st is None:
+            st = self.stats[engine] = LatencyStats(_PRIOR_LATENCY.get(engine, 0.8))
+            self.engines.append(engine)
+        return st
+
+    def record(self, engine: str, seconds: float, ok: bool = True):
+        with self._lock:
+            self._stat(engine).observe(seconds, ok)
+
+    def choose(self, session_id: str | None = None, exclude=(), candidates=None, weights=None) -> str | None:
+        pool = [e for e in (candidates or self.engines) if e not in exclude]
+        if session_id is not None:
+            sticky = _STICKY.get(session_id)
+            if sticky in pool: return sticky
+        if not pool: return None
+        if len(pool) == 1: return pool[0]
+        a, b = self._rng.sample(pool, 2)
+        weights = weights or {}
+        with self._lock:
+            cost_a = self._stat(a).expected() / max(weights.get(a, 1.0), 0.05)
+            cost_b = self._stat(b).expected() / max(weights.get(b, 1.0), 0.05)
+            return a if cost_a <= cost_b else b
+
+    def hedge_delay(self, engine: str) -> float:
+        with self._lock:
+            st = self._stat(engine)
+            if st.count < self.hedge_min_samples: return self.hedge_initial_delay
+            return max(self.hedge_min_delay, st.percentile(self.hedge_percentile) or 0.0)
+
+    def _executor_(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="engine-hedge")
+        return self._executor
+
+    def _timed(self, call, engine: str, cancelled: threading.Event):
+        with self._lock: self._stat(engine).in_flight += 1
+        t0 = time.perf_counter(); ok = False
+        try:
+            out = call(engine, cancelled); ok = True
+            return out
+        finally:
+            with self._lock:
+                st = self._stat(engine); st.in_flight -= 1
+                if ok or not cancelled.is_set():  # an aborted loser says nothing about the engine
+                    st.observe(time.perf_counter() - t0, ok)
+
+    def run(self, call, session_id: str | None = None, hedge: bool | None = None, candidates=None, weights=None):
+        """Run `call(engine, cancelled_event)`; returns (result, engine)."""
+        hedge = self.hedge_enabled if hedge is None else hedge
+        primary = self.choose(session_id, candidates=candidates, weights=weights)
+        if primary is None: raise RuntimeError("no engine available")
+        with self._lock: self.counters["requests"] += 1
+        ex = self._executor_(); cancel = {}; futs = {}
+
+        def launch(engine):
+            cancel[engine] = threading.Event()
+            futs[ex.submit(self._timed, call, engine, cancel[engine])] = engine
+
+        launch(primary); hedged = False; error = None
+        if hedge:
+            done, _ = wait(futs, timeout=self.hedge_delay(primary), return_when=FIRST_COMPLETED)
+            with self._lock:
+                allowed = self.counters["hedges"] < self.hedge_max_ratio * self.counters["requests"]
+            second = self.choose(exclude=set(cancel), candidates=candidates, weights=weights) if not done and allowed else None
+            if second is not None:
+                with self._lock: self.counters["hedges"] += 1
+                launch(second); hedged = True
+        while futs:
+            done, _ = wait(futs, return_when=FIRST_COMPLETED)
+            for f in done:
+                engine = futs.pop(f)
+                try:
+                    result = f.result()
+                except Exception as e:
+                    error = e; continue
+                with self._lock:
+                    if engine != primary and hedged: self.counters["hedge_wins"] += 1
+                    self.counters["cancelled"] += len(futs)
+                for other_f, other in futs.items():
+                    cancel[other].set(); other_f.cancel()
+                return result, engine
+            if not futs and not hedged:  # primary failed before the hedge fired: fail over once
+                second = self.choose(exclude=set(cancel), candidates=candidates, weights=weights)
+                if second is not None:
+                    with self._lock: self.counters["failovers"] += 1
+                    launch(second); hedged = True
+        raise error
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"engines": {e: st.snapshot() for e, st in self.stats.items()}, **self.counters}
+
+
+_balancer: Balancer | None = None
+
+def balancer() -> Balancer:
+    global _balancer
+    if _balancer is None:
+        cfg = _load_policy().get("balancer") or {}
+        with _lock:
+            if _balancer is None:
+                _balancer = Balancer(ENGINES, ewma_alpha=float(cfg.get("ewma_alpha", 0.2)), window=int(cfg.get("window", 512)),
+                                     hedge=cfg.get("hedge"))
+    return _balancer
+
 def record_latency(engine: str, seconds: float):
-    with _lock:
-        cur = _latency.get(engine, 0.8)
-        # EMA smoothing
-        _latency[engine] = 0.8*cur + 0.2*seconds
+    balancer().record(engine, seconds)
 
-def score_engines() -> Dict[str,float]:
+def score_engines(include_latency: bool = True) -> Dict[str,float]:
+    """Policy score per engine; without `include_latency`, only cost/capability/gpu (balancer weights)."""
     pol = _load_policy()
     w = pol["weights"]; cap = pol["capabilities"]; cost = pol["cost"]
     gpu = _gpu_available()
     scores = {}
-    for eng in ["transformers","ollama","vllm","tgi"]:
-        L = _latency.get(eng, 0.8)
+    stats = balancer().stats
+    for eng in ENGINES:
+        L = stats[eng].ewma if eng in stats else _PRIOR_LATENCY.get(eng, 0.8)
         # normalize latency to 0..1 where lower is better
         lat_score = max(0.0, min(1.0, 1.0 - L))
-        s = w["latency"]*lat_score + w["cost"]*cost.get(eng,0.5) + w["capability"]*cap.get(eng,0.5) + w["gpu"]*gpu
+        s = (w["latency"]*lat_score if include_latency else 0.0) + w["cost"]*cost.get(eng,0.5) + w["capability"]*cap.get(eng,0.5) + w["gpu"]*gpu
         scores[eng]=s
     return scores
 
-def select_engine(capsule: str) -> Tuple[object, dict]:
-    # honor DEMO/OFFLINE defaults unless LIVE_ENGINES=1
-    live = os.environ.get("LIVE_ENGINES","0") == "1"
-    prefer = os.environ.get("DEFAULT_ENGINE","transformers")
-    if not live:
-        prefer = "transformers"
-    scores = score_engines()
-    eng = max(scores.items(), key=lambda kv: kv[1])[0] if live else prefer
-
+def _engine_class(eng: str):
     if eng == "ollama":
         from core.engines.ollama_backend import Engine as E
     elif eng == "vllm":
@@ -60,35 +231,40 @@ def select_engine(capsule: str) -> Tuple[object, dict]:
         from core.engines.tgi_backend import Engine as E
     else:
         from core.engines.local_backend import Engine as E
+    return E
+
+def select_engine(capsule: str, session_id: str | None = None) -> Tuple[object, dict]:
+    # honor DEMO/OFFLINE defaults unless LIVE_ENGINES=1
+    live = os.environ.get("LIVE_ENGINES","0") == "1"
+    prefer = os.environ.get("DEFAULT_ENGINE","transformers")
+    if not live:
+        prefer = "transformers"
+    scores = score_engines()
+    eng = balancer().choose(session_id, candidates=ENGINES, weights=score_engines(include_latency=False)) if live else prefer
+    if eng not in ("ollama","vllm","tgi"):
         eng = "transformers"
-    return E(), {"engine": eng, "scores": scores}
+    return _engine_class(eng)(), {"engine": eng, "scores": scores, "latency": balancer().snapshot()["engines"].get(eng)}
 
+_instances: Dict[str, object] = {}
 
-import threading, time, random
-_PROBE = {"data":{}}
-_STICKY = {}   # sid -> engine
-_CANARY = {"ratio": 0.1, "candidate": None, "win": {"engine":None, "delta":0.0}}
+def generate(prompt: str, session_id: str | None = None, **kw) -> Tuple[str, str]:
+    """Route through the balancer (hedged when live); returns (text, engine)."""
+    live = os.environ.get("LIVE_ENGINES","0") == "1"
+    candidates = ENGINES if live else ["transformers"]
 
-class ProbeThread(threading.Thread):
-    daemon = True
-    def run(self):
-        while True:
-            try:
-                for eng in ["transformers","ollama","vllm","tgi"]:
-                    # micro-probe; in $0 mode this is a synthetic sleep
-                    start=time.time(); time.sleep(random.uniform(0.01,0.03))
-                    dur=time.time()-start
-                    _PROBE["data"][eng] = {"lat": dur}
-            except Exception:
-                pass
-            time.sleep(2.0)
+    def call(eng, cancelled):
+        inst = _instances.get(eng)
+        if inst is None:
+            with _lock:
+                inst = _instances.get(eng)
+                if inst is None:
+                    inst = _instances[eng] = _engine_class(eng)()
+        return inst.generate(prompt, cancelled=cancelled, **kw)
 
-_probe_once = False
-def ensure_probe():
-    global _probe_once
-    if not _probe_once:
-        ProbeThread().start()
-        _probe_once = True
+    return balancer().run(call, session_id=session_id, candidates=candidates, weights=score_engines(include_latency=False) if live else None)
+
+
+_CANARY = {"ratio": 0.1, "candidate": None, "win": {"engine":None, "delta":0.0}}
 
 def sticky_for_session(sid: str, eng: str | None = None) -> str | None:
     if eng is not None:
@@ -98,5 +274,4 @@ def sticky_for_session(sid: str, eng: str | None = None) -> str | None:
 def select_canary(base_engine: str) -> str:
     cand = _CANARY.get("candidate")
     if not cand: return base_engine
-    import random
     return cand if random.random() < _CANARY.get("ratio", 0.1) else base_engine
@@ -13,7 +13,7 @@ class TGIEngine(BaseEngine):
     def generate(self, prompt: str, **kw) -> str:
         if not self.live:
             return f"[tgi:dry] {prompt}"
-        j = post_json(self.base + "/generate", {"inputs": prompt, "parameters": {"max_new_tokens": 64}}, timeout=3, retries=2)
+        j = post_json(self.base + "/generate", {"inputs": prompt, "parameters": {"max_new_tokens": 64}}, timeout=3, retries=2, cancelled=kw.get("cancelled"))
         if isinstance(j, dict) and "generated_text" in j:
             return (j["generated_text"] or "").strip() or f"[tgi] {prompt}"
         return f"[tgi] {prompt}"
@@ -1,16 +1,22 @@
-
 from __future__ import annotations
+import threading
+from functools import lru_cache
 
 _tok_cache = {}
+_tok_lock = threading.Lock()  # one load per model when request threads race on a cold cache
 
 def tok(model_id: str = "gpt2"):
-    try:
-        from transformers import AutoTokenizer  # type: ignore
+    if model_id in _tok_cache:
+        return _tok_cache[model_id]
+    with _tok_lock:
         if model_id not in _tok_cache:
-            _tok_cache[model_id] = AutoTokenizer.from_pretrained(model_id)
+            try:
+                from transformers import AutoTokenizer  # type: ignore
+                # request path: only tokenizers already on disk, never a hub download
+                _tok_cache[model_id] = AutoTokenizer.from_pretrained(model_id, local_files_only=True)
+            except Exception:
+                _tok_cache[model_id] = None  # don't retry the import / disk lookup on every call
         return _tok_cache[model_id]
-    except Exception:
-        return None
 
 def count_text(text: str, model_id: str = "gpt2") -> int:
     t = tok(model_id)
@@ -20,3 +26,41 @@ def count_text(text: str, model_id: str = "gpt2") -> int:
         return len(t.encode(text or ""))
     except Exception:
         return max(1, len((text or "").split()))
+
+def _approx(text: str) -> int:
+    # no tokenizer: words undercount BPE on code/identifiers, so take the larger of words and chars/4
+    return max(len(text.split()), (len(text) + 3) // 4)
+
+def count_tokens(text: str, model_id: str = "gpt2") -> int:
+    """Exact token count for `model_id` (without special tokens); uncached, for whole prompts."""
+    if not text:
+        return 0
+    t = tok(model_id)
+    if t is None:
+        return _approx(text)
+    try:
+        return len(t.encode(text, add_special_tokens=False))
+    except Exception:
+        return _approx(text)
+
+@lru_cache(maxsize=16384)
+def count_segment_tokens(text: str, model_id: str = "gpt2") -> int:
+    """`count_tokens` cached per (model, segment), for the bullets and headers that recur across prompts."""
+    return count_tokens(text, model_id)
+
+def truncate_tokens(text: str, max_tokens: int, model_id: str = "gpt2") -> str:
+    """Longest prefix of `text` that fits in `max_tokens` tokens."""
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text, model_id) <= max_tokens:
+        return text
+    t = tok(model_id)
+    if t is not None:
+        try:
+            return t.decode(t.encode(text, add_special_tokens=False)[:max_tokens], skip_special_tokens=True)
+        except Exception:
+            pass
+    return " ".join(text.split()[:max_tokens])[: max_tokens * 4]
+
+def tokenizer_name(model_id: str = "gpt2") -> str:
+    return model_id if tok(model_id) is not None else "approx"
@@ -14,7 +14,7 @@ class VLLMEngine(BaseEngine):
     def generate(self, prompt: str, **kw) -> str:
         if not self.live:
             return f"[vllm:dry] {prompt}"
-        j = post_json(self.base + "/v1/completions", {"model": self.model, "prompt": prompt, "max_tokens": 64}, timeout=3, retries=2)
+        j = post_json(self.base + "/v1/completions", {"model": self.model, "prompt": prompt, "max_tokens": 64}, timeout=3, retries=2, cancelled=kw.get("cancelled"))
         if isinstance(j, dict) and j.get("choices"):
             return j["choices"][0].get("text") or f"[vllm] {prompt}"
         return f"[vllm] {prompt}"
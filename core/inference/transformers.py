@@ -1,11 +1,388 @@
+"""
+In-process Hugging Face causal LM engine.
 
-def available(): 
+Models are loaded once and kept in an LRU keyed by (model_id, quant). Each loaded model owns a
+`ContinuousBatcher`: a single decode thread that advances every running request by one token
+per step, admitting queued requests and retiring finished ones between steps, so concurrent
+callers share forward passes instead of taking turns at `model.generate`.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any
+
+DEFAULT_MODEL = "TinyLlama/TinyLlama-1.1B-Chat-v1.0"
+
+
+def available():
     try:
         import torch, transformers  # noqa: F401
         return True
     except Exception:
         return False
 
-def generate(prompt:str, quant:str|None=None)->str:
-    # Placeholder; real impl would load model with quantization choice
-    return f"[transformers/{quant or 'auto'}] {prompt[:80]}"
+
+@dataclass
+class GenRequest:
+    prompt_ids: list[int]
+    max_new_tokens: int = 128
+    temperature: float = 0.7
+    top_p: float = 0.95
+    stop_ids: frozenset[int] = frozenset()
+    tokens: list[int] = field(default_factory=list)
+    state: Any = None  # per-request KV cache, owned by the stepper
+    error: BaseException | None = None
+    cancelled: bool = False  # set by a caller that stopped waiting; the batcher drops it before the next step
+    done: threading.Event = field(default_factory=threading.Event)
+
+    def finished(self) -> bool:
+        return len(self.tokens) >= self.max_new_tokens or (bool(self.tokens) and self.tokens[-1] in self.stop_ids)
+
+
+class ContinuousBatcher:
+    """Iteration-level scheduler: requests join and leave the running batch on every decode step.
+
+    `stepper` does the model work: `prefill(req)` builds the request's cache and returns its first
+    token, `decode(reqs)` runs one batched forward pass and returns the next token for each.
+    """
+
+    def __init__(self, stepper: Any, max_batch: int = 8, idle_wait: float = 0.05):
+        self.stepper = stepper
+        self.max_batch = max(int(max_batch), 1)
+        self.idle_wait = idle_wait
+        self.running: list[GenRequest] = []
+        self._waiting: deque[GenRequest] = deque()
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stop = False
+        self._drain = False
+        self.stats = {"steps": 0, "admitted": 0, "completed": 0, "failed": 0, "cancelled": 0, "tokens": 0, "peak_batch": 0}
+
+    def submit(self, prompt_ids: list[int], **params: Any) -> GenRequest:
+        req = GenRequest(list(prompt_ids), **params)
+        with self._cond:
+            self._waiting.append(req)
+            self._cond.notify()
+            self._ensure_thread()
+        return req
+
+    def generate_ids(self, prompt_ids: list[int], timeout: float | None = None, **params: Any) -> list[int]:
+        req = self.submit(prompt_ids, **params)
+        if not req.done.wait(timeout):
+            req.cancelled = True
+            raise TimeoutError(f"generation did not finish within {timeout}s")
+        if req.error is not None:
+            raise req.error
+        return req.tokens
+
+    def _retire(self, req: GenRequest, error: BaseException | None = None) -> None:
+        req.error, req.state = error, None
+        self.stats["cancelled" if req.cancelled else "failed" if error else "completed"] += 1
+        req.done.set()
+
+    def step(self) -> int:
+        """Admit waiting requests, run one decode step, retire finished ones; returns the batch size stepped."""
+        with self._cond:
+            admitted = []
+            while self._waiting and len(self.running) + len(admitted) < self.max_batch:
+                admitted.append(self._waiting.popleft())
+        for req in [r for r in self.running if r.cancelled]:
+            self._retire(req, TimeoutError("generation cancelled"))
+        self.running = [r for r in self.running if not r.cancelled]
+        for req in admitted:
+            if req.cancelled:
+                self._retire(req, TimeoutError("generation cancelled"))
+                continue
+            self.stats["admitted"] += 1
+            try:
+                req.tokens.append(int(self.stepper.prefill(req)))
+                self.stats["tokens"] += 1
+            except Exception as exc:
+                self._retire(req, exc)
+                continue
+            if req.finished():
+                self._retire(req)
+            else:
+                self.running.append(req)
+        batch = self.running
+        if not batch:
+            return 0
+        self.stats["steps"] += 1
+        self.stats["peak_batch"] = max(self.stats["peak_batch"], len(batch))
+        try:
+            next_tokens = self.stepper.decode(batch)
+        except Exception as exc:
+            for req in batch:
+                self._retire(req, exc)
+            self.running = []
+            return len(batch)
+        still = []
+        for req, token in zip(batch, next_tokens):
+            req.tokens.append(int(token))
+            self.stats["tokens"] += 1
+            if req.finished():
+                self._retire(req)
+            else:
+                still.append(req)
+        self.running = still
+        return len(batch)
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stop and not self._waiting and not self.running:
+                    self._cond.wait(self.idle_wait)
+                if self._stop and not (self._drain and (self._waiting or self.running)):
+                    # exit under the lock so a concurrent submit either is seen here or starts a new thread
+                    leftover = [*self.running, *self._waiting]
+                    self.running, self._waiting = [], deque()
+                    self._thread = None
+                    break
+            self.step()
+        for req in leftover:
+            self._retire(req, RuntimeError("engine stopped"))
+
+    def _ensure_thread(self) -> None:
+        """Called with the condition held"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="transformers-batcher", daemon=True)
+            self._thread.start()
+
+    def stop(self, drain: bool = False, wait: bool = True) -> None:
+        """Stop the decode thread; with `drain`, queued and running requests finish first.
+
+        A drained batcher still serves callers that submit to it afterwards, then exits again.
+        """
+        with self._cond:
+            self._stop, self._drain = True, drain
+            thread = self._thread
+            self._cond.notify_all()
+        if wait and thread is not None:
+            thread.join(timeout=None if drain else 5)
+
+    def summary(self) -> dict[str, Any]:
+        with self._cond:
+            waiting = len(self._waiting)
+        return {**self.stats, "running": len(self.running), "waiting": waiting, "max_batch": self.max_batch}
+
+
+class TorchStepper:
+    """Prefill and batched single-token decode over per-request KV caches.
+
+    Caches of different lengths are left-padded to a common length for each step (masked out via
+    the attention mask, with explicit position ids) and sliced back afterwards, so a request can
+    join or leave without disturbing the others.
+    """
+
+    def __init__(self, model: Any, device: str = "cpu"):
+        import torch
+
+        self.torch = torch
+        self.model = model
+        self.device = device
+        try:
+            from transformers import DynamicCache
+
+            self._wrap = DynamicCache.from_legacy_cache
+        except Exception:  # older transformers take the tuple format directly
+            self._wrap = lambda legacy: legacy
+
+    @staticmethod
+    def _legacy(cache: Any) -> tuple:
+        return cache.to_legacy_cache() if hasattr(cache, "to_legacy_cache") else tuple(cache)
+
+    def _sample(self, logits: Any, req: GenRequest) -> int:
+        torch = self.torch
+        if req.temperature <= 0:
+            return int(torch.argmax(logits, dim=-1))
+        probs = torch.softmax(logits.float() / req.temperature, dim=-1)
+        if req.top_p < 1.0:
+            sorted_probs, order = torch.sort(probs, descending=True)
+            keep = torch.cumsum(sorted_probs, dim=-1) - sorted_probs < req.top_p
+            sorted_probs = sorted_probs * keep
+            return int(order[torch.multinomial(sorted_probs / sorted_probs.sum(), 1)])
+        return int(torch.multinomial(probs, 1))
+
+    def prefill(self, req: GenRequest) -> int:
+        torch = self.torch
+        ids = torch.tensor([req.prompt_ids], dtype=torch.long, device=self.device)
+        with torch.inference_mode():
+            out = self.model(input_ids=ids, use_cache=True)
+        req.state = self._legacy(out.past_key_values)
+        return self._sample(out.logits[0, -1], req)
+
+    def decode(self, reqs: list[GenRequest]) -> list[int]:
+        torch = self.torch
+        lengths = [req.state[0][0].shape[2] for req in reqs]
+        width = max(lengths)
+        layers = []
+        for layer in range(len(reqs[0].state)):
+            keys, values = [], []
+            for req, n in zip(reqs, lengths):
+                k, v = req.state[layer][0], req.state[layer][1]
+                if n < width:
+                    pad = (0, 0, width - n, 0)
+                    k, v = torch.nn.functional.pad(k, pad), torch.nn.functional.pad(v, pad)
+                keys.append(k)
+                values.append(v)
+            layers.append((torch.cat(keys), torch.cat(values)))
+        mask = torch.zeros((len(reqs), width + 1), dtype=torch.long, device=self.device)
+        for i, n in enumerate(lengths):
+            mask[i, width - n:] = 1
+        ids = torch.tensor([[req.tokens[-1]] for req in reqs], dtype=torch.long, device=self.device)
+        positions = torch.tensor([[n] for n in lengths], dtype=torch.long, device=self.device)
+        with torch.inference_mode():
+            out = self.model(input_ids=ids, attention_mask=mask, position_ids=positions,
+                             past_key_values=self._wrap(tuple(layers)), use_cache=True)
+        cache = self._legacy(out.past_key_values)
+        tokens = []
+        for i, (req, n) in enumerate(zip(reqs, lengths)):
+            start = width - n
+            req.state = tuple((k[i:i + 1, :, start:], v[i:i + 1, :, start:]) for k, v, *_ in cache)
+            tokens.append(self._sample(out.logits[i, -1], req))
+        return tokens
+
+
+@dataclass
+class LoadedModel:
+    model_id: str
+    quant: str
+    tokenizer: Any
+    model: Any
+    batcher: ContinuousBatcher
+    loaded_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+
+
+def _default_device() -> str:
+    env = os.environ.get("HF_DEVICE")
+    if env:
+        return env
+    import torch
+
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+_DTYPES = {"fp16": "float16", "half": "float16", "bf16": "bfloat16", "fp32": "float32", "float": "float32"}
+
+
+def load_model(model_id: str, quant: str = "auto", device: str = "cpu", dtype: str | None = None) -> tuple[Any, Any]:
+    """`quant` fp16/bf16/fp32 overrides `dtype`; dtype "auto" is float32 on CPU and float16 elsewhere."""
+    import torch
+    from transformers import AutoModelForCausalLM, AutoTokenizer
+
+    kwargs: dict[str, Any] = {}
+    quant = (quant or "auto").lower()
+    dtype = (dtype or "auto").lower()
+    if quant in {"fp16", "bf16", "fp32"}:
+        dtype = quant
+    if dtype == "auto":
+        dtype = "float32" if device == "cpu" else "float16"
+    kwargs["torch_dtype"] = getattr(torch, _DTYPES.get(dtype, dtype))
+    if quant in {"int8", "8bit", "int4", "4bit", "nf4"} and device != "cpu":
+        from transformers import BitsAndBytesConfig
+
+        four = quant in {"int4", "4bit", "nf4"}
+        kwargs["quantization_config"] = BitsAndBytesConfig(load_in_4bit=four, load_in_8bit=not four)
+        kwargs["device_map"] = "auto"
+    tok = AutoTokenizer.from_pretrained(model_id)
+    model = AutoModelForCausalLM.from_pretrained(model_id, **kwargs)
+    if "device_map" not in kwargs:
+        model = model.to(device)
+    if device == "cpu" and quant in {"int8", "8bit"}:
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    elif device == "cpu" and quant in {"int4", "4bit", "nf4"}:
+        raise ValueError(f"quant={quant} needs a CUDA device (bitsandbytes)")
+    model.eval()
+    return tok, model
+
+
+class TransformersEngine:
+    """LRU of loaded models keyed by (model_id, quant), each served by its own continuous batcher."""
+
+    def __init__(self, capacity: int = 2, max_batch: int = 8, device: str | None = None, dtype: str | None = None,
+                 loader: Any = None, stepper: Any = None):
+        self.capacity = max(int(capacity), 1)
+        self.max_batch = max_batch
+        self.device = device
+        self.dtype = dtype
+        self._loader = loader or load_model
+        self._stepper = stepper or TorchStepper
+        self._models: OrderedDict[tuple[str, str], LoadedModel] = OrderedDict()
+        self._loading: dict[tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.stats = {"loads": 0, "hits": 0, "evictions": 0}
+
+    def get(self, model_id: str, quant: str | None = None) -> LoadedModel:
+        key = (model_id, (quant or "auto").lower())
+        with self._lock:
+            loaded = self._models.get(key)
+            if loaded is not None:
+                self._models.move_to_end(key)
+                self.stats["hits"] += 1
+                loaded.last_used = time.time()
+                return loaded
+            gate = self._loading.setdefault(key, threading.Lock())
+        with gate:  # one load per key; other callers for the same key wait for it
+            with self._lock:
+                if key in self._models:
+                    return self._models[key]
+            device = self.device or _default_device()
+            tok, model = self._loader(key[0], key[1], device, self.dtype)
+            loaded = LoadedModel(key[0], key[1], tok, model, ContinuousBatcher(self._stepper(model, device), max_batch=self.max_batch))
+            with self._lock:
+                self._models[key] = loaded
+                self._loading.pop(key, None)
+                self.stats["loads"] += 1
+                evicted = []
+                while len(self._models) > self.capacity:
+                    evicted.append(self._models.popitem(last=False)[1])
+                    self.stats["evictions"] += 1
+        for old in evicted:
+            old.batcher.stop(drain=True, wait=False)  # callers already holding it finish; the model goes with the thread
+        return loaded
+
+    def generate(self, prompt: str, model_id: str | None = None, quant: str | None = None, max_new_tokens: int = 128,
+                 temperature: float = 0.7, top_p: float = 0.95, timeout: float | None = None) -> str:
+        loaded = self.get(model_id or os.environ.get("HF_MODEL_ID") or DEFAULT_MODEL, quant)
+        tok = loaded.tokenizer
+        stop = frozenset(i for i in [tok.eos_token_id] if i is not None)
+        ids = tok(prompt)["input_ids"] or [tok.bos_token_id or tok.eos_token_id or 0]
+        out = loaded.batcher.generate_ids(ids, timeout=timeout, max_new_tokens=max_new_tokens,
+                                          temperature=temperature, top_p=top_p, stop_ids=stop)
+        return tok.decode(out, skip_special_tokens=True).strip()
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            models = [{"model_id": m.model_id, "quant": m.quant, "last_used": m.last_used, **m.batcher.summary()}
+                      for m in self._models.values()]
+        return {**self.stats, "capacity": self.capacity, "models": models}
+
+    def close(self) -> None:
+        with self._lock:
+            models = list(self._models.values())
+            self._models.clear()
+        for m in models:
+            m.batcher.stop()
+
+
+_engine: TransformersEngine | None = None
+_engine_lock = threading.Lock()
+
+
+def engine(capacity: int | None = None, max_batch: int | None = None, dtype: str | None = None) -> TransformersEngine:
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = TransformersEngine(capacity=capacity or int(os.environ.get("HF_MODEL_CACHE_SIZE", "2")),
+                                         max_batch=max_batch or int(os.environ.get("HF_MAX_BATCH", "8")),
+                                         dtype=dtype or os.environ.get("HF_DTYPE"))
+        return _engine
+
+
+def generate(prompt: str, quant: str | None = None, model_id: str | None = None, **kw: Any) -> str:
+    return engine().generate(prompt, model_id=model_id, quant=quant, **kw)
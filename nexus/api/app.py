@@ -4,11 +4,12 @@ import json
 from pathlib import Path
 from typing import Any
 
-from fastapi import Body, FastAPI, HTTPException
+from fastapi import Body, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import PlainTextResponse, RedirectResponse
+from fastapi.responses import PlainTextResponse, RedirectResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
+from ..async_exec import PipelineSaturated
 from ..schemas import ApprovalRequest, ChatRequest, RetrievalIngestRequest, RetrievalRequest
 from ..services import NexusServices, build_services
 from nexusnet.schemas import CurriculumAssessmentRequest, DistillationExportRequest, DreamCycleRequest, GraphIngestRequest, ModelAttachRequest
@@ -19,6 +20,11 @@ def create_app(project_root: str | None = None) -> FastAPI:
     application = FastAPI(title="Nexus API", version=services.version)
     application.state.services = services
 
+    @application.on_event("shutdown")
+    async def _close_async_clients():
+        await services.runtime_registry.aclose()
+        services.async_chat.close()
+
     application.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -36,6 +42,13 @@ def create_app(project_root: str | None = None) -> FastAPI:
             if trace.get("session_id") == session_id and trace.get("trace_id")
         ][:limit]
 
+    def _event_stream(events) -> StreamingResponse:
+        async def _encode():
+            async for event in events:
+                yield f"event: {event['event']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+
+        return StreamingResponse(_encode(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
     def _recipe_requested_tools(item: dict[str, Any]) -> list[str]:
         requested: set[str] = set(item.get("approved_tools", []) or [])
         for step in item.get("steps", []) or []:
@@ -290,6 +303,29 @@ def create_app(project_root: str | None = None) -> FastAPI:
     def ops_brain_wrapper_surface(session_id: str | None = None):
         return services.brain_ui_surface.snapshot(session_id=session_id)
 
+    @application.get("/ops/brain/wrapper-surface/delta")
+    def ops_brain_wrapper_surface_delta(session_id: str | None = None, since: int | None = None):
+        delta = services.brain_ui_surface.change_feed.delta(session_id, since=since)
+        return delta or {"session_id": session_id, "version": since, "unchanged": True}
+
+    @application.get("/ops/brain/wrapper-surface/stream")
+    async def ops_brain_wrapper_surface_stream(
+        request: Request,
+        session_id: str | None = None,
+        since: int | None = None,
+        poll_interval_seconds: float = 1.0,
+        max_events: int | None = None,
+    ):
+        return _event_stream(
+            services.brain_ui_surface.change_feed.stream(
+                session_id,
+                since=since,
+                poll_interval_seconds=max(poll_interval_seconds, 0.1),
+                max_events=max_events,
+                is_disconnected=request.is_disconnected,
+            )
+        )
+
     @application.get("/ops/brain/visualizer/state")
     def ops_brain_visualizer_state(session_id: str | None = None):
         return services.brain_visualizer.state(session_id=session_id)
@@ -298,6 +334,29 @@ def create_app(project_root: str | None = None) -> FastAPI:
     def ops_brain_visualizer_replay(session_id: str | None = None, limit: int = 12):
         return services.brain_visualizer.replay(session_id=session_id, limit=limit)
 
+    @application.get("/ops/brain/visualizer/delta")
+    def ops_brain_visualizer_delta(session_id: str | None = None, since: int | None = None):
+        delta = services.brain_visualizer.change_feed.delta(session_id, since=since)
+        return delta or {"session_id": session_id, "version": since, "unchanged": True}
+
+    @application.get("/ops/brain/visualizer/stream")
+    async def ops_brain_visualizer_stream(
+        request: Request,
+        session_id: str | None = None,
+        since: int | None = None,
+        poll_interval_seconds: float = 1.0,
+        max_events: int | None = None,
+    ):
+        return _event_stream(
+            services.brain_visualizer.change_feed.stream(
+                session_id,
+                since=since,
+                poll_interval_seconds=max(poll_interval_seconds, 0.1),
+                max_events=max_events,
+                is_disconnected=request.is_disconnected,
+            )
+        )
+
     @application.get("/ops/brain/visualizer/disagreements/compare")
     def ops_brain_visualizer_disagreement_compare(left_artifact_id: str, right_artifact_id: str):
         return services.brain_visualizer.compare_disagreements(left_artifact_id, right_artifact_id)
@@ -616,7 +675,11 @@ def create_app(project_root: str | None = None) -> FastAPI:
         schedule_id: str | None = None,
         trigger_source: str | None = None,
         status: str | None = None,
+        flow_family: str | None = None,
+        started_after: str | None = None,
+        started_before: str | None = None,
         limit: int = 12,
+        offset: int = 0,
     ):
         return services.brain_recipe_history.summary(
             execution_kind="recipe",
@@ -624,7 +687,11 @@ def create_app(project_root: str | None = None) -> FastAPI:
             schedule_id=schedule_id,
             trigger_source=trigger_source,
             status=status,
+            flow_family=flow_family,
+            started_after=started_after,
+            started_before=started_before,
             limit=limit,
+            offset=offset,
         )
 
     @application.get("/ops/brain/recipes/history/compare")
@@ -932,6 +999,19 @@ def create_app(project_root: str | None = None) -> FastAPI:
             "parallel": services.brain_parallel.summary(),
         }
 
+    @application.get("/ops/brain/subagents/runs/{run_id}")
+    def ops_brain_subagents_run(run_id: str):
+        run = services.brain_subagents.get_run(run_id)
+        if run is None:
+            raise HTTPException(status_code=404, detail="subagent run not found")
+        return run
+
+    @application.post("/ops/brain/subagents/runs/{run_id}/cancel")
+    def ops_brain_subagents_cancel(run_id: str):
+        if not services.brain_subagents.cancel(run_id):
+            raise HTTPException(status_code=404, detail="subagent run not active")
+        return {"run_id": run_id, "cancel_requested": True}
+
     @application.post("/ops/brain/subagents/plan")
     def ops_brain_subagents_plan(
         recipe_id: str = Body(...),
@@ -945,6 +1025,8 @@ def create_app(project_root: str | None = None) -> FastAPI:
         linked_trace_ids: list[str] | None = Body(default=None),
         policy_path: list[dict] | None = Body(default=None),
         approval_path: dict | None = Body(default=None),
+        dispatch: bool | None = Body(default=None),
+        wait: bool = Body(default=True),
     ):
         recipe = services.brain_recipe_catalog.get(recipe_id)
         if recipe is None:
@@ -980,6 +1062,9 @@ def create_app(project_root: str | None = None) -> FastAPI:
             approval_fallback_chain=execution_context["approval_fallback_chain"],
             adversary_review_report_ids=execution_context["adversary_review_report_ids"],
             linked_report_ids=execution_context["linked_report_ids"],
+            dispatch=dispatch,
+            wait=wait,
+            session_id=session_id,
         )
         privilege_requested_tools = sorted({tool for worker in execution.get("workers", []) for tool in worker.get("requested_tools", [])})
         privilege_allowed_tools = sorted({tool for worker in execution.get("workers", []) for tool in worker.get("allowed_tools", [])})
@@ -1005,12 +1090,14 @@ def create_app(project_root: str | None = None) -> FastAPI:
                 allowed_extensions=privilege_allowed_extensions,
                 trigger_source=effective_trigger_source,
             )
-        execution["gateway_resolution"] = execution_context["gateway_resolution"]
-        execution["gateway_execution_history"] = ((execution_context.get("gateway_resolution") or {}).get("execution_history"))
-        execution["privilege_review"] = privilege_review
-        execution["linked_trace_ids"] = execution_context["linked_trace_ids"]
-        if execution.get("artifact_path"):
-            Path(execution["artifact_path"]).write_text(json.dumps(execution, indent=2), encoding="utf-8")
+        annotations = {
+            "gateway_resolution": execution_context["gateway_resolution"],
+            "gateway_execution_history": ((execution_context.get("gateway_resolution") or {}).get("execution_history")),
+            "privilege_review": privilege_review,
+            "linked_trace_ids": execution_context["linked_trace_ids"],
+        }
+        execution.update(annotations)
+        services.brain_subagents.annotate(execution["run_id"], annotations)  # a background run rewrites its artifact too
         history_service = services.brain_runbook_history if recipe.get("kind") == "runbook" else services.brain_recipe_history
         adversary_report_ids = list(execution_context["adversary_review_report_ids"])
         if privilege_review and ((privilege_review.get("report") or {}).get("report_id")):
@@ -1311,6 +1398,34 @@ def create_app(project_root: str | None = None) -> FastAPI:
             },
         }
 
+    @application.get("/ops/brain/retrieval/cache")
+    def ops_brain_retrieval_cache():
+        return services.retrieval.cache_stats()
+
+    @application.get("/ops/brain/storage/write-behind")
+    def ops_brain_storage_write_behind():
+        writer = services.store.write_behind
+        return writer.summary() if writer is not None else {"enabled": False}
+
+    @application.get("/ops/brain/async-pipeline")
+    def ops_brain_async_pipeline():
+        return services.async_chat.summary()
+
+    @application.get("/ops/brain/storage/traces")
+    def ops_brain_storage_traces():
+        return services.store.trace_storage_stats()
+
+    @application.post("/ops/brain/storage/traces/compact")
+    def ops_brain_storage_traces_compact(
+        retention_days: float | None = Body(default=None),
+        max_traces: int | None = Body(default=None),
+    ):
+        traces_cfg = (services.runtime_configs.get("storage", {}) or {}).get("traces", {}) or {}
+        return services.store.compact_traces(
+            retention_days=retention_days if retention_days is not None else traces_cfg.get("retention_days"),
+            max_traces=max_traces if max_traces is not None else traces_cfg.get("max_traces"),
+        )
+
     @application.get("/ops/brain/retrieval/rerank-benchmark")
     def ops_brain_retrieval_rerank_benchmark(
         query: str,
@@ -1749,13 +1864,31 @@ def create_app(project_root: str | None = None) -> FastAPI:
         return decision.model_dump(mode="json")
 
     @application.post("/retrieval/ingest")
-    def retrieval_ingest(request: RetrievalIngestRequest):
-        doc_ids = services.retrieval.ingest(request)
+    async def retrieval_ingest(request: RetrievalIngestRequest):
+        doc_ids = await services.async_chat.offload(services.retrieval.ingest, request)
         return {"ok": True, "doc_ids": doc_ids, "count": len(doc_ids)}
 
+    @application.post("/retrieval/ingest/bulk")
+    def retrieval_ingest_bulk(
+        request: RetrievalIngestRequest,
+        batch_size: int | None = None,
+        workers: int | None = None,
+        artifact_mode: str | None = None,
+    ):
+        try:
+            report = services.retrieval.bulk_ingest(
+                request.documents,
+                batch_size=batch_size,
+                workers=workers,
+                artifact_mode=artifact_mode,
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        return {"ok": True, "count": len(report["doc_ids"]), **report}
+
     @application.post("/retrieval/query")
-    def retrieval_query(request: RetrievalRequest):
-        hits = services.retrieval.query(request)
+    async def retrieval_query(request: RetrievalRequest):
+        hits = await services.async_chat.offload(services.retrieval.query, request)
         return {"hits": [hit.model_dump(mode="json") for hit in hits]}
 
     @application.post("/rag/ingest")
@@ -1763,12 +1896,21 @@ def create_app(project_root: str | None = None) -> FastAPI:
         documents = RetrievalIngestRequest(documents=[
             {"source": "legacy-rag", "text": text, "metadata": {"compat": True}} for text in (payload or [])
         ])
-        doc_ids = services.retrieval.ingest(documents)
-        return {"ok": True, "added": len(doc_ids), "doc_ids": doc_ids}
+        report = services.retrieval.bulk_ingest(documents.documents)
+        return {
+            "ok": True,
+            "added": len(report["doc_ids"]),
+            "doc_ids": report["doc_ids"],
+            "docs_per_second": report["docs_per_second"],
+            "chunks_per_second": report["chunks_per_second"],
+        }
 
     @application.post("/chat")
-    def chat(request: ChatRequest):
-        result = services.operator.execute_chat(request)
+    async def chat(request: ChatRequest):
+        try:
+            result = await services.async_chat.execute_chat(request)
+        except PipelineSaturated as exc:
+            raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "1"}) from exc
         return {
             "ok": result.status != "error",
             "status": result.status,
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, nullcontext
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, AsyncIterator, Callable, ContextManager, Generator
+
+Steps = Generator["RuntimeCall", Any, Any]
+
+
+class PipelineSaturated(RuntimeError):
+    pass
+
+
+class StepsCancelled(RuntimeError):
+    pass
+
+
+@dataclass
+class RuntimeCall:
+    """A model call yielded by a step generator; the driver decides how to wait for it."""
+
+    adapter: Any
+    session_context: Any
+    prompt: str
+    messages: list
+
+    def run(self) -> str:
+        return self.adapter.generate(session_context=self.session_context, prompt=self.prompt, messages=self.messages)
+
+    async def arun(self, executor: ThreadPoolExecutor | None = None) -> str:
+        agenerate = getattr(self.adapter, "agenerate", None)
+        if agenerate is not None:
+            return await agenerate(session_context=self.session_context, prompt=self.prompt, messages=self.messages, executor=executor)
+        return await asyncio.get_running_loop().run_in_executor(executor, self.run)
+
+
+def drive(steps: Steps, *, cancel: threading.Event | None = None) -> Any:
+    """Run a step generator to completion on the calling thread; `cancel` is checked before each model call."""
+    value: Any = None
+    error: BaseException | None = None
+    while True:
+        try:
+            call = steps.throw(error) if error is not None else steps.send(value)
+        except StopIteration as stop:
+            return stop.value
+        value, error = None, None
+        if cancel is not None and cancel.is_set():
+            steps.close()
+            raise StepsCancelled("cancelled before model call")
+        try:
+            value = call.run()
+        except Exception as exc:
+            error = exc
+
+
+class AsyncChatPipeline:
+    """Async request path: admission control, CPU stages on a bounded executor, awaited model calls.
+
+    Step generators (see `OperatorKernel.execute_chat_steps`) run their synchronous stages on
+    `cpu_executor` and yield a `RuntimeCall` at each model call. The call is awaited on the
+    event loop, so an in-flight request holds no thread while a remote runtime is working.
+    Runtimes without a native async client fall back to `blocking_executor`.
+    """
+
+    def __init__(self, *, kernel: Any = None, store: Any = None, config: dict[str, Any] | None = None):
+        config = config or {}
+        cpus = os.cpu_count() or 2
+        self.kernel = kernel
+        self.store = store
+        self.max_in_flight = max(int(config.get("max_in_flight", 256)), 1)
+        self.max_queue = max(int(config.get("max_queue", 1024)), 0)
+        self.cpu_executor = ThreadPoolExecutor(
+            max_workers=max(int(config.get("cpu_workers") or cpus * 2), 1), thread_name_prefix="nexus-cpu"
+        )
+        self.blocking_executor = ThreadPoolExecutor(
+            max_workers=max(int(config.get("blocking_runtime_workers", 32)), 1), thread_name_prefix="nexus-runtime"
+        )
+        self._semaphores: dict[int, asyncio.Semaphore] = {}
+        self._lock = threading.Lock()
+        self._waits: deque[float] = deque(maxlen=512)
+        self.metrics = {
+            "in_flight": 0,
+            "queued": 0,
+            "peak_in_flight": 0,
+            "peak_queued": 0,
+            "admitted": 0,
+            "rejected": 0,
+            "completed": 0,
+            "failed": 0,
+            "runtime_calls": 0,
+        }
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(id(loop))
+            if semaphore is None:
+                semaphore = self._semaphores[id(loop)] = asyncio.Semaphore(self.max_in_flight)
+            return semaphore
+
+    def _bump(self, key: str, delta: int = 1) -> None:
+        with self._lock:
+            self.metrics[key] += delta
+            peak = f"peak_{key}"
+            if peak in self.metrics:
+                self.metrics[peak] = max(self.metrics[peak], self.metrics[key])
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        semaphore = self._semaphore()
+        if semaphore.locked() and self.metrics["queued"] >= self.max_queue:
+            self._bump("rejected")
+            raise PipelineSaturated(f"{self.metrics['in_flight']} requests in flight and {self.metrics['queued']} queued")
+        started = time.perf_counter()
+        self._bump("queued")
+        try:
+            await semaphore.acquire()
+        finally:
+            self._bump("queued", -1)
+        self._waits.append((time.perf_counter() - started) * 1000.0)
+        self._bump("admitted")
+        self._bump("in_flight")
+        try:
+            yield
+            self._bump("completed")
+        except BaseException:
+            self._bump("failed")
+            raise
+        finally:
+            self._bump("in_flight", -1)
+            semaphore.release()
+
+    async def offload(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self.cpu_executor, partial(fn, *args, **kwargs))
+
+    async def run_steps(self, steps: Steps, *, scope: Callable[[], ContextManager[Any]] | None = None) -> Any:
+        """Async counterpart of `drive`; each synchronous stage runs on the CPU executor inside `scope`."""
+        scope = scope or nullcontext
+        value: Any = None
+        error: BaseException | None = None
+
+        def advance(value: Any, error: BaseException | None) -> tuple[bool, Any]:
+            # write-behind bundles are thread-local, so each stage re-enters the scope on its worker thread
+            with scope():
+                try:
+                    return False, steps.throw(error) if error is not None else steps.send(value)
+                except StopIteration as stop:
+                    return True, stop.value
+
+        while True:
+            done, item = await self.offload(advance, value, error)
+            if done:
+                return item
+            value, error = None, None
+            self._bump("runtime_calls")
+            try:
+                value = await item.arun(self.blocking_executor)
+            except Exception as exc:
+                error = exc
+
+    async def execute_chat(self, request: Any) -> Any:
+        async with self.admit():
+            if self.store is None:
+                return await self.run_steps(self.kernel.execute_chat_steps(request))
+            # one bundle for the whole request, as on the synchronous path, whichever threads the stages land on
+            bundle = self.store.open_bundle(request.session_id)
+            try:
+                return await self.run_steps(self.kernel.execute_chat_steps(request), scope=lambda: self.store.use_bundle(bundle))
+            finally:
+                # shielded so a cancelled request still hands its writes over; may block on write-behind backpressure
+                await asyncio.shield(self.offload(self.store.submit_bundle, bundle))
+
+    def summary(self) -> dict[str, Any]:
+        waits = sorted(self._waits)
+        with self._lock:
+            metrics = dict(self.metrics)
+        return {
+            **metrics,
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "cpu_workers": self.cpu_executor._max_workers,
+            "blocking_runtime_workers": self.blocking_executor._max_workers,
+            "queue_wait_ms_avg": round(sum(waits) / len(waits), 3) if waits else 0.0,
+            "queue_wait_ms_p95": round(waits[min(int(len(waits) * 0.95), len(waits) - 1)], 3) if waits else 0.0,
+        }
+
+    def close(self) -> None:
+        self.cpu_executor.shutdown(wait=False, cancel_futures=True)
+        self.blocking_executor.shutdown(wait=False, cancel_futures=True)
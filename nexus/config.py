@@ -96,6 +96,10 @@ def load_runtime_configs(paths: NexusPaths) -> dict[str, Any]:
         "teachers": load_yaml_file(paths.config_dir / "teachers.yaml", {}),
         "router": load_yaml_file(paths.config_dir / "router.yaml", {}),
         "rag": load_yaml_file(paths.config_dir / "rag.yaml", {}),
+        "storage": load_yaml_file(
+            paths.config_dir / "storage.yaml",
+            load_yaml_file(_project_root() / "runtime" / "config" / "storage.yaml", {}),
+        ),
         "retrieval": load_yaml_file(
             paths.config_dir / "retrieval.yaml",
             load_yaml_file(_project_root() / "runtime" / "config" / "retrieval.yaml", {}),
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 import json
 from pathlib import Path
 
@@ -23,15 +24,21 @@ class GovernanceService:
         event_id = new_id("audit")
         created_at = utcnow().isoformat()
         self.store.save_audit_event(event_id, action, detail, created_at)
+        line = json.dumps({"event_id": event_id, "action": action, "detail": detail, "created_at": created_at}) + "\n"
+        snapshot = copy.deepcopy(detail)
+        if not self.store.defer(lambda: self._append_audit_log(line, action, snapshot), after_commit=True):
+            self._append_audit_log(line, action, detail)
+        return {"event_id": event_id, "action": action, "detail": detail, "created_at": created_at}
+
+    def _append_audit_log(self, line: str, action: str, detail: dict) -> None:
         with self.audit_log_path.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps({"event_id": event_id, "action": action, "detail": detail, "created_at": created_at}) + "\n")
+            handle.write(line)
         try:
             from core.ops.audit import log as legacy_log  # type: ignore
 
             legacy_log(action, detail)
         except Exception:
             pass
-        return {"event_id": event_id, "action": action, "detail": detail, "created_at": created_at}
 
     def record_approval(self, request: ApprovalRequest) -> PromotionDecision:
         decision = PromotionDecision(
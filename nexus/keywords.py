@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Iterable, Mapping
+
+
+class KeywordAutomaton:
+    """Aho-Corasick matcher over named keyword groups.
+
+    Matching is case-insensitive substring matching, the same semantics as `keyword in text`,
+    but every group is counted in one pass over the text regardless of how many groups or
+    keywords were compiled.
+    """
+
+    def __init__(self, groups: Mapping[str, Iterable[str]]):
+        self.groups = list(groups)
+        self.keywords: list[str] = []
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[int, ...]] = [()]
+        owners: dict[str, list[int]] = {}
+        for group_index, group in enumerate(self.groups):
+            for keyword in groups[group] or ():
+                keyword = str(keyword).lower()
+                if keyword:
+                    owners.setdefault(keyword, []).append(group_index)
+        self._keyword_groups: list[tuple[int, ...]] = []
+        for keyword, group_indexes in owners.items():
+            self._insert(keyword, len(self.keywords))
+            self.keywords.append(keyword)
+            self._keyword_groups.append(tuple(dict.fromkeys(group_indexes)))
+        self._link()
+
+    def _insert(self, keyword: str, keyword_index: int) -> None:
+        node = 0
+        for char in keyword:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            node = nxt
+        self._out[node] = self._out[node] + (keyword_index,)
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def keyword_counts(self, text: str) -> list[int]:
+        counts = [0] * len(self.keywords)
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for char in text.lower():
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for keyword_index in out[node]:
+                counts[keyword_index] += 1
+        return counts
+
+    def scan(self, text: str) -> dict[str, dict[str, int]]:
+        """Group -> {keyword: occurrences} for every group with at least one hit."""
+        hits: dict[str, dict[str, int]] = {}
+        for keyword_index, count in enumerate(self.keyword_counts(text)):
+            if not count:
+                continue
+            keyword = self.keywords[keyword_index]
+            for group_index in self._keyword_groups[keyword_index]:
+                hits.setdefault(self.groups[group_index], {})[keyword] = count
+        return hits
+
+    def rank(self, text: str, *, allowed: Iterable[str] | None = None) -> list[dict[str, Any]]:
+        """Groups ordered by total occurrences, ties broken by compile (config) order."""
+        allowed_set = set(allowed) if allowed is not None else None
+        order = {group: index for index, group in enumerate(self.groups)}
+        ranked = [
+            {"capsule": group, "matches": sum(keywords.values()), "keywords": keywords}
+            for group, keywords in self.scan(text).items()
+            if allowed_set is None or group in allowed_set
+        ]
+        ranked.sort(key=lambda item: (-item["matches"], order[item["capsule"]]))
+        return ranked
+
+
+def keyword_map_signature(keyword_map: Mapping[str, Iterable[str]], extra: Mapping[str, Iterable[str]] | None = None) -> tuple:
+    return tuple((group, tuple(keywords or ())) for group, keywords in {**dict(keyword_map), **dict(extra or {})}.items())
+
+
+def _map_shape(keyword_map: Mapping[str, Iterable[str]]) -> tuple:
+    # O(groups): catches added/removed groups and replaced or resized keyword lists without walking keywords
+    return (id(keyword_map), *((group, id(keywords), len(keywords) if hasattr(keywords, "__len__") else -1) for group, keywords in keyword_map.items()))
+
+
+class CompiledKeywordMap:
+    """Holds the automaton for a keyword map and recompiles it when the map's contents change.
+
+    The full signature is only taken when the map's shape (identity, groups, list sizes) changes, so a
+    lookup against an unchanged map costs O(groups), not O(keywords).
+    """
+
+    def __init__(self, extra_groups: Mapping[str, Iterable[str]] | None = None):
+        self.extra_groups = {group: tuple(keywords) for group, keywords in (extra_groups or {}).items()}
+        self._shape: tuple | None = None
+        self._signature: tuple | None = None
+        self._automaton: KeywordAutomaton | None = None
+        self.builds = 0
+
+    def get(self, keyword_map: Mapping[str, Iterable[str]]) -> KeywordAutomaton:
+        shape = _map_shape(keyword_map)
+        if self._automaton is not None and shape == self._shape:
+            return self._automaton
+        signature = keyword_map_signature(keyword_map, self.extra_groups)
+        if self._automaton is None or signature != self._signature:
+            self._automaton = KeywordAutomaton(dict(signature))
+            self._signature = signature
+            self.builds += 1
+        self._shape = shape
+        return self._automaton
@@ -1,4 +1,4 @@
+from .hot_cache import SessionHotCache
 from .service import MemoryService
 
-__all__ = ["MemoryService"]
-
+__all__ = ["MemoryService", "SessionHotCache"]
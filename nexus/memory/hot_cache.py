@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict, deque
+from typing import Any
+
+
+class _SessionState:
+    __slots__ = ("records", "complete")
+
+    def __init__(self, records: list[dict[str, Any]], capacity: int, complete: bool):
+        self.records: deque[dict[str, Any]] = deque(records[-capacity:], maxlen=capacity)
+        self.complete = complete and len(records) <= capacity
+
+
+class SessionHotCache:
+    """Newest memory records per session, held in process and written through on append.
+
+    A session's ring holds its latest `records_per_session` records; while the session has never
+    overflowed it, the ring is the whole session and answers any query. Sessions are evicted LRU
+    past `max_sessions`. Writes that bypass MemoryService must call `invalidate`.
+    """
+
+    def __init__(self, max_sessions: int = 128, records_per_session: int = 512):
+        self.max_sessions = max(1, int(max_sessions))
+        self.records_per_session = max(1, int(records_per_session))
+        self._sessions: OrderedDict[str, _SessionState] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "fallbacks": 0, "loads": 0, "appends": 0, "evictions": 0, "invalidations": 0}
+
+    def loaded(self, session_id: str) -> bool:
+        with self._lock:
+            return session_id in self._sessions
+
+    def load(self, session_id: str, newest_first: list[dict[str, Any]], *, complete: bool) -> None:
+        with self._lock:
+            self._sessions[session_id] = _SessionState(list(reversed(newest_first)), self.records_per_session, complete)
+            self._sessions.move_to_end(session_id)
+            self.stats["loads"] += 1
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def append(self, session_id: str, record: dict[str, Any]) -> None:
+        with self._lock:
+            state = self._sessions.get(session_id)
+            if state is None:
+                return  # not hot; the next read loads it from the store
+            self.stats["appends"] += 1
+            for index, existing in enumerate(state.records):
+                if existing["memory_id"] == record["memory_id"]:
+                    state.records[index] = record
+                    return
+            if len(state.records) == state.records.maxlen:
+                state.complete = False
+            state.records.append(record)
+
+    def records(self, session_id: str, plane: str | None = None, limit: int = 200) -> list[dict[str, Any]] | None:
+        """Oldest-first records, as the store lists them; None when the ring no longer holds the session start."""
+        with self._lock:
+            state = self._sessions.get(session_id)
+            if state is None or not state.complete:
+                self.stats["fallbacks" if state is not None else "misses"] += 1
+                return None
+            self._sessions.move_to_end(session_id)
+            self.stats["hits"] += 1
+            return [r for r in state.records if plane is None or r["plane"] == plane][:limit]
+
+    def recent(self, session_id: str, plane: str | None = None, limit: int = 6) -> list[dict[str, Any]] | None:
+        """The newest `limit` records, oldest-first; None when the ring holds fewer than asked of an overflowed session."""
+        with self._lock:
+            state = self._sessions.get(session_id)
+            if state is None:
+                self.stats["misses"] += 1
+                return None
+            picked = [r for r in state.records if plane is None or r["plane"] == plane]
+            if len(picked) < limit and not state.complete:
+                self.stats["fallbacks"] += 1
+                return None
+            self._sessions.move_to_end(session_id)
+            self.stats["hits"] += 1
+            return picked[-limit:] if limit > 0 else []
+
+    def invalidate(self, session_id: str | None = None) -> None:
+        with self._lock:
+            if session_id is None:
+                self._sessions.clear()
+            else:
+                self._sessions.pop(session_id, None)
+            self.stats["invalidations"] += 1
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            reads = self.stats["hits"] + self.stats["misses"] + self.stats["fallbacks"]
+            return {
+                **self.stats,
+                "sessions": len(self._sessions),
+                "records": sum(len(s.records) for s in self._sessions.values()),
+                "hit_rate": round(self.stats["hits"] / reads, 4) if reads else 0.0,
+            }
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import math
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Iterable
+
+_TOKEN = re.compile(r"[a-z0-9_]+")
+
+
+def _terms(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def _flatten(value: Any) -> Iterable[str]:
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from _flatten(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _flatten(item)
+    elif value is not None and not isinstance(value, bool):
+        yield str(value)
+
+
+def _timestamp(value: Any) -> float:
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        return 0.0
+
+
+class _SessionIndex:
+    __slots__ = ("docs", "postings", "total_length")
+
+    def __init__(self) -> None:
+        self.docs: dict[str, tuple[str, int, float, dict[str, Any]]] = {}  # memory_id -> (plane, length, ts, record)
+        self.postings: dict[str, dict[str, int]] = {}
+        self.total_length = 0
+
+    def add(self, record: dict[str, Any]) -> None:
+        memory_id = record["memory_id"]
+        if memory_id in self.docs:
+            self.remove(memory_id)
+        counts = Counter(_terms(" ".join(_flatten(record.get("content")))))
+        length = sum(counts.values())
+        self.docs[memory_id] = (record["plane"], length, _timestamp(record.get("created_at")), record)
+        self.total_length += length
+        for term, tf in counts.items():
+            self.postings.setdefault(term, {})[memory_id] = tf
+
+    def remove(self, memory_id: str) -> None:
+        plane, length, _, record = self.docs.pop(memory_id)
+        self.total_length -= length
+        for term in set(_terms(" ".join(_flatten(record.get("content"))))):
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(memory_id, None)
+                if not posting:
+                    del self.postings[term]
+
+
+class MemoryIndex:
+    """Per-session inverted index over memory-record text, scored with BM25 and a recency decay.
+
+    Sessions are built from the full stored history on first search (via `loader`), then kept
+    current by `add` on every write; at most `max_sessions` stay resident, LRU.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], list[dict[str, Any]]],
+        *,
+        max_sessions: int = 64,
+        k1: float = 1.2,
+        b: float = 0.75,
+        half_life_hours: float = 72.0,
+        recency_weight: float = 0.25,
+        max_pending_records: int = 2048,
+    ):
+        self.loader = loader
+        self.max_sessions = max(1, int(max_sessions))
+        self.k1 = k1
+        self.b = b
+        self.half_life_seconds = max(float(half_life_hours), 0.0) * 3600.0
+        self.recency_weight = recency_weight
+        self.max_pending_records = max(0, int(max_pending_records))
+        self._sessions: OrderedDict[str, _SessionIndex] = OrderedDict()
+        # recent writes to cold sessions, replayed over the build: under write-behind the store may not
+        # hold them yet. Bounded in total; older entries are committed by then and the build reads them.
+        self._pending: OrderedDict[str, dict[str, dict[str, Any]]] = OrderedDict()
+        self._pending_count = 0
+        self._lock = threading.Lock()
+        self.stats = {"builds": 0, "adds": 0, "searches": 0, "evictions": 0}
+
+    def add(self, record: dict[str, Any]) -> None:
+        with self._lock:
+            session_id = record["session_id"]
+            index = self._sessions.get(session_id)
+            if index is not None:
+                index.add(record)
+                self.stats["adds"] += 1
+                return
+            if not self.max_pending_records:
+                return
+            queued = self._pending.setdefault(session_id, {})
+            self._pending_count += record["memory_id"] not in queued
+            queued[record["memory_id"]] = record
+            self._pending.move_to_end(session_id)
+            while self._pending_count > self.max_pending_records:
+                oldest = next(iter(self._pending.values()))
+                oldest.pop(next(iter(oldest)))
+                self._pending_count -= 1
+                if not oldest:
+                    self._pending.popitem(last=False)
+
+    def invalidate(self, session_id: str | None = None) -> None:
+        with self._lock:
+            if session_id is None:
+                self._sessions.clear()
+                self._pending.clear()
+                self._pending_count = 0
+            else:
+                self._sessions.pop(session_id, None)
+                self._pending_count -= len(self._pending.pop(session_id, {}))
+
+    def _session(self, session_id: str) -> _SessionIndex:
+        with self._lock:
+            index = self._sessions.get(session_id)
+            if index is not None:
+                self._sessions.move_to_end(session_id)
+                return index
+        built = _SessionIndex()
+        for record in self.loader(session_id):
+            built.add(record)
+        with self._lock:
+            queued = self._pending.pop(session_id, {})
+            self._pending_count -= len(queued)
+            for record in queued.values():
+                built.add(record)
+            index = self._sessions.setdefault(session_id, built)
+            self._sessions.move_to_end(session_id)
+            self.stats["builds"] += index is built
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.stats["evictions"] += 1
+        return index
+
+    def search(
+        self,
+        session_id: str,
+        query: str,
+        *,
+        top_k: int = 10,
+        planes: Iterable[str] | None = None,
+        now: float | None = None,
+    ) -> list[tuple[dict[str, Any], float]]:
+        """Best `top_k` records of the session for `query` as (record, score), highest first."""
+        terms = set(_terms(query))
+        if not terms:
+            return []
+        index = self._session(session_id)
+        allowed = set(planes) if planes else None
+        now = time.time() if now is None else now
+        with self._lock:
+            self.stats["searches"] += 1
+            n = len(index.docs)
+            if not n:
+                return []
+            avg_length = index.total_length / n or 1.0
+            scores: dict[str, float] = {}
+            for term in terms:
+                posting = index.postings.get(term)
+                if not posting:
+                    continue
+                idf = math.log(1.0 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+                for memory_id, tf in posting.items():
+                    length = index.docs[memory_id][1]
+                    scores[memory_id] = scores.get(memory_id, 0.0) + idf * tf * (self.k1 + 1) / (
+                        tf + self.k1 * (1 - self.b + self.b * length / avg_length)
+                    )
+            ranked = []
+            for memory_id, score in scores.items():
+                plane, _, ts, record = index.docs[memory_id]
+                if allowed is not None and plane not in allowed:
+                    continue
+                if self.half_life_seconds and self.recency_weight:
+                    decay = 0.5 ** (max(now - ts, 0.0) / self.half_life_seconds)
+                    score *= 1.0 + self.recency_weight * decay
+                ranked.append((record, score))
+        ranked.sort(key=lambda item: item[1], reverse=True)
+        return ranked[:top_k]
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "sessions": len(self._sessions),
+                "pending_records": self._pending_count,
+                "documents": sum(len(index.docs) for index in self._sessions.values()),
+                "terms": sum(len(index.postings) for index in self._sessions.values()),
+            }
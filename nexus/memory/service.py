@@ -7,6 +7,8 @@ from typing import Iterable
 from ..config import NexusPaths
 from ..schemas import MemoryQuery, MemoryRecord, MemoryScore, Message
 from ..storage import NexusStore
+from .hot_cache import SessionHotCache
+from .index import MemoryIndex
 
 
 class MemoryService:
@@ -22,9 +24,27 @@ class MemoryService:
         "optimization",
     )
 
-    def __init__(self, paths: NexusPaths, store: NexusStore):
+    def __init__(
+        self,
+        paths: NexusPaths,
+        store: NexusStore,
+        hot_cache: SessionHotCache | None = None,
+        index_config: dict | None = None,
+    ):
         self.paths = paths
         self.store = store
+        self.hot_cache = hot_cache if hot_cache is not None else SessionHotCache()
+        index_config = index_config or {}
+        self.max_indexed_records = int(index_config.get("max_records_per_session", 50_000))
+        self.index = MemoryIndex(
+            self._session_history,
+            max_sessions=int(index_config.get("max_sessions", 64)),
+            k1=float(index_config.get("k1", 1.2)),
+            b=float(index_config.get("b", 0.75)),
+            half_life_hours=float(index_config.get("half_life_hours", 72.0)),
+            recency_weight=float(index_config.get("recency_weight", 0.25)),
+            max_pending_records=int(index_config.get("max_pending_records", 2048)),
+        )
 
     def append_messages(self, session_id: str, messages: Iterable[Message]) -> list[MemoryRecord]:
         saved = []
@@ -37,7 +57,7 @@ class MemoryService:
                 tags=["chat"],
                 score=MemoryScore(relevance=0.8, freshness=1.0, importance=0.5),
             )
-            self.store.add_memory_record(record.model_dump(mode="json"))
+            self.store_record(record)
             saved.append(record)
         self._update_analytics(session_id)
         return saved
@@ -50,7 +70,7 @@ class MemoryService:
             tags=["trace", "episode"],
             score=MemoryScore(relevance=0.7, freshness=0.9, importance=0.8, success_history=0.6),
         )
-        self.store.add_memory_record(record.model_dump(mode="json"))
+        self.store_record(record)
         self._update_analytics(session_id)
         return record
 
@@ -62,7 +82,7 @@ class MemoryService:
             tags=["summary", "fact"],
             score=MemoryScore(relevance=0.7, freshness=0.6, importance=0.7, recurrence=0.2),
         )
-        self.store.add_memory_record(record.model_dump(mode="json"))
+        self.store_record(record)
         self._update_analytics(session_id)
         return record
 
@@ -74,13 +94,41 @@ class MemoryService:
             tags=["procedure", "playbook"],
             score=MemoryScore(relevance=0.6, freshness=0.5, importance=0.7, success_history=0.5),
         )
-        self.store.add_memory_record(record.model_dump(mode="json"))
+        self.store_record(record)
         self._update_analytics(session_id)
         return record
 
+    def store_record(self, record: MemoryRecord) -> None:
+        """Persist a record and write it through to the session's hot cache."""
+        payload = record.model_dump(mode="json")
+        self.store.add_memory_record(payload)
+        if not self.hot_cache.loaded(record.session_id):
+            # load before appending: under write-behind the store may not hold this write yet
+            self._load_hot(record.session_id)
+        self.hot_cache.append(record.session_id, payload)
+        self.index.add(payload)
+
+    def invalidate(self, session_id: str | None = None) -> None:
+        """Drop cached state for records written to the store without going through this service."""
+        self.hot_cache.invalidate(session_id)
+        self.index.invalidate(session_id)
+
+    def search(self, session_id: str, query: str, *, top_k: int = 10, planes: Iterable[str] | None = None) -> list[tuple[MemoryRecord, float]]:
+        """BM25 relevance over the session's whole history, optionally restricted to `planes`."""
+        self._warm(session_id)
+        return [
+            (MemoryRecord.model_validate(record), score)
+            for record, score in self.index.search(session_id, query, top_k=top_k, planes=planes)
+        ]
+
+    def _session_history(self, session_id: str) -> list[dict]:
+        return self.store.list_memory_records(session_id, limit=self.max_indexed_records, newest=True)
+
     def query(self, request: MemoryQuery) -> list[MemoryRecord]:
-        self._migrate_legacy_session(request.session_id)
-        records = self.store.list_memory_records(request.session_id, request.plane, request.limit)
+        self._warm(request.session_id)
+        records = self.hot_cache.records(request.session_id, request.plane, request.limit)
+        if records is None:
+            records = self.store.list_memory_records(request.session_id, request.plane, request.limit)
         return [MemoryRecord.model_validate(record) for record in records]
 
     def session_view(self, session_id: str) -> dict:
@@ -92,15 +140,37 @@ class MemoryService:
         return {"session_id": session_id, "planes": grouped, "analytics": analytics}
 
     def recent_messages(self, session_id: str, limit: int = 6) -> list[Message]:
-        records = self.query(MemoryQuery(session_id=session_id, plane="working", limit=limit))
+        self._warm(session_id)
+        records = self.hot_cache.recent(session_id, "working", limit)
+        if records is None:
+            records = list(reversed(self.store.list_memory_records(session_id, "working", limit, newest=True)))
         messages = []
-        for record in records[-limit:]:
-            text = record.content.get("text")
+        for record in records:
+            text = (record.get("content") or {}).get("text")
             if text:
-                messages.append(Message(role=record.role or "user", content=text))
+                messages.append(Message(role=record.get("role") or "user", content=text))
         return messages
 
+    def _warm(self, session_id: str) -> None:
+        # one read per session per process; an empty session is then migrated, its writes landing in the ring
+        if self.hot_cache.loaded(session_id):
+            return
+        if not self._load_hot(session_id):
+            self._migrate_legacy_session(session_id)
+
+    def _load_hot(self, session_id: str) -> int:
+        capacity = self.hot_cache.records_per_session
+        newest = self.store.list_memory_records(session_id, limit=capacity + 1, newest=True)
+        self.hot_cache.load(session_id, newest, complete=len(newest) <= capacity)
+        return len(newest)
+
     def _update_analytics(self, session_id: str) -> dict:
+        # inside a write-behind scope, recount once when the bundle commits rather than per record
+        if self.store.defer(lambda: self._refresh_analytics(session_id), key=f"memory-analytics::{session_id}"):
+            return {}
+        return self._refresh_analytics(session_id)
+
+    def _refresh_analytics(self, session_id: str) -> dict:
         records = self.store.list_memory_records(session_id, limit=1000)
         counts = {plane: 0 for plane in self.DEFAULT_PLANES}
         last_updated = None
@@ -111,12 +181,10 @@ class MemoryService:
         self.store.save_memory_analytics(session_id, analytics, last_updated or "")
         return analytics
 
-    def _migrate_legacy_session(self, session_id: str) -> None:
-        if self.store.list_memory_records(session_id, limit=1):
-            return
+    def _migrate_legacy_session(self, session_id: str) -> bool:
         legacy_path = self.paths.legacy_sessions_dir / f"{session_id}.jsonl"
         if not legacy_path.exists():
-            return
+            return False
         records = []
         with legacy_path.open("r", encoding="utf-8") as handle:
             for line in handle:
@@ -132,4 +200,7 @@ class MemoryService:
                     continue
                 records.append(Message(role=payload.get("role", "user"), content=text))
         if records:
-            self.append_messages(session_id, records)
+            # written through so the next query in this request sees the migrated session
+            with self.store.immediate():
+                self.append_messages(session_id, records)
+        return bool(records)
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import hashlib
+import random
+from functools import lru_cache
+from typing import Any, Callable, Hashable, Iterable
+
+try:  # optional: vectorises signature computation for large pools
+    import numpy
+except ImportError:  # pragma: no cover - exercised only when numpy is missing
+    numpy = None
+
+_PRIME = (1 << 31) - 1
+_EMPTY = (1 << 32) - 1
+
+
+def tokens(text: str, ngram: int = 1) -> frozenset[str]:
+    """Lower-cased whitespace tokens (or token n-grams), the same sets `jaccard` compares."""
+    words = str(text or "").lower().split()
+    if ngram <= 1:
+        return frozenset(words)
+    return frozenset(" ".join(words[i:i + ngram]) for i in range(max(len(words) - ngram + 1, 1)))
+
+
+def jaccard(a: frozenset[str], b: frozenset[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / (len(a | b) or 1)
+
+
+@lru_cache(maxsize=64)
+def lsh_params(threshold: float, num_perm: int, max_miss: float = 1e-4) -> tuple[int, int]:
+    """(bands, rows) with the most rows per band whose miss probability at `threshold` is <= max_miss.
+
+    Pairs above the threshold are missed even less often; pairs below it only cost an exact
+    Jaccard check, so recall is bought with extra candidates rather than the other way round.
+    """
+    for rows in range(num_perm, 0, -1):
+        bands = num_perm // rows
+        if (1.0 - threshold ** rows) ** bands <= max_miss:
+            return bands, rows
+    return num_perm, 1
+
+
+class MinHasher:
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = int(num_perm)
+        self.a = [rng.randrange(1, _PRIME) for _ in range(self.num_perm)]
+        self.b = [rng.randrange(0, _PRIME) for _ in range(self.num_perm)]
+        if numpy is not None:
+            self._a = numpy.array(self.a, dtype=numpy.uint64)[:, None]
+            self._b = numpy.array(self.b, dtype=numpy.uint64)[:, None]
+
+    @staticmethod
+    def _hash(token: str) -> int:
+        return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest(), "little") % _PRIME
+
+    def signature(self, token_set: Iterable[str]) -> tuple[int, ...]:
+        hashes = [self._hash(token) for token in token_set]
+        if not hashes:
+            return (_EMPTY,) * self.num_perm
+        if numpy is not None and len(hashes) > 4:
+            values = (self._a * numpy.array(hashes, dtype=numpy.uint64)[None, :] + self._b) % _PRIME
+            return tuple(int(item) for item in values.min(axis=1))
+        return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in zip(self.a, self.b))
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH index over token sets; `query` returns keys whose exact Jaccard >= threshold.
+
+    LSH only proposes candidates; each one is confirmed with exact Jaccard, so reported
+    pairs never fall below the threshold. Below `exact_below` indexed items every query is a
+    plain scan, which keeps small batches identical to the all-pairs computation.
+    """
+
+    def __init__(self, threshold: float = 0.85, *, num_perm: int = 128, ngram: int = 1, seed: int = 1, exact_below: int = 64):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = float(threshold)
+        self.ngram = int(ngram)
+        self.exact_below = int(exact_below)
+        self.bands, self.rows = lsh_params(self.threshold, num_perm)
+        self.hasher = MinHasher(self.bands * self.rows, seed=seed)
+        self.sets: dict[Hashable, frozenset[str]] = {}
+        self.signatures: dict[Hashable, tuple[int, ...]] = {}
+        self.buckets: list[dict[tuple[int, ...], list[Hashable]]] = [{} for _ in range(self.bands)]
+        self.comparisons = 0
+
+    def __len__(self) -> int:
+        return len(self.sets)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.sets
+
+    def _bands(self, signature: tuple[int, ...]):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def add(self, key: Hashable, text: str) -> None:
+        if key in self.sets:
+            return
+        token_set = tokens(text, self.ngram)
+        signature = self.hasher.signature(token_set)
+        self.sets[key] = token_set
+        self.signatures[key] = signature
+        for band, chunk in self._bands(signature):
+            self.buckets[band].setdefault(chunk, []).append(key)
+
+    def query(self, text: str, *, exclude: Hashable | None = None) -> list[tuple[Hashable, float]]:
+        """Indexed keys at or above the threshold, most similar first."""
+        token_set = tokens(text, self.ngram)
+        if len(self.sets) < self.exact_below:
+            candidates: Iterable[Hashable] = self.sets
+        else:
+            found: dict[Hashable, None] = {}
+            for band, chunk in self._bands(self.hasher.signature(token_set)):
+                for key in self.buckets[band].get(chunk, ()):
+                    found[key] = None
+            candidates = found
+        matches = []
+        for key in candidates:
+            if key == exclude:
+                continue
+            self.comparisons += 1
+            score = jaccard(token_set, self.sets[key])
+            if score >= self.threshold:
+                matches.append((key, score))
+        matches.sort(key=lambda item: -item[1])
+        return matches
+
+
+def near_duplicate_pairs(texts: list[str], threshold: float = 0.85, **index_kwargs: Any) -> list[tuple[int, int, float]]:
+    """All (i, j, jaccard) with i < j and jaccard >= threshold."""
+    index = NearDuplicateIndex(threshold, **index_kwargs)
+    pairs = []
+    for i, text in enumerate(texts):
+        for j, score in index.query(text):
+            pairs.append((j, i, score))
+        index.add(i, text)
+    pairs.sort()
+    return pairs
+
+
+def dedup(
+    items: Iterable[Any],
+    *,
+    text: Callable[[Any], str],
+    threshold: float = 0.9,
+    index: NearDuplicateIndex | None = None,
+    key: Callable[[Any], Hashable] | None = None,
+) -> tuple[list[Any], list[Any]]:
+    """(kept, dropped): an item is dropped when it near-duplicates one already indexed or kept.
+
+    Pass a pre-filled `index` to dedup against earlier batches; kept items are added to it.
+    """
+    index = index if index is not None else NearDuplicateIndex(threshold)
+    kept, dropped = [], []
+    for position, item in enumerate(items):
+        body = text(item)
+        if index.query(body):
+            dropped.append(item)
+            continue
+        index.add(key(item) if key is not None else ("item", len(index), position), body)
+        kept.append(item)
+    return kept, dropped
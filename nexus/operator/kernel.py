@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Generator
 
 from ..agents import AgentRegistry
+from ..async_exec import RuntimeCall, drive
 from ..ao import AORegistry
 from ..critique import CritiqueEngine
 from ..experiments import ExperimentService
@@ -74,6 +75,14 @@ class OperatorKernel:
         self.brain_promotions = brain_promotions
 
     def execute_chat(self, request: ChatRequest) -> OperatorResult:
+        with self.store.write_behind_scope(request.session_id):
+            return drive(self.execute_chat_steps(request))
+
+    def execute_chat_steps(self, request: ChatRequest) -> Generator[RuntimeCall, Any, OperatorResult]:
+        """`execute_chat` as a step generator; `AsyncChatPipeline` awaits each yielded model call."""
+        return self._execute_chat(request)
+
+    def _execute_chat(self, request: ChatRequest) -> Generator[RuntimeCall, Any, OperatorResult]:
         operator_request = OperatorRequest(
             session_id=request.session_id,
             prompt=request.prompt or request.message,
@@ -172,7 +181,7 @@ class OperatorKernel:
         if runtime_decision is not None:
             steps.append(TraceStep(name="brain_runtime_decision", detail=runtime_decision.model_dump(mode="json")))
 
-        brain_result = self.brain.generate(
+        brain_result = yield from self.brain.generate_steps(
             session_context=SessionContext(
                 session_id=request.session_id,
                 trace_id=operator_request.trace_id,
@@ -2,27 +2,50 @@ from __future__ import annotations
 
 from typing import Any
 
+from ..keywords import CompiledKeywordMap
+
+CODE_HINTS = "__code_hints__"
+QUESTION_HINTS = "__question_hints__"
+_HINT_GROUPS = {
+    CODE_HINTS: ("def ", "class ", "traceback", "exception", "compile", "debug"),
+    QUESTION_HINTS: ("what", "which", "who", "when", "where", "why", "source", "citation", "support"),
+}
+
 
 class ExpertSelector:
     def __init__(self, runtime_configs: dict[str, Any]):
         self.expert_config = runtime_configs.get("experts", {})
         self.router_config = runtime_configs.get("router", {})
+        self._matcher = CompiledKeywordMap(_HINT_GROUPS)
+
+    def rank(self, text: str) -> list[dict[str, Any]]:
+        """Enabled capsules whose keywords occur in `text`, best first, with match counts."""
+        return self._rank(self._scan(text))
 
     def select(self, text: str, *, use_retrieval: bool = False) -> str:
-        low = text.lower()
-        keyword_map = self.router_config.get("keyword_map", {})
+        hits = self._scan(text)
+        ranked = self._rank(hits)
+        if ranked:
+            return ranked[0]["capsule"]
         capsules = self.expert_config.get("capsules", {})
-        for capsule, keywords in keyword_map.items():
-            if capsule not in capsules:
-                continue
-            if not capsules.get(capsule, {}).get("enabled", True):
-                continue
-            if any(keyword in low for keyword in keywords):
-                return capsule
-        if any(token in low for token in ["def ", "class ", "traceback", "exception", "compile", "debug"]):
+        if CODE_HINTS in hits:
             if capsules.get("coder", {}).get("enabled", True):
                 return "coder"
-        if use_retrieval and any(token in low for token in ["what", "which", "who", "when", "where", "why", "source", "citation", "support"]):
+        if use_retrieval and QUESTION_HINTS in hits:
             if capsules.get("researcher", {}).get("enabled", True):
                 return "researcher"
         return self.router_config.get("default_expert", "conversationalist")
+
+    def _scan(self, text: str) -> dict[str, dict[str, int]]:
+        return self._matcher.get(self.router_config.get("keyword_map", {})).scan(text)
+
+    def _rank(self, hits: dict[str, dict[str, int]]) -> list[dict[str, Any]]:
+        capsules = self.expert_config.get("capsules", {})
+        order = {capsule: index for index, capsule in enumerate(self.router_config.get("keyword_map", {}))}
+        ranked = [
+            {"capsule": capsule, "matches": sum(keywords.values()), "keywords": keywords}
+            for capsule, keywords in hits.items()
+            if capsule in capsules and capsules.get(capsule, {}).get("enabled", True)
+        ]
+        ranked.sort(key=lambda item: (-item["matches"], order.get(item["capsule"], len(order))))
+        return ranked
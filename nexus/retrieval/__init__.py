@@ -1,4 +1,4 @@
+from .cache import CorpusGeneration
 from .service import RetrievalService
 
-__all__ = ["RetrievalService"]
-
+__all__ = ["CorpusGeneration", "RetrievalService"]
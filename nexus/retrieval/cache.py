@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class CorpusGeneration:
+    """Monotonic counter bumped whenever retrievable content changes in this process."""
+
+    def __init__(self) -> None:
+        self._value = 0
+        self._lock = threading.Lock()
+        self.last_reason: str | None = None
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def bump(self, reason: str = "ingest") -> int:
+        with self._lock:
+            self._value += 1
+            self.last_reason = reason
+            return self._value
+
+
+class LRUCache:
+    def __init__(self, *, max_entries: int = 1024, ttl_seconds: float = 0.0, clock=time.monotonic):
+        self.max_entries = max(int(max_entries), 1)
+        self.ttl_seconds = float(ttl_seconds)
+        self.clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None and self.ttl_seconds > 0 and self.clock() - item[0] > self.ttl_seconds:
+                self._entries.pop(key, None)
+                item = None
+            if item is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (self.clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
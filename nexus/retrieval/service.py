@@ -1,14 +1,21 @@
 from __future__ import annotations
 
+import copy
 import hashlib
 import json
+import os
 import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
-from typing import Any
+from pathlib import Path
+from typing import Any, Iterable
 
 from ..config import NexusPaths
-from ..schemas import MemoryQuery, RetrievalDocumentInput, RetrievalHit, RetrievalIngestRequest, RetrievalRequest
+from ..schemas import RetrievalDocumentInput, RetrievalHit, RetrievalIngestRequest, RetrievalRequest
 from ..storage import NexusStore
+from .cache import CorpusGeneration, LRUCache
 from nexusnet.retrieval.rerank import CrossEncoderStageTwoReranker, weighted_reciprocal_rank_fusion
 
 
@@ -34,6 +41,49 @@ def _chunk_text(text: str, max_chars: int = 450, overlap: int = 60) -> list[str]
     return chunks
 
 
+def _postings(chunk_id: str, doc_id: str, text: str) -> list[tuple[str, str, str, int]]:
+    return [(term, chunk_id, doc_id, count) for term, count in Counter(_normalize(text)).items()]
+
+
+def _prepare_document(document: dict[str, Any], created_at: str) -> dict[str, Any]:
+    text = document["text"]
+    doc_id = hashlib.sha256(f"{document['source']}|{document.get('title')}|{text}".encode("utf-8")).hexdigest()[:16]
+    metadata = dict(document.get("metadata") or {})
+    chunks = []
+    postings: list[tuple[str, str, str, int]] = []
+    for index, chunk in enumerate(_chunk_text(text)):
+        chunk_id = hashlib.sha256(f"{doc_id}:{index}:{chunk}".encode("utf-8")).hexdigest()[:16]
+        chunks.append(
+            {
+                "chunk_id": chunk_id,
+                "doc_id": doc_id,
+                "chunk_index": index,
+                "source": document["source"],
+                "content": chunk,
+                "metadata": {"title": document.get("title"), **metadata},
+                "created_at": created_at,
+            }
+        )
+        postings.extend(_postings(chunk_id, doc_id, chunk))
+    return {
+        "document": {
+            "doc_id": doc_id,
+            "source": document["source"],
+            "title": document.get("title"),
+            "content": text,
+            "metadata": metadata,
+            "created_at": created_at,
+        },
+        "content_hash": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        "chunks": chunks,
+        "postings": postings,
+    }
+
+
+def _prepare_batch(documents: list[dict[str, Any]], created_at: str) -> list[dict[str, Any]]:
+    return [_prepare_document(document, created_at) for document in documents]
+
+
 def _hit_summary(hit: RetrievalHit) -> dict[str, Any]:
     metadata = hit.metadata or {}
     return {
@@ -58,6 +108,7 @@ class RetrievalService:
         memory_service: Any | None = None,
         temporal_retriever: Any | None = None,
         retrieval_config: dict[str, Any] | None = None,
+        corpus_generation: CorpusGeneration | None = None,
     ):
         self.paths = paths
         self.store = store
@@ -67,17 +118,100 @@ class RetrievalService:
         self.temporal_retriever = temporal_retriever
         self.retrieval_config = retrieval_config or {}
         stage2 = self.retrieval_config.get("stage2", {}) or {}
+        cache_cfg = self.retrieval_config.get("cache", {}) or {}
         self.reranker = CrossEncoderStageTwoReranker(
             model_name=str(stage2.get("provider", "cross-encoder/ms-marco-MiniLM-L6-v2")),
             device=str(stage2.get("device", "cpu")),
             fallback_provider=str(stage2.get("fallback_provider", "heuristic-cross-encoder")),
+            pair_cache_size=int(cache_cfg.get("pair_score_max_entries", 20_000)) if cache_cfg.get("enabled", True) else 0,
+            batch_size=int(stage2.get("batch_size", 32)),
+            max_length=int(stage2.get("max_length", 512)),
+            max_passage_chars=int(stage2.get("max_passage_chars", 2048)),
+            failure_retry_seconds=float(stage2.get("failure_retry_seconds", 300)),
+            micro_batch_window_ms=float(stage2.get("micro_batch_window_ms", 2.0)),
+            micro_batch_max_pairs=int(stage2.get("micro_batch_max_pairs", 128)),
         )
+        if bool(stage2.get("enabled", True)) and bool(stage2.get("warm_load", True)):
+            self.reranker.warm_load(background=True)
+        self.corpus_generation = corpus_generation or CorpusGeneration()
+        self.result_cache = (
+            LRUCache(
+                max_entries=int(cache_cfg.get("max_entries", 1024)),
+                ttl_seconds=float(cache_cfg.get("ttl_seconds", 600)),
+            )
+            if cache_cfg.get("enabled", True)
+            else None
+        )
+        self.ingest_config = self.retrieval_config.get("ingest", {}) or {}
+        self._backfill_postings()
 
     def ingest(self, request: RetrievalIngestRequest) -> list[str]:
-        doc_ids = []
-        for document in request.documents:
-            doc_ids.append(self._ingest_document(document))
-        return doc_ids
+        return self.bulk_ingest(request.documents)["doc_ids"]
+
+    def bulk_ingest(
+        self,
+        documents: Iterable[RetrievalDocumentInput | dict[str, Any]],
+        *,
+        batch_size: int | None = None,
+        workers: int | None = None,
+        artifact_mode: str | None = None,
+        replace_sources: bool = False,
+    ) -> dict[str, Any]:
+        batch_size = max(int(batch_size or self.ingest_config.get("batch_size", 256)), 1)
+        if workers is not None and int(workers) < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        max_workers = int(self.ingest_config.get("max_workers") or os.cpu_count() or 1)
+        workers = min(max(int(workers or self.ingest_config.get("workers", 1)), 1), max(max_workers, 1))
+        artifact_mode = str(artifact_mode or self.ingest_config.get("artifact_mode", "per-document"))
+        if artifact_mode not in {"per-document", "content-addressed", "none"}:
+            raise ValueError(f"unsupported artifact_mode: {artifact_mode}")
+        started = time.perf_counter()
+        report: dict[str, Any] = {
+            "doc_ids": [],
+            "document_count": 0,
+            "chunk_count": 0,
+            "posting_count": 0,
+            "batch_count": 0,
+            "artifact_mode": artifact_mode,
+            "artifacts_written": 0,
+            "artifacts_deduplicated": 0,
+            "workers": workers,
+            "batch_size": batch_size,
+            "replace_sources": replace_sources,
+        }
+
+        def commit(prepared: list[dict[str, Any]]) -> None:
+            self._commit_batch(prepared, artifact_mode, report, replace_sources=replace_sources)
+
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            pending = []
+            for batch in self._document_batches(documents, batch_size):
+                created_at = _utcnow()
+                if pool is None:
+                    commit(_prepare_batch(batch, created_at))
+                    continue
+                pending.append(pool.submit(_prepare_batch, batch, created_at))
+                if len(pending) >= workers * 2:
+                    commit(pending.pop(0).result())
+            for future in pending:
+                commit(future.result())
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True)
+        if report["document_count"]:
+            self.corpus_generation.bump("retrieval-ingest")
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        report["elapsed_seconds"] = round(elapsed, 6)
+        report["docs_per_second"] = round(report["document_count"] / elapsed, 2)
+        report["chunks_per_second"] = round(report["chunk_count"] / elapsed, 2)
+        return report
+
+    def delete_sources(self, sources: Iterable[str]) -> int:
+        deleted = self.store.delete_retrieval_sources(list(dict.fromkeys(sources)))
+        if deleted:
+            self.corpus_generation.bump("retrieval-delete")
+        return deleted
 
     def query(self, request: RetrievalRequest) -> list[RetrievalHit]:
         return self.query_with_policy(request)["hits"]
@@ -89,6 +223,66 @@ class RetrievalService:
         policy_mode: str = "lexical+graph-merged",
         plane_tags: list[str] | None = None,
         rerank_enabled: bool | None = None,
+        use_cache: bool = True,
+    ) -> dict[str, Any]:
+        stage1_sources = ((self.retrieval_config.get("stage1", {}) or {}).get("sources", {}) or {})
+        if self.result_cache is None or not use_cache or request.use_pgvector or bool(stage1_sources.get("pgvector", False)):
+            return self._query_with_policy(request, policy_mode=policy_mode, plane_tags=plane_tags, rerank_enabled=rerank_enabled)
+        generation = self._corpus_token(request)
+        key = (
+            " ".join(request.query.split()),
+            policy_mode,
+            tuple(sorted(plane_tags or [])),
+            request.top_k,
+            request.session_id,
+            rerank_enabled,
+            generation,
+        )
+        # the reranker's state is part of the key: fallback-ranked results are reused while the model stays
+        # unavailable and are superseded as soon as it loads
+        cached = self.result_cache.get((*key, self.reranker.model_name, self.reranker.model_state()["state"]))
+        if cached is None:
+            cached = self._query_with_policy(request, policy_mode=policy_mode, plane_tags=plane_tags, rerank_enabled=rerank_enabled)
+            state = self.reranker.model_state()["state"]
+            # a cold or still-loading model is about to take over; its heuristic stand-in is not worth keeping
+            if not (cached["reranker"]["fallback_used"] and state in {"cold", "loading"}):
+                self.result_cache.put((*key, self.reranker.model_name, state), cached)
+            hit = False
+        else:
+            hit = True
+        result = copy.deepcopy(cached)  # callers may mutate hits; the cached entry must not change
+        result["retrieval_cache"] = {"hit": hit, "corpus_generation": generation[0]}
+        return result
+
+    def cache_stats(self) -> dict[str, Any]:
+        return {
+            "corpus_generation": self.corpus_generation.value,
+            "result_cache": self.result_cache.stats() if self.result_cache is not None else None,
+            "pair_score_cache": self.reranker.pair_cache_stats(),
+            "reranker_model": self.reranker.model_state(),
+        }
+
+    def _corpus_token(self, request: RetrievalRequest) -> tuple:
+        sources_cfg = ((self.retrieval_config.get("stage1", {}) or {}).get("sources", {}) or {})
+        sequences = self.store.change_sequences()
+        token: list[Any] = [
+            self.corpus_generation.value,
+            sequences.get("retrieval_documents", 0),
+            sequences.get("retrieval_chunks", 0),
+        ]
+        if request.session_id and self.memory_service is not None and bool(sources_cfg.get("memory", True)):
+            token.append(sequences.get("memory_records", 0))
+        if self.temporal_retriever is not None and bool(sources_cfg.get("temporal", True)):
+            token.append(datetime.now(timezone.utc).date().isoformat())
+        return tuple(token)
+
+    def _query_with_policy(
+        self,
+        request: RetrievalRequest,
+        *,
+        policy_mode: str,
+        plane_tags: list[str] | None,
+        rerank_enabled: bool | None,
     ) -> dict[str, Any]:
         stage1 = self.retrieval_config.get("stage1", {}) or {}
         sources_cfg = stage1.get("sources", {}) or {}
@@ -181,6 +375,7 @@ class RetrievalService:
             "reranker": {
                 "provider": rerank_result.provider_name if rerank_result is not None else None,
                 "applied": bool(rerank_result and rerank_result.applied),
+                "fallback_used": bool(rerank_result and rerank_result.diagnostics.get("fallback_used")),
                 "requested_top_k": requested_top_k,
                 "top_k_before_rerank": len(before_rerank_hits[:requested_top_k]),
                 "top_k_after_rerank": len(merged_hits[: requested_top_k]),
@@ -198,57 +393,85 @@ class RetrievalService:
         }
 
     def _ingest_document(self, document: RetrievalDocumentInput) -> str:
-        doc_id = hashlib.sha256(f"{document.source}|{document.title}|{document.text}".encode("utf-8")).hexdigest()[:16]
-        created_at = _utcnow()
-        payload = {
-            "doc_id": doc_id,
-            "source": document.source,
-            "title": document.title,
-            "content": document.text,
-            "metadata": document.metadata,
-            "created_at": created_at,
-        }
-        self.store.save_retrieval_document(payload)
-        self.store.write_artifact(f"retrieval/docs/{doc_id}.txt", document.text)
-        chunks = []
-        for index, chunk in enumerate(_chunk_text(document.text)):
-            chunks.append(
-                {
-                    "chunk_id": hashlib.sha256(f"{doc_id}:{index}:{chunk}".encode("utf-8")).hexdigest()[:16],
-                    "doc_id": doc_id,
-                    "chunk_index": index,
-                    "source": document.source,
-                    "content": chunk,
-                    "metadata": {"title": document.title, **document.metadata},
-                    "created_at": created_at,
-                }
-            )
-        self.store.replace_retrieval_chunks(doc_id, chunks)
-        return doc_id
+        return self.bulk_ingest([document], workers=1)["doc_ids"][0]
+
+    def _document_batches(self, documents: Iterable[RetrievalDocumentInput | dict[str, Any]], batch_size: int):
+        batch: list[dict[str, Any]] = []
+        for document in documents:
+            batch.append(document.model_dump() if isinstance(document, RetrievalDocumentInput) else dict(document))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _commit_batch(
+        self,
+        prepared: list[dict[str, Any]],
+        artifact_mode: str,
+        report: dict[str, Any],
+        *,
+        replace_sources: bool = False,
+    ) -> None:
+        if not prepared:
+            return
+        unique: dict[str, dict[str, Any]] = {}
+        for item in prepared:
+            unique[item["document"]["doc_id"]] = item
+        items = list(unique.values())
+        chunks = [chunk for item in items for chunk in item["chunks"]]
+        postings = [posting for item in items for posting in item["postings"]]
+        self.store.save_retrieval_batch(
+            [item["document"] for item in items],
+            chunks,
+            postings,
+            replace_sources=sorted({item["document"]["source"] for item in items}) if replace_sources else None,
+        )
+        for item in items:
+            self._write_document_artifact(item, artifact_mode, report)
+        report["doc_ids"].extend(item["document"]["doc_id"] for item in prepared)
+        report["document_count"] += len(prepared)
+        report["chunk_count"] += len(chunks)
+        report["posting_count"] += len(postings)
+        report["batch_count"] += 1
+
+    def _write_document_artifact(self, item: dict[str, Any], artifact_mode: str, report: dict[str, Any]) -> None:
+        if artifact_mode == "none":
+            return
+        if artifact_mode == "per-document":
+            self.store.write_artifact(f"retrieval/docs/{item['document']['doc_id']}.txt", item["document"]["content"])
+            report["artifacts_written"] += 1
+            return
+        content_hash = item["content_hash"]
+        relative_path = f"retrieval/blobs/{content_hash[:2]}/{content_hash}.txt"
+        if (Path(self.paths.artifacts_dir) / relative_path).exists():
+            report["artifacts_deduplicated"] += 1
+            return
+        self.store.write_artifact(relative_path, item["document"]["content"])
+        report["artifacts_written"] += 1
+
+    def _backfill_postings(self) -> None:
+        missing = self.store.list_retrieval_chunks_without_postings()
+        postings = [posting for chunk in missing for posting in _postings(chunk["chunk_id"], chunk["doc_id"], chunk["content"])]
+        if postings:
+            self.store.add_retrieval_postings(postings)
 
     def _lexical_hits(self, query: str, top_k: int) -> list[RetrievalHit]:
         query_terms = _normalize(query)
         if not query_terms:
             return []
-        candidates = []
-        for chunk in self.store.list_retrieval_chunks():
-            haystack_terms = _normalize(chunk["content"])
-            overlap = sum(haystack_terms.count(term) for term in query_terms)
-            if overlap <= 0:
-                continue
-            score = float(overlap) / max(len(query_terms), 1)
-            candidates.append(
-                RetrievalHit(
-                    chunk_id=chunk["chunk_id"],
-                    doc_id=chunk["doc_id"],
-                    source=chunk["source"],
-                    content=chunk["content"],
-                    score=score,
-                    metadata=chunk.get("metadata", {}),
-                )
+        rows = self.store.search_retrieval_postings(dict(Counter(query_terms)), limit=top_k)
+        return [
+            RetrievalHit(
+                chunk_id=row["chunk_id"],
+                doc_id=row["doc_id"],
+                source=row["source"],
+                content=row["content"],
+                score=float(row["overlap"]) / max(len(query_terms), 1),
+                metadata=row.get("metadata", {}),
             )
-        candidates.sort(key=lambda hit: hit.score, reverse=True)
-        return candidates[:top_k]
+            for row in rows
+        ]
 
     def _merge_pgvector_hits(self, query: str, top_k: int, lexical_hits: list[RetrievalHit]) -> list[RetrievalHit]:
         try:
@@ -310,26 +533,20 @@ class RetrievalService:
     def _memory_hits(self, *, query: str, session_id: str | None, top_k: int) -> list[RetrievalHit]:
         if self.memory_service is None or not session_id:
             return []
+        planes = ((self.retrieval_config.get("stage1", {}) or {}).get("memory", {}) or {}).get("planes")
         try:
-            records = self.memory_service.query(MemoryQuery(session_id=session_id, plane=None, limit=max(top_k * 4, 20)))
+            ranked = self.memory_service.search(session_id, query, top_k=top_k, planes=planes)
         except Exception:
             return []
-        query_terms = _normalize(query)
         hits: list[RetrievalHit] = []
-        for record in records:
-            text = json.dumps(record.content, sort_keys=True)
-            haystack_terms = _normalize(text)
-            overlap = sum(haystack_terms.count(term) for term in query_terms)
-            if overlap <= 0:
-                continue
-            score = round(float(overlap) / max(len(query_terms), 1), 6)
+        for record, score in ranked:
             hits.append(
                 RetrievalHit(
                     chunk_id=f"memory::{record.memory_id}",
                     doc_id=record.memory_id,
                     source=f"memory::{record.plane}",
-                    content=text,
-                    score=score,
+                    content=json.dumps(record.content, sort_keys=True),
+                    score=round(score, 6),
                     metadata={
                         "backend": "memory",
                         "memory_plane": record.plane,
@@ -339,8 +556,7 @@ class RetrievalService:
                     },
                 )
             )
-        hits.sort(key=lambda hit: hit.score, reverse=True)
-        return hits[:top_k]
+        return hits
 
     def _temporal_hits(self, *, query: str, top_k: int) -> list[RetrievalHit]:
         if self.temporal_retriever is None:
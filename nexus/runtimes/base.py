@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from functools import partial
 from typing import Any
 
+import httpx
+
 from ..schemas import Message, RuntimeProfile
 
 
@@ -40,6 +45,37 @@ class RuntimeAdapter(ABC):
     ) -> str:
         raise NotImplementedError
 
+    async def agenerate(
+        self,
+        *,
+        prompt: str | None,
+        messages: list[Message],
+        model_id: str,
+        expert: str | None = None,
+        metadata: dict[str, Any] | None = None,
+        executor: Executor | None = None,
+    ) -> str:
+        """Non-blocking generate; runtimes without a native async client run `generate` on `executor`."""
+        call = partial(self.generate, prompt=prompt, messages=messages, model_id=model_id, expert=expert, metadata=metadata)
+        return await asyncio.get_running_loop().run_in_executor(executor, call)
+
+    def async_client(self) -> httpx.AsyncClient:
+        """Pooled HTTP client for the running event loop (clients cannot be shared across loops)."""
+        loop = asyncio.get_running_loop()
+        cached = getattr(self, "_async_client", None)
+        if cached is None or cached[0] is not loop or cached[1].is_closed:
+            limits = httpx.Limits(max_connections=int(self.config.get("max_connections", 256)), max_keepalive_connections=64)
+            cached = (loop, httpx.AsyncClient(timeout=float(self.config.get("timeout_seconds", 30)), limits=limits))
+            self._async_client = cached
+        return cached[1]
+
+    async def aclose(self) -> None:
+        """Close the pooled client if it belongs to the running loop; clients of other loops are dropped."""
+        cached = getattr(self, "_async_client", None)
+        self._async_client = None
+        if cached is not None and cached[0] is asyncio.get_running_loop() and not cached[1].is_closed:
+            await cached[1].aclose()
+
     def profile(self) -> RuntimeProfile:
         health = self.health()
         return RuntimeProfile(
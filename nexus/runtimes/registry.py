@@ -25,6 +25,9 @@ class MockRuntimeAdapter(RuntimeAdapter):
         hint = f" expert={expert}" if expert else ""
         return f"[mock runtime{hint}] {preview}"
 
+    async def agenerate(self, *, prompt: str | None, messages: list[Message], model_id: str, expert: str | None = None, metadata: dict[str, Any] | None = None, executor: Any = None) -> str:
+        return self.generate(prompt=prompt, messages=messages, model_id=model_id, expert=expert, metadata=metadata)
+
 
 class OllamaRuntimeAdapter(RuntimeAdapter):
     runtime_name = "ollama"
@@ -50,11 +53,21 @@ class OllamaRuntimeAdapter(RuntimeAdapter):
         text = prompt_from_messages(messages, prompt)
         if not self.live:
             return f"[ollama:dry] {text[:240]}"
-        payload = {"model": model_id.split("/", 1)[-1] if "/" in model_id else self.default_model, "prompt": text}
-        response = requests.post(f"{self.base_url}/api/generate", json=payload, timeout=30)
+        response = requests.post(f"{self.base_url}/api/generate", json=self._payload(text, model_id), timeout=30)
+        response.raise_for_status()
+        return response.json().get("response", "")
+
+    async def agenerate(self, *, prompt: str | None, messages: list[Message], model_id: str, expert: str | None = None, metadata: dict[str, Any] | None = None, executor: Any = None) -> str:
+        text = prompt_from_messages(messages, prompt)
+        if not self.live:
+            return f"[ollama:dry] {text[:240]}"
+        response = await self.async_client().post(f"{self.base_url}/api/generate", json=self._payload(text, model_id))
         response.raise_for_status()
         return response.json().get("response", "")
 
+    def _payload(self, text: str, model_id: str) -> dict[str, Any]:
+        return {"model": model_id.split("/", 1)[-1] if "/" in model_id else self.default_model, "prompt": text}
+
 
 class OpenAICompatibleRuntimeAdapter(RuntimeAdapter):
     runtime_name = "openai-compatible"
@@ -75,6 +88,22 @@ class OpenAICompatibleRuntimeAdapter(RuntimeAdapter):
     def generate(self, *, prompt: str | None, messages: list[Message], model_id: str, expert: str | None = None, metadata: dict[str, Any] | None = None) -> str:
         if not self.base_url:
             return f"[openai-compatible:dry] {prompt_from_messages(messages, prompt)[:240]}"
+        payload, headers = self._request(prompt, messages, model_id)
+        response = requests.post(f"{self.base_url}/v1/chat/completions", json=payload, headers=headers, timeout=30)
+        response.raise_for_status()
+        data = response.json()
+        return data.get("choices", [{}])[0].get("message", {}).get("content", "")
+
+    async def agenerate(self, *, prompt: str | None, messages: list[Message], model_id: str, expert: str | None = None, metadata: dict[str, Any] | None = None, executor: Any = None) -> str:
+        if not self.base_url:
+            return f"[openai-compatible:dry] {prompt_from_messages(messages, prompt)[:240]}"
+        payload, headers = self._request(prompt, messages, model_id)
+        response = await self.async_client().post(f"{self.base_url}/v1/chat/completions", json=payload, headers=headers)
+        response.raise_for_status()
+        data = response.json()
+        return data.get("choices", [{}])[0].get("message", {}).get("content", "")
+
+    def _request(self, prompt: str | None, messages: list[Message], model_id: str) -> tuple[dict[str, Any], dict[str, str]]:
         payload_messages = [{"role": message.role, "content": message.content} for message in messages]
         if prompt and not payload_messages:
             payload_messages = [{"role": "user", "content": prompt}]
@@ -82,10 +111,7 @@ class OpenAICompatibleRuntimeAdapter(RuntimeAdapter):
         if self.api_key:
             headers["Authorization"] = f"Bearer {self.api_key}"
         payload = {"model": model_id.split("/", 1)[-1] if "/" in model_id else self.default_model, "messages": payload_messages}
-        response = requests.post(f"{self.base_url}/v1/chat/completions", json=payload, headers=headers, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-        return data.get("choices", [{}])[0].get("message", {}).get("content", "")
+        return payload, headers
 
 
 class VLLMRuntimeAdapter(OpenAICompatibleRuntimeAdapter):
@@ -112,37 +138,82 @@ class LMStudioRuntimeAdapter(RuntimeAdapter):
             return {"available": False, "mode": "unreachable", "base_url": self.base_url, "error": str(exc)}
 
     def generate(self, *, prompt: str | None, messages: list[Message], model_id: str, expert: str | None = None, metadata: dict[str, Any] | None = None) -> str:
-        payload = {
+        response = requests.post(f"{self.base_url}/v1/completions", json=self._payload(prompt, messages, model_id), timeout=30)
+        response.raise_for_status()
+        data = response.json()
+        return data.get("choices", [{}])[0].get("text", "")
+
+    async def agenerate(self, *, prompt: str | None, messages: list[Message], model_id: str, expert: str | None = None, metadata: dict[str, Any] | None = None, executor: Any = None) -> str:
+        response = await self.async_client().post(f"{self.base_url}/v1/completions", json=self._payload(prompt, messages, model_id))
+        response.raise_for_status()
+        data = response.json()
+        return data.get("choices", [{}])[0].get("text", "")
+
+    def _payload(self, prompt: str | None, messages: list[Message], model_id: str) -> dict[str, Any]:
+        return {
             "model": model_id.split("/", 1)[-1] if "/" in model_id else self.default_model,
             "prompt": prompt_from_messages(messages, prompt),
             "max_tokens": 256,
         }
-        response = requests.post(f"{self.base_url}/v1/completions", json=payload, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-        return data.get("choices", [{}])[0].get("text", "")
+
+
+_OTHER_RUNTIME_PREFIXES = {"mock", "ollama", "openai", "openai-compatible", "vllm", "lmstudio", "llama.cpp"}
 
 
 class TransformersRuntimeAdapter(RuntimeAdapter):
     runtime_name = "transformers"
     backend_type = "local-python"
 
-    def health(self) -> dict[str, Any]:
+    def __init__(self, config: dict[str, Any] | None = None):
+        super().__init__(config)
+        self._engine = None
+
+    def _ready(self) -> bool:
         try:
             from core.inference.transformers import available  # type: ignore
 
-            ready = bool(available())
+            return bool(available())
         except Exception:
-            ready = False
-        return {"available": ready, "mode": "live" if ready else "stub", "capabilities": {"text": True}}
+            return False
 
-    def generate(self, *, prompt: str | None, messages: list[Message], model_id: str, expert: str | None = None, metadata: dict[str, Any] | None = None) -> str:
-        try:
-            from core.inference.transformers import generate  # type: ignore
+    def health(self) -> dict[str, Any]:
+        ready = self._ready()
+        health: dict[str, Any] = {"available": ready, "mode": "live" if ready else "stub", "capabilities": {"text": True}}
+        if ready and self._engine is not None:
+            health["metrics"] = self._engine.summary()
+        return health
 
-            return generate(prompt_from_messages(messages, prompt))
-        except Exception:
-            return f"[transformers:stub] {prompt_from_messages(messages, prompt)[:240]}"
+    def engine(self) -> Any:
+        if self._engine is None:
+            from core.inference.transformers import engine  # type: ignore
+
+            self._engine = engine(
+                capacity=self.config.get("cache_size"), max_batch=self.config.get("max_batch"), dtype=self.config.get("dtype")
+            )
+        return self._engine
+
+    def hf_model_id(self, model_id: str | None) -> str | None:
+        """`transformers/org/name` -> `org/name`; hints aimed at another runtime (or empty) fall back to config."""
+        name = (model_id or "").strip()
+        head, _, rest = name.partition("/")
+        if head in {self.runtime_name, "hf"}:
+            name = rest
+        elif head in _OTHER_RUNTIME_PREFIXES:
+            name = ""
+        return name if name and name != "default" else self.config.get("model")
+
+    def generate(self, *, prompt: str | None, messages: list[Message], model_id: str, expert: str | None = None, metadata: dict[str, Any] | None = None) -> str:
+        text = prompt_from_messages(messages, prompt)
+        if not self._ready():
+            return f"[transformers:stub] {text[:240]}"
+        return self.engine().generate(
+            text,
+            model_id=self.hf_model_id(model_id),
+            quant=self.config.get("quant"),
+            max_new_tokens=int(self.config.get("max_new_tokens", 256)),
+            temperature=float(self.config.get("temperature", 0.7)),
+            timeout=self.config.get("timeout_seconds"),
+        )
 
 
 class LlamaCppRuntimeAdapter(RuntimeAdapter):
@@ -156,7 +227,10 @@ class LlamaCppRuntimeAdapter(RuntimeAdapter):
 
     def health(self) -> dict[str, Any]:
         ready = self.model_path.exists()
-        return {"available": ready, "mode": "live" if ready else "stub", "model_path": str(self.model_path), "capabilities": {"text": True}}
+        health = {"available": ready, "mode": "live" if ready else "stub", "model_path": str(self.model_path), "capabilities": {"text": True}}
+        if self._engine is not None:
+            health["metrics"] = {"prefix_cache": self._engine.cache_stats()}
+        return health
 
     def generate(self, *, prompt: str | None, messages: list[Message], model_id: str, expert: str | None = None, metadata: dict[str, Any] | None = None) -> str:
         if not self.model_path.exists():
@@ -164,7 +238,9 @@ class LlamaCppRuntimeAdapter(RuntimeAdapter):
         if self._engine is None:
             from core.engines.llamacpp_engine import LlamaCppEngine  # type: ignore
 
-            self._engine = LlamaCppEngine(str(self.model_path))
+            self._engine = LlamaCppEngine(
+                str(self.model_path), n_ctx=int(self.config.get("n_ctx", 4096)), prefix_cache=self.config.get("prefix_cache")
+            )
         return self._engine.generate(prompt_from_messages(messages, prompt))
 
 
@@ -199,6 +275,10 @@ class RuntimeRegistry:
         stored = [RuntimeProfile.model_validate(payload) for payload in self.store.list_runtime_profiles()]
         return stored or self.refresh_profiles()
 
+    async def aclose(self) -> None:
+        for adapter in self.adapters.values():
+            await adapter.aclose()
+
     def get_adapter(self, runtime_name: str) -> RuntimeAdapter:
         return self.adapters[runtime_name]
 
@@ -4,6 +4,7 @@ from dataclasses import dataclass
 from typing import Any
 
 from .agents import build_default_agent_registry
+from .async_exec import AsyncChatPipeline
 from .ao import build_default_ao_registry
 from .config import VERSION, build_paths, ensure_paths, load_runtime_configs
 from .critique import CritiqueEngine
@@ -14,22 +15,24 @@ from .experiments import ExperimentService
 from .foundry import DatasetRefinery
 from .governance import GovernanceService
 from .manifest import build_workspace_manifest
-from .memory import MemoryService
+from .memory import MemoryService, SessionHotCache
 from .models import ModelRegistry
 from .operator import OperatorKernel
 from .operator.routing import ExpertSelector
 from .permissions import PermissionContext
-from .retrieval import RetrievalService
+from .retrieval import CorpusGeneration, RetrievalService
 from .runtimes import RuntimeRegistry
+from .schemas import RetrievalRequest
 from .storage import NexusStore
 from .tools import ToolRegistry
+from .write_behind import WriteBehindWriter
 from nexusnet.agents.delegation import DelegationPlanner
 from nexusnet.agents.parallel import ParallelExecutionAdvisor
-from nexusnet.agents.subagents import SubagentExecutionService
+from nexusnet.agents.subagents import BrainSubagentRunner, SubagentExecutionService
 from nexusnet.agents import BrainAgentRegistry
 from nexusnet.agents.scheduled import ScheduledAgentService
 from nexusnet.aos import build_default_ao_registry as build_brain_ao_registry
-from nexusnet.core import CoreEvidenceBridge, NexusBrain
+from nexusnet.core import CoreEvidenceBridge, GenerationCache, NexusBrain
 from nexusnet.curriculum import CurriculumEngine
 from nexusnet.curriculum.skill_refinement import SkillRefinementService
 from nexusnet.distillation import DistillationDatasetBuilder
@@ -179,6 +182,7 @@ class NexusServices:
     brain_retrieval_rerank_ops: Any
     brain_visualizer: Any
     operator: OperatorKernel
+    async_chat: AsyncChatPipeline
 
     def doctor_report(self) -> dict[str, Any]:
         profiles = [profile.model_dump(mode="json") for profile in self.runtime_registry.list_profiles()]
@@ -205,6 +209,17 @@ def build_services(project_root: str | None = None) -> NexusServices:
     )
 
     store = NexusStore(paths)
+    store.configure_trace_storage((runtime_configs.get("storage", {}) or {}).get("traces"))
+    write_behind_cfg = (runtime_configs.get("storage", {}) or {}).get("write_behind", {}) or {}
+    if write_behind_cfg.get("enabled", False):
+        store.attach_write_behind(
+            WriteBehindWriter(
+                store,
+                max_pending_bundles=int(write_behind_cfg.get("max_pending_bundles", 256)),
+                max_batch_bundles=int(write_behind_cfg.get("max_batch_bundles", 64)),
+                barrier_timeout_seconds=float(write_behind_cfg.get("barrier_timeout_seconds", 5.0)),
+            )
+        )
     ao_registry = build_default_ao_registry()
     brain_aos = build_brain_ao_registry()
     agent_registry = build_default_agent_registry()
@@ -213,7 +228,17 @@ def build_services(project_root: str | None = None) -> NexusServices:
     runtime_registry.bootstrap()
     model_registry = ModelRegistry(store, runtime_registry, runtime_configs)
     model_registry.bootstrap()
-    memory = MemoryService(paths, store)
+    hot_cache_cfg = (runtime_configs.get("storage", {}) or {}).get("memory_hot_cache", {}) or {}
+    memory_index_cfg = (runtime_configs.get("storage", {}) or {}).get("memory_index", {}) or {}
+    memory = MemoryService(
+        paths,
+        store,
+        SessionHotCache(
+            max_sessions=int(hot_cache_cfg.get("max_sessions", 128)),
+            records_per_session=int(hot_cache_cfg.get("records_per_session", 512)),
+        ),
+        index_config=memory_index_cfg,
+    )
     brain_memory_node = MemoryNode(project_root=paths.project_root, runtime_configs=runtime_configs)
     runtime_configs["planes"] = brain_memory_node.summary()["raw_config"]
     brain_memory_planes = brain_memory_node.registry
@@ -229,12 +254,13 @@ def build_services(project_root: str | None = None) -> NexusServices:
     brain_teachers.schema_manifest_path = teacher_schema_manifest["path"]
     graph_store = LocalGraphStore(paths.artifacts_dir)
     graph_bridge = MemoryGraphBridge(brain_memory_planes)
-    brain_graph_ingestion = GraphRAGIngestionService(store=graph_store, graph_bridge=graph_bridge)
+    corpus_generation = CorpusGeneration()
+    brain_graph_ingestion = GraphRAGIngestionService(store=graph_store, graph_bridge=graph_bridge, corpus_generation=corpus_generation)
     brain_graph_retriever = GraphRAGRetriever(graph_store)
     brain_graph_evaluator = GraphRAGEvaluator()
     temporal_cfg = (runtime_configs.get("rag", {}) or {}).get("temporal", {}) or {}
     temporal_retriever = (
-        TemporalRetriever(str(paths.runtime_dir / "temporal" / "tkg.sqlite"))
+        TemporalRetriever(str(paths.runtime_dir / "temporal" / "tkg.sqlite"), corpus_generation=corpus_generation)
         if temporal_cfg.get("enabled", False)
         else None
     )
@@ -246,6 +272,7 @@ def build_services(project_root: str | None = None) -> NexusServices:
         memory_service=memory,
         temporal_retriever=temporal_retriever,
         retrieval_config=runtime_configs.get("retrieval", {}),
+        corpus_generation=corpus_generation,
     )
     critique = CritiqueEngine(store)
     governance = GovernanceService(paths, store)
@@ -264,6 +291,10 @@ def build_services(project_root: str | None = None) -> NexusServices:
         brain_runtime_registry=brain_runtime_registry,
         teacher_registry=brain_teachers,
         memory_node=brain_memory_node,
+        generation_cache=GenerationCache.from_config(
+            (runtime_configs.get("inference", {}) or {}).get("generation_cache"),
+            state_dir=paths.state_dir,
+        ),
     )
     brain.wake()
     brain.bootstrap_from_registry()
@@ -325,7 +356,7 @@ def build_services(project_root: str | None = None) -> NexusServices:
         replacement_cohorts=brain_replacement_cohorts,
         readiness=brain_replacement_readiness,
     )
-    brain_agent_registry = BrainAgentRegistry(artifacts_dir=paths.artifacts_dir)
+    brain_agent_registry = BrainAgentRegistry(artifacts_dir=paths.artifacts_dir, artifact_writer=store.write_artifact)
     brain_recipe_catalog = RecipeCatalogService(
         config_dir=paths.config_dir,
         runtime_configs=runtime_configs,
@@ -406,6 +437,15 @@ def build_services(project_root: str | None = None) -> NexusServices:
     brain_subagents = SubagentExecutionService(
         artifacts_dir=paths.artifacts_dir,
         runtime_configs=runtime_configs,
+        runner=BrainSubagentRunner(
+            brain=brain,
+            tool_handlers={
+                "retrieval.query": lambda query, top_k=4: [
+                    hit.model_dump(mode="json") for hit in retrieval.query(RetrievalRequest(query=query, top_k=int(top_k)))
+                ],
+                "governance.audit": lambda action, detail=None: governance.record_event(action, detail or {}),
+            },
+        ),
     )
     brain_delegation = DelegationPlanner(
         recipe_service=brain_recipe_catalog,
@@ -413,6 +453,7 @@ def build_services(project_root: str | None = None) -> NexusServices:
     )
     brain_parallel = ParallelExecutionAdvisor(
         max_parallel=int((((runtime_configs.get("goose_lane") or {}).get("subagents") or {}).get("max_parallel", 1))),
+        subagents=brain_subagents,
     )
     brain_agent_harness = AgentHarnessBenchmarkCatalog()
     brain_agent_teams = AgentTeamRegistry()
@@ -599,6 +640,11 @@ def build_services(project_root: str | None = None) -> NexusServices:
         brain_gateway=brain_gateway,
         brain_promotions=brain_promotions,
     )
+    async_chat = AsyncChatPipeline(
+        kernel=operator,
+        store=store,
+        config=(runtime_configs.get("inference", {}) or {}).get("async_pipeline"),
+    )
     return NexusServices(
         version=VERSION,
         paths=paths,
@@ -684,4 +730,5 @@ def build_services(project_root: str | None = None) -> NexusServices:
         brain_retrieval_rerank_ops=brain_retrieval_rerank_ops,
         brain_visualizer=brain_visualizer,
         operator=operator,
+        async_chat=async_chat,
     )
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import copy
+import functools
 import json
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator
 
 from .config import NexusPaths, ensure_paths
+from .trace_store import HEADER_KEYS, LazyTrace, TraceCodec
+from .write_behind import WriteBundle
 
 
 def _json_dump(payload: Any) -> str:
@@ -18,16 +24,149 @@ def _json_load(payload: str | None, default: Any) -> Any:
     return json.loads(payload)
 
 
+def _deferrable(key: Callable[..., str] | None = None, read: Callable[..., Any] | None = None):
+    """Capture the write into the active write-behind bundle instead of running it now.
+
+    With `read`, the bundle also keeps what readers on the request should see under the write's key.
+    """
+
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self: "NexusStore", *args: Any, **kwargs: Any) -> Any:
+            bundle = getattr(self._local, "bundle", None)
+            if bundle is None:
+                return method(self, *args, **kwargs)
+            # snapshot the arguments: callers may mutate their payloads before the bundle commits
+            args, kwargs = copy.deepcopy((args, kwargs))
+            op_key = key(*args, **kwargs) if key else None
+            bundle.add(functools.partial(method, self, *args, **kwargs), key=op_key)
+            if read is not None and op_key is not None:
+                bundle.reads[op_key] = read(*args, **kwargs)
+            return None
+
+        return wrapper
+
+    return decorate
+
+
+class _BatchConnection:
+    """Shared connection handed out inside `NexusStore.batch`; the batch owns commit and close."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+    def __enter__(self) -> "_BatchConnection":
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        return False
+
+    def close(self) -> None:
+        return None
+
+
 class NexusStore:
     def __init__(self, paths: NexusPaths):
         self.paths = ensure_paths(paths)
+        self.write_behind = None
+        self.trace_codec = TraceCodec()
+        self._local = threading.local()
         self._initialize()
 
-    def _connect(self) -> sqlite3.Connection:
+    def _connect(self, session_id: str | None = None) -> sqlite3.Connection:
+        batch_conn = getattr(self._local, "batch_conn", None)
+        if batch_conn is not None:
+            return batch_conn
+        if self.write_behind is not None:
+            self.write_behind.wait_for(session_id)
         conn = sqlite3.connect(self.paths.database_path)
         conn.row_factory = sqlite3.Row
         return conn
 
+    def attach_write_behind(self, writer: Any) -> None:
+        self.write_behind = writer
+
+    @contextmanager
+    def batch(self) -> Iterator[sqlite3.Connection]:
+        """Run every store call on this thread inside one transaction."""
+        if getattr(self._local, "batch_conn", None) is not None:
+            yield self._local.batch_conn
+            return
+        conn = sqlite3.connect(self.paths.database_path)
+        conn.row_factory = sqlite3.Row
+        self._local.batch_conn = _BatchConnection(conn)
+        try:
+            with conn:
+                yield self._local.batch_conn
+        finally:
+            self._local.batch_conn = None
+            conn.close()
+
+    @contextmanager
+    def write_behind_scope(self, session_id: str | None = None) -> Iterator[WriteBundle | None]:
+        """Collect deferrable writes into one bundle, submitted when the outermost scope exits."""
+        if getattr(self._local, "bundle", None) is not None:
+            yield self._local.bundle
+            return
+        if self.write_behind is None:
+            yield None
+            return
+        bundle = WriteBundle(session_id)
+        self._local.bundle = bundle
+        try:
+            yield bundle
+        finally:
+            self._local.bundle = None
+            self.write_behind.submit(bundle)
+
+    def open_bundle(self, session_id: str | None = None) -> WriteBundle | None:
+        """A bundle for writes spread over several threads; enter it with `use_bundle`, then `submit_bundle`."""
+        return WriteBundle(session_id) if self.write_behind is not None else None
+
+    @contextmanager
+    def use_bundle(self, bundle: WriteBundle | None) -> Iterator[WriteBundle | None]:
+        """Collect this thread's deferrable writes into `bundle` without submitting it on exit."""
+        if bundle is None or getattr(self._local, "bundle", None) is not None:
+            yield getattr(self._local, "bundle", None)
+            return
+        self._local.bundle = bundle
+        try:
+            yield bundle
+        finally:
+            self._local.bundle = None
+
+    def submit_bundle(self, bundle: WriteBundle | None) -> Any:
+        """Queue `bundle`; returns its ack (None without write-behind) for callers that wait on it explicitly."""
+        if bundle is not None and self.write_behind is not None:
+            return self.write_behind.submit(bundle)
+        return None
+
+    def _pending_traces(self) -> dict[str, dict[str, Any]]:
+        """Traces saved into this thread's open bundle, which the database does not hold yet."""
+        bundle = getattr(self._local, "bundle", None)
+        if bundle is None:
+            return {}
+        return {key.split("::", 1)[1]: value for key, value in bundle.reads.items() if key.startswith("trace::")}
+
+    @contextmanager
+    def immediate(self) -> Iterator[None]:
+        bundle = getattr(self._local, "bundle", None)
+        self._local.bundle = None
+        try:
+            yield
+        finally:
+            self._local.bundle = bundle
+
+    def defer(self, fn: Callable[[], Any], *, key: str | None = None, after_commit: bool = False) -> bool:
+        bundle = getattr(self._local, "bundle", None)
+        if bundle is None:
+            return False
+        bundle.add(fn, key=key, after_commit=after_commit)
+        return True
+
     def _initialize(self) -> None:
         schema = """
         create table if not exists models (
@@ -49,6 +188,35 @@ class NexusStore:
             trace_json text not null,
             created_at text not null
         );
+        create table if not exists trace_headers (
+            trace_id text primary key,
+            session_id text not null,
+            status text not null,
+            header_json text not null,
+            body_hash text not null,
+            raw_bytes integer not null,
+            created_at text not null
+        );
+        create index if not exists trace_headers_created on trace_headers(created_at);
+        create index if not exists trace_headers_status on trace_headers(status, created_at);
+        create table if not exists trace_blobs (
+            blob_hash text primary key,
+            codec text not null,
+            data blob not null,
+            raw_bytes integer not null
+        );
+        create table if not exists trace_blob_refs (
+            trace_id text not null,
+            blob_hash text not null,
+            primary key (trace_id, blob_hash)
+        );
+        create index if not exists trace_blob_refs_blob on trace_blob_refs(blob_hash);
+        create table if not exists trace_dictionaries (
+            dict_id integer primary key autoincrement,
+            data blob not null,
+            sample_count integer not null,
+            created_at text not null
+        );
         create table if not exists critiques (
             critique_id text primary key,
             trace_id text not null,
@@ -88,6 +256,15 @@ class NexusStore:
             metadata_json text not null,
             created_at text not null
         );
+        create table if not exists retrieval_postings (
+            term text not null,
+            chunk_id text not null,
+            doc_id text not null,
+            tf integer not null
+        );
+        create index if not exists retrieval_postings_term on retrieval_postings(term);
+        create index if not exists retrieval_postings_doc on retrieval_postings(doc_id);
+        create index if not exists retrieval_postings_chunk on retrieval_postings(chunk_id);
         create table if not exists experiments (
             experiment_id text primary key,
             kind text not null,
@@ -218,12 +395,48 @@ class NexusStore:
             report_json text not null,
             created_at text not null
         );
+        create table if not exists change_feed (
+            table_name text primary key,
+            seq integer not null
+        );
         """
         with self._connect() as conn:
             conn.executescript(schema)
+            row = conn.execute("select dict_id, data from trace_dictionaries order by dict_id desc limit 1").fetchone()
+        if row is not None:
+            self.trace_codec.use_dictionary(int(row["dict_id"]), bytes(row["data"]))
+
+    def configure_trace_storage(self, config: dict[str, Any] | None) -> None:
+        self.trace_codec = TraceCodec.from_config(config)
+        with self._connect() as conn:
+            row = conn.execute("select dict_id, data from trace_dictionaries order by dict_id desc limit 1").fetchone()
+        if row is not None:
+            self.trace_codec.use_dictionary(int(row["dict_id"]), bytes(row["data"]))
+
+    def _touch(self, conn: sqlite3.Connection, table_name: str) -> None:
+        conn.execute(
+            """
+            insert into change_feed(table_name, seq) values (?, 1)
+            on conflict(table_name) do update set seq = seq + 1
+            """,
+            (table_name,),
+        )
+
+    def change_sequences(self) -> dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute("select table_name, seq from change_feed").fetchall()
+        return {row["table_name"]: int(row["seq"]) for row in rows}
+
+    def change_cursor(self, sequences: dict[str, int] | None = None) -> int:
+        return sum((sequences if sequences is not None else self.change_sequences()).values())
 
     def write_artifact(self, relative_path: str, content: str) -> str:
         destination = self.paths.artifacts_dir / relative_path
+        if self.defer(functools.partial(self._write_file, destination, content), key=f"artifact::{destination}"):
+            return str(destination)
+        return self._write_file(destination, content)
+
+    def _write_file(self, destination: Path, content: str) -> str:
         destination.parent.mkdir(parents=True, exist_ok=True)
         destination.write_text(content, encoding="utf-8")
         return str(destination)
@@ -241,6 +454,7 @@ class NexusStore:
                 """,
                 (model_id, runtime_name, _json_dump(payload), created_at, updated_at),
             )
+            self._touch(conn, "models")
 
     def list_models(self) -> list[dict[str, Any]]:
         with self._connect() as conn:
@@ -259,44 +473,222 @@ class NexusStore:
                 """,
                 (runtime_name, _json_dump(payload), updated_at),
             )
+            self._touch(conn, "runtime_profiles")
 
     def list_runtime_profiles(self) -> list[dict[str, Any]]:
         with self._connect() as conn:
             rows = conn.execute("select profile_json from runtime_profiles order by runtime_name").fetchall()
         return [_json_load(row["profile_json"], {}) for row in rows]
 
+    @_deferrable(
+        lambda trace_id, *_, **__: f"trace::{trace_id}",
+        read=lambda trace_id, session_id, status, payload, created_at: {"status": status, "payload": payload, "created_at": created_at},
+    )
     def save_trace(self, trace_id: str, session_id: str, status: str, payload: dict[str, Any], created_at: str) -> None:
+        body_hash, blobs = self.trace_codec.split(payload)
+        header = {key: payload[key] for key in HEADER_KEYS if key in payload}
         with self._connect() as conn:
+            self._put_trace_blobs(conn, blobs)
             conn.execute(
                 """
-                insert into execution_traces(trace_id, session_id, status, trace_json, created_at)
-                values (?, ?, ?, ?, ?)
+                insert into trace_headers(trace_id, session_id, status, header_json, body_hash, raw_bytes, created_at)
+                values (?, ?, ?, ?, ?, ?, ?)
                 on conflict(trace_id) do update set
                     status=excluded.status,
-                    trace_json=excluded.trace_json
+                    header_json=excluded.header_json,
+                    body_hash=excluded.body_hash,
+                    raw_bytes=excluded.raw_bytes
                 """,
-                (trace_id, session_id, status, _json_dump(payload), created_at),
+                (trace_id, session_id, status, _json_dump(header), body_hash, len(_json_dump(payload)), created_at),
+            )
+            conn.execute("delete from trace_blob_refs where trace_id = ?", (trace_id,))
+            conn.executemany(
+                "insert or ignore into trace_blob_refs(trace_id, blob_hash) values (?, ?)",
+                [(trace_id, blob_hash) for blob_hash in blobs],
             )
+            conn.execute("delete from execution_traces where trace_id = ?", (trace_id,))
+            self._touch(conn, "execution_traces")
 
     def get_trace(self, trace_id: str) -> dict[str, Any] | None:
+        pending = self._pending_traces().get(trace_id)
+        if pending is not None:
+            return copy.deepcopy(pending["payload"])
         with self._connect() as conn:
+            row = conn.execute("select body_hash from trace_headers where trace_id = ?", (trace_id,)).fetchone()
+            if row is not None:
+                return self._load_trace_body(conn, row["body_hash"])
             row = conn.execute("select trace_json from execution_traces where trace_id = ?", (trace_id,)).fetchone()
         if not row:
             return None
         return _json_load(row["trace_json"], {})
 
     def list_traces(self, limit: int = 100, status: str | None = None) -> list[dict[str, Any]]:
-        sql = "select trace_json from execution_traces"
-        params: list[Any] = []
-        if status:
-            sql += " where status = ?"
-            params.append(status)
-        sql += " order by created_at desc limit ?"
-        params.append(limit)
+        """Newest first; compact-format traces come back as `LazyTrace` and decode on first body read."""
+        where = " where status = ?" if status else ""
+        sql = f"""
+            select trace_id, header_json, body_hash, null as trace_json, created_at from trace_headers{where}
+            union all
+            select trace_id, null, null, trace_json, created_at from execution_traces{where}
+            order by created_at desc limit ?
+        """
+        params: list[Any] = [status, status] if status else []
+        pending = {trace_id: item for trace_id, item in self._pending_traces().items() if not status or item["status"] == status}
+        params.append(limit + len(pending))
         with self._connect() as conn:
-            rows = conn.execute(sql, params).fetchall()
-        return [_json_load(row["trace_json"], {}) for row in rows]
+            rows = [row for row in conn.execute(sql, params).fetchall() if row["trace_id"] not in pending]
+        load = self._trace_body_batch([row["body_hash"] for row in rows if row["trace_json"] is None])
+        output: list[tuple[str, dict[str, Any]]] = []
+        position = 0
+        for row in rows:
+            if row["trace_json"] is not None:
+                output.append((row["created_at"], _json_load(row["trace_json"], {})))
+            else:
+                output.append((row["created_at"], LazyTrace(_json_load(row["header_json"], {}), functools.partial(load, position))))
+                position += 1
+        if pending:  # this request's own unsaved traces, in created_at order with the stored ones
+            output.extend((item["created_at"], copy.deepcopy(item["payload"])) for item in pending.values())
+            output.sort(key=lambda entry: entry[0], reverse=True)
+        return [trace for _, trace in output[:limit]]
+
+    def trace_storage_stats(self) -> dict[str, Any]:
+        with self._connect() as conn:
+            headers = conn.execute("select count(*) as traces, coalesce(sum(raw_bytes), 0) as raw_bytes from trace_headers").fetchone()
+            blobs = conn.execute(
+                "select count(*) as blobs, coalesce(sum(length(data)), 0) as stored_bytes, coalesce(sum(raw_bytes), 0) as blob_raw_bytes from trace_blobs"
+            ).fetchone()
+            legacy = conn.execute("select count(*) as traces, coalesce(sum(length(trace_json)), 0) as bytes from execution_traces").fetchone()
+        raw_bytes = int(headers["raw_bytes"])
+        stored_bytes = int(blobs["stored_bytes"])
+        return {
+            **self.trace_codec.stats(),
+            "traces": int(headers["traces"]),
+            "blobs": int(blobs["blobs"]),
+            "raw_bytes": raw_bytes,
+            "stored_bytes": stored_bytes,
+            "compression_ratio": round(raw_bytes / stored_bytes, 2) if stored_bytes else 0.0,
+            "legacy_traces": int(legacy["traces"]),
+            "legacy_bytes": int(legacy["bytes"]),
+        }
+
+    def compact_traces(
+        self,
+        *,
+        retention_days: float | None = None,
+        max_traces: int | None = None,
+        migrate_limit: int = 5000,
+        now: str | None = None,
+    ) -> dict[str, Any]:
+        """Migrate legacy rows, enforce retention, drop unreferenced blobs and refresh the dictionary."""
+        report = {"migrated": 0, "expired": 0, "blobs_removed": 0, "dictionary_id": None, "recompressed": 0}
+        with self._connect() as conn:
+            legacy = conn.execute(
+                "select trace_id, session_id, status, trace_json, created_at from execution_traces order by created_at limit ?",
+                (migrate_limit,),
+            ).fetchall()
+        for row in legacy:
+            self.save_trace(row["trace_id"], row["session_id"], row["status"], _json_load(row["trace_json"], {}), row["created_at"])
+        report["migrated"] = len(legacy)
+        with self._connect() as conn:
+            doomed: set[str] = set()
+            if retention_days is not None:
+                cutoff_sql = "select trace_id from trace_headers where created_at < strftime('%Y-%m-%dT%H:%M:%f', coalesce(?, 'now'), ?)"
+                rows = conn.execute(cutoff_sql, (now, f"-{float(retention_days)} days")).fetchall()
+                doomed |= {row["trace_id"] for row in rows}
+            if max_traces is not None:
+                rows = conn.execute(
+                    "select trace_id from trace_headers order by created_at desc limit -1 offset ?",
+                    (max(int(max_traces), 0),),
+                ).fetchall()
+                doomed |= {row["trace_id"] for row in rows}
+            if doomed:
+                conn.executemany("delete from trace_headers where trace_id = ?", [(trace_id,) for trace_id in doomed])
+                conn.executemany("delete from trace_blob_refs where trace_id = ?", [(trace_id,) for trace_id in doomed])
+                self._touch(conn, "execution_traces")
+            report["expired"] = len(doomed)
+            cursor = conn.execute("delete from trace_blobs where blob_hash not in (select blob_hash from trace_blob_refs)")
+            report["blobs_removed"] = cursor.rowcount
+        report.update(self._refresh_trace_dictionary())
+        return report
+
+    def _refresh_trace_dictionary(self) -> dict[str, Any]:
+        codec = self.trace_codec
+        with self._connect() as conn:
+            if codec.dictionary is not None:
+                # blobs written since training already use the live dictionary; retrain only for a backlog without it
+                stale = conn.execute(
+                    "select count(*) as n from trace_blobs where codec <> ?", (f"zstd-dict:{codec.dictionary[0]}",)
+                ).fetchone()["n"]
+                if stale < codec.dictionary_min_samples:
+                    return {"dictionary_id": codec.dictionary[0], "recompressed": 0}
+            rows = conn.execute(
+                "select blob_hash, codec, data from trace_blobs order by rowid desc limit ?",
+                (max(codec.dictionary_min_samples * 10, 1),),
+            ).fetchall()
+            samples = [codec.decode(row["codec"], row["data"], functools.partial(self._trace_dictionary, conn)) for row in rows]
+            trained = codec.train_dictionary(samples)
+            if trained is None:
+                return {"dictionary_id": codec.dictionary[0] if codec.dictionary else None, "recompressed": 0}
+            cursor = conn.execute(
+                "insert into trace_dictionaries(data, sample_count, created_at) values (?, ?, strftime('%Y-%m-%dT%H:%M:%f', 'now'))",
+                (trained, len(samples)),
+            )
+            dict_id = int(cursor.lastrowid)
+            codec.use_dictionary(dict_id, trained)
+            recompressed = 0
+            for row in conn.execute("select blob_hash, codec, data from trace_blobs").fetchall():
+                text = codec.decode(row["codec"], row["data"], functools.partial(self._trace_dictionary, conn))
+                new_codec, data = codec.encode(text)
+                conn.execute("update trace_blobs set codec = ?, data = ? where blob_hash = ?", (new_codec, data, row["blob_hash"]))
+                recompressed += 1
+            conn.execute("delete from trace_dictionaries where dict_id <> ?", (dict_id,))
+        return {"dictionary_id": dict_id, "recompressed": recompressed}
+
+    def _put_trace_blobs(self, conn: sqlite3.Connection, blobs: dict[str, str]) -> None:
+        # no existence pre-check: compaction may delete a blob between the check and our ref insert
+        rows = [(blob_hash, *self.trace_codec.encode(text), len(text)) for blob_hash, text in blobs.items()]
+        conn.executemany("insert or ignore into trace_blobs(blob_hash, codec, data, raw_bytes) values (?, ?, ?, ?)", rows)
+
+    def _trace_body_batch(self, body_hashes: list[str]) -> Callable[[int], dict[str, Any]]:
+        """Loader for the bodies of one listing: the first body read decodes every unread body at once."""
+        bodies: dict[int, dict[str, Any]] = {}
+        unread = set(range(len(body_hashes)))
+        lock = threading.Lock()
+
+        def load(position: int) -> dict[str, Any]:
+            with lock:
+                if position not in bodies:
+                    wanted = sorted(unread)
+                    with self._connect() as conn:
+                        try:
+                            bodies.update(zip(wanted, self._load_trace_bodies(conn, [body_hashes[i] for i in wanted])))
+                        except KeyError:  # a sibling lost blobs; fail only the trace that is missing them
+                            bodies[position] = self._load_trace_body(conn, body_hashes[position])
+                unread.discard(position)
+                return bodies.pop(position)
+
+        return load
+
+    def _load_trace_body(self, conn: sqlite3.Connection, body_hash: str) -> dict[str, Any]:
+        return self._load_trace_bodies(conn, [body_hash])[0]
+
+    def _load_trace_bodies(self, conn: sqlite3.Connection, body_hashes: list[str]) -> list[dict[str, Any]]:
+        def fetch(hashes: list[str]) -> dict[str, str]:
+            rows = conn.execute(
+                f"select blob_hash, codec, data from trace_blobs where blob_hash in ({','.join('?' * len(hashes))})",
+                hashes,
+            ).fetchall()
+            load_dictionary = functools.partial(self._trace_dictionary, conn)
+            return {row["blob_hash"]: self.trace_codec.decode(row["codec"], row["data"], load_dictionary) for row in rows}
 
+        return self.trace_codec.join_many(body_hashes, fetch)
+
+    def _trace_dictionary(self, conn: sqlite3.Connection, dict_id: int) -> bytes:
+        row = conn.execute("select data from trace_dictionaries where dict_id = ?", (dict_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"trace dictionary {dict_id} missing")
+        return bytes(row["data"])
+
+    @_deferrable()
     def save_critique(self, critique_id: str, trace_id: str, payload: dict[str, Any], created_at: str) -> None:
         with self._connect() as conn:
             conn.execute(
@@ -308,12 +700,14 @@ class NexusStore:
                 """,
                 (critique_id, trace_id, _json_dump(payload), created_at),
             )
+            self._touch(conn, "critiques")
 
     def list_critiques(self, limit: int = 100) -> list[dict[str, Any]]:
         with self._connect() as conn:
             rows = conn.execute("select critique_json from critiques order by created_at desc limit ?", (limit,)).fetchall()
         return [_json_load(row["critique_json"], {}) for row in rows]
 
+    @_deferrable()
     def add_memory_record(self, payload: dict[str, Any]) -> None:
         with self._connect() as conn:
             conn.execute(
@@ -339,8 +733,11 @@ class NexusStore:
                     payload["updated_at"],
                 ),
             )
+            self._touch(conn, "memory_records")
 
-    def list_memory_records(self, session_id: str, plane: str | None = None, limit: int = 200) -> list[dict[str, Any]]:
+    def list_memory_records(
+        self, session_id: str, plane: str | None = None, limit: int = 200, *, newest: bool = False
+    ) -> list[dict[str, Any]]:
         sql = """
             select memory_id, session_id, plane, role, content_json, tags_json, score_json, created_at, updated_at
             from memory_records where session_id = ?
@@ -349,9 +746,10 @@ class NexusStore:
         if plane:
             sql += " and plane = ?"
             params.append(plane)
-        sql += " order by created_at asc limit ?"
+        direction = "desc" if newest else "asc"
+        sql += f" order by created_at {direction}, rowid {direction} limit ?"
         params.append(limit)
-        with self._connect() as conn:
+        with self._connect(session_id) as conn:
             rows = conn.execute(sql, params).fetchall()
         output = []
         for row in rows:
@@ -370,6 +768,7 @@ class NexusStore:
             )
         return output
 
+    @_deferrable(lambda session_id, *_, **__: f"memory-analytics::{session_id}")
     def save_memory_analytics(self, session_id: str, payload: dict[str, Any], updated_at: str) -> None:
         with self._connect() as conn:
             conn.execute(
@@ -382,9 +781,10 @@ class NexusStore:
                 """,
                 (session_id, _json_dump(payload), updated_at),
             )
+            self._touch(conn, "memory_analytics")
 
     def get_memory_analytics(self, session_id: str) -> dict[str, Any] | None:
-        with self._connect() as conn:
+        with self._connect(session_id) as conn:
             row = conn.execute("select analytics_json from memory_analytics where session_id = ?", (session_id,)).fetchone()
         if not row:
             return None
@@ -411,28 +811,153 @@ class NexusStore:
                     payload["created_at"],
                 ),
             )
+            self._touch(conn, "retrieval_documents")
 
-    def replace_retrieval_chunks(self, doc_id: str, chunks: list[dict[str, Any]]) -> None:
+    def replace_retrieval_chunks(
+        self,
+        doc_id: str,
+        chunks: list[dict[str, Any]],
+        postings: list[tuple[str, str, str, int]] | None = None,
+    ) -> None:
         with self._connect() as conn:
-            conn.execute("delete from retrieval_chunks where doc_id = ?", (doc_id,))
+            self._replace_retrieval_rows(conn, [doc_id], chunks, postings or [])
+            self._touch(conn, "retrieval_chunks")
+
+    def save_retrieval_batch(
+        self,
+        documents: list[dict[str, Any]],
+        chunks: list[dict[str, Any]],
+        postings: list[tuple[str, str, str, int]],
+        *,
+        replace_sources: list[str] | None = None,
+    ) -> None:
+        with self._connect() as conn:
+            if replace_sources:
+                self._delete_retrieval_sources(conn, replace_sources)
             conn.executemany(
                 """
-                insert into retrieval_chunks(chunk_id, doc_id, chunk_index, source, content, metadata_json, created_at)
-                values (?, ?, ?, ?, ?, ?, ?)
+                insert into retrieval_documents(doc_id, source, title, content, metadata_json, created_at)
+                values (?, ?, ?, ?, ?, ?)
+                on conflict(doc_id) do update set
+                    source=excluded.source,
+                    title=excluded.title,
+                    content=excluded.content,
+                    metadata_json=excluded.metadata_json
                 """,
                 [
                     (
-                        chunk["chunk_id"],
-                        chunk["doc_id"],
-                        chunk["chunk_index"],
-                        chunk["source"],
-                        chunk["content"],
-                        _json_dump(chunk.get("metadata", {})),
-                        chunk["created_at"],
+                        payload["doc_id"],
+                        payload["source"],
+                        payload.get("title"),
+                        payload["content"],
+                        _json_dump(payload.get("metadata", {})),
+                        payload["created_at"],
                     )
-                    for chunk in chunks
+                    for payload in documents
                 ],
             )
+            self._replace_retrieval_rows(conn, [payload["doc_id"] for payload in documents], chunks, postings)
+            self._touch(conn, "retrieval_documents")
+            self._touch(conn, "retrieval_chunks")
+
+    def _replace_retrieval_rows(
+        self,
+        conn: sqlite3.Connection,
+        doc_ids: list[str],
+        chunks: list[dict[str, Any]],
+        postings: list[tuple[str, str, str, int]],
+    ) -> None:
+        conn.executemany("delete from retrieval_chunks where doc_id = ?", [(doc_id,) for doc_id in doc_ids])
+        conn.executemany("delete from retrieval_postings where doc_id = ?", [(doc_id,) for doc_id in doc_ids])
+        conn.executemany(
+            """
+            insert into retrieval_chunks(chunk_id, doc_id, chunk_index, source, content, metadata_json, created_at)
+            values (?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    chunk["chunk_id"],
+                    chunk["doc_id"],
+                    chunk["chunk_index"],
+                    chunk["source"],
+                    chunk["content"],
+                    _json_dump(chunk.get("metadata", {})),
+                    chunk["created_at"],
+                )
+                for chunk in chunks
+            ],
+        )
+        conn.executemany("insert into retrieval_postings(term, chunk_id, doc_id, tf) values (?, ?, ?, ?)", postings)
+
+    def delete_retrieval_sources(self, sources: list[str]) -> int:
+        if not sources:
+            return 0
+        with self._connect() as conn:
+            deleted = self._delete_retrieval_sources(conn, sources)
+            self._touch(conn, "retrieval_documents")
+            self._touch(conn, "retrieval_chunks")
+        return deleted
+
+    def _delete_retrieval_sources(self, conn: sqlite3.Connection, sources: list[str]) -> int:
+        params = [(source,) for source in sources]
+        conn.executemany(
+            "delete from retrieval_postings where doc_id in (select doc_id from retrieval_documents where source = ?)",
+            params,
+        )
+        conn.executemany("delete from retrieval_chunks where source = ?", params)
+        before = conn.total_changes
+        conn.executemany("delete from retrieval_documents where source = ?", params)
+        return conn.total_changes - before
+
+    def list_retrieval_chunks_without_postings(self) -> list[dict[str, Any]]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                select chunk_id, doc_id, content from retrieval_chunks c
+                where not exists (select 1 from retrieval_postings p where p.chunk_id = c.chunk_id)
+                """
+            ).fetchall()
+        return [{"chunk_id": row["chunk_id"], "doc_id": row["doc_id"], "content": row["content"]} for row in rows]
+
+    def add_retrieval_postings(self, postings: list[tuple[str, str, str, int]]) -> None:
+        with self._connect() as conn:
+            conn.executemany("insert into retrieval_postings(term, chunk_id, doc_id, tf) values (?, ?, ?, ?)", postings)
+            self._touch(conn, "retrieval_postings")
+
+    def search_retrieval_postings(self, term_weights: dict[str, int], limit: int) -> list[dict[str, Any]]:
+        if not term_weights:
+            return []
+        values = ", ".join("(?, ?)" for _ in term_weights)
+        params: list[Any] = [item for pair in term_weights.items() for item in pair]
+        params.append(limit)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"""
+                with query_terms(term, weight) as (values {values})
+                select c.chunk_id, c.doc_id, c.chunk_index, c.source, c.content, c.metadata_json, c.created_at,
+                    sum(p.tf * q.weight) as overlap
+                from query_terms q
+                join retrieval_postings p on p.term = q.term
+                join retrieval_chunks c on c.chunk_id = p.chunk_id
+                group by c.chunk_id
+                order by overlap desc, c.created_at asc, c.rowid asc
+                limit ?
+                """,
+                params,
+            ).fetchall()
+        return [
+            {
+                "chunk_id": row["chunk_id"],
+                "doc_id": row["doc_id"],
+                "chunk_index": row["chunk_index"],
+                "source": row["source"],
+                "content": row["content"],
+                "metadata": _json_load(row["metadata_json"], {}),
+                "created_at": row["created_at"],
+                "overlap": int(row["overlap"]),
+            }
+            for row in rows
+        ]
 
     def list_retrieval_chunks(self) -> list[dict[str, Any]]:
         with self._connect() as conn:
@@ -471,6 +996,7 @@ class NexusStore:
                     payload["created_at"],
                 ),
             )
+            self._touch(conn, "experiments")
 
     def list_experiments(self) -> list[dict[str, Any]]:
         with self._connect() as conn:
@@ -496,6 +1022,7 @@ class NexusStore:
                     payload["created_at"],
                 ),
             )
+            self._touch(conn, "promotion_candidates")
 
     def get_promotion_candidate(self, candidate_id: str) -> dict[str, Any] | None:
         with self._connect() as conn:
@@ -537,6 +1064,7 @@ class NexusStore:
                     payload["created_at"],
                 ),
             )
+            self._touch(conn, "promotion_evaluations")
 
     def list_promotion_evaluations(self, *, candidate_id: str | None = None, limit: int = 200) -> list[dict[str, Any]]:
         sql = "select evaluation_json from promotion_evaluations"
@@ -573,6 +1101,7 @@ class NexusStore:
                     payload["created_at"],
                 ),
             )
+            self._touch(conn, "promotion_decisions")
 
     def list_promotion_decisions(self, *, candidate_id: str | None = None, limit: int = 200) -> list[dict[str, Any]]:
         sql = "select decision_json from promotion_decisions"
@@ -610,6 +1139,7 @@ class NexusStore:
                     payload["created_at"],
                 ),
             )
+            self._touch(conn, "approvals")
 
     def list_approvals(self, limit: int = 50) -> list[dict[str, Any]]:
         with self._connect() as conn:
@@ -637,7 +1167,9 @@ class NexusStore:
                     payload["created_at"],
                 ),
             )
+            self._touch(conn, "rollbacks")
 
+    @_deferrable()
     def save_audit_event(self, event_id: str, action: str, detail: dict[str, Any], created_at: str) -> None:
         with self._connect() as conn:
             conn.execute(
@@ -650,6 +1182,7 @@ class NexusStore:
                 """,
                 (event_id, action, _json_dump(detail), created_at),
             )
+            self._touch(conn, "audit_events")
 
     def list_audit_events(self, limit: int = 200) -> list[dict[str, Any]]:
         with self._connect() as conn:
@@ -689,6 +1222,7 @@ class NexusStore:
                 """,
                 (record_id, subject, course, status, score, _json_dump(detail), created_at),
             )
+            self._touch(conn, "curriculum_transcript")
 
     def list_curriculum_records(self, subject: str | None = None, limit: int = 200) -> list[dict[str, Any]]:
         sql = """
@@ -733,6 +1267,7 @@ class NexusStore:
                     payload["created_at"],
                 ),
             )
+            self._touch(conn, "teacher_scorecards")
 
     def list_teacher_scorecards(self, *, subject: str | None = None, limit: int = 200) -> list[dict[str, Any]]:
         sql = "select scorecard_json from teacher_scorecards"
@@ -773,6 +1308,7 @@ class NexusStore:
                     payload["created_at"],
                 ),
             )
+            self._touch(conn, "teacher_disagreement_artifacts")
 
     def list_teacher_disagreement_artifacts(self, *, subject: str | None = None, limit: int = 200) -> list[dict[str, Any]]:
         sql = "select artifact_json from teacher_disagreement_artifacts"
@@ -803,6 +1339,7 @@ class NexusStore:
                     payload["created_at"],
                 ),
             )
+            self._touch(conn, "teacher_evidence_bundles")
 
     def get_teacher_evidence_bundle(self, bundle_id: str) -> dict[str, Any] | None:
         with self._connect() as conn:
@@ -843,6 +1380,7 @@ class NexusStore:
                     payload["created_at"],
                 ),
             )
+            self._touch(conn, "takeover_scorecards")
 
     def get_takeover_scorecard(self, scorecard_id: str) -> dict[str, Any] | None:
         with self._connect() as conn:
@@ -884,6 +1422,7 @@ class NexusStore:
                     payload["created_at"],
                 ),
             )
+            self._touch(conn, "retirement_shadow_log")
 
     def list_retirement_shadow_records(self, *, teacher_id: str | None = None, limit: int = 200) -> list[dict[str, Any]]:
         sql = "select record_json from retirement_shadow_log"
@@ -914,6 +1453,7 @@ class NexusStore:
                     payload["created_at"],
                 ),
             )
+            self._touch(conn, "teacher_trend_scorecards")
 
     def get_teacher_trend_scorecard(self, trend_id: str) -> dict[str, Any] | None:
         with self._connect() as conn:
@@ -965,6 +1505,7 @@ class NexusStore:
                     payload["created_at"],
                 ),
             )
+            self._touch(conn, "takeover_trend_reports")
 
     def get_takeover_trend_report(self, trend_id: str) -> dict[str, Any] | None:
         with self._connect() as conn:
@@ -1005,6 +1546,7 @@ class NexusStore:
                     payload["created_at"],
                 ),
             )
+            self._touch(conn, "teacher_benchmark_fleet_summaries")
 
     def list_teacher_benchmark_fleet_summaries(
         self,
@@ -1047,6 +1589,7 @@ class NexusStore:
                     payload["created_at"],
                 ),
             )
+            self._touch(conn, "teacher_cohort_scorecards")
 
     def list_teacher_cohort_scorecards(
         self,
@@ -1089,6 +1632,7 @@ class NexusStore:
                     payload["created_at"],
                 ),
             )
+            self._touch(conn, "replacement_readiness_reports")
 
     def list_replacement_readiness_reports(
         self,
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Iterator
+
+try:  # optional: pip install -r requirements-storage.txt
+    import zstandard
+except ImportError:  # pragma: no cover - exercised only when zstandard is missing
+    zstandard = None
+
+BLOB_REF = "__trace_blob__"
+HEADER_KEYS = ("trace_id", "session_id", "status", "model_id", "runtime_name", "selected_expert", "wrapper_mode")
+
+
+def _dump(payload: Any) -> str:
+    return json.dumps(payload, ensure_ascii=True, default=str, separators=(",", ":"))
+
+
+class TraceCodec:
+    """Splits a trace into content-addressed sub-blobs and compresses each one.
+
+    Any dict or list whose JSON is at least `min_blob_bytes` is replaced by a
+    `{"__trace_blob__": hash}` reference, children first, so identical policy and evidence
+    snapshots are stored once no matter which trace embeds them.
+    """
+
+    def __init__(
+        self,
+        *,
+        codec: str = "auto",
+        min_blob_bytes: int = 256,
+        level: int = 6,
+        dictionary_size_bytes: int = 64 * 1024,
+        dictionary_min_samples: int = 200,
+        decoded_cache_entries: int = 4096,
+    ):
+        if codec == "auto":
+            codec = "zstd" if zstandard is not None else "zlib"
+        if codec == "zstd" and zstandard is None:
+            codec = "zlib"
+        self.codec = codec
+        self.min_blob_bytes = max(int(min_blob_bytes), 32)
+        self.level = int(level)
+        self.dictionary_size_bytes = int(dictionary_size_bytes)
+        self.dictionary_min_samples = int(dictionary_min_samples)
+        self.decoded_cache_entries = max(int(decoded_cache_entries), 1)
+        self.dictionary: tuple[int, Any] | None = None
+        self._decoded: OrderedDict[str, str] = OrderedDict()
+        self._dictionaries: dict[int, Any] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any] | None) -> "TraceCodec":
+        config = config or {}
+        dictionary = config.get("dictionary", {}) or {}
+        return cls(
+            codec=str(config.get("codec", "auto")),
+            min_blob_bytes=int(config.get("min_blob_bytes", 256)),
+            level=int(config.get("level", 6)),
+            dictionary_size_bytes=int(dictionary.get("size_bytes", 64 * 1024)),
+            dictionary_min_samples=int(dictionary.get("min_samples", 200)),
+            decoded_cache_entries=int(config.get("decoded_cache_entries", 4096)),
+        )
+
+    def split(self, payload: dict[str, Any]) -> tuple[str, dict[str, str]]:
+        blobs: dict[str, str] = {}
+        node = self._split(payload, blobs)
+        if isinstance(node, dict) and set(node) == {BLOB_REF}:
+            return node[BLOB_REF], blobs
+        root = _dump(node)
+        root_hash = self._hash(root)
+        blobs[root_hash] = root
+        return root_hash, blobs
+
+    def join(self, root_hash: str, fetch: Callable[[list[str]], dict[str, str]]) -> dict[str, Any]:
+        """Rebuild a payload; `fetch` maps missing hashes to their decoded JSON."""
+        return self.join_many([root_hash], fetch)[0]
+
+    def join_many(self, root_hashes: list[str], fetch: Callable[[list[str]], dict[str, str]]) -> list[dict[str, Any]]:
+        """Rebuild several payloads, fetching each tree level for all of them at once; one fresh dict per root."""
+        texts: dict[str, str] = {}
+        pending = list(dict.fromkeys(root_hashes))
+        while pending:
+            missing = list(dict.fromkeys(blob_hash for blob_hash in pending if blob_hash not in texts))
+            texts.update(self._cached(missing, fetch))
+            pending = [ref for blob_hash in missing for ref in self._refs(texts[blob_hash])]
+        return [self._expand(json.loads(texts[root_hash]), texts) for root_hash in root_hashes]
+
+    def encode(self, text: str) -> tuple[str, bytes]:
+        raw = text.encode("utf-8")
+        if self.codec == "zstd":
+            if self.dictionary is not None:
+                dict_id, data = self.dictionary
+                compressor = zstandard.ZstdCompressor(level=self.level, dict_data=data)
+                return f"zstd-dict:{dict_id}", compressor.compress(raw)
+            return "zstd", zstandard.ZstdCompressor(level=self.level).compress(raw)
+        if self.codec == "zlib":
+            return "zlib", zlib.compress(raw, self.level)
+        return "raw", raw
+
+    def decode(self, codec: str, data: bytes, load_dictionary: Callable[[int], bytes] | None = None) -> str:
+        if codec == "raw":
+            return bytes(data).decode("utf-8")
+        if codec == "zlib":
+            return zlib.decompress(data).decode("utf-8")
+        if zstandard is None:
+            raise RuntimeError(f"trace blob uses {codec} but zstandard is not installed")
+        if codec == "zstd":
+            return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+        dict_id = int(codec.split(":", 1)[1])
+        if dict_id not in self._dictionaries:
+            if load_dictionary is None:
+                raise RuntimeError(f"trace dictionary {dict_id} is not loaded")
+            self._dictionaries[dict_id] = zstandard.ZstdCompressionDict(load_dictionary(dict_id))
+        return zstandard.ZstdDecompressor(dict_data=self._dictionaries[dict_id]).decompress(data).decode("utf-8")
+
+    def use_dictionary(self, dict_id: int, data: bytes) -> None:
+        if zstandard is None or self.codec != "zstd":
+            return
+        compiled = zstandard.ZstdCompressionDict(data)
+        self._dictionaries[dict_id] = compiled
+        self.dictionary = (dict_id, compiled)
+
+    def train_dictionary(self, samples: list[str]) -> bytes | None:
+        if zstandard is None or self.codec != "zstd" or len(samples) < self.dictionary_min_samples:
+            return None
+        return zstandard.train_dictionary(self.dictionary_size_bytes, [sample.encode("utf-8") for sample in samples]).as_bytes()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "codec": self.codec,
+            "zstandard_available": zstandard is not None,
+            "dictionary_id": self.dictionary[0] if self.dictionary else None,
+            "min_blob_bytes": self.min_blob_bytes,
+            "decoded_cache_entries": len(self._decoded),
+        }
+
+    def _split(self, value: Any, blobs: dict[str, str]) -> Any:
+        if isinstance(value, dict):
+            node: Any = {key: self._split(item, blobs) for key, item in value.items()}
+        elif isinstance(value, (list, tuple)):
+            node = [self._split(item, blobs) for item in value]
+        else:
+            return value
+        text = _dump(node)
+        if len(text) < self.min_blob_bytes:
+            return node
+        blob_hash = self._hash(text)
+        blobs[blob_hash] = text
+        return {BLOB_REF: blob_hash}
+
+    def _expand(self, value: Any, texts: dict[str, str]) -> Any:
+        if isinstance(value, dict):
+            if len(value) == 1 and BLOB_REF in value:
+                return self._expand(json.loads(texts[value[BLOB_REF]]), texts)
+            return {key: self._expand(item, texts) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._expand(item, texts) for item in value]
+        return value
+
+    def _refs(self, text: str) -> Iterator[str]:
+        marker = f'{{"{BLOB_REF}":"'
+        start = text.find(marker)
+        while start != -1:
+            begin = start + len(marker)
+            end = text.index('"', begin)
+            yield text[begin:end]
+            start = text.find(marker, end)
+
+    def _cached(self, hashes: list[str], fetch: Callable[[list[str]], dict[str, str]]) -> dict[str, str]:
+        found: dict[str, str] = {}
+        with self._lock:
+            for blob_hash in hashes:
+                text = self._decoded.get(blob_hash)
+                if text is not None:
+                    self._decoded.move_to_end(blob_hash)
+                    found[blob_hash] = text
+        missing = [blob_hash for blob_hash in hashes if blob_hash not in found]
+        if missing:
+            fetched = fetch(missing)
+            absent = set(missing) - set(fetched)
+            if absent:
+                raise KeyError(f"trace blobs missing: {sorted(absent)[:3]}")
+            found.update(fetched)
+            with self._lock:
+                for blob_hash, text in fetched.items():
+                    self._decoded[blob_hash] = text
+                while len(self._decoded) > self.decoded_cache_entries:
+                    self._decoded.popitem(last=False)
+        return found
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()[:40]
+
+
+class LazyTrace(dict):
+    """Trace dict that holds only header fields until a body key is read.
+
+    Reads through the Python mapping API (`[]`, `get`, `in`, iteration, `items`, copies)
+    load the body once; after that it is an ordinary dict.
+    """
+
+    def __init__(self, header: dict[str, Any], loader: Callable[[], dict[str, Any] | None]):
+        super().__init__(header)
+        self._loader: Callable[[], dict[str, Any] | None] | None = loader
+
+    def materialize(self) -> "LazyTrace":
+        loader, self._loader = self._loader, None
+        if loader is not None:
+            body = loader() or {}
+            dict.clear(self)
+            dict.update(self, body)
+        return self
+
+    @property
+    def loaded(self) -> bool:
+        return self._loader is None
+
+    def __getitem__(self, key: Any) -> Any:
+        if self._loader is not None and not dict.__contains__(self, key):
+            self.materialize()
+        return dict.__getitem__(self, key)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        if self._loader is not None and not dict.__contains__(self, key):
+            self.materialize()
+        return dict.get(self, key, default)
+
+    def __contains__(self, key: object) -> bool:
+        if self._loader is not None and not dict.__contains__(self, key):
+            self.materialize()
+        return dict.__contains__(self, key)
+
+    def __iter__(self):
+        return dict.__iter__(self.materialize())
+
+    def __len__(self) -> int:
+        return dict.__len__(self.materialize())
+
+    def __eq__(self, other: object) -> bool:
+        return dict.__eq__(self.materialize(), other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return dict.__repr__(self.materialize())
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        dict.__setitem__(self.materialize(), key, value)
+
+    def __delitem__(self, key: Any) -> None:
+        dict.__delitem__(self.materialize(), key)
+
+    def __reduce__(self):
+        return (dict, (dict(self.items()),))
+
+    def keys(self):
+        return dict.keys(self.materialize())
+
+    def values(self):
+        return dict.values(self.materialize())
+
+    def items(self):
+        return dict.items(self.materialize())
+
+    def copy(self) -> dict[str, Any]:
+        return dict(self.items())
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        return dict.setdefault(self.materialize(), key, default)
+
+    def pop(self, key: Any, *default: Any) -> Any:
+        return dict.pop(self.materialize(), key, *default)
+
+    def popitem(self):
+        return dict.popitem(self.materialize())
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        dict.update(self.materialize(), *args, **kwargs)
+
+    def clear(self) -> None:
+        self._loader = None
+        dict.clear(self)
+
+    def __or__(self, other: Any) -> dict[str, Any]:
+        return {**dict(self.items()), **other}
+
+    def __copy__(self) -> dict[str, Any]:
+        return self.copy()
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> dict[str, Any]:
+        import copy
+
+        return copy.deepcopy(dict(self.items()), memo)
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import atexit
+import itertools
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+log = logging.getLogger("nexus.write_behind")
+
+
+class WriteAck:
+    def __init__(self, bundle_id: int, op_count: int):
+        self.bundle_id = bundle_id
+        self.op_count = op_count
+        self.error: str | None = None
+        self.committed_at: float | None = None
+        self._event = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        return self._event.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._event.wait(timeout)
+
+    def _resolve(self, error: str | None = None) -> None:
+        self.error = error
+        self.committed_at = time.time()
+        self._event.set()
+
+
+class WriteBundle:
+    """Ordered store writes captured during one request; keyed ops keep only their latest write.
+
+    Ops added with `after_commit=True` (file appends and other non-transactional side effects)
+    run once after the bundle's transaction settles, so a retried transaction cannot repeat them.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, session_id: str | None = None):
+        self.bundle_id = next(self._ids)
+        self.session_id = session_id
+        self.reads: dict[str, Any] = {}  # key -> value readers see before the bundle commits (e.g. trace payloads)
+        self._ops: OrderedDict[Any, Callable[[], Any]] = OrderedDict()
+        self._after_commit: list[Callable[[], Any]] = []
+        self._anonymous = itertools.count()
+        self.superseded = 0
+
+    def add(self, op: Callable[[], Any], *, key: str | None = None, after_commit: bool = False) -> None:
+        if after_commit:
+            self._after_commit.append(op)
+            return
+        if key is not None and key in self._ops:
+            self._ops.pop(key)
+            self.superseded += 1
+        self._ops[key if key is not None else ("op", next(self._anonymous))] = op
+
+    def ops(self) -> list[Callable[[], Any]]:
+        return list(self._ops.values())
+
+    def after_commit_ops(self) -> list[Callable[[], Any]]:
+        return list(self._after_commit)
+
+    def __len__(self) -> int:
+        return len(self._ops) + len(self._after_commit)
+
+
+class WriteBehindWriter:
+    """Background writer that commits request bundles in grouped store transactions.
+
+    `submit` blocks once `max_pending_bundles` are queued, which bounds memory and pushes
+    back on request threads when the disk falls behind. Store reads wait on `wait_for()`:
+    a session's reads wait for that session's pending bundles, other reads for every bundle
+    submitted before the read began, whichever thread submitted it; `barrier()` waits for
+    everything queued.
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        *,
+        max_pending_bundles: int = 256,
+        max_batch_bundles: int = 64,
+        barrier_timeout_seconds: float = 5.0,
+    ):
+        self.store = store
+        self.max_batch_bundles = max(int(max_batch_bundles), 1)
+        self.barrier_timeout_seconds = float(barrier_timeout_seconds)
+        self._queue: queue.Queue[tuple[WriteBundle, WriteAck] | None] = queue.Queue(maxsize=max(int(max_pending_bundles), 1))
+        self._pending = 0
+        self._pending_sessions: dict[str | None, int] = {}
+        self._open: dict[int, int] = {}  # bundle_id -> submission sequence, until committed
+        self._submissions = itertools.count(1)
+        self._idle = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+        self.stats = {"bundles": 0, "ops": 0, "superseded_ops": 0, "transactions": 0, "errors": 0}
+        atexit.register(self.close)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def submit(self, bundle: WriteBundle) -> WriteAck:
+        ack = WriteAck(bundle.bundle_id, len(bundle))
+        if not len(bundle):
+            ack._resolve()
+            return ack
+        if self._closed:
+            self._commit([(bundle, ack)])
+            return ack
+        self._ensure_thread()
+        with self._idle:
+            self._pending += 1
+            self._pending_sessions[bundle.session_id] = self._pending_sessions.get(bundle.session_id, 0) + 1
+            self._open[bundle.bundle_id] = next(self._submissions)
+        self._queue.put((bundle, ack))
+        return ack
+
+    def barrier(self, timeout: float | None = None) -> bool:
+        if self._pending == 0 or threading.current_thread() is self._thread:
+            return True
+        deadline = time.monotonic() + (self.barrier_timeout_seconds if timeout is None else timeout)
+        with self._idle:
+            while self._pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    log.warning("write-behind barrier timed out with %s bundles pending", self._pending)
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def wait_for(self, session_id: str | None = None, timeout: float | None = None, *, ack: WriteAck | None = None) -> bool:
+        """Wait until `ack` (if given) and the bundles a read must see are committed.
+
+        With `session_id`, that is every pending bundle of the session; without, every bundle
+        submitted before this call (later submissions do not extend the wait).
+        """
+        if threading.current_thread() is self._thread:
+            return True
+        deadline = time.monotonic() + (self.barrier_timeout_seconds if timeout is None else timeout)
+        if ack is not None and not ack.wait(max(deadline - time.monotonic(), 0.0)):
+            log.warning("write-behind wait timed out on bundle %s", ack.bundle_id)
+            return False
+        with self._idle:
+            mark = max(self._open.values(), default=0)
+            while self._pending_sessions.get(session_id) if session_id is not None else min(self._open.values(), default=mark + 1) <= mark:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    log.warning("write-behind wait timed out on %s", f"session {session_id}" if session_id is not None else f"bundles up to {mark}")
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def flush(self, timeout: float | None = None) -> bool:
+        return self.barrier(timeout)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self.flush(timeout=max(self.barrier_timeout_seconds, 30.0))
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=5.0)
+
+    def summary(self) -> dict[str, Any]:
+        return {"enabled": True, "pending": self._pending, "running": bool(self._thread and self._thread.is_alive()), **self.stats}
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="nexus-write-behind", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            while len(batch) < self.max_batch_bundles:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+            self._commit(batch)
+            with self._idle:
+                self._pending -= len(batch)
+                for bundle, _ in batch:
+                    self._open.pop(bundle.bundle_id, None)
+                    left = self._pending_sessions[bundle.session_id] - 1
+                    if left:
+                        self._pending_sessions[bundle.session_id] = left
+                    else:
+                        del self._pending_sessions[bundle.session_id]
+                self._idle.notify_all()
+
+    def _commit(self, batch: list[tuple[WriteBundle, WriteAck]]) -> None:
+        try:
+            with self.store.batch():
+                for bundle, _ in batch:
+                    for op in bundle.ops():
+                        op()
+            self.stats["transactions"] += 1
+            for bundle, ack in batch:
+                self._record(bundle)
+                self._settle(bundle, ack)
+            return
+        except Exception:
+            if len(batch) == 1:
+                bundle, ack = batch[0]
+                self.stats["errors"] += 1
+                log.exception("write-behind bundle %s failed", bundle.bundle_id)
+                self._settle(bundle, ack, error="commit failed")
+                return
+        # isolate the failing bundle so one bad write does not drop its neighbours
+        for entry in batch:
+            self._commit([entry])
+
+    def _settle(self, bundle: WriteBundle, ack: WriteAck, error: str | None = None) -> None:
+        for op in bundle.after_commit_ops():
+            try:
+                op()
+            except Exception:
+                self.stats["errors"] += 1
+                log.exception("write-behind side effect of bundle %s failed", bundle.bundle_id)
+        ack._resolve(error=error)
+
+    def _record(self, bundle: WriteBundle) -> None:
+        self.stats["bundles"] += 1
+        self.stats["ops"] += len(bundle)
+        self.stats["superseded_ops"] += bundle.superseded
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+from functools import partial
+from typing import Any
+
 from nexus.schemas import Message, ModelRegistration
 
 from ..schemas import CapabilityProfile, SessionContext
@@ -35,6 +39,20 @@ class RegistryModelAdapter(TeacherModelAdapter):
             metadata=session_context.metadata,
         )
 
+    async def agenerate(self, *, session_context: SessionContext, prompt: str, messages: list[Message], executor: Any = None) -> str:
+        agenerate = getattr(self.runtime_backend, "agenerate", None)
+        if agenerate is None:
+            call = partial(self.generate, session_context=session_context, prompt=prompt, messages=messages)
+            return await asyncio.get_running_loop().run_in_executor(executor, call)
+        return await agenerate(
+            prompt=prompt,
+            messages=messages,
+            model_id=self.registration.model_id,
+            expert=session_context.expert,
+            metadata=session_context.metadata,
+            executor=executor,
+        )
+
 
 class RegistrySpecialistAdapter(RegistryModelAdapter, SpecialistModelAdapter):
     adapter_role = "specialist"
@@ -1,14 +1,20 @@
 from __future__ import annotations
 
+from typing import Any
+
 
 class ParallelExecutionAdvisor:
-    def __init__(self, *, max_parallel: int):
+    def __init__(self, *, max_parallel: int, subagents: Any | None = None):
         self.max_parallel = max_parallel
+        self.subagents = subagents
 
     def summary(self) -> dict:
+        subagents = self.subagents.summary() if self.subagents is not None else {}
         return {
             "status_label": "EXPLORATORY / PROTOTYPE",
             "max_parallel": self.max_parallel,
             "supported_modes": ["sequential", "parallel"],
             "restricted_inheritance": True,
+            "dispatch_enabled": bool(subagents.get("dispatch_enabled", False)),
+            "active_run_ids": subagents.get("active_run_ids", []),
         }
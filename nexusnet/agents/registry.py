@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
+from typing import Callable
 
 from ..schemas import AgentCapabilityCard, AgentExecutionRecord, SessionAgentProvenance
 
@@ -48,8 +49,9 @@ def default_agent_capability_cards() -> list[AgentCapabilityCard]:
 
 
 class BrainAgentRegistry:
-    def __init__(self, *, artifacts_dir: Path):
+    def __init__(self, *, artifacts_dir: Path, artifact_writer: Callable[[str, str], str] | None = None):
         self.artifacts_dir = artifacts_dir
+        self.artifact_writer = artifact_writer
         self._cards = {card.agent_id: card for card in default_agent_capability_cards()}
         self._executions: dict[str, list[AgentExecutionRecord]] = {}
 
@@ -97,6 +99,9 @@ class BrainAgentRegistry:
         return SessionAgentProvenance(session_id=session_id, active_agent_id=active_agent, executions=executions)
 
     def _write_artifact(self, record: AgentExecutionRecord) -> None:
+        if self.artifact_writer is not None:
+            self.artifact_writer(f"agents/{record.execution_id}.json", json.dumps(record.model_dump(mode="json"), indent=2))
+            return
         destination = self.artifacts_dir / "agents" / f"{record.execution_id}.json"
         destination.parent.mkdir(parents=True, exist_ok=True)
         destination.write_text(json.dumps(record.model_dump(mode="json"), indent=2), encoding="utf-8")
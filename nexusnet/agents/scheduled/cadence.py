@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+
+def _utc(ts: float) -> datetime:
+    return datetime.fromtimestamp(ts, tz=timezone.utc)
+
+
+def _parse_field(spec: str, low: int, high: int) -> list[int]:
+    values: set[int] = set()
+    for part in spec.split(","):
+        step = 1
+        stepped = "/" in part
+        if stepped:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+        if part in ("*", ""):
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(item) for item in part.split("-", 1))
+        else:
+            start = int(part)
+            end = high if stepped else start  # `5/15` runs from 5 to the top of the range
+        if start < low or end > high or start > end or step <= 0:
+            raise ValueError(f"cron field '{spec}' out of range {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return sorted(values)
+
+
+class Cadence:
+    """When a job fires: a fixed interval or a 5-field cron expression (UTC).
+
+    Accepted forms: integer minutes, ``every-30m`` / ``every-2h`` / ``every-45s``, ``hourly``,
+    ``daily``, ``weekly`` and ``m h dom mon dow`` cron strings.
+    """
+
+    _ALIASES = {"hourly": 3600, "daily": 86400, "weekly": 7 * 86400}
+
+    def __init__(self, spec: Any):
+        self.spec = str(spec)
+        self.interval_s: float | None = None
+        self.cron: tuple | None = None
+        text = self.spec.strip().lower()
+        if isinstance(spec, (int, float)) and not isinstance(spec, bool):
+            self.interval_s = float(spec) * 60
+        elif text in self._ALIASES:
+            self.interval_s = float(self._ALIASES[text])
+        elif text.startswith("every"):
+            amount = text.removeprefix("every").strip(" -_")
+            unit = amount[-1:]
+            scale = {"s": 1, "m": 60, "h": 3600, "d": 86400}.get(unit)
+            if scale is None:
+                raise ValueError(f"unsupported cadence '{spec}'")
+            self.interval_s = float(amount[:-1]) * scale
+        elif len(text.split()) == 5:
+            minute, hour, dom, month, dow = text.split()
+            self.cron = (
+                _parse_field(minute, 0, 59),
+                _parse_field(hour, 0, 23),
+                _parse_field(dom, 1, 31),
+                _parse_field(month, 1, 12),
+                sorted({day % 7 for day in _parse_field(dow, 0, 7)}),
+                dom != "*",
+                dow != "*",
+            )
+        else:
+            raise ValueError(f"unsupported cadence '{spec}'")
+        if self.interval_s is not None and self.interval_s <= 0:
+            raise ValueError(f"cadence '{spec}' must be positive")
+
+    def next_after(self, ts: float) -> float:
+        """First fire time strictly after ``ts`` (epoch seconds)."""
+        if self.interval_s is not None:
+            return ts + self.interval_s
+        minutes, hours, doms, months, dows, dom_set, dow_set = self.cron
+        start = _utc(ts).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        day = start.replace(hour=0, minute=0)
+        for _ in range(366 * 5):
+            cron_dow = (day.weekday() + 1) % 7
+            if dom_set and dow_set:
+                day_ok = day.day in doms or cron_dow in dows
+            else:
+                day_ok = day.day in doms and cron_dow in dows
+            if day.month in months and day_ok:
+                for hour in hours:
+                    for minute in minutes:
+                        candidate = day.replace(hour=hour, minute=minute)
+                        if candidate >= start:
+                            return candidate.timestamp()
+            day += timedelta(days=1)
+        raise ValueError(f"cron '{self.spec}' never fires")
+
+
+def next_run_iso(last_run: str | None, cadence: Any) -> str | None:
+    """Next fire time after an ISO timestamp, or None when either side cannot be parsed."""
+    if not last_run:
+        return None
+    try:
+        anchor = datetime.fromisoformat(str(last_run).replace("Z", "+00:00"))
+        aware = anchor if anchor.tzinfo is not None else anchor.replace(tzinfo=timezone.utc)
+        upcoming = _utc(Cadence(cadence).next_after(aware.timestamp())).astimezone(aware.tzinfo)
+        return (upcoming if anchor.tzinfo is not None else upcoming.replace(tzinfo=None)).isoformat()
+    except (ValueError, TypeError):
+        return None
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
 import json
 from pathlib import Path
 from typing import Any
 
 from .artifacts import ScheduledArtifactStore
+from .cadence import next_run_iso
 from .reports import build_scheduled_report
 
 
@@ -246,19 +246,7 @@ class ScheduledHistoryService:
         return None
 
     def _next_run(self, *, last_run: str | None, cadence: str) -> str | None:
-        if not last_run:
-            return None
-        try:
-            anchor = datetime.fromisoformat(str(last_run).replace("Z", "+00:00"))
-        except ValueError:
-            return None
-        cadence = cadence.lower()
-        if cadence.startswith("every-") and cadence.endswith("m"):
-            minutes = int(cadence.removeprefix("every-").removesuffix("m"))
-            return (anchor + timedelta(minutes=minutes)).isoformat()
-        if cadence == "daily":
-            return (anchor + timedelta(days=1)).isoformat()
-        return None
+        return next_run_iso(last_run, cadence)
 
     def _trend(self, statuses: list[str | None]) -> str:
         normalized = [status for status in statuses if status]
@@ -1,3 +1,4 @@
+from .executor import BrainSubagentRunner, SubagentWorkerPool, WorkerCancelled
 from .service import SubagentExecutionService
 
-__all__ = ["SubagentExecutionService"]
+__all__ = ["BrainSubagentRunner", "SubagentExecutionService", "SubagentWorkerPool", "WorkerCancelled"]
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable
+
+from nexus.async_exec import StepsCancelled
+from nexus.schemas import utcnow
+
+TERMINAL_STATES = {"completed", "failed", "timeout", "cancelled", "skipped"}
+
+
+class WorkerCancelled(RuntimeError):
+    pass
+
+
+def worker_dependencies(workers: list[dict[str, Any]], mode: str) -> dict[str, list[str]]:
+    """Map subagent_id -> upstream ids; sequential mode chains workers in plan order."""
+    ids = [worker["subagent_id"] for worker in workers]
+    by_ordinal = {index: subagent_id for index, subagent_id in enumerate(ids)}
+    dependencies: dict[str, list[str]] = {}
+    for index, worker in enumerate(workers):
+        declared = []
+        for ref in worker.get("depends_on") or []:
+            upstream = by_ordinal.get(ref) if isinstance(ref, int) else ref
+            if upstream in ids and upstream != worker["subagent_id"]:
+                declared.append(upstream)
+        if mode == "sequential" and index:
+            declared.append(ids[index - 1])
+        dependencies[worker["subagent_id"]] = list(dict.fromkeys(declared))
+    _check_acyclic(dependencies)
+    return dependencies
+
+
+def _check_acyclic(dependencies: dict[str, list[str]]) -> None:
+    visiting: set[str] = set()
+    done: set[str] = set()
+
+    def visit(node: str) -> None:
+        if node in done:
+            return
+        if node in visiting:
+            raise ValueError(f"subagent dependency cycle through {node}")
+        visiting.add(node)
+        for upstream in dependencies.get(node, []):
+            visit(upstream)
+        visiting.discard(node)
+        done.add(node)
+
+    for node in dependencies:
+        visit(node)
+
+
+def critical_path_ms(workers: list[dict[str, Any]], dependencies: dict[str, list[str]]) -> float:
+    durations = {worker["subagent_id"]: float(worker.get("duration_ms") or 0.0) for worker in workers}
+    finish: dict[str, float] = {}
+
+    def longest(node: str) -> float:
+        if node not in finish:
+            finish[node] = durations.get(node, 0.0) + max((longest(up) for up in dependencies.get(node, [])), default=0.0)
+        return finish[node]
+
+    return round(max((longest(node) for node in durations), default=0.0), 3)
+
+
+class SubagentWorkerPool:
+    """Runs worker records on a bounded thread pool, respecting `dependencies`.
+
+    A worker starts once all of its upstream workers completed; if any upstream ended in
+    another terminal state it is skipped. Timeouts and cancellation are cooperative: the
+    worker's `cancel` event is set and its record is finalised immediately, and any late
+    result from the thread is discarded. An abandoned thread keeps its pool slot until it
+    returns, and a worker's timeout, `started_at` and `duration_ms` count from the moment its
+    thread picks it up, not from submission. `lock`, when given, is held while records change.
+    """
+
+    def __init__(self, *, max_parallel: int, default_timeout_seconds: float | None = None):
+        self.max_parallel = max(int(max_parallel), 1)
+        self.default_timeout_seconds = default_timeout_seconds
+
+    def run(
+        self,
+        workers: list[dict[str, Any]],
+        dependencies: dict[str, list[str]],
+        runner: Callable[..., dict[str, Any]],
+        *,
+        cancel: threading.Event | None = None,
+        on_update: Callable[[dict[str, Any]], None] | None = None,
+        lock: Any = None,
+    ) -> None:
+        cancel = cancel or threading.Event()
+        lock = lock if lock is not None else threading.Lock()
+        by_id = {worker["subagent_id"]: worker for worker in workers}
+        events = {subagent_id: threading.Event() for subagent_id in by_id}
+        running: dict[Future, str] = {}
+        abandoned: set[Future] = set()
+        begun: dict[str, tuple[float, str]] = {}  # subagent_id -> (monotonic start, iso start), set by the worker thread
+        executor = ThreadPoolExecutor(max_workers=self.max_parallel, thread_name_prefix="subagent")
+
+        def timeout_of(subagent_id: str) -> float | None:
+            return by_id[subagent_id].get("timeout_seconds", self.default_timeout_seconds)
+
+        def launch(subagent_id: str, worker: dict[str, Any], upstream: dict[str, Any]) -> dict[str, Any]:
+            begun[subagent_id] = (time.monotonic(), utcnow().isoformat())
+            with lock:
+                by_id[subagent_id]["started_at"] = begun[subagent_id][1]
+            if events[subagent_id].is_set():
+                raise WorkerCancelled("cancelled before start")
+            return runner(worker, upstream=upstream, cancel=events[subagent_id])
+
+        def finish(subagent_id: str, status: str, **fields: Any) -> None:
+            worker = by_id[subagent_id]
+            with lock:
+                worker.update(fields)
+                worker["status"] = status
+                worker["completed_at"] = utcnow().isoformat()
+                if subagent_id in begun:
+                    worker["duration_ms"] = round((time.monotonic() - begun[subagent_id][0]) * 1000.0, 3)
+            if on_update is not None:
+                on_update(worker)
+
+        try:
+            while True:
+                abandoned = {future for future in abandoned if not future.done()}
+                for subagent_id, worker in by_id.items():
+                    if worker["status"] != "pending":
+                        continue
+                    upstream = [by_id[up]["status"] for up in dependencies.get(subagent_id, [])]
+                    if cancel.is_set():
+                        finish(subagent_id, "cancelled", error="run cancelled")
+                    elif any(state in TERMINAL_STATES - {"completed"} for state in upstream):
+                        finish(subagent_id, "skipped", error="upstream worker did not complete")
+                    elif all(state == "completed" for state in upstream) and len(running) + len(abandoned) < self.max_parallel:
+                        with lock:
+                            worker["status"] = "running"
+                        upstream_results = {up: by_id[up].get("output") for up in dependencies.get(subagent_id, [])}
+                        running[executor.submit(launch, subagent_id, dict(worker), upstream_results)] = subagent_id
+                        if on_update is not None:
+                            on_update(worker)
+                if not running:
+                    if all(worker["status"] in TERMINAL_STATES for worker in by_id.values()):
+                        return
+                    if abandoned:  # every slot is held by a thread that outlived its worker
+                        wait(list(abandoned), timeout=0.25, return_when=FIRST_COMPLETED)
+                    continue
+                now = time.monotonic()
+                deadlines = {
+                    sid: begun[sid][0] + float(timeout_of(sid))
+                    for sid in running.values()
+                    if sid in begun and timeout_of(sid)
+                }
+                wait_for = min((deadline - now for deadline in deadlines.values()), default=0.25)
+                done, _ = wait(list(running), timeout=max(min(wait_for, 0.25), 0.0), return_when=FIRST_COMPLETED)
+                for future in done:
+                    subagent_id = running.pop(future)
+                    error = future.exception()
+                    if isinstance(error, WorkerCancelled):
+                        finish(subagent_id, "cancelled", error=str(error) or "cancelled")
+                    elif error is not None:
+                        finish(subagent_id, "failed", error=f"{type(error).__name__}: {error}")
+                    else:
+                        finish(subagent_id, "completed", **(future.result() or {}))
+                now = time.monotonic()
+                for future, subagent_id in list(running.items()):
+                    expired = subagent_id in deadlines and now >= deadlines[subagent_id]
+                    if expired or cancel.is_set():
+                        events[subagent_id].set()
+                        running.pop(future)
+                        if not future.cancel():
+                            abandoned.add(future)
+                        if expired:
+                            finish(subagent_id, "timeout", error=f"exceeded {timeout_of(subagent_id)}s")
+                        else:
+                            finish(subagent_id, "cancelled", error="run cancelled")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class BrainSubagentRunner:
+    """Runs one worker: its permitted tool calls, then a NexusBrain.generate call on its task."""
+
+    def __init__(self, *, brain: Any, tool_handlers: dict[str, Callable[..., Any]] | None = None, model_hint: str | None = None):
+        self.brain = brain
+        self.tool_handlers = dict(tool_handlers or {})
+        self.model_hint = model_hint
+
+    def __call__(self, worker: dict[str, Any], *, upstream: dict[str, Any], cancel: threading.Event) -> dict[str, Any]:
+        from nexusnet.schemas import SessionContext
+
+        tool_results = []
+        for call in worker.get("tool_calls") or []:
+            if cancel.is_set():
+                raise WorkerCancelled("cancelled before tool call")
+            name = call.get("tool") or call.get("tool_name")
+            if name not in worker.get("allowed_tools", []) or name not in self.tool_handlers:
+                tool_results.append({"tool": name, "status": "denied"})
+                continue
+            tool_results.append({"tool": name, "status": "ok", "result": self.tool_handlers[name](**(call.get("arguments") or {}))})
+        if cancel.is_set():
+            raise WorkerCancelled("cancelled before generation")
+        sections = [f"Parent task: {worker.get('parent_task') or ''}", f"Your task: {worker.get('task') or ''}"]
+        sections.extend(f"Result from {subagent_id}: {output}" for subagent_id, output in upstream.items() if output)
+        sections.extend(f"Tool {item['tool']} returned: {item['result']}" for item in tool_results if item["status"] == "ok")
+        try:
+            result = self.brain.generate(
+                session_context=SessionContext(
+                    session_id=worker.get("session_id") or f"subagents::{worker.get('run_id')}",
+                    task_type="subagent",
+                    use_retrieval=bool(worker.get("use_retrieval", False)),
+                    metadata={"subagent_id": worker["subagent_id"], "run_id": worker.get("run_id")},
+                ),
+                prompt="\n\n".join(sections),
+                model_hint=worker.get("model_hint") or self.model_hint,
+                cancel=cancel,
+            )
+        except StepsCancelled as exc:
+            raise WorkerCancelled(str(exc)) from exc
+        return {
+            "output": result.output,
+            "trace_id": result.trace_id,
+            "model_id": result.model_id,
+            "runtime_name": result.runtime_name,
+            "tool_results": tool_results,
+        }
@@ -1,17 +1,35 @@
 from __future__ import annotations
 
+import copy
 import json
+import threading
+import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from nexus.schemas import new_id, utcnow
 
+from .executor import SubagentWorkerPool, critical_path_ms, worker_dependencies
+
 
 class SubagentExecutionService:
-    def __init__(self, *, artifacts_dir: Path, runtime_configs: dict[str, Any]):
+    def __init__(
+        self,
+        *,
+        artifacts_dir: Path,
+        runtime_configs: dict[str, Any],
+        runner: Callable[..., dict[str, Any]] | None = None,
+    ):
         self.artifacts_dir = artifacts_dir
         self.config = ((runtime_configs.get("goose_lane") or {}).get("subagents") or {})
+        self.runner = runner
+        self.pool = SubagentWorkerPool(
+            max_parallel=int(self.config.get("max_parallel", 1)),
+            default_timeout_seconds=self.config.get("worker_timeout_seconds"),
+        )
         self._runs: list[dict[str, Any]] = []
+        self._cancel_events: dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
 
     def execute(
         self,
@@ -30,6 +48,9 @@ class SubagentExecutionService:
         approval_fallback_chain: list[dict[str, Any]] | None = None,
         adversary_review_report_ids: list[str] | None = None,
         linked_report_ids: list[str] | None = None,
+        dispatch: bool | None = None,
+        wait: bool = True,
+        session_id: str | None = None,
     ) -> dict[str, Any]:
         inherited_tools = list(inherited_tools or [])
         inherited_extensions = list(inherited_extensions or [])
@@ -69,22 +90,104 @@ class SubagentExecutionService:
                     "requested_policy_set_ids": worker.get("requested_policy_set_ids", []),
                     "requested_bundle_families": worker.get("requested_bundle_families", []),
                     "tool_calls": worker.get("tool_calls", []),
+                    "depends_on": list(worker.get("depends_on") or []),
+                    "timeout_seconds": worker.get("timeout_seconds"),
                     "result_summary": worker.get("result_summary") or "bounded-worker-plan",
+                    "status": "planned",
                 }
             )
         artifact = self.artifacts_dir / "agents" / "subagents" / f"{run['run_id']}.json"
         artifact.parent.mkdir(parents=True, exist_ok=True)
-        artifact.write_text(json.dumps(run, indent=2), encoding="utf-8")
         run["artifact_path"] = str(artifact)
-        self._runs.insert(0, run)
-        self._runs = self._runs[:20]
-        return run
+        if dispatch is None:
+            dispatch = bool(self.config.get("dispatch", False))
+        if dispatch and self.runner is not None and run["workers"]:
+            try:
+                self._dispatch(run, session_id=session_id, wait=wait)
+            except ValueError as exc:  # a dependency cycle: nothing was started
+                run["execution_state"] = "failed"
+                run["error"] = str(exc)
+                self._write(run)
+        else:
+            self._write(run)
+        with self._lock:
+            self._runs.insert(0, run)
+            self._runs = self._runs[:20]
+            # a background run keeps mutating `run`; callers get a snapshot, as from get_run
+            return copy.deepcopy(run)
+
+    def get_run(self, run_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            return copy.deepcopy(next((run for run in self._runs if run["run_id"] == run_id), None))
+
+    def annotate(self, run_id: str, fields: dict[str, Any]) -> None:
+        """Merge caller-side context into a run, live or finished, and rewrite its artifact."""
+        with self._lock:
+            run = next((run for run in self._runs if run["run_id"] == run_id), None)
+            if run is not None:
+                run.update(copy.deepcopy(fields))
+                self._write(run)
+
+    def cancel(self, run_id: str) -> bool:
+        event = self._cancel_events.get(run_id)
+        if event is None:
+            return False
+        event.set()
+        return True
+
+    def _dispatch(self, run: dict[str, Any], *, session_id: str | None, wait: bool) -> None:
+        dependencies = worker_dependencies(run["workers"], run["mode"])
+        for worker in run["workers"]:
+            worker["status"] = "pending"
+            worker["depends_on"] = dependencies[worker["subagent_id"]]
+            worker["run_id"] = run["run_id"]
+            worker["parent_task"] = run["parent_task"]
+            if session_id:
+                worker["session_id"] = session_id
+        run["execution_state"] = "running"
+        run["max_parallel"] = self.pool.max_parallel
+        run["events"] = []
+        cancel = self._cancel_events.setdefault(run["run_id"], threading.Event())
+        self._write(run)
+
+        def on_update(worker: dict[str, Any]) -> None:
+            with self._lock:
+                run["events"].append(
+                    {"subagent_id": worker["subagent_id"], "status": worker["status"], "at": utcnow().isoformat()}
+                )
+                self._write(run)
+
+        def execute() -> None:
+            started = time.perf_counter()
+            try:
+                self.pool.run(run["workers"], dependencies, self.runner, cancel=cancel, on_update=on_update, lock=self._lock)
+            finally:
+                with self._lock:
+                    states = {worker["status"] for worker in run["workers"]}
+                    run["execution_state"] = "completed" if states == {"completed"} else ("cancelled" if cancel.is_set() else "partial")
+                    run["wall_ms"] = round((time.perf_counter() - started) * 1000.0, 3)
+                    run["critical_path_ms"] = critical_path_ms(run["workers"], dependencies)
+                    run["completed_at"] = utcnow().isoformat()
+                    self._cancel_events.pop(run["run_id"], None)
+                    self._write(run)
+
+        if wait:
+            execute()
+        else:
+            threading.Thread(target=execute, name=f"subagents-{run['run_id']}", daemon=True).start()
+
+    def _write(self, run: dict[str, Any]) -> None:
+        Path(run["artifact_path"]).write_text(json.dumps(run, indent=2, default=str), encoding="utf-8")
 
     def summary(self) -> dict[str, Any]:
+        with self._lock:
+            recent = copy.deepcopy(self._runs[:5])
         return {
             "status_label": "EXPLORATORY / PROTOTYPE",
             "recent_run_count": len(self._runs),
-            "latest_run": self._runs[0] if self._runs else None,
-            "recent_runs": self._runs[:5],
+            "latest_run": recent[0] if recent else None,
+            "recent_runs": recent,
             "max_parallel": int(self.config.get("max_parallel", 1)),
+            "dispatch_enabled": self.runner is not None,
+            "active_run_ids": sorted(self._cancel_events),
         }
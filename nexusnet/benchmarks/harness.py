@@ -16,7 +16,15 @@ class BenchmarkHarness:
         self.memory = memory
         self._artifact_writer = artifact_writer
 
-    def run(self, *, suite_name: str, brain, cases: list[BenchmarkCase], model_hint: str | None = None) -> BenchmarkRun:
+    def run(
+        self,
+        *,
+        suite_name: str,
+        brain,
+        cases: list[BenchmarkCase],
+        model_hint: str | None = None,
+        cache_mode: str | None = None,
+    ) -> BenchmarkRun:
         results: list[BenchmarkCaseResult] = []
         run_model_id = "unknown"
         run_runtime = "unknown"
@@ -27,7 +35,11 @@ class BenchmarkHarness:
                 expert=case.expert,
                 task_type="benchmark",
                 use_retrieval=case.use_retrieval,
-                metadata={"benchmark_suite": suite_name, **case.metadata},
+                metadata={
+                    "benchmark_suite": suite_name,
+                    **({"generation_cache": cache_mode} if cache_mode else {}),
+                    **case.metadata,
+                },
             )
             generated = brain.generate(session_context=session, prompt=case.prompt, model_hint=case.model_hint or model_hint)
             run_model_id = generated.model_id
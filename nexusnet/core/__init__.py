@@ -1,12 +1,14 @@
 from .brain import NexusBrain
 from .evidence_feeds import CoreEvidenceBridge
 from .execution_policy import CoreExecutionPolicyEngine
+from .generation_cache import GenerationCache
 from .model_ingestion import ModelIngestionService
 from .native_execution import NativeExecutionPlanner
 
 __all__ = [
     "CoreEvidenceBridge",
     "CoreExecutionPolicyEngine",
+    "GenerationCache",
     "ModelIngestionService",
     "NativeExecutionPlanner",
     "NexusBrain",
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import platform
+import threading
 import time
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Generator
 
+from nexus.async_exec import RuntimeCall, drive
 from nexus.config import NexusPaths
 from nexus.critique import CritiqueEngine
 from nexus.memory import MemoryService
@@ -23,6 +25,7 @@ from ..schemas import BrainGenerateResult, BrainGenerateRequest, InferenceTrace,
 from ..telemetry import BrainTelemetryLogger
 from .execution_policy import CoreExecutionPolicyEngine
 from .execution_trace import CoreExecutionTraceRecorder, build_lineage_tags, persist_core_execution_artifact
+from .generation_cache import SAMPLING_KEYS, GenerationCache, context_hash
 from .model_ingestion import ModelIngestionService
 from .native_execution import NativeExecutionPlanner
 
@@ -50,6 +53,7 @@ class NexusBrain:
         execution_policy_engine: CoreExecutionPolicyEngine | None = None,
         native_execution_planner: NativeExecutionPlanner | None = None,
         internal_expert_execution: InternalExpertExecutionService | None = None,
+        generation_cache: GenerationCache | None = None,
     ):
         self.paths = paths
         self.store = store
@@ -66,6 +70,7 @@ class NexusBrain:
         self.execution_policy_engine = execution_policy_engine or CoreExecutionPolicyEngine()
         self.native_execution_planner = native_execution_planner or NativeExecutionPlanner()
         self.internal_expert_execution = internal_expert_execution or InternalExpertExecutionService()
+        self.generation_cache = generation_cache or GenerationCache()
         self.telemetry = BrainTelemetryLogger(paths)
         self.adapters: dict[str, BaseModelAdapter] = {}
         self.attachment_records: dict[str, dict] = {}
@@ -184,6 +189,7 @@ class NexusBrain:
             "native_execution_preview": native_execution_preview,
             "promotion_linkage_preview": promotion_linkage_preview,
             "lifecycle_trace": self.lifecycle_trace.snapshot(),
+            "generation_cache": self.generation_cache.stats(),
             "traceability": {
                 "trace_detail_template": "/ops/traces/{trace_id}",
                 "core_summary_ref": "/ops/brain/core",
@@ -206,7 +212,40 @@ class NexusBrain:
         runtime_override: str | None = None,
         fallback_chain: list[str] | None = None,
         runtime_selection: dict | None = None,
+        cancel: threading.Event | None = None,
     ) -> BrainGenerateResult:
+        # trace, memory, critique and log writes land in one bundle committed off the request thread
+        with self.store.write_behind_scope(session_context.session_id):
+            return drive(
+                self.generate_steps(
+                    session_context=session_context,
+                    prompt=prompt,
+                    messages=messages,
+                    model_hint=model_hint,
+                    success_conditions=success_conditions,
+                    runtime_override=runtime_override,
+                    fallback_chain=fallback_chain,
+                    runtime_selection=runtime_selection,
+                ),
+                cancel=cancel,
+            )
+
+    def generate_steps(self, **kwargs: Any) -> Generator[RuntimeCall, Any, BrainGenerateResult]:
+        """`generate` as a step generator yielding each model call; see `nexus.async_exec`."""
+        return self._generate(**kwargs)
+
+    def _generate(
+        self,
+        *,
+        session_context: SessionContext,
+        prompt: str | None = None,
+        messages: list[Message] | None = None,
+        model_hint: str | None = None,
+        success_conditions: list[str] | None = None,
+        runtime_override: str | None = None,
+        fallback_chain: list[str] | None = None,
+        runtime_selection: dict | None = None,
+    ) -> Generator[RuntimeCall, Any, BrainGenerateResult]:
         if self._wake_state is None:
             self.wake()
         request = BrainGenerateRequest(
@@ -381,8 +420,23 @@ class NexusBrain:
         execution_prompt, compression = self.memory.compress_prompt(
             enriched_prompt,
             target_tokens=session_context.compression_target_tokens,
+            model_id=registration.model_id,
+            query=raw_prompt,
         )
 
+        cache_mode = self.generation_cache.resolve_mode(task_type=session_context.task_type, metadata=session_context.metadata)
+        cache_context = {
+            "mode": cache_mode,
+            "prompt": "\n".join([raw_prompt, *(f"{message.role}: {message.content}" for message in request.messages)]),
+            "context": context_hash(
+                retrieval_hits=retrieval_hits,
+                recent_memory=recent_memory,
+                extra={"expert": session_context.expert, "task_type": session_context.task_type},
+            ),
+            "sampling": {key: session_context.metadata[key] for key in SAMPLING_KEYS if key in session_context.metadata},
+        }
+        cache_telemetry: dict[str, Any] = {"mode": cache_mode, "hit": False, "tier": None}
+
         started_at = _utcnow()
         start_time = time.perf_counter()
         status = "ok"
@@ -431,7 +485,10 @@ class NexusBrain:
                         "fallback_candidate": runtime_name != (runtime_override or registration.runtime_name),
                     },
                 )
-                output = adapter.generate(
+                output, cache_telemetry = yield from self._generate_with_cache(
+                    adapter,
+                    runtime_name=runtime_name,
+                    cache_context=cache_context,
                     session_context=session_context,
                     prompt=execution_prompt,
                     messages=request.messages or [Message(role="user", content=raw_prompt)],
@@ -462,7 +519,10 @@ class NexusBrain:
                     "fallback": True,
                 },
             )
-            output = adapter.generate(
+            output, cache_telemetry = yield from self._generate_with_cache(
+                adapter,
+                runtime_name="mock",
+                cache_context=cache_context,
                 session_context=session_context,
                 prompt=execution_prompt,
                 messages=request.messages or [Message(role="user", content=raw_prompt)],
@@ -523,6 +583,7 @@ class NexusBrain:
                 },
                 "attempted_runtimes": attempted_runtimes,
                 "fallback_used": fallback_used,
+                "generation_cache": cache_telemetry,
                 "retrieval_policy": retrieval_policy_decision["policy_mode"],
                 "retrieval_effective_policy": retrieval_policy_decision.get("effective_policy_mode"),
                 "graph_store_health": retrieval_policy_decision["graph_store_health"],
@@ -633,7 +694,7 @@ class NexusBrain:
             },
             trace.started_at.isoformat(),
         )
-        trace.log_path = self.telemetry.log_inference(trace.model_dump(mode="json"))
+        trace.log_path = self.telemetry.log_inference(trace.model_dump(mode="json"), defer=self.store.defer)
         citations = [
             {"doc_id": hit.doc_id, "chunk_id": hit.chunk_id, "source": hit.source, "score": hit.score}
             for hit in retrieval_hits
@@ -685,8 +746,8 @@ class NexusBrain:
             ],
         )
 
-    def run_benchmark(self, *, suite_name: str, cases, model_hint: str | None = None):
-        return self.benchmarks.run(suite_name=suite_name, brain=self, cases=cases, model_hint=model_hint)
+    def run_benchmark(self, *, suite_name: str, cases, model_hint: str | None = None, cache_mode: str | None = None):
+        return self.benchmarks.run(suite_name=suite_name, brain=self, cases=cases, model_hint=model_hint, cache_mode=cache_mode)
 
     def _build_prompt(
         self,
@@ -842,6 +903,56 @@ class NexusBrain:
         )
         return adapter, attachment_record
 
+    def _generate_with_cache(
+        self,
+        adapter: BaseModelAdapter,
+        *,
+        runtime_name: str,
+        cache_context: dict[str, Any],
+        session_context: SessionContext,
+        prompt: str,
+        messages: list[Message],
+    ) -> Generator[RuntimeCall, Any, tuple[str, dict[str, Any]]]:
+        mode = cache_context["mode"]
+        telemetry: dict[str, Any] = {"mode": mode, "hit": False, "tier": None}
+        if mode == "bypass":
+            self.generation_cache.note_bypass()
+            output = yield RuntimeCall(adapter, session_context, prompt, messages)
+            return output, telemetry
+        key = self.generation_cache.key(
+            model_id=adapter.model_id,
+            runtime_name=runtime_name,
+            prompt=cache_context["prompt"],
+            context=cache_context["context"],
+            sampling=cache_context["sampling"],
+        )
+        telemetry["key"] = key[:16]
+        if mode == "reuse":
+            cached, tier = self.generation_cache.get(key)
+            if cached is not None:
+                telemetry.update(
+                    hit=True,
+                    tier=tier,
+                    age_seconds=round(self.generation_cache.clock() - float(cached["cached_at"]), 3),
+                    saved_latency_ms=cached.get("latency_ms"),
+                    source_trace_id=cached.get("trace_id"),
+                )
+                return str(cached["output"]), telemetry
+        start_time = time.perf_counter()
+        output = yield RuntimeCall(adapter, session_context, prompt, messages)
+        self.generation_cache.put(
+            key,
+            {
+                "output": output,
+                "model_id": adapter.model_id,
+                "runtime_name": runtime_name,
+                "latency_ms": int((time.perf_counter() - start_time) * 1000),
+                "trace_id": session_context.trace_id,
+            },
+        )
+        telemetry["stored"] = True
+        return output, telemetry
+
     def _planned_runtimes(self, registration_runtime: str, *, runtime_override: str | None, fallback_chain: list[str] | None) -> list[str]:
         planned = [runtime_override or registration_runtime, *(fallback_chain or []), registration_runtime, "mock"]
         ordered: list[str] = []
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Iterable
+
+CACHE_MODES = {"reuse", "bypass", "refresh"}
+SAMPLING_KEYS = ("temperature", "top_p", "top_k", "max_tokens", "max_new_tokens", "seed", "stop", "repetition_penalty")
+
+
+def normalize_prompt(text: str) -> str:
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+def context_hash(*, retrieval_hits: Iterable[Any] = (), recent_memory: Iterable[Any] = (), extra: dict[str, Any] | None = None) -> str:
+    digest = hashlib.sha256()
+    for hit in retrieval_hits:
+        digest.update(f"hit|{hit.chunk_id}|{hashlib.sha256(hit.content.encode('utf-8')).hexdigest()}\n".encode("utf-8"))
+    for message in recent_memory:
+        digest.update(f"mem|{message.role}|{message.content}\n".encode("utf-8"))
+    digest.update(json.dumps(extra or {}, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class GenerationCache:
+    """Two-tier (in-process LRU, then SQLite) cache of brain generations with TTL expiry."""
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = False,
+        max_entries: int = 512,
+        ttl_seconds: float = 3600.0,
+        db_path: str | Path | None = None,
+        max_disk_entries: int = 20_000,
+        task_modes: dict[str, str] | None = None,
+        clock=time.time,
+    ):
+        self.enabled = bool(enabled)
+        self.max_entries = max(int(max_entries), 1)
+        self.ttl_seconds = float(ttl_seconds)
+        self.db_path = Path(db_path) if db_path else None
+        self.max_disk_entries = max(int(max_disk_entries), 1)
+        self.task_modes = {key: value for key, value in (task_modes or {}).items() if value in CACHE_MODES}
+        self.clock = clock
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_ready = False
+        self._counters = {"hits": 0, "memory_hits": 0, "sqlite_hits": 0, "misses": 0, "writes": 0, "bypassed": 0, "expired": 0}
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any] | None, *, state_dir: Path) -> "GenerationCache":
+        config = config or {}
+        sqlite_path = config.get("sqlite_path")
+        if sqlite_path is None and config.get("sqlite", True):
+            sqlite_path = state_dir / "generation_cache.sqlite"
+        return cls(
+            enabled=bool(config.get("enabled", False)),
+            max_entries=int(config.get("max_entries", 512)),
+            ttl_seconds=float(config.get("ttl_seconds", 3600)),
+            db_path=sqlite_path or None,
+            max_disk_entries=int(config.get("max_disk_entries", 20_000)),
+            task_modes=config.get("task_modes") or {},
+        )
+
+    def resolve_mode(self, *, task_type: str, metadata: dict[str, Any]) -> str:
+        requested = metadata.get("generation_cache")
+        if requested in CACHE_MODES:
+            return str(requested)
+        if task_type in self.task_modes:
+            return self.task_modes[task_type]
+        return "reuse" if self.enabled else "bypass"
+
+    def key(
+        self,
+        *,
+        model_id: str,
+        runtime_name: str,
+        prompt: str,
+        context: str,
+        sampling: dict[str, Any],
+    ) -> str:
+        payload = json.dumps(
+            [model_id, runtime_name, normalize_prompt(prompt), context, sampling],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> tuple[dict[str, Any] | None, str | None]:
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._expired(entry, now):
+                    self._entries.pop(key, None)
+                    self._counters["expired"] += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    self._counters["memory_hits"] += 1
+                    return dict(entry), "memory"
+        entry = self._disk_get(key, now)
+        with self._lock:
+            if entry is None:
+                self._counters["misses"] += 1
+                return None, None
+            self._remember(key, entry)
+            self._counters["hits"] += 1
+            self._counters["sqlite_hits"] += 1
+        return dict(entry), "sqlite"
+
+    def put(self, key: str, payload: dict[str, Any]) -> None:
+        entry = {**payload, "cached_at": self.clock()}
+        with self._lock:
+            self._remember(key, entry)
+            self._counters["writes"] += 1
+        self._disk_put(key, entry)
+
+    def note_bypass(self) -> None:
+        with self._lock:
+            self._counters["bypassed"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self._connect_disk():
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("delete from generation_cache")
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "sqlite_path": str(self.db_path) if self.db_path else None,
+                "hit_rate": round(self._counters["hits"] / lookups, 4) if lookups else 0.0,
+                **self._counters,
+            }
+
+    def _expired(self, entry: dict[str, Any], now: float) -> bool:
+        return self.ttl_seconds > 0 and now - float(entry.get("cached_at", 0.0)) > self.ttl_seconds
+
+    def _remember(self, key: str, entry: dict[str, Any]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _connect_disk(self) -> bool:
+        if self.db_path is None:
+            return False
+        if not self._db_ready:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute(
+                    """
+                    create table if not exists generation_cache (
+                        cache_key text primary key,
+                        payload_json text not null,
+                        cached_at real not null
+                    )
+                    """
+                )
+                conn.execute("create index if not exists generation_cache_age on generation_cache(cached_at)")
+            self._db_ready = True
+        return True
+
+    def _disk_get(self, key: str, now: float) -> dict[str, Any] | None:
+        if not self._connect_disk():
+            return None
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute("select payload_json, cached_at from generation_cache where cache_key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            entry = {**json.loads(row[0]), "cached_at": row[1]}
+            if self._expired(entry, now):
+                conn.execute("delete from generation_cache where cache_key = ?", (key,))
+                with self._lock:
+                    self._counters["expired"] += 1
+                return None
+        return entry
+
+    def _disk_put(self, key: str, entry: dict[str, Any]) -> None:
+        if not self._connect_disk():
+            return
+        payload = {name: value for name, value in entry.items() if name != "cached_at"}
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "insert or replace into generation_cache(cache_key, payload_json, cached_at) values (?, ?, ?)",
+                (key, json.dumps(payload, default=str), entry["cached_at"]),
+            )
+            if self.ttl_seconds > 0:
+                conn.execute("delete from generation_cache where cached_at < ?", (entry["cached_at"] - self.ttl_seconds,))
+            conn.execute(
+                """
+                delete from generation_cache where cache_key in (
+                    select cache_key from generation_cache order by cached_at desc limit -1 offset ?
+                )
+                """,
+                (self.max_disk_entries,),
+            )
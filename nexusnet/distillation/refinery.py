@@ -4,6 +4,7 @@ import json
 from pathlib import Path
 
 from nexus.experiments import ExperimentService
+from nexus.neardup import dedup
 from nexus.foundry import DatasetRefinery
 from nexus.schemas import ExperimentRecord
 from nexus.storage import NexusStore
@@ -102,6 +103,11 @@ class DistillationDatasetBuilder:
                 )
                 source_kinds.add("curriculum")
 
+        duplicates_dropped = 0
+        if request.dedup_threshold:
+            samples, dropped = dedup(samples, text=lambda sample: sample["input"], threshold=request.dedup_threshold)
+            duplicates_dropped = len(dropped)
+
         teacher_evidence = aggregate_teacher_evidence(
             traces=teacher_traces,
             curriculum_records=curriculum_records_for_evidence,
@@ -184,6 +190,8 @@ class DistillationDatasetBuilder:
                 "trace_limit": request.trace_limit,
                 "include_dreams": request.include_dreams,
                 "include_curriculum": request.include_curriculum,
+                "dedup_threshold": request.dedup_threshold,
+                "duplicates_dropped": duplicates_dropped,
                 "teacher_evidence": teacher_evidence,
             },
         )
@@ -211,6 +219,7 @@ class DistillationDatasetBuilder:
                 "include_dreams": request.include_dreams,
                 "include_curriculum": request.include_curriculum,
                 "source_kinds": sorted(source_kinds),
+                "duplicates_dropped": duplicates_dropped,
                 "lineage": lineage,
                 "lineage_artifact_id": lineage_record.artifact_id if lineage_record else None,
                 "teacher_evidence": teacher_evidence,
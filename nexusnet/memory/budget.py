@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass, field
+
+from core.engines.token_counters import count_segment_tokens, count_tokens, truncate_tokens
+
+_WORD = re.compile(r"[a-z0-9_]+")
+_BULLET = re.compile(r"^-\s*(\([^)]*\)\s*|\w+:\s*)?")
+_SECTION_KIND = {"memory:": "memory", "retrieved context:": "retrieval"}
+_PRIOR = {"system": 2.0, "retrieval": 1.0, "memory": 0.8}
+
+
+@dataclass
+class Segment:
+    kind: str
+    text: str
+    order: int
+    header: str | None = None
+    score: float = 0.0
+    tokens: int = 0
+
+
+@dataclass
+class PackResult:
+    text: str
+    tokens_before: int
+    tokens_after: int
+    kept: list[Segment] = field(default_factory=list)
+    dropped: list[Segment] = field(default_factory=list)
+    duplicates: int = 0
+
+
+def split_prompt(prompt: str) -> tuple[list[Segment], Segment | None]:
+    """Split a wrapper prompt into its section bullets and the trailing `User request:` block."""
+    segments: list[Segment] = []
+    header: str | None = None
+    kind = "system"
+    request: Segment | None = None
+    for order, raw in enumerate(prompt.splitlines()):
+        line = raw.rstrip()
+        if not line.strip():
+            continue
+        if request is not None:
+            request.text += "\n" + line
+            continue
+        if line.lower().startswith("user request:"):
+            request = Segment(kind="request", text=line, order=order)
+        elif not line.startswith("- ") and line.endswith(":"):
+            header, kind = line, _SECTION_KIND.get(line.strip().lower(), "system")
+        else:
+            segments.append(Segment(kind=kind, text=line, order=order, header=header))
+    return segments, request
+
+
+def _terms(text: str) -> set[str]:
+    return set(_WORD.findall(text.lower()))
+
+
+def _content_key(text: str) -> str:
+    return " ".join(_WORD.findall(_BULLET.sub("", text.strip()).lower()))
+
+
+def _rank(segments: list[Segment], query: str) -> None:
+    wanted = _terms(query)
+    memory = [s for s in segments if s.kind == "memory"]
+    for s in segments:
+        terms = _terms(s.text)
+        overlap = len(wanted & terms) / math.sqrt(len(terms) + 1) if wanted and terms else 0.0
+        s.score = _PRIOR.get(s.kind, 1.0) + overlap
+    for position, s in enumerate(memory):
+        s.score += 0.3 * (position + 1) / len(memory)  # later turns matter more
+
+
+def _dedupe(segments: list[Segment]) -> tuple[list[Segment], int]:
+    kept: list[Segment] = []
+    keys: list[str] = []
+    for s in sorted(segments, key=lambda s: -s.score):
+        key = _content_key(s.text)
+        if key and any(key == k or (len(key) >= 24 and key in k) for k in keys):
+            continue
+        kept.append(s)
+        keys.append(key)
+    return kept, len(segments) - len(kept)
+
+
+def _render(segments: list[Segment], request: Segment | None) -> str:
+    lines: list[str] = []
+    header: str | None = None
+    for s in sorted(segments, key=lambda s: s.order):
+        if s.header and s.header != header:
+            lines.append(s.header)
+        header = s.header
+        lines.append(s.text)
+    if request is not None:
+        lines.append(request.text)
+    return "\n".join(lines)
+
+
+def pack_prompt(prompt: str, target_tokens: int, *, model_id: str = "gpt2", query: str | None = None) -> PackResult:
+    """Fit `prompt` into `target_tokens` of `model_id`'s tokenizer.
+
+    The user request is always kept (truncated only if it alone exceeds the budget); the remaining
+    bullets are deduplicated, ranked by section prior and overlap with the request, and added
+    greedily while their exact cached token cost - plus their section header the first time - fits.
+    """
+    before = count_tokens(prompt, model_id)
+    segments, request = split_prompt(prompt)
+    if request is not None:
+        request.tokens = count_segment_tokens(request.text, model_id)
+        if request.tokens > target_tokens:
+            request.text = truncate_tokens(request.text, target_tokens, model_id)
+            request.tokens = count_tokens(request.text, model_id)
+    _rank(segments, query if query is not None else (request.text if request else ""))
+    candidates, duplicates = _dedupe(segments)
+    used = request.tokens if request else 0
+    headers: set[str] = set()
+    kept: list[Segment] = []
+    dropped: list[Segment] = []
+    for s in candidates:
+        s.tokens = count_segment_tokens(s.text, model_id) + 1
+        cost = s.tokens + (count_segment_tokens(s.header, model_id) + 1 if s.header and s.header not in headers else 0)
+        if used + cost <= target_tokens:
+            kept.append(s)
+            used += cost
+            if s.header:
+                headers.add(s.header)
+        else:
+            dropped.append(s)
+    text = _render(kept, request)
+    after = count_tokens(text, model_id)
+    # token merges across line joins can differ from the per-segment sum; shed the weakest until exact
+    while after > target_tokens and kept:
+        dropped.append(kept.pop())
+        text = _render(kept, request)
+        after = count_tokens(text, model_id)
+    return PackResult(text=text, tokens_before=before, tokens_after=after, kept=kept, dropped=dropped, duplicates=duplicates)
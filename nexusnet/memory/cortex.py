@@ -7,10 +7,6 @@ from nexus.storage import NexusStore
 from ..schemas import BenchmarkRun, CompressionTrace, InferenceTrace, SessionContext
 
 
-def _estimate_tokens(text: str) -> int:
-    return max(1, len(text) // 4) if text else 0
-
-
 class NeuralMemoryCortex:
     def __init__(self, memory: MemoryService, store: NexusStore):
         self.memory = memory
@@ -19,33 +15,40 @@ class NeuralMemoryCortex:
     def recent_messages(self, session_id: str, limit: int = 6) -> list[Message]:
         return self.memory.recent_messages(session_id, limit=limit)
 
-    def compress_prompt(self, prompt: str, target_tokens: int = 512) -> tuple[str, CompressionTrace | None]:
+    def compress_prompt(
+        self,
+        prompt: str,
+        target_tokens: int = 512,
+        *,
+        model_id: str = "gpt2",
+        query: str | None = None,
+    ) -> tuple[str, CompressionTrace | None]:
         if not prompt.strip():
             return prompt, None
-        before = _estimate_tokens(prompt)
+        # core (and its tokenizer loading) is only pulled in once a prompt actually needs packing
+        from core.engines.token_counters import count_tokens, tokenizer_name
+
+        from .budget import pack_prompt
+
+        before = count_tokens(prompt, model_id)
         if before <= target_tokens:
             return prompt, None
-        lines = [line.strip() for line in prompt.splitlines() if line.strip()]
-        if len(lines) <= 8:
-            keep = lines[:]
-        else:
-            head = lines[:4]
-            tail = lines[-3:]
-            middle = [line for line in lines[4:-3] if line.lower().startswith("user request:") or line.lower().startswith("retrieved context:")]
-            keep = head + middle[:2] + tail
-        summary = "\n".join(keep)
-        after = _estimate_tokens(summary)
-        loss_estimate = round(min(0.95, max(0.0, 1.0 - (after / max(before, 1)))), 3)
+        packed = pack_prompt(prompt, target_tokens, model_id=model_id, query=query)
+        loss_estimate = round(min(0.95, max(0.0, 1.0 - (packed.tokens_after / max(before, 1)))), 3)
         trace = CompressionTrace(
-            strategy="dual-track-summary",
+            strategy="token-budget-pack",
             original_chars=len(prompt),
-            compressed_chars=len(summary),
+            compressed_chars=len(packed.text),
             estimated_tokens_before=before,
-            estimated_tokens_after=after,
+            estimated_tokens_after=packed.tokens_after,
             loss_estimate=loss_estimate,
-            summary=summary,
+            summary=packed.text,
+            tokenizer=tokenizer_name(model_id),
+            kept_segments=len(packed.kept),
+            dropped_segments=len(packed.dropped),
+            duplicate_segments=packed.duplicates,
         )
-        return summary, trace
+        return packed.text, trace
 
     def record_inference(
         self,
@@ -118,5 +121,5 @@ class NeuralMemoryCortex:
 
     def _record_extra(self, *, session_id: str, plane: str, content: dict, tags: list[str], score: MemoryScore) -> MemoryRecord:
         record = MemoryRecord(session_id=session_id, plane=plane, content=content, tags=tags, score=score)
-        self.store.add_memory_record(record.model_dump(mode="json"))
+        self.memory.store_record(record)
         return record
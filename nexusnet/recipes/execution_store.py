@@ -1,17 +1,57 @@
 from __future__ import annotations
 
+import copy
 import json
+import sqlite3
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
 from nexus.schemas import new_id, utcnow
 from .reports import build_execution_compare_report
 
+_INDEX_SCHEMA = """
+create table if not exists executions (
+    execution_id text primary key,
+    recipe_id text,
+    execution_kind text,
+    schedule_id text,
+    trigger_source text,
+    status text,
+    started_at text,
+    recorded_at real not null,
+    path text not null
+);
+create index if not exists executions_recorded on executions(recorded_at desc);
+create index if not exists executions_recipe on executions(recipe_id, recorded_at desc);
+create index if not exists executions_status on executions(status, recorded_at desc);
+create index if not exists executions_kind on executions(execution_kind, recorded_at desc);
+create table if not exists execution_families (
+    execution_id text not null,
+    family text not null,
+    primary key (family, execution_id)
+);
+"""
+_FILTER_COLUMNS = ("execution_kind", "recipe_id", "schedule_id", "trigger_source", "status")
+
 
 class RecipeExecutionStore:
-    def __init__(self, *, artifacts_dir: Path):
+    """Execution artifacts are JSON files; an append-only SQLite index next to them answers listings.
+
+    The index is reconciled with the directory once per store instance (files written before the
+    index existed, or removed since); afterwards `record` keeps it current. Parsed payloads are
+    cached LRU so `get`/`compare` and repeated listings skip the file read.
+    """
+
+    def __init__(self, *, artifacts_dir: Path, payload_cache_size: int = 512):
         self.artifacts_dir = Path(artifacts_dir)
         self.execution_dir = self.artifacts_dir / "recipes" / "executions"
+        self.index_path = self.artifacts_dir / "recipes" / "execution_index.sqlite3"
+        self.payload_cache_size = max(0, int(payload_cache_size))
+        self._payloads: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._reconciled = False
 
     def record(
         self,
@@ -88,6 +128,9 @@ class RecipeExecutionStore:
         path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
         payload["artifact_path"] = str(path)
         path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        with self._connect() as conn:
+            self._index(conn, payload, path)
+        self._remember(payload)
         return payload
 
     def list_executions(
@@ -98,37 +141,126 @@ class RecipeExecutionStore:
         schedule_id: str | None = None,
         trigger_source: str | None = None,
         status: str | None = None,
+        flow_family: str | None = None,
+        started_after: str | None = None,
+        started_before: str | None = None,
         limit: int = 20,
+        offset: int = 0,
     ) -> list[dict[str, Any]]:
+        """Newest first; `offset`/`limit` page through the matches."""
+        where, params = self._filters(
+            execution_kind=execution_kind,
+            recipe_id=recipe_id,
+            schedule_id=schedule_id,
+            trigger_source=trigger_source,
+            status=status,
+            flow_family=flow_family,
+            started_after=started_after,
+            started_before=started_before,
+        )
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"select execution_id, path from executions{where} order by recorded_at desc, rowid desc limit ? offset ?",
+                [*params, max(int(limit), 0), max(int(offset), 0)],
+            ).fetchall()
         records: list[dict[str, Any]] = []
-        if not self.execution_dir.exists():
-            return records
-        for path in sorted(self.execution_dir.glob("*.json"), key=lambda item: item.stat().st_mtime, reverse=True):
-            try:
-                payload = json.loads(path.read_text(encoding="utf-8"))
-            except (OSError, json.JSONDecodeError):
-                continue
-            if "flow_families" not in payload:
-                payload["flow_families"] = self._classify_flow_families(payload)
-            if execution_kind and payload.get("execution_kind") != execution_kind:
-                continue
-            if recipe_id and payload.get("recipe_id") != recipe_id:
-                continue
-            if schedule_id and payload.get("schedule_id") != schedule_id:
-                continue
-            if trigger_source and payload.get("trigger_source") != trigger_source:
-                continue
-            if status and payload.get("status") != status:
-                continue
-            records.append(payload)
-            if len(records) >= limit:
-                break
+        for row in rows:
+            payload = self._load(row["execution_id"], Path(row["path"]))
+            if payload is not None:
+                records.append(payload)
         return records
 
+    def count_executions(self, **filters: Any) -> int:
+        where, params = self._filters(**filters)
+        with self._connect() as conn:
+            return int(conn.execute(f"select count(*) from executions{where}", params).fetchone()[0])
+
     def get(self, execution_id: str) -> dict[str, Any] | None:
-        path = self.execution_dir / f"{execution_id}.json"
-        if not path.exists():
-            return None
+        return self._load(execution_id, self.execution_dir / f"{execution_id}.json")
+
+    def reindex(self) -> int:
+        """Rebuild the index from the execution files; returns the number indexed."""
+        with self._lock:
+            self._reconciled = False
+        with self._connect(reset=True) as conn:
+            return int(conn.execute("select count(*) from executions").fetchone()[0])
+
+    def _filters(
+        self,
+        *,
+        flow_family: str | None = None,
+        started_after: str | None = None,
+        started_before: str | None = None,
+        **columns: str | None,
+    ) -> tuple[str, list[Any]]:
+        clauses: list[str] = []
+        params: list[Any] = []
+        for column in _FILTER_COLUMNS:
+            if columns.get(column):
+                clauses.append(f"{column} = ?")
+                params.append(columns[column])
+        if flow_family:
+            clauses.append("execution_id in (select execution_id from execution_families where family = ?)")
+            params.append(flow_family)
+        if started_after:
+            clauses.append("started_at >= ?")
+            params.append(started_after)
+        if started_before:
+            clauses.append("started_at < ?")
+            params.append(started_before)
+        return (" where " + " and ".join(clauses) if clauses else ""), params
+
+    def _connect(self, *, reset: bool = False) -> sqlite3.Connection:
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.index_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        if reset:
+            conn.executescript("drop table if exists executions; drop table if exists execution_families;")
+        conn.executescript(_INDEX_SCHEMA)
+        with self._lock:
+            reconcile = not self._reconciled
+            self._reconciled = True
+        if reconcile:
+            with conn:
+                self._reconcile(conn)
+        return conn
+
+    def _reconcile(self, conn: sqlite3.Connection) -> None:
+        on_disk = {path.stem: path for path in self.execution_dir.glob("*.json")} if self.execution_dir.exists() else {}
+        indexed = {row[0] for row in conn.execute("select execution_id from executions")}
+        for execution_id in indexed - on_disk.keys():
+            conn.execute("delete from executions where execution_id = ?", (execution_id,))
+            conn.execute("delete from execution_families where execution_id = ?", (execution_id,))
+        for execution_id in on_disk.keys() - indexed:
+            payload = self._read(on_disk[execution_id])
+            if payload is not None:
+                self._index(conn, payload, on_disk[execution_id])
+
+    def _index(self, conn: sqlite3.Connection, payload: dict[str, Any], path: Path) -> None:
+        execution_id = str(payload.get("execution_id") or path.stem)
+        conn.execute(
+            """
+            insert or replace into executions(execution_id, recipe_id, execution_kind, schedule_id, trigger_source, status, started_at, recorded_at, path)
+            values (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                execution_id,
+                payload.get("recipe_id"),
+                payload.get("execution_kind"),
+                payload.get("schedule_id"),
+                payload.get("trigger_source"),
+                payload.get("status"),
+                payload.get("started_at"),
+                path.stat().st_mtime,
+                str(path),
+            ),
+        )
+        conn.executemany(
+            "insert or ignore into execution_families(execution_id, family) values (?, ?)",
+            [(execution_id, family) for family in payload.get("flow_families", [])],
+        )
+
+    def _read(self, path: Path) -> dict[str, Any] | None:
         try:
             payload = json.loads(path.read_text(encoding="utf-8"))
         except (OSError, json.JSONDecodeError):
@@ -137,6 +269,28 @@ class RecipeExecutionStore:
             payload["flow_families"] = self._classify_flow_families(payload)
         return payload
 
+    def _load(self, execution_id: str, path: Path) -> dict[str, Any] | None:
+        with self._lock:
+            cached = self._payloads.get(execution_id)
+            if cached is not None:
+                self._payloads.move_to_end(execution_id)
+                return copy.deepcopy(cached)
+        if not path.exists():
+            return None
+        payload = self._read(path)
+        if payload is not None:
+            self._remember(payload)
+        return payload
+
+    def _remember(self, payload: dict[str, Any]) -> None:
+        if not self.payload_cache_size or not payload.get("execution_id"):
+            return
+        with self._lock:
+            self._payloads[payload["execution_id"]] = copy.deepcopy(payload)
+            self._payloads.move_to_end(payload["execution_id"])
+            while len(self._payloads) > self.payload_cache_size:
+                self._payloads.popitem(last=False)
+
     def compare(self, left_execution_id: str, right_execution_id: str) -> dict[str, Any] | None:
         left = self.get(left_execution_id)
         right = self.get(right_execution_id)
@@ -85,16 +85,23 @@ class RecipeHistoryService:
         schedule_id: str | None = None,
         trigger_source: str | None = None,
         status: str | None = None,
+        flow_family: str | None = None,
+        started_after: str | None = None,
+        started_before: str | None = None,
         limit: int = 12,
+        offset: int = 0,
     ) -> dict[str, Any]:
-        items = self.execution_store.list_executions(
-            execution_kind=execution_kind,
-            recipe_id=recipe_id,
-            schedule_id=schedule_id,
-            trigger_source=trigger_source,
-            status=status,
-            limit=limit,
-        )
+        filters = {
+            "execution_kind": execution_kind,
+            "recipe_id": recipe_id,
+            "schedule_id": schedule_id,
+            "trigger_source": trigger_source,
+            "status": status,
+            "flow_family": flow_family,
+            "started_after": started_after,
+            "started_before": started_before,
+        }
+        items = self.execution_store.list_executions(**filters, limit=limit, offset=offset)
         status_counts: dict[str, int] = {}
         flow_family_counts: dict[str, int] = {}
         latest_by_flow_family: dict[str, dict[str, Any]] = {}
@@ -123,7 +130,10 @@ class RecipeHistoryService:
             "schedule_id": schedule_id,
             "trigger_source": trigger_source,
             "status_filter": status,
+            "flow_family_filter": flow_family,
             "execution_count": len(items),
+            "total_count": self.execution_store.count_executions(**filters),
+            "offset": offset,
             "status_counts": status_counts,
             "latest_execution": latest or None,
             "latest_report_id": ((latest.get("report") or {}).get("report_id")),
@@ -26,11 +26,13 @@ class RetrievalRerankBenchmarkSuite:
             RetrievalRequest(query=query, top_k=top_k, session_id=session_id),
             policy_mode=policy_mode,
             rerank_enabled=False,
+            use_cache=False,
         )
         after = self.retrieval_service.query_with_policy(
             RetrievalRequest(query=query, top_k=top_k, session_id=session_id),
             policy_mode=policy_mode,
             rerank_enabled=True,
+            use_cache=False,
         )
         report_id = new_id("retrievalbench")
         destination = self.artifacts_dir / "retrieval" / "rerank" / report_id
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import re
+from typing import Any
 
 from ...graph.store import GraphStore
 from ...memory.graph_bridge import MemoryGraphBridge
@@ -14,9 +15,10 @@ def _sentences(text: str) -> list[str]:
 
 
 class GraphRAGIngestionService:
-    def __init__(self, *, store: GraphStore, graph_bridge: MemoryGraphBridge):
+    def __init__(self, *, store: GraphStore, graph_bridge: MemoryGraphBridge, corpus_generation: Any | None = None):
         self.store = store
         self.graph_bridge = graph_bridge
+        self.corpus_generation = corpus_generation
 
     def ingest(self, request: GraphIngestRequest) -> dict:
         plane_tags = self.graph_bridge.plane_tags(request.plane_hint)
@@ -53,4 +55,7 @@ class GraphRAGIngestionService:
                     )
                 )
             previous_node_id = node_id
-        return self.store.ingest(source=request.source, nodes=nodes, edges=edges, metadata=request.metadata)
+        result = self.store.ingest(source=request.source, nodes=nodes, edges=edges, metadata=request.metadata)
+        if self.corpus_generation is not None:
+            self.corpus_generation.bump("graph-ingest")
+        return result
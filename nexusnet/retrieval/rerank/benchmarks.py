@@ -56,8 +56,8 @@ class RetrievalRerankOperationalBenchmarkSuite:
         case_results: list[dict[str, Any]] = []
         for case in cases:
             request = RetrievalRequest(query=case["query"], top_k=top_k, session_id=session_id)
-            before = self.retrieval_service.query_with_policy(request, policy_mode=policy_mode, rerank_enabled=False)
-            after = self.retrieval_service.query_with_policy(request, policy_mode=policy_mode, rerank_enabled=True)
+            before = self.retrieval_service.query_with_policy(request, policy_mode=policy_mode, rerank_enabled=False, use_cache=False)
+            after = self.retrieval_service.query_with_policy(request, policy_mode=policy_mode, rerank_enabled=True, use_cache=False)
             before_hits = before.get("hits", [])
             after_hits = after.get("hits", [])
             expected_sources = {value.lower() for value in case.get("expected_sources", [])}
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import hashlib
 import math
 import re
+import threading
 import time
-from typing import Any
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable
 
 from nexus.schemas import RetrievalHit
 
@@ -29,12 +33,141 @@ def _heuristic_pair_score(query: str, hit: RetrievalHit) -> float:
     return round(coverage + source_bonus + provenance_bonus + backend_bonus, 6)
 
 
+class _PairMicroBatcher:
+    """Coalesces pairs from concurrent queries into shared model.predict calls."""
+
+    def __init__(self, score_pairs: Callable[[list[list[str]]], list[float]], *, window_seconds: float, max_pairs: int):
+        self.score_pairs = score_pairs
+        self.window_seconds = window_seconds
+        self.max_pairs = max(int(max_pairs), 1)
+        self._pending: list[tuple[list[list[str]], Future]] = []
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self.flushes = 0
+        self.coalesced_requests = 0
+
+    def submit(self, pairs: list[list[str]]) -> list[float]:
+        future: Future = Future()
+        with self._cond:
+            self._pending.append((pairs, future))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="cross-encoder-batcher", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return future.result()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                deadline = time.monotonic() + self.window_seconds
+                while sum(len(pairs) for pairs, _ in self._pending) < self.max_pairs:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, size = [], 0
+                while self._pending and (not batch or size + len(self._pending[0][0]) <= self.max_pairs):
+                    pairs, future = self._pending.pop(0)
+                    batch.append((pairs, future))
+                    size += len(pairs)
+            self.flushes += 1
+            self.coalesced_requests += len(batch)
+            try:
+                scores = self.score_pairs([pair for pairs, _ in batch for pair in pairs])
+            except Exception as exc:
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+            offset = 0
+            for pairs, future in batch:
+                future.set_result(scores[offset : offset + len(pairs)])
+                offset += len(pairs)
+
+
 class CrossEncoderStageTwoReranker:
-    def __init__(self, *, model_name: str, device: str = "cpu", fallback_provider: str = "heuristic-cross-encoder"):
+    def __init__(
+        self,
+        *,
+        model_name: str,
+        device: str = "cpu",
+        fallback_provider: str = "heuristic-cross-encoder",
+        pair_cache_size: int = 20_000,
+        batch_size: int = 32,
+        max_length: int = 512,
+        max_passage_chars: int = 2048,
+        failure_retry_seconds: float = 300.0,
+        micro_batch_window_ms: float = 2.0,
+        micro_batch_max_pairs: int = 128,
+    ):
         self.model_name = model_name
         self.device = device
         self.fallback_provider = fallback_provider
+        self.batch_size = max(int(batch_size), 1)
+        self.max_length = max(int(max_length), 1)
+        self.max_passage_chars = max(int(max_passage_chars), 1)
+        self.failure_retry_seconds = float(failure_retry_seconds)
         self._model: Any | None = None
+        self._load_lock = threading.Lock()
+        self._loading: threading.Thread | None = None
+        self._load_error: str | None = None
+        self._load_failed_at: float | None = None
+        self._load_latency_ms: int | None = None
+        self._batcher = (
+            _PairMicroBatcher(self._score_pairs, window_seconds=micro_batch_window_ms / 1000.0, max_pairs=micro_batch_max_pairs)
+            if micro_batch_window_ms > 0
+            else None
+        )
+        # model pair scores depend only on (query, passage), so they survive corpus changes
+        self.pair_cache_size = max(int(pair_cache_size), 0)
+        self._pair_scores: OrderedDict[tuple[str, str], float] = OrderedDict()
+        self._pair_lock = threading.Lock()
+        self._pair_hits = 0
+        self._pair_misses = 0
+
+    def warm_load(self, *, background: bool = True) -> None:
+        if self._model is not None or self._failure_cached():
+            return
+        if not background:
+            self._load_model()
+            return
+        with self._load_lock:
+            if self._loading is not None and self._loading.is_alive():
+                return
+            self._loading = threading.Thread(target=self._warm_load_quietly, name="cross-encoder-warm-load", daemon=True)
+            self._loading.start()
+
+    def model_state(self) -> dict[str, Any]:
+        if self._model is not None:
+            state = "ready"
+        elif self._loading is not None and self._loading.is_alive():
+            state = "loading"
+        elif self._failure_cached():
+            state = "unavailable"
+        else:
+            state = "cold"
+        return {
+            "state": state,
+            "model_name": self.model_name,
+            "device": self.device,
+            "load_latency_ms": self._load_latency_ms,
+            "load_error": self._load_error,
+            "batch_size": self.batch_size,
+            "max_length": self.max_length,
+            "max_passage_chars": self.max_passage_chars,
+            "micro_batch_flushes": self._batcher.flushes if self._batcher is not None else 0,
+            "micro_batch_requests": self._batcher.coalesced_requests if self._batcher is not None else 0,
+        }
+
+    def pair_cache_stats(self) -> dict[str, Any]:
+        with self._pair_lock:
+            return {
+                "entries": len(self._pair_scores),
+                "max_entries": self.pair_cache_size,
+                "hits": self._pair_hits,
+                "misses": self._pair_misses,
+            }
 
     def rerank(self, *, query: str, candidates: list[RetrievalHit], top_k: int) -> StageTwoRerankResult:
         before_hits = list(candidates[:top_k])
@@ -51,9 +184,11 @@ class CrossEncoderStageTwoReranker:
 
         started = time.perf_counter()
         provider_name = self.model_name
+        fallback_reason = None
         try:
             scores = self._predict(query, before_hits)
-        except Exception:
+        except Exception as exc:
+            fallback_reason = str(exc)
             provider_name = self.fallback_provider
             scores = [_heuristic_pair_score(query, hit) for hit in before_hits]
 
@@ -95,6 +230,8 @@ class CrossEncoderStageTwoReranker:
             diagnostics={
                 **quality_delta,
                 "fallback_used": provider_name == self.fallback_provider,
+                "fallback_reason": fallback_reason,
+                "model_state": self.model_state()["state"],
                 "score_spread": round(max(rerank_scores.values()) - min(rerank_scores.values()), 6) if rerank_scores else 0.0,
                 "score_entropy_hint": round(
                     -sum(
@@ -110,10 +247,68 @@ class CrossEncoderStageTwoReranker:
         )
 
     def _predict(self, query: str, candidates: list[RetrievalHit]) -> list[float]:
-        if self._model is None:
-            from sentence_transformers import CrossEncoder  # type: ignore
+        passages = [hit.content[: self.max_passage_chars] for hit in candidates]
+        keys = [(query, hashlib.sha1(passage.encode("utf-8")).hexdigest()) for passage in passages]
+        scores: dict[tuple[str, str], float] = {}
+        with self._pair_lock:
+            for key in keys:
+                if key in self._pair_scores:
+                    self._pair_scores.move_to_end(key)
+                    scores[key] = self._pair_scores[key]
+            self._pair_hits += len(scores)
+        missing = [(key, passage) for key, passage in zip(keys, passages) if key not in scores]
+        if missing:
+            self._require_model()
+            pairs = [[query, passage] for _, passage in missing]
+            predicted = self._batcher.submit(pairs) if self._batcher is not None else self._score_pairs(pairs)
+            with self._pair_lock:
+                self._pair_misses += len(missing)
+                for (key, _), score in zip(missing, predicted):
+                    scores[key] = float(score)
+                    if self.pair_cache_size:
+                        self._pair_scores[key] = float(score)
+                while len(self._pair_scores) > self.pair_cache_size:
+                    self._pair_scores.popitem(last=False)
+        return [scores[key] for key in keys]
+
+    def _warm_load_quietly(self) -> None:
+        try:
+            self._load_model()
+        except RuntimeError:
+            pass  # recorded in _load_error; queries use the fallback provider
 
-            self._model = CrossEncoder(self.model_name, device=self.device)
-        pairs = [[query, hit.content] for hit in candidates]
-        scores = self._model.predict(pairs, convert_to_tensor=False)
+    def _score_pairs(self, pairs: list[list[str]]) -> list[float]:
+        scores = self._model.predict(pairs, batch_size=self.batch_size, convert_to_tensor=False, show_progress_bar=False)
         return [float(score) for score in scores]
+
+    def _require_model(self) -> None:
+        if self._model is not None:
+            return
+        if self._failure_cached():
+            raise RuntimeError(f"cross-encoder unavailable: {self._load_error}")
+        if self._loading is not None and self._loading.is_alive():
+            # never block a query on the warm load; stage 2 falls back until the model is ready
+            raise RuntimeError("cross-encoder warm load in progress")
+        self._load_model()
+
+    def _load_model(self) -> None:
+        with self._load_lock:
+            if self._model is None and not self._failure_cached():
+                started = time.perf_counter()
+                try:
+                    from sentence_transformers import CrossEncoder  # type: ignore
+
+                    self._model = CrossEncoder(self.model_name, device=self.device, max_length=self.max_length)
+                    self._load_error = None
+                    self._load_failed_at = None
+                except Exception as exc:
+                    self._load_error = f"{type(exc).__name__}: {exc}"
+                    self._load_failed_at = time.monotonic()
+                self._load_latency_ms = int((time.perf_counter() - started) * 1000)
+        if self._model is None:
+            raise RuntimeError(f"cross-encoder unavailable: {self._load_error}")
+
+    def _failure_cached(self) -> bool:
+        return self._load_failed_at is not None and (
+            self.failure_retry_seconds <= 0 or time.monotonic() - self._load_failed_at < self.failure_retry_seconds
+        )
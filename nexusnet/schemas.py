@@ -55,6 +55,10 @@ class CompressionTrace(BaseModel):
     estimated_tokens_after: int
     loss_estimate: float
     summary: str
+    tokenizer: str | None = None
+    kept_segments: int = 0
+    dropped_segments: int = 0
+    duplicate_segments: int = 0
 
 
 class InferenceTrace(BaseModel):
@@ -213,6 +217,7 @@ class DistillationExportRequest(BaseModel):
     trace_limit: int = 100
     include_dreams: bool = True
     include_curriculum: bool = True
+    dedup_threshold: float | None = Field(default=None, gt=0, le=1)
 
 
 class DistillationExportResult(BaseModel):
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import functools
 import json
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from nexus.config import NexusPaths
 from nexus.schemas import utcnow
@@ -19,15 +20,20 @@ class BrainTelemetryLogger:
     def log_model_attach(self, payload: dict[str, Any]) -> str:
         return self._append("model_load.log", payload)
 
-    def log_inference(self, payload: dict[str, Any]) -> str:
-        return self._append("inference.log", payload)
+    def log_inference(self, payload: dict[str, Any], *, defer: Callable[..., bool] | None = None) -> str:
+        return self._append("inference.log", payload, defer=defer)
 
     def log_benchmark(self, payload: dict[str, Any]) -> str:
         return self._append("benchmark.log", payload)
 
-    def _append(self, filename: str, payload: dict[str, Any]) -> str:
+    def _append(self, filename: str, payload: dict[str, Any], *, defer: Callable[..., bool] | None = None) -> str:
         destination = self.paths.logs_dir / filename
-        line = {"timestamp": utcnow().isoformat(), **payload}
-        with destination.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(line, ensure_ascii=True, default=str) + "\n")
+        line = json.dumps({"timestamp": utcnow().isoformat(), **payload}, ensure_ascii=True, default=str) + "\n"
+        write = functools.partial(self._write_line, destination, line)
+        if defer is None or not defer(write, after_commit=True):
+            write()
         return str(destination)
+
+    def _write_line(self, destination: Path, line: str) -> None:
+        with destination.open("a", encoding="utf-8") as handle:
+            handle.write(line)
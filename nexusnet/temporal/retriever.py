@@ -5,14 +5,17 @@ from typing import List, Dict, Any
 from .tkg import TKG
 
 class TemporalRetriever:
-    def __init__(self, db_path: str = "runtime/temporal/tkg.sqlite"):
+    def __init__(self, db_path: str = "runtime/temporal/tkg.sqlite", corpus_generation=None):
         self.tkg = TKG(db_path)
+        self.corpus_generation = corpus_generation
 
     def ingest(self, texts: List[str], extractor):
         items = 0
         for t in texts:
             facts = extractor.extract_atomic(t)
             items += self.tkg.upsert(facts)
+        if items and self.corpus_generation is not None:
+            self.corpus_generation.bump("tkg-upsert")
         return items
 
     def retrieve_as_of(self, query: str, date_iso: str, limit: int = 20) -> List[Dict[str,Any]]:
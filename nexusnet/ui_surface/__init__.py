@@ -1,3 +1,4 @@
+from .changefeed import SurfaceChangeFeed, snapshot_delta
 from .surface import WrapperSurfaceService, default_wrapper_modes
 
-__all__ = ["WrapperSurfaceService", "default_wrapper_modes"]
+__all__ = ["SurfaceChangeFeed", "WrapperSurfaceService", "default_wrapper_modes", "snapshot_delta"]
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable
+
+from nexus.storage import NexusStore
+
+_MISSING = object()
+
+
+def snapshot_delta(previous: dict[str, Any] | None, current: dict[str, Any], *, max_depth: int = 2) -> dict[str, Any]:
+    if previous is None:
+        return {"full": True, "changed": dict(current), "removed": []}
+    changed: dict[str, Any] = {}
+    removed: list[str] = []
+
+    def _walk(left: Any, right: Any, path: str, depth: int) -> None:
+        if isinstance(left, dict) and isinstance(right, dict) and depth < max_depth:
+            for key, value in right.items():
+                _walk(left.get(key, _MISSING), value, f"{path}.{key}" if path else str(key), depth + 1)
+            removed.extend(f"{path}.{key}" if path else str(key) for key in left if key not in right)
+            return
+        if left is _MISSING or left != right:
+            changed[path] = right
+
+    _walk(previous, current, "", 0)
+    return {"full": False, "changed": changed, "removed": sorted(removed)}
+
+
+class SurfaceChangeFeed:
+    """Incrementally maintained wrapper-surface state driven by the store change feed.
+
+    Store-backed sections are invalidated exactly through ``NexusStore.change_sequences``,
+    restricted to ``tables`` (the tables the surface reads) when given, so writes elsewhere
+    do not rebuild the snapshot. Sections built from config and artifact summaries are
+    re-checked at most once per ``refresh_interval_seconds``, so an idle subscriber costs one
+    change-feed read per tick. Subscribers hold a ``version`` token and receive deltas against
+    the version they last saw.
+    """
+
+    def __init__(
+        self,
+        *,
+        store: NexusStore,
+        snapshot_provider: Callable[..., dict[str, Any]],
+        refresh_interval_seconds: float = 15.0,
+        history_size: int = 8,
+        max_sessions: int = 64,
+        tables: Iterable[str] | None = None,
+    ):
+        self.store = store
+        self.tables = frozenset(tables) if tables is not None else None
+        self.snapshot_provider = snapshot_provider
+        self.refresh_interval_seconds = max(float(refresh_interval_seconds), 0.0)
+        self.history_size = max(int(history_size), 1)
+        self.max_sessions = max(int(max_sessions), 1)
+        self._versions = itertools.count(1)
+        self._lock = threading.Lock()
+        self._sessions: dict[str | None, deque[dict[str, Any]]] = {}
+
+    def current(self, session_id: str | None = None) -> dict[str, Any]:
+        entry = self._refresh(session_id)
+        return {
+            "session_id": session_id,
+            "version": entry["version"],
+            "cursor": entry["cursor"],
+            "sequences": dict(entry["sequences"]),
+            "snapshot": entry["snapshot"],
+        }
+
+    def delta(self, session_id: str | None = None, *, since: int | None = None) -> dict[str, Any] | None:
+        entry = self._refresh(session_id)
+        if since is not None and since == entry["version"]:
+            return None
+        base = self._history_entry(session_id, since) if since is not None else None
+        return {
+            "session_id": session_id,
+            "version": entry["version"],
+            "since": since,
+            "cursor": entry["cursor"],
+            "changed_tables": sorted(
+                table
+                for table, seq in entry["sequences"].items()
+                if base is None or base["sequences"].get(table) != seq
+            ),
+            "delta": snapshot_delta(base["snapshot"] if base else None, entry["snapshot"]),
+        }
+
+    async def stream(
+        self,
+        session_id: str | None = None,
+        *,
+        since: int | None = None,
+        poll_interval_seconds: float = 1.0,
+        heartbeat_seconds: float = 15.0,
+        max_events: int | None = None,
+        is_disconnected: Callable[[], Awaitable[bool]] | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Server-sent-event payloads; store reads run off the event loop and idle ticks await."""
+        emitted = 0
+        version = since
+        last_emit = time.monotonic()
+        while max_events is None or emitted < max_events:
+            if is_disconnected is not None and await is_disconnected():
+                return
+            update = await asyncio.to_thread(self.delta, session_id, since=version)
+            if update is not None:
+                version = update["version"]
+                yield {"event": "delta", "data": update}
+                emitted += 1
+                last_emit = time.monotonic()
+            elif time.monotonic() - last_emit >= heartbeat_seconds:
+                yield {"event": "heartbeat", "data": {"session_id": session_id, "version": version}}
+                emitted += 1
+                last_emit = time.monotonic()
+            else:
+                await asyncio.sleep(poll_interval_seconds)
+
+    def _history_entry(self, session_id: str | None, version: int) -> dict[str, Any] | None:
+        with self._lock:
+            history = self._sessions.get(session_id) or ()
+            for entry in history:
+                if entry["version"] == version:
+                    return entry
+        return None
+
+    def _refresh(self, session_id: str | None) -> dict[str, Any]:
+        sequences = self.store.change_sequences()
+        if self.tables is not None:
+            sequences = {table: seq for table, seq in sequences.items() if table in self.tables}
+        cursor = self.store.change_cursor(sequences)
+        now = time.monotonic()
+        with self._lock:
+            history = self._sessions.get(session_id)
+            latest = history[-1] if history else None
+            if latest is not None and latest["cursor"] == cursor and now - latest["refreshed_at"] < self.refresh_interval_seconds:
+                return latest
+        snapshot = self.snapshot_provider(session_id=session_id)
+        with self._lock:
+            history = self._sessions.pop(session_id, None) or deque(maxlen=self.history_size)
+            self._sessions[session_id] = history
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.pop(next(iter(self._sessions)))
+            latest = history[-1] if history else None
+            if latest is not None and latest["snapshot"] == snapshot:
+                latest.update(cursor=cursor, sequences=sequences, refreshed_at=now)
+                return latest
+            entry = {
+                "version": next(self._versions),
+                "cursor": cursor,
+                "sequences": sequences,
+                "snapshot": snapshot,
+                "refreshed_at": now,
+            }
+            history.append(entry)
+            return entry
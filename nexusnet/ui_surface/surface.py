@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import threading
+from typing import Any, Callable
+
 from nexus.memory import MemoryService
 from nexus.schemas import MemoryQuery
 from nexus.storage import NexusStore
@@ -12,6 +15,29 @@ from ..runtime_optimizer import AdaptiveRuntimeProfiler
 from ..schemas import WrapperMode, WrapperSurfaceState
 from ..teachers import TeacherRegistry
 from ..teachers.evidence import aggregate_teacher_evidence
+from .changefeed import SurfaceChangeFeed
+
+# store tables the snapshot reads directly or through its memory and promotion providers;
+# the change feed ignores writes to any other table
+SURFACE_TABLES = (
+    "execution_traces",
+    "curriculum_transcript",
+    "teacher_evidence_bundles",
+    "teacher_disagreement_artifacts",
+    "teacher_scorecards",
+    "teacher_trend_scorecards",
+    "takeover_trend_reports",
+    "takeover_scorecards",
+    "teacher_benchmark_fleet_summaries",
+    "teacher_cohort_scorecards",
+    "replacement_readiness_reports",
+    "retirement_shadow_log",
+    "promotion_candidates",
+    "promotion_decisions",
+    "promotion_evaluations",
+    "memory_records",
+    "memory_analytics",
+)
 
 
 def default_wrapper_modes() -> list[WrapperMode]:
@@ -90,6 +116,7 @@ class WrapperSurfaceService:
         promotion_provider: object | None = None,
         retrieval_scorecard_provider: object | None = None,
         brain_core_summary_provider: object | None = None,
+        refresh_interval_seconds: float = 15.0,
     ):
         self.store = store
         self.memory = memory
@@ -135,6 +162,14 @@ class WrapperSurfaceService:
         self.retrieval_scorecard_provider = retrieval_scorecard_provider
         self.brain_core_summary_provider = brain_core_summary_provider
         self._modes = default_wrapper_modes()
+        self._row_cache: dict[tuple[Any, ...], tuple[int, list[dict]]] = {}
+        self._row_cache_lock = threading.Lock()
+        self.change_feed = SurfaceChangeFeed(
+            store=store,
+            snapshot_provider=self.snapshot,
+            refresh_interval_seconds=refresh_interval_seconds,
+            tables=SURFACE_TABLES,
+        )
 
     def state(self, session_id: str | None = None) -> WrapperSurfaceState:
         active_teacher = self.teacher_registry.active_teacher()
@@ -158,19 +193,20 @@ class WrapperSurfaceService:
             else None
         )
         provenance = self.agent_registry.session_provenance(session_id) if session_id else None
-        traces = self.store.list_traces(limit=50)
+        sequences = self.store.change_sequences()
+        traces = self.store_rows("execution_traces", self.store.list_traces, sequences=sequences, limit=50)
         teacher_traces = [trace for trace in traces if trace.get("teacher_provenance")]
-        curriculum_records = self.store.list_curriculum_records(limit=100)
+        curriculum_records = self.store_rows("curriculum_transcript", self.store.list_curriculum_records, sequences=sequences, limit=100)
         teacher_evidence = aggregate_teacher_evidence(traces=teacher_traces, curriculum_records=curriculum_records)
-        teacher_bundles = self.store.list_teacher_evidence_bundles(limit=50)
-        disagreement_records = self.store.list_teacher_disagreement_artifacts(limit=50)
-        teacher_scorecards = self.store.list_teacher_scorecards(limit=50)
-        teacher_trends = self.store.list_teacher_trend_scorecards(limit=50)
-        takeover_trends = self.store.list_takeover_trend_reports(limit=50)
-        fleet_summaries = self.store.list_teacher_benchmark_fleet_summaries(limit=50)
-        cohort_scorecards = self.store.list_teacher_cohort_scorecards(limit=50)
-        replacement_readiness_reports = self.store.list_replacement_readiness_reports(limit=50)
-        retirement_shadow_log = self.store.list_retirement_shadow_records(limit=50)
+        teacher_bundles = self.store_rows("teacher_evidence_bundles", self.store.list_teacher_evidence_bundles, sequences=sequences, limit=50)
+        disagreement_records = self.store_rows("teacher_disagreement_artifacts", self.store.list_teacher_disagreement_artifacts, sequences=sequences, limit=50)
+        teacher_scorecards = self.store_rows("teacher_scorecards", self.store.list_teacher_scorecards, sequences=sequences, limit=50)
+        teacher_trends = self.store_rows("teacher_trend_scorecards", self.store.list_teacher_trend_scorecards, sequences=sequences, limit=50)
+        takeover_trends = self.store_rows("takeover_trend_reports", self.store.list_takeover_trend_reports, sequences=sequences, limit=50)
+        fleet_summaries = self.store_rows("teacher_benchmark_fleet_summaries", self.store.list_teacher_benchmark_fleet_summaries, sequences=sequences, limit=50)
+        cohort_scorecards = self.store_rows("teacher_cohort_scorecards", self.store.list_teacher_cohort_scorecards, sequences=sequences, limit=50)
+        replacement_readiness_reports = self.store_rows("replacement_readiness_reports", self.store.list_replacement_readiness_reports, sequences=sequences, limit=50)
+        retirement_shadow_log = self.store_rows("retirement_shadow_log", self.store.list_retirement_shadow_records, sequences=sequences, limit=50)
         recent_teacher_traces = [
             {
                 "trace_id": trace.get("trace_id"),
@@ -723,8 +759,27 @@ class WrapperSurfaceService:
         records = self.memory.query(MemoryQuery(session_id=session_id, limit=500))
         return self.memory_planes.project(projection_name, records).model_dump(mode="json")
 
+    def store_rows(
+        self,
+        table_name: str,
+        loader: Callable[..., list[dict]],
+        *,
+        sequences: dict[str, int] | None = None,
+        **kwargs: Any,
+    ) -> list[dict]:
+        sequence = (sequences if sequences is not None else self.store.change_sequences()).get(table_name, 0)
+        key = (table_name, getattr(loader, "__name__", repr(loader)), tuple(sorted(kwargs.items())))
+        with self._row_cache_lock:
+            cached = self._row_cache.get(key)
+        if cached is not None and cached[0] == sequence:
+            return list(cached[1])
+        rows = loader(**kwargs)
+        with self._row_cache_lock:
+            self._row_cache[key] = (sequence, rows)
+        return list(rows)
+
     def _last_trace(self, session_id: str | None) -> dict | None:
-        traces = self.store.list_traces(limit=100)
+        traces = self.store_rows("execution_traces", self.store.list_traces, limit=100)
         if session_id:
             for trace in traces:
                 if trace.get("session_id") == session_id:
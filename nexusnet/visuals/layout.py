@@ -21,6 +21,8 @@ from .schema import (
     VisualizerOverlayState,
 )
 from .telemetry import VisualizerTelemetryAdapter
+from ..ui_surface.changefeed import SurfaceChangeFeed
+from ..ui_surface.surface import SURFACE_TABLES
 
 
 def _repo_root() -> Path:
@@ -453,6 +455,12 @@ class NexusVisualizerService:
             paths=paths,
             allow_depth_enhancement=any(mode.allow_threejs_enhancement for mode in self.compiler.modes),
         )
+        self.change_feed = SurfaceChangeFeed(
+            store=store,
+            snapshot_provider=self.state,
+            refresh_interval_seconds=getattr(getattr(wrapper_surface, "change_feed", None), "refresh_interval_seconds", 15.0),
+            tables=SURFACE_TABLES,
+        )
         self.ensure_ui_assets()
 
     def ensure_ui_assets(self) -> None:
@@ -915,7 +923,12 @@ class NexusVisualizerService:
         )
 
     def _recent_traces(self, *, session_id: str | None, limit: int) -> list[dict[str, Any]]:
-        traces = self.store.list_traces(limit=max(limit * 4, limit))
+        store_rows = getattr(self.wrapper_surface, "store_rows", None)
+        traces = (
+            store_rows("execution_traces", self.store.list_traces, limit=max(limit * 4, limit))
+            if callable(store_rows)
+            else self.store.list_traces(limit=max(limit * 4, limit))
+        )
         if session_id:
             scoped = [trace for trace in traces if trace.get("session_id") == session_id]
             if scoped:
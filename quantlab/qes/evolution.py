@@ -1,20 +1,26 @@
 from __future__ import annotations
 import random, copy
 
-def mutate(c: dict) -> dict:
+def mutate(c: dict, space: dict | None = None, rng=random) -> dict:
+    """Resample ~30% of the genes; with `space`, values stay inside the declared choices (neighbouring ones for ordered lists)."""
     d = copy.deepcopy(c)
     for k,v in list(d.items()):
-        if random.random() < 0.3 and isinstance(v,(int,bool,str)):
-            if isinstance(v,int):
-                d[k] = max(2, v + random.choice([-2,0,2]))
-            elif isinstance(v,bool):
-                d[k] = not v
-            elif isinstance(v,str):
-                d[k] = v
+        if rng.random() >= 0.3: continue
+        choices = (space or {}).get(k)
+        if choices:
+            if isinstance(v,bool) or not isinstance(v,(int,float)) or v not in choices:
+                d[k] = rng.choice(choices)
+            else:
+                i = choices.index(v)
+                d[k] = choices[max(0, min(len(choices)-1, i + rng.choice([-1,1])))]
+        elif isinstance(v,bool):
+            d[k] = not v
+        elif isinstance(v,int):
+            d[k] = max(2, v + rng.choice([-2,0,2]))
     return d
 
-def crossover(a: dict, b: dict) -> dict:
+def crossover(a: dict, b: dict, rng=random) -> dict:
     c = {}
-    for k in set(a)|set(b):
-        c[k] = random.choice([a.get(k), b.get(k)])
+    for k in sorted(set(a)|set(b)):
+        c[k] = rng.choice([a.get(k), b.get(k)])
     return c
@@ -1,15 +1,220 @@
 from __future__ import annotations
-import time, random
-
-def eval_candidate(candidate: dict, sample_prompts: list[str]) -> dict:
-    seed = sum(ord(c) for c in str(candidate)) % 9973
-    random.seed(seed)
-    quality = 0.80 + 0.15 * random.random()
-    b = candidate.get("bits", 8)
-    kv = candidate.get("kv_cache_bits", 8)
-    latency = max(5.0, 50.0/(b+kv/8.0))
-    stability = 1.0
-    return {"quality": quality, "latency_ms": latency, "stability": stability}
+import hashlib, json, time
+
+try:  # the micro-benchmark needs numpy; without it candidates cannot be measured
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+BENCH_VERSION = "qes-micro-v1"
+# workload: one transformer block's MLP plus a quantised-KV attention read over a cached context
+D_MODEL, D_FF, N_TOKENS, N_CTX, N_HEADS = 128, 512, 64, 1024, 4
+OBJECTIVES = (("latency_ms", "min"), ("memory_mb", "min"), ("quality", "max"))
+
+
+def config_hash(candidate: dict) -> str:
+    return hashlib.sha1(json.dumps({"v": BENCH_VERSION, **candidate}, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def _workload(seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    outliers = np.random.default_rng(1234).choice(D_MODEL, 4, replace=False)  # same channels for every batch
+    x = rng.standard_normal((4, N_TOKENS, D_MODEL)).astype(np.float32)
+    x[..., outliers] *= 20.0  # activation outlier channels, as in real LLMs
+    wr = np.random.default_rng(4321)  # weights are the model: fixed across workloads
+    w1 = (wr.standard_normal((D_MODEL, D_FF)) / np.sqrt(D_MODEL)).astype(np.float32)
+    w2 = (wr.standard_normal((D_FF, D_MODEL)) / np.sqrt(D_FF)).astype(np.float32)
+    w1[wr.choice(D_MODEL, 2, replace=False)] *= 8.0  # a few salient weight rows
+    hd = D_MODEL // N_HEADS
+    k = rng.standard_normal((N_HEADS, N_CTX, hd)).astype(np.float32)
+    v = rng.standard_normal((N_HEADS, N_CTX, hd)).astype(np.float32)
+    q = rng.standard_normal((N_HEADS, N_TOKENS, hd)).astype(np.float32)
+    return {"x": x, "w1": w1, "w2": w2, "k": k, "v": v, "q": q}
+
+
+# --- packed integer tensors -------------------------------------------------------------------
+
+def _qparams(x, bits: int, symmetric: bool, axis):
+    if symmetric:
+        half = 1 << (bits - 1)
+        scale = np.abs(x).max(axis=axis, keepdims=True) / max(half - 1, 1)
+        scale[scale == 0] = 1.0
+        return scale, np.full_like(scale, half)
+    lo, hi = x.min(axis=axis, keepdims=True), x.max(axis=axis, keepdims=True)
+    scale = (hi - lo) / ((1 << bits) - 1)
+    scale[scale == 0] = 1.0
+    return scale, np.round(-lo / scale)
+
+
+def _pack(codes, bits: int, scale, zero, symmetric: bool) -> dict:
+    flat = codes.astype(np.uint8).ravel()
+    if bits <= 4:  # two codes per byte
+        if flat.size % 2: flat = np.append(flat, np.uint8(0))
+        flat = flat[0::2] | (flat[1::2] << 4)
+    return {"data": flat, "bits": bits, "shape": codes.shape, "scale": scale.astype(np.float16),
+            "zero": (1 << (bits - 1)) if symmetric else zero.astype(np.uint8)}
+
+
+def _quantize(x, bits: int, symmetric: bool = True, axis=-1) -> dict:
+    if bits >= 16: return {"data": x.astype(np.float16), "bits": 16}
+    scale, zero = _qparams(x, bits, symmetric, axis)
+    return _pack(np.clip(np.round(x / scale) + zero, 0, (1 << bits) - 1), bits, scale, zero, symmetric)
+
+
+def _dequant(t: dict):
+    if t["bits"] >= 16: return t["data"].astype(np.float32)
+    data, n = t["data"], int(np.prod(t["shape"]))
+    if t["bits"] <= 4:
+        codes = np.empty(data.size * 2, dtype=np.uint8); codes[0::2] = data & 15; codes[1::2] = data >> 4
+        data = codes[:n]
+    zero = t["zero"] if np.isscalar(t["zero"]) else t["zero"].astype(np.float32)
+    return (data.reshape(t["shape"]).astype(np.float32) - zero) * t["scale"].astype(np.float32)
+
+
+def _nbytes(t: dict) -> int:
+    return sum(v.nbytes for v in t.values() if isinstance(v, np.ndarray))
+
+
+def _quant_weight(w, bits: int, group: int, symmetric: bool, hessian=None) -> dict:
+    """Group-wise quantisation along the input dim; with `hessian`, GPTQ error feedback across rows."""
+    rows, cols = w.shape; group = min(group, rows)
+    if bits >= 16: return {"data": w.astype(np.float16), "bits": 16, "rows": rows}
+    if hessian is None:
+        t = _quantize(w.reshape(rows // group, group, cols), bits, symmetric, axis=1)
+        return {**t, "rows": rows}
+    h = hessian + np.eye(rows) * 0.01 * np.mean(np.diag(hessian))
+    hinv = np.linalg.cholesky(np.linalg.inv(h)).T  # upper Cholesky factor of H^-1
+    w = w.astype(np.float64).copy()
+    codes = np.zeros((rows // group, group, cols)); scales = []; zeros = []
+    for g, start in enumerate(range(0, rows, group)):
+        scale, zero = _qparams(w[start:start + group], bits, symmetric, 0)
+        scales.append(scale); zeros.append(zero)
+        for i in range(start, start + group):
+            codes[g, i - start] = np.clip(np.round(w[i] / scale[0]) + zero[0], 0, (1 << bits) - 1)
+            err = (w[i] - (codes[g, i - start] - zero[0]) * scale[0]) / hinv[i, i]
+            w[i + 1:] -= np.outer(hinv[i, i + 1:], err)
+    return {**_pack(codes, bits, np.stack(scales), np.stack(zeros), symmetric), "rows": rows}
+
+
+def _weight(t: dict):
+    return _dequant(t).reshape(t["rows"], -1)
+
+
+# --- the quantised block ----------------------------------------------------------------------
+
+def _act_scale(x, bits: int, tracker: str) -> float:
+    """Static activation scale from calibration batches, using the candidate's range tracker."""
+    a = np.abs(x)
+    if tracker == "percentile": r = np.percentile(a, 99.9)
+    elif tracker == "ema":
+        r = a[0].max()
+        for batch in a[1:]: r = 0.9 * r + 0.1 * batch.max()
+    else: r = a.max()
+    return max(float(r), 1e-8) / ((1 << (bits - 1)) - 1)
+
+
+def _quant_act(x, bits: int, scale: float, keep=None):
+    if bits >= 16: return x
+    levels = (1 << (bits - 1)) - 1
+    out = np.clip(np.round(x / scale), -levels, levels) * np.float32(scale)
+    return out if keep is None else np.where(keep, x, out)
+
+
+def prepare(c: dict, wl: dict, calib: dict) -> dict:
+    """Offline step: quantise weights and the KV cache, fix smoothing factors and activation scales."""
+    bits = int(c.get("bits", 8)); abits = int(c.get("activation_bits", 16)); group = int(c.get("group_size", 128))
+    sym = c.get("scheme", "symmetric") == "symmetric"; tracker = c.get("range_tracker", "static")
+    w1, cx = wl["w1"], calib["x"]
+    act_mag = np.abs(cx).reshape(-1, D_MODEL).max(axis=0) + 1e-6
+    s = np.ones(D_MODEL, dtype=np.float32)
+    if c.get("smoothquant"):  # migrate activation outliers into the weights (alpha = 0.5)
+        s = s * np.sqrt(act_mag / (np.abs(w1).max(axis=1) + 1e-6))
+    if c.get("awq"):  # scale salient input channels up before weight rounding
+        s = s * (act_mag / act_mag.mean()) ** 0.25
+    s = s.astype(np.float32); w1 = w1 * s[:, None]; cx = cx / s
+    keep = routed = None
+    if c.get("outlier_routing"):  # LLM.int8()-style: outlier channels and their weight rows stay in fp16
+        keep = np.zeros(D_MODEL, dtype=bool); keep[np.argsort(-np.abs(cx).reshape(-1, D_MODEL).max(axis=0))[:4]] = True
+        routed = w1[keep].astype(np.float16)
+    hess = None
+    if c.get("gptq"):
+        flat = cx.reshape(-1, D_MODEL).astype(np.float64); hess = flat.T @ flat
+    q1 = _quant_weight(w1, bits, group, sym, hess)
+    q2 = _quant_weight(wl["w2"], bits, group, sym)
+    kvb = int(c.get("kv_cache_bits", 16))
+    m = {"s": s, "keep": keep, "routed": routed, "w1": q1, "w2": q2, "abits": abits,
+         "k": _quantize(wl["k"], kvb), "v": _quantize(wl["v"], kvb)}
+    if abits < 16:
+        m["x_scale"] = _act_scale(np.where(keep, 0.0, cx) if keep is not None else cx, abits, tracker)
+        m["h_scale"] = _act_scale(np.maximum(cx @ _weight(q1), 0.0), abits, tracker)
+    return m
+
+
+def infer(m: dict, x, q):
+    """The measured inference path: dequantise-on-read weights and KV, static activation quantisation."""
+    w1 = _weight(m["w1"])
+    if m["routed"] is not None: w1[m["keep"]] = m["routed"]
+    x = _quant_act(x / m["s"], m["abits"], m.get("x_scale", 1.0), m["keep"])
+    h = _quant_act(np.maximum(x @ w1, 0.0), m["abits"], m.get("h_scale", 1.0))
+    y = h @ _weight(m["w2"])
+    k, v = _dequant(m["k"]), _dequant(m["v"])
+    scores = q @ k.transpose(0, 2, 1) / np.float32(np.sqrt(k.shape[-1]))
+    p = np.exp(scores - scores.max(-1, keepdims=True)); p /= p.sum(-1, keepdims=True)
+    return y, p @ v
+
+
+def _reference(wl: dict):
+    y = np.maximum(wl["x"] @ wl["w1"], 0.0) @ wl["w2"]
+    scores = wl["q"] @ wl["k"].transpose(0, 2, 1) / np.float32(np.sqrt(wl["k"].shape[-1]))
+    p = np.exp(scores - scores.max(-1, keepdims=True)); p /= p.sum(-1, keepdims=True)
+    return y, p @ wl["v"]
+
+
+def _rel_err(a, b) -> float:
+    return float(np.linalg.norm(a - b) / max(np.linalg.norm(b), 1e-12))
+
+
+def micro_benchmark(candidate: dict, seeds=(0, 1, 2), repeats: int = 5) -> dict:
+    """Quantise the block per the candidate, then measure inference latency, held bytes and error vs fp32."""
+    if np is None: raise RuntimeError("numpy is required for the QES micro-benchmark")
+    calib = _workload(10_000)
+    errs, lat, mem = [], [], 0
+    for seed in seeds:
+        wl = _workload(seed)
+        m = prepare(candidate, wl, calib)
+        mem = _nbytes(m["w1"]) + _nbytes(m["w2"]) + _nbytes(m["k"]) + _nbytes(m["v"]) + (m["routed"].nbytes if m["routed"] is not None else 0)
+        best = float("inf")
+        for _ in range(repeats):
+            t0 = time.perf_counter(); y, o = infer(m, wl["x"], wl["q"]); best = min(best, time.perf_counter() - t0)
+        lat.append(best * 1000.0)
+        ref_y, ref_o = _reference(wl)
+        errs.append(0.5 * (_rel_err(y, ref_y) + _rel_err(o, ref_o)))
+    return {"quality": round(max(0.0, 1.0 - float(np.mean(errs))), 6), "latency_ms": round(float(np.median(lat)), 4),
+            "memory_mb": round(mem / float(1 << 20), 6), "stability": round(max(0.0, 1.0 - float(np.std(errs)) * 10.0), 6),
+            "samples": len(seeds)}
+
+
+def dominates(a: dict, b: dict, margin: float = 0.0) -> bool:
+    """Pareto dominance of `a` over `b`; with `margin`, `a` must be better by that relative amount on every objective."""
+    strictly = False
+    for key, sense in OBJECTIVES:
+        x, y = float(a[key]), float(b[key])
+        if sense == "min": x, y = -x, -y
+        if margin:
+            if x < y + abs(y) * margin: return False
+        elif x < y: return False
+        strictly = strictly or x > y
+    return strictly
+
+
+def eval_candidate(candidate: dict, front: list[dict] | None = None, prune_margin: float = 0.05) -> dict:
+    """Two-phase measured fitness: a one-seed screen, stopped early when the front clearly dominates it, then the full run."""
+    quick = micro_benchmark(candidate, seeds=(0,), repeats=2)
+    for member in front or []:
+        if dominates(member, quick, prune_margin):
+            return {**quick, "pruned": True, "config_hash": config_hash(candidate)}
+    return {**micro_benchmark(candidate), "pruned": False, "config_hash": config_hash(candidate)}
+
 
 def score(fit: dict, w=(0.6,0.3,0.1)) -> float:
     q,l,s = fit["quality"], fit["latency_ms"], fit["stability"]
@@ -1,38 +1,121 @@
-
 from __future__ import annotations
-import os, json, yaml
-from .fitness import eval_candidate, score
+import os, json, time, random, platform, contextlib, yaml
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from .fitness import eval_candidate, score, dominates, config_hash, BENCH_VERSION
 from .evolution import mutate, crossover
 from .sandbox import run_trial
 
 SPACE = yaml.safe_load(open("quantlab/qes/search_space.yaml","r",encoding="utf-8"))
 POLICY_PATH = "runtime/quantlab/policy.json"
 POLICY_DIR  = "runtime/quantlab/policies"
+PARETO_PATH = "runtime/quantlab/pareto.json"
+CACHE_PATH  = "runtime/quantlab/fitness_cache.json"
+MIN_QUALITY = 0.90
+_BLAS_THREADS = ("OMP_NUM_THREADS","OPENBLAS_NUM_THREADS","MKL_NUM_THREADS","VECLIB_MAXIMUM_THREADS","NUMEXPR_NUM_THREADS")
+
+def sample_candidate(rng=random) -> dict:
+    return {k: rng.choice(v) for k,v in SPACE.items()}
+
+def _machine() -> str:
+    # latencies are only comparable on the same host and benchmark version
+    return f"{BENCH_VERSION}:{platform.node()}:{platform.machine()}:{os.cpu_count()}"
+
+def _load(path: str) -> dict:
+    try:
+        data = json.load(open(path,"r",encoding="utf-8"))
+        return data if data.get("machine") == _machine() else {}
+    except Exception:
+        return {}
+
+def _save(path: str, data: dict) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp,"w",encoding="utf-8") as f: json.dump({"machine": _machine(), "updated_at": time.time(), **data}, f)
+    os.replace(tmp, path)
+
+def pareto_front(entries: list[dict]) -> list[dict]:
+    """Non-dominated fully measured entries ({candidate, fitness}), one per config hash."""
+    full = {e["fitness"]["config_hash"]: e for e in entries if not e["fitness"].get("pruned")}
+    return [e for h,e in full.items()
+            if not any(dominates(o["fitness"], e["fitness"]) for g,o in full.items() if g != h)]
+
+def _pick(front: list[dict], min_quality: float) -> dict | None:
+    ok = [e for e in front if e["fitness"]["quality"] >= min_quality]
+    return max(ok, key=lambda e: score(e["fitness"])) if ok else None
+
+@contextlib.contextmanager
+def _single_threaded_blas():
+    # parallel workers each timing a multi-threaded BLAS would measure contention, not the config.
+    # BLAS reads these once at load, so they only reach freshly spawned workers, never this process
+    saved = {k: os.environ.get(k) for k in _BLAS_THREADS}
+    os.environ.update({k: "1" for k in _BLAS_THREADS})
+    try: yield
+    finally:
+        for k,v in saved.items():
+            if v is None: os.environ.pop(k, None)
+            else: os.environ[k] = v
+
+def _workers(workers: int | None) -> int:
+    if workers: return max(1, int(workers))
+    if os.getenv("QES_WORKERS"): return max(1, int(os.environ["QES_WORKERS"]))
+    return max(1, (os.cpu_count() or 2) // 2)  # leave cores idle so timings stay quiet
+
+def _evaluate(batch: list[dict], front: list[dict], pool) -> list[dict]:
+    rivals = [e["fitness"] for e in front]
+    return list(pool.map(eval_candidate, batch, [rivals]*len(batch)))
 
-def sample_candidate() -> dict:
-    import random
-    return {k: random.choice(v) for k,v in SPACE.items()}
+def run_evolution(capsule: str | None = None, budget_trials: int = 16, workers: int | None = None,
+                  population: int = 8, min_quality: float = MIN_QUALITY, seed: int | None = None) -> dict:
+    """Generational search over SPACE scored by the measured micro-benchmark.
 
-def run_evolution(capsule: str | None = None, budget_trials: int = 16) -> dict:
-    sample_prompts = ["hello world","explain quicksort","proof sketch of pythagoras"]
+    Each generation's unseen configs are benchmarked in spawned worker processes (even with workers=1, so
+    every measurement runs under the same single-threaded BLAS); full results are memoised by config hash
+    in CACHE_PATH, so `budget_trials` counts new measurements only. Candidates the current front clearly
+    dominates after a one-seed screen are stopped early and only remembered for this run. The Pareto front over
+    latency/memory/quality persists in PARETO_PATH; the policy is its best-scoring member above `min_quality`.
+    """
+    rng = random.Random(seed)
     os.makedirs(os.path.dirname(POLICY_PATH), exist_ok=True)
     os.makedirs(POLICY_DIR, exist_ok=True)
-    pop = [sample_candidate() for _ in range(6)]
-    best = None
-    for t in range(budget_trials):
-        cand = pop[t % len(pop)]
-        fit = eval_candidate(cand, sample_prompts)
-        sc = score(fit)
-        run_trial(cand, fit)
-        if fit["quality"] >= 0.80 and (best is None or sc > best["score"]):
-            best = {"candidate": cand, "fitness": fit, "score": sc}
-        a = sample_candidate(); b = sample_candidate()
-        pop.append(mutate(cand))
-        pop.append(crossover(a,b))
+    cache = _load(CACHE_PATH).get("entries", {})
+    front = pareto_front(_load(PARETO_PATH).get("front", []))
+    seen: dict[str, dict] = {}
+    stats = {"trials": 0, "cache_hits": 0, "pruned": 0, "generations": 0}
+    pop = [dict(e["candidate"]) for e in front[:population // 2]]
+    pop += [sample_candidate(rng) for _ in range(population - len(pop))]
+    n = _workers(workers)
+    with _single_threaded_blas(), ProcessPoolExecutor(n, mp_context=mp.get_context("spawn")) as pool:
+        stale = 0
+        while stats["trials"] < budget_trials and stale < 8:
+            batch, fresh = [], []
+            for cand in pop:
+                h = config_hash(cand)
+                if h in seen or any(config_hash(c) == h for c in batch): continue
+                if h in cache:
+                    seen[h] = {"candidate": cand, "fitness": cache[h]}; stats["cache_hits"] += 1
+                elif len(batch) < budget_trials - stats["trials"]:
+                    batch.append(cand)
+            for cand, fit in zip(batch, _evaluate(batch, front, pool)):
+                run_trial(cand, fit)
+                if not fit.get("pruned"): cache[fit["config_hash"]] = fit  # a screen is only valid against this front
+                seen[fit["config_hash"]] = entry = {"candidate": cand, "fitness": fit}
+                fresh.append(entry)
+            stats["trials"] += len(batch); stats["pruned"] += sum(e["fitness"].get("pruned", False) for e in fresh)
+            stats["generations"] += 1
+            stale = 0 if batch else stale + 1
+            front = pareto_front(front + list(seen.values()))
+            parents = [e["candidate"] for e in front] or [e["candidate"] for e in seen.values()] or pop
+            pop = [mutate(crossover(rng.choice(parents), rng.choice(parents), rng), SPACE, rng) for _ in range(population - 1)]
+            pop.append(sample_candidate(rng))  # keep some exploration outside the front's neighbourhood
+    _save(CACHE_PATH, {"entries": cache})
+    _save(PARETO_PATH, {"objectives": ["latency_ms","memory_mb","quality"], "front": front})
+    best = _pick(front, min_quality)
     if best:
         pol = {"engine": best["candidate"].get("engine_hint","transformers"),
                "quant": f"int{best['candidate'].get('bits','8')}",
-               "qes": {"candidate": best["candidate"], "fitness": best["fitness"]}}
+               "qes": {"candidate": best["candidate"], "fitness": best["fitness"], "score": round(score(best["fitness"]), 6),
+                       "pareto_front": PARETO_PATH, "front_size": len(front), **stats}}
         with open(POLICY_PATH,"w",encoding="utf-8") as f: f.write(json.dumps(pol))
         if capsule:
             with open(os.path.join(POLICY_DIR, f"{capsule}.json"),"w",encoding="utf-8") as f:
@@ -1,4 +1,5 @@
 from .benchmarks import TriAttentionComparativeBenchmark
 from .provider import TriAttentionProviderCard
+from .reference import KVCompressionPolicy, ReferenceGeometry
 
-__all__ = ["TriAttentionComparativeBenchmark", "TriAttentionProviderCard"]
+__all__ = ["KVCompressionPolicy", "ReferenceGeometry", "TriAttentionComparativeBenchmark", "TriAttentionProviderCard"]
@@ -19,6 +19,7 @@ class TriAttentionComparativeBenchmark:
 
     def run(self, *, context_windows: list[int]) -> dict[str, Any]:
         cases: list[dict[str, Any]] = []
+        measured_cases: list[dict[str, Any]] = []
         primary_ratios: list[float] = []
         throughput_ratios: list[float] = []
         latency_ratios: list[float] = []
@@ -32,28 +33,48 @@ class TriAttentionComparativeBenchmark:
         for context_tokens in context_windows:
             tri = self.provider.estimate(context_tokens=context_tokens)
             baselines = self.baselines.baseline_cases(context_tokens=context_tokens)
+            measured = tri.get("measurement")
+            projected = tri
+            if measured is not None:
+                # dense attention on the same tensors replaces the formula for the primary baseline; the
+                # other baselines are compared against the measured ratios/deltas applied to the dense path
+                formula = baselines[0]
+                baselines[0] = {**formula, **self.provider.case_metrics(measured, "dense"), "measurement_mode": "numpy-reference"}
+                projected = {
+                    **tri,
+                    **{
+                        key: round(float(formula[key]) * float(tri[key]) / max(float(baselines[0][key]), 1e-9), 3)
+                        for key in ("kv_memory_mb", "throughput_tokens_per_s", "latency_ms")
+                    },
+                    **{
+                        key: round(float(formula[key]) + float(tri[key]) - float(baselines[0][key]), 4)
+                        for key in ("stability_score", "reasoning_quality", "long_context_regression")
+                    },
+                }
+                measured_cases.append(measured)
             runtime_anchors = self.baselines.runtime_anchor_cases(context_tokens=context_tokens)
             primary = baselines[0]
             baseline_providers.update(item["provider_name"] for item in baselines)
             primary_ratios.append(float(tri["kv_memory_mb"]) / max(float(primary["kv_memory_mb"]), 1.0))
             throughput_ratios.append(float(tri["throughput_tokens_per_s"]) / max(float(primary["throughput_tokens_per_s"]), 1.0))
-            latency_ratios.append(float(tri["latency_ms"]) / max(float(primary["latency_ms"]), 1.0))
+            latency_ratios.append(float(tri["latency_ms"]) / max(float(primary["latency_ms"]), 1e-9))
             stability_deltas.append(float(tri["stability_score"]) - float(primary["stability_score"]))
             reasoning_deltas.append(float(tri["reasoning_quality"]) - float(primary["reasoning_quality"]))
             regression_deltas.append(float(tri["long_context_regression"]) - float(primary["long_context_regression"]))
             comparisons = []
             for baseline in baselines:
+                subject = tri if baseline is primary else projected
                 comparison = (
                     {
                         "provider_name": baseline["provider_name"],
                         "comparison_kind": baseline.get("comparison_kind"),
                         "source_refs": baseline.get("source_refs", []),
-                        "kv_memory_ratio": round(float(tri["kv_memory_mb"]) / max(float(baseline["kv_memory_mb"]), 1.0), 4),
-                        "throughput_ratio": round(float(tri["throughput_tokens_per_s"]) / max(float(baseline["throughput_tokens_per_s"]), 1.0), 4),
-                        "latency_ratio": round(float(tri["latency_ms"]) / max(float(baseline["latency_ms"]), 1.0), 4),
-                        "stability_delta": round(float(tri["stability_score"]) - float(baseline["stability_score"]), 4),
-                        "reasoning_delta": round(float(tri["reasoning_quality"]) - float(baseline["reasoning_quality"]), 4),
-                        "regression_delta": round(float(tri["long_context_regression"]) - float(baseline["long_context_regression"]), 4),
+                        "kv_memory_ratio": round(float(subject["kv_memory_mb"]) / max(float(baseline["kv_memory_mb"]), 1.0), 4),
+                        "throughput_ratio": round(float(subject["throughput_tokens_per_s"]) / max(float(baseline["throughput_tokens_per_s"]), 1.0), 4),
+                        "latency_ratio": round(float(subject["latency_ms"]) / max(float(baseline["latency_ms"]), 1e-9), 4),
+                        "stability_delta": round(float(subject["stability_score"]) - float(baseline["stability_score"]), 4),
+                        "reasoning_delta": round(float(subject["reasoning_quality"]) - float(baseline["reasoning_quality"]), 4),
+                        "regression_delta": round(float(subject["long_context_regression"]) - float(baseline["long_context_regression"]), 4),
                     }
                 )
                 comparisons.append(comparison)
@@ -80,12 +101,12 @@ class TriAttentionComparativeBenchmark:
                         "source_health": anchor.get("source_health"),
                         "backend_type": anchor.get("backend_type"),
                         "source_refs": anchor.get("source_refs", []),
-                        "kv_memory_ratio": round(float(tri["kv_memory_mb"]) / max(float(anchor["kv_memory_mb"]), 1.0), 4),
-                        "throughput_ratio": round(float(tri["throughput_tokens_per_s"]) / max(float(anchor["throughput_tokens_per_s"]), 1.0), 4),
-                        "latency_ratio": round(float(tri["latency_ms"]) / max(float(anchor["latency_ms"]), 1.0), 4),
-                        "stability_delta": round(float(tri["stability_score"]) - float(anchor["stability_score"]), 4),
-                        "reasoning_delta": round(float(tri["reasoning_quality"]) - float(anchor["reasoning_quality"]), 4),
-                        "regression_delta": round(float(tri["long_context_regression"]) - float(anchor["long_context_regression"]), 4),
+                        "kv_memory_ratio": round(float(projected["kv_memory_mb"]) / max(float(anchor["kv_memory_mb"]), 1.0), 4),
+                        "throughput_ratio": round(float(projected["throughput_tokens_per_s"]) / max(float(anchor["throughput_tokens_per_s"]), 1.0), 4),
+                        "latency_ratio": round(float(projected["latency_ms"]) / max(float(anchor["latency_ms"]), 1.0), 4),
+                        "stability_delta": round(float(projected["stability_score"]) - float(anchor["stability_score"]), 4),
+                        "reasoning_delta": round(float(projected["reasoning_quality"]) - float(anchor["reasoning_quality"]), 4),
+                        "regression_delta": round(float(projected["long_context_regression"]) - float(anchor["long_context_regression"]), 4),
                     }
                 )
             cases.append(
@@ -158,6 +179,8 @@ class TriAttentionComparativeBenchmark:
             "head_to_head": head_to_head,
             "runtime_anchor_summary": runtime_anchor_summary,
             "runtime_anchor_quality_summary": runtime_anchor_quality_summary,
+            "measurement_mode": "numpy-reference" if measured_cases else "analytic-projection",
+            "measurement_summary": self._measurement_summary(measured_cases),
             "generated_at": utcnow().isoformat(),
         }
         thresholds = load_triattention_thresholds()
@@ -200,6 +223,10 @@ class TriAttentionComparativeBenchmark:
                     f"# TriAttention Comparative Benchmark {report_id}",
                     "",
                     f"- Case count: {summary['case_count']}",
+                    f"- Measurement mode: {summary['measurement_mode']}",
+                    f"- Average output relative error vs full attention: {summary['measurement_summary'].get('avg_output_relative_error')}",
+                    f"- Average attention mass kept: {summary['measurement_summary'].get('avg_attention_recall')}",
+                    f"- Average peak memory ratio: {summary['measurement_summary'].get('avg_peak_memory_ratio')}",
                     f"- Average KV memory ratio: {summary['avg_kv_memory_ratio']}",
                     f"- Average throughput ratio: {summary['avg_throughput_ratio']}",
                     f"- Average latency ratio: {summary['avg_latency_ratio']}",
@@ -233,3 +260,21 @@ class TriAttentionComparativeBenchmark:
                 "report": str(report_path),
             },
         }
+
+    @staticmethod
+    def _measurement_summary(measured_cases: list[dict[str, Any]]) -> dict[str, Any]:
+        if not measured_cases:
+            return {}
+        n = len(measured_cases)
+        return {
+            "case_count": n,
+            "policy": measured_cases[0]["policy"],
+            "geometry": measured_cases[0]["geometry"],
+            "avg_output_relative_error": round(sum(item["output_relative_error"] for item in measured_cases) / n, 6),
+            "avg_output_cosine": round(sum(item["output_cosine"] for item in measured_cases) / n, 6),
+            "avg_attention_recall": round(sum(item["attention_recall"] for item in measured_cases) / n, 6),
+            "avg_peak_memory_ratio": round(
+                sum(item["compressed"]["peak_memory_mb"] / max(item["dense"]["peak_memory_mb"], 1e-9) for item in measured_cases) / n, 4
+            ),
+            "avg_compression_ms": round(sum(item["compressed"]["compression_ms"] for item in measured_cases) / n, 4),
+        }
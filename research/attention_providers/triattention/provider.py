@@ -2,8 +2,14 @@ from __future__ import annotations
 
 from typing import Any
 
+from . import reference
+
 
 class TriAttentionProviderCard:
+    def __init__(self, *, policy: reference.KVCompressionPolicy | None = None, geometry: reference.ReferenceGeometry | None = None):
+        self.policy = policy or reference.KVCompressionPolicy()
+        self.geometry = geometry or reference.ReferenceGeometry()
+
     def summary(self, *, enabled: bool = False) -> dict:
         return {
             "provider_name": "triattention",
@@ -14,10 +20,47 @@ class TriAttentionProviderCard:
             "focus": ["kv compression", "long-context efficiency", "key-importance estimation"],
         }
 
+    def measure(self, *, context_tokens: int) -> dict[str, Any] | None:
+        """NumPy reference run of dense vs compressed attention; None when numpy is unavailable."""
+        if reference.np is None:
+            return None
+        return reference.measure(context_tokens, self.policy, self.geometry)
+
     def estimate(self, *, context_tokens: int) -> dict[str, Any]:
+        measured = self.measure(context_tokens=context_tokens)
+        if measured is not None:
+            return {
+                "context_tokens": context_tokens,
+                "measurement_mode": "numpy-reference",
+                **self.case_metrics(measured, "compressed"),
+                "measurement": measured,
+            }
+        return self._projection(context_tokens=context_tokens)
+
+    @staticmethod
+    def case_metrics(measured: dict[str, Any], variant: str) -> dict[str, Any]:
+        """Map a reference run onto the benchmark case fields; `variant` is "compressed" or "dense".
+
+        Quality fields are measured against full attention on the same tensors: stability is the
+        output cosine, reasoning quality the attention mass kept, regression the relative output error.
+        """
+        side = measured[variant]
+        dense = variant == "dense"
+        return {
+            "kv_memory_mb": side["kv_memory_mb"],
+            "peak_memory_mb": side["peak_memory_mb"],
+            "throughput_tokens_per_s": side["throughput_tokens_per_s"],
+            "latency_ms": side["attention_ms"],
+            "stability_score": 1.0 if dense else measured["output_cosine"],
+            "reasoning_quality": 1.0 if dense else measured["attention_recall"],
+            "long_context_regression": 0.0 if dense else measured["output_relative_error"],
+        }
+
+    def _projection(self, *, context_tokens: int) -> dict[str, Any]:
         scale = max(context_tokens, 1024) / 1024.0
         return {
             "context_tokens": context_tokens,
+            "measurement_mode": "analytic-projection",
             "kv_memory_mb": round(180.0 * scale * 0.62, 3),
             "throughput_tokens_per_s": round(max(8.0, 96.0 / scale), 3),
             "latency_ms": round(19.0 + scale * 5.1, 3),
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any
+
+try:  # optional: without numpy the provider card falls back to its analytic projection
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only when numpy is missing
+    np = None
+
+
+@dataclass(frozen=True)
+class KVCompressionPolicy:
+    """TriAttention cache policy: keep attention sinks, a recent window and the most important middle keys.
+
+    Importance is the attention mass each key receives from the last `observation_window` prompt
+    queries, max-pooled over `pool_kernel` neighbouring positions, selected per head.
+    """
+
+    compression_ratio: float = 0.25
+    sink_tokens: int = 4
+    recent_tokens: int = 256
+    observation_window: int = 32
+    pool_kernel: int = 7
+    kv_bits: int = 16
+
+    def budget(self, context_tokens: int) -> int:
+        return max(min(context_tokens, int(round(context_tokens * self.compression_ratio))), self.sink_tokens + 1)
+
+
+@dataclass(frozen=True)
+class ReferenceGeometry:
+    """Shape of the NumPy reference tensors and of the model the measured bytes are scaled to."""
+
+    heads: int = 4
+    head_dim: int = 64
+    decode_queries: int = 16
+    model_layers: int = 22
+    model_kv_heads: int = 4
+    model_head_dim: int = 64
+    dtype_bytes: int = 2
+
+    def model_bytes_per_ref_byte(self) -> float:
+        return (self.model_layers * self.model_kv_heads * self.model_head_dim) / (self.heads * self.head_dim)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("numpy is required for the TriAttention reference")
+
+
+def synthetic_kv(context_tokens: int, geometry: ReferenceGeometry = ReferenceGeometry(), *, seed: int = 0) -> dict[str, Any]:
+    """Key/value/query tensors with the structure compression relies on: sinks, salient tokens and recency."""
+    _require_numpy()
+    rng = np.random.default_rng(seed)
+    h, d, t = geometry.heads, geometry.head_dim, context_tokens
+    topic = rng.standard_normal((h, 1, d)).astype(np.float32)
+    topic *= np.float32(np.sqrt(d)) / np.linalg.norm(topic, axis=-1, keepdims=True)
+    keys = rng.standard_normal((h, t, d), dtype=np.float32)
+    values = rng.standard_normal((h, t, d), dtype=np.float32)
+    salient = rng.random((h, t)) < 0.02
+    recency = np.linspace(0.0, 1.0, t, dtype=np.float32) ** 8
+    keys += (salient[..., None] * np.float32(1.2) + recency[None, :, None] * np.float32(1.2)) * topic
+    keys[:, : min(4, t)] += 2.0 * topic
+    queries = rng.standard_normal((h, geometry.decode_queries + 32, d), dtype=np.float32) + np.float32(0.5) * topic
+    return {"keys": keys, "values": values, "prompt_queries": np.ascontiguousarray(queries[:, :32]),
+            "decode_queries": np.ascontiguousarray(queries[:, 32:])}
+
+
+def attention(queries: Any, keys: Any, values: Any) -> tuple[Any, Any]:
+    """Softmax attention per head; returns (output, probabilities)."""
+    scores = np.matmul(queries, keys.transpose(0, 2, 1)) / np.float32(np.sqrt(queries.shape[-1]))
+    scores -= scores.max(axis=-1, keepdims=True)
+    probs = np.exp(scores)
+    probs /= probs.sum(axis=-1, keepdims=True)
+    return np.matmul(probs, values), probs
+
+
+def _quantize(x: Any, bits: int) -> tuple[Any, int]:
+    """Per-token symmetric quantisation round trip; returns (dequantised tensor, stored bytes)."""
+    if bits >= 16:
+        return x, x.shape[0] * x.shape[1] * x.shape[2] * 2
+    levels = (1 << (bits - 1)) - 1
+    scale = np.abs(x).max(axis=-1, keepdims=True) / levels
+    scale[scale == 0] = 1.0
+    q = np.clip(np.round(x / scale), -levels, levels)
+    stored = q.size * bits // 8 + scale.size * 2
+    return (q * scale).astype(np.float32), stored
+
+
+def compress(keys: Any, values: Any, prompt_queries: Any, policy: KVCompressionPolicy) -> dict[str, Any]:
+    """Apply the eviction policy per head; returns the kept indices, compressed tensors and stored bytes."""
+    _require_numpy()
+    h, t, d = keys.shape
+    budget = policy.budget(t)
+    if budget >= t:
+        index = np.broadcast_to(np.arange(t), (h, t))
+        kept_k, kept_v = keys, values
+    else:
+        sinks = min(policy.sink_tokens, budget)
+        recent = min(policy.recent_tokens, max(budget - sinks, 0) // 2)
+        middle = budget - sinks - recent
+        window = prompt_queries[:, -policy.observation_window:]
+        _, probs = attention(window, keys, values)
+        importance = probs.sum(axis=1)
+        if policy.pool_kernel > 1:
+            pad = policy.pool_kernel // 2
+            padded = np.pad(importance, ((0, 0), (pad, pad)), constant_values=0.0)
+            importance = np.lib.stride_tricks.sliding_window_view(padded, policy.pool_kernel, axis=-1).max(axis=-1)
+        lo, hi = sinks, t - recent
+        chosen = np.argpartition(-importance[:, lo:hi], middle - 1, axis=-1)[:, :middle] + lo if middle > 0 else np.empty((h, 0), dtype=np.int64)
+        fixed = np.concatenate([np.arange(sinks), np.arange(hi, t)])
+        index = np.sort(np.concatenate([np.broadcast_to(fixed, (h, fixed.size)), chosen], axis=-1), axis=-1)
+        kept_k = np.take_along_axis(keys, index[..., None], axis=1)
+        kept_v = np.take_along_axis(values, index[..., None], axis=1)
+    kept_k, k_bytes = _quantize(kept_k, policy.kv_bits)
+    kept_v, v_bytes = _quantize(kept_v, policy.kv_bits)
+    return {"index": index, "keys": kept_k, "values": kept_v, "bytes": k_bytes + v_bytes, "budget": int(index.shape[1])}
+
+
+def _timed(fn: Any, *args: Any, repeats: int = 3) -> tuple[Any, float, int]:
+    """Best-of-`repeats` wall clock in ms, with the tracemalloc peak of one run."""
+    tracemalloc.start()
+    try:
+        result = fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn(*args)
+        best = min(best, (time.perf_counter() - started) * 1000.0)
+    return result, best, peak
+
+
+def measure(context_tokens: int, policy: KVCompressionPolicy = KVCompressionPolicy(), geometry: ReferenceGeometry = ReferenceGeometry(),
+            *, tensors: dict[str, Any] | None = None, seed: int = 0) -> dict[str, Any]:
+    """Run full and compressed attention on the same tensors and report measured cost and error.
+
+    `tensors` may carry real (heads, tokens, dim) keys/values and prompt/decode queries captured from a
+    model; otherwise `synthetic_kv` is used. Latency is per decode step (all `decode_queries` at once).
+    """
+    _require_numpy()
+    data = tensors or synthetic_kv(context_tokens, geometry, seed=seed)
+    keys, values = data["keys"], data["values"]
+    queries = data["decode_queries"]
+    context_tokens = int(keys.shape[1])
+    (full_out, full_probs), full_ms, full_peak = _timed(attention, queries, keys, values)
+    packed, compress_ms, compress_peak = _timed(compress, keys, values, data["prompt_queries"], policy, repeats=1)
+    (comp_out, _), comp_ms, comp_peak = _timed(attention, queries, packed["keys"], packed["values"])
+
+    dense_bytes = keys.size * geometry.dtype_bytes * 2
+    rel_error = float(np.linalg.norm(comp_out - full_out) / max(np.linalg.norm(full_out), 1e-12))
+    cosine = float(np.mean(np.sum(comp_out * full_out, axis=-1)
+                           / np.maximum(np.linalg.norm(comp_out, axis=-1) * np.linalg.norm(full_out, axis=-1), 1e-12)))
+    recall = float(np.mean(np.take_along_axis(full_probs, np.broadcast_to(packed["index"][:, None, :], full_probs.shape[:2] + packed["index"].shape[-1:]), axis=-1).sum(axis=-1)))
+    steps = queries.shape[1]
+    scale = geometry.model_bytes_per_ref_byte() / float(1 << 20)
+    return {
+        "context_tokens": context_tokens,
+        "policy": asdict(policy),
+        "geometry": asdict(geometry),
+        "kept_tokens": packed["budget"],
+        "dense": {
+            "kv_bytes": int(dense_bytes),
+            "kv_memory_mb": round(dense_bytes * scale, 3),
+            "attention_ms": round(full_ms, 4),
+            "peak_memory_mb": round((full_peak + dense_bytes) / float(1 << 20), 3),
+            "throughput_tokens_per_s": round(steps / max(full_ms / 1000.0, 1e-9), 3),
+        },
+        "compressed": {
+            "kv_bytes": int(packed["bytes"]),
+            "kv_memory_mb": round(packed["bytes"] * scale, 3),
+            "attention_ms": round(comp_ms, 4),
+            "compression_ms": round(compress_ms, 4),
+            "peak_memory_mb": round((max(comp_peak, compress_peak) + packed["bytes"]) / float(1 << 20), 3),
+            "throughput_tokens_per_s": round(steps / max(comp_ms / 1000.0, 1e-9), 3),
+        },
+        "output_relative_error": round(rel_error, 6),
+        "output_cosine": round(cosine, 6),
+        "attention_recall": round(recall, 6),
+    }
+
+
+def sweep(context_tokens: int, ratios: list[float], policy: KVCompressionPolicy = KVCompressionPolicy(), **kwargs: Any) -> list[dict[str, Any]]:
+    """Measure several compression ratios on the same tensors, for tuning the policy on data."""
+    geometry = kwargs.pop("geometry", ReferenceGeometry())
+    tensors = kwargs.pop("tensors", None) or synthetic_kv(context_tokens, geometry, seed=kwargs.pop("seed", 0))
+    fields = {k: v for k, v in asdict(policy).items() if k != "compression_ratio"}
+    return [measure(context_tokens, KVCompressionPolicy(compression_ratio=ratio, **fields), geometry, tensors=tensors) for ratio in ratios]
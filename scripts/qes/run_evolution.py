@@ -7,8 +7,9 @@ if __name__ == "__main__":
     ap = argparse.ArgumentParser()
     ap.add_argument("--capsule", default=None)
     ap.add_argument("--trials", type=int, default=None)
+    ap.add_argument("--workers", type=int, default=None, help="benchmark processes (default: half the cores)")
     args = ap.parse_args()
     cfg = yaml.safe_load(open("runtime/config/qes.yaml","r",encoding="utf-8"))
     trials = args.trials or int(cfg.get("budget",{}).get("trials",16))
-    pol = run_evolution(args.capsule, trials)
+    pol = run_evolution(args.capsule, trials, workers=args.workers)
     print("Winner:", pol or current_policy())
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Bulk-load a text corpus into the RetrievalService store.
+
+Usage:
+  python scripts/rag/bulk_ingest.py [CORPUS_DIR] [--workers N] [--batch-size N] [--artifact-mode MODE]
+"""
+from __future__ import annotations
+import argparse, json, os
+from pathlib import Path
+
+from nexus.config import build_paths, ensure_paths, load_runtime_configs
+from nexus.retrieval import RetrievalService
+from nexus.storage import NexusStore
+
+
+def iter_documents(corpus: Path, max_bytes: int):
+    for p in sorted(corpus.rglob("*")):
+        if not p.is_file() or p.stat().st_size >= max_bytes:
+            continue
+        try:
+            txt = p.read_text(encoding="utf-8", errors="ignore")
+        except Exception:
+            continue
+        yield {"source": str(p), "title": p.name, "text": txt, "metadata": {"path": str(p)}}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("corpus", nargs="?", default=os.environ.get("CORPUS_DIR", "data/corpus"))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=512)
+    parser.add_argument("--artifact-mode", default="content-addressed", choices=["per-document", "content-addressed", "none"])
+    parser.add_argument("--max-bytes", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    paths = ensure_paths(build_paths())
+    store = NexusStore(paths)
+    retrieval = RetrievalService(paths, store, retrieval_config=load_runtime_configs(paths).get("retrieval", {}))
+    report = retrieval.bulk_ingest(
+        iter_documents(Path(args.corpus), args.max_bytes),
+        batch_size=args.batch_size,
+        workers=args.workers,
+        artifact_mode=args.artifact_mode,
+    )
+    report.pop("doc_ids", None)
+    print(json.dumps(report, indent=2))
+if __name__ == "__main__":
+    main()
@@ -1,42 +1,66 @@
-
 #!/usr/bin/env python3
+"""Incrementally keep the retrieval store and temporal KG in sync with data/corpus.
+
+Usage:
+  python scripts/rag/watch_ingest.py            # one incremental pass (cron-friendly)
+  python scripts/rag/watch_ingest.py --watch    # long-running daemon (watchdog or polling)
+"""
 from __future__ import annotations
-import os, time, glob, hashlib
-from pathlib import Path
-from temporal import tkg
-from temporal.atomic_extractor import extract_facts
-
-STATE="runtime/state/ingest.hash"
-os.makedirs("runtime/state", exist_ok=True)
-
-def digest():
-    h=hashlib.sha256()
-    for p in glob.glob("data/corpus/**/*.txt", recursive=True):
-        with open(p,"rb") as f: h.update(f.read())
-    return h.hexdigest()
-
-def ingest():
-    for p in glob.glob("data/corpus/**/*.txt", recursive=True):
-        try:
-            txt = Path(p).read_text(encoding="utf-8", errors="ignore")
-        except Exception:
-            continue
-        # naive: each line -> fact about file contains text
-        facts=extract_facts(txt)
-        if facts:
-            for f in facts:
-                tkg.upsert_fact(f['s'], f['p'], f['o'], p, int(time.time()-86400), int(time.time()+10*365*86400))
-        else:
-            tkg.upsert_fact(subj=p, pred='contains', obj=txt[:40], source=p, valid_from=int(time.time()-86400), valid_to=int(time.time()+10*365*86400))
+import argparse, json, logging, os, time
+
+from connectors.corpus_watch import IncrementalIngestDaemon, RetrievalSink, TemporalSink
+
+STATE="runtime/state/ingest_manifest.json"
+
+
+def build_sinks(targets):
+    sinks=[]
+    if "retrieval" in targets:
+        from nexus.config import build_paths, ensure_paths, load_runtime_configs
+        from nexus.retrieval import RetrievalService
+        from nexus.storage import NexusStore
+        paths = ensure_paths(build_paths())
+        retrieval = RetrievalService(paths, NexusStore(paths), retrieval_config=load_runtime_configs(paths).get("retrieval", {}))
+        sinks.append(RetrievalSink(retrieval))
+    if "temporal" in targets:
+        sinks.append(TemporalSink())
+    return sinks
+
 
 def main():
-    cur = digest()
-    prev = Path(STATE).read_text(encoding="utf-8") if Path(STATE).exists() else ""
-    if cur != prev:
-        ingest()
-        Path(STATE).write_text(cur, encoding="utf-8")
-        print("Indexed changes.")
-    else:
-        print("No changes.")
+    parser = argparse.ArgumentParser()
+    parser.add_argument("corpus", nargs="?", default=os.environ.get("CORPUS_DIR", "data/corpus"))
+    parser.add_argument("--manifest", default=STATE)
+    parser.add_argument("--pattern", action="append", dest="patterns")
+    parser.add_argument("--sink", action="append", dest="sinks", choices=["retrieval", "temporal"])
+    parser.add_argument("--watch", action="store_true")
+    parser.add_argument("--poll-interval", type=float, default=2.0)
+    parser.add_argument("--queue-size", type=int, default=64)
+    parser.add_argument("--no-watchdog", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    daemon = IncrementalIngestDaemon(
+        args.corpus,
+        manifest_path=args.manifest,
+        sinks=build_sinks(args.sinks or ["retrieval", "temporal"]),
+        patterns=args.patterns or ["*.txt"],
+        queue_size=args.queue_size,
+        poll_interval_seconds=args.poll_interval,
+        use_watchdog=not args.no_watchdog,
+    )
+    if not args.watch:
+        report = daemon.run_once()
+        print("Indexed changes." if report["changes"] else "No changes.")
+        print(json.dumps(report, indent=2))
+        return
+    daemon.start()
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.stop()
 if __name__ == "__main__":
     main()
@@ -1,275 +1,442 @@
-
 from __future__ import annotations
+import heapq
+import itertools
+import json
+import os
+import random
 import threading
 import time
 import subprocess
 import yaml
 import shlex
 import logging
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Dict, Any, Optional
 from pathlib import Path
 
+from nexusnet.agents.scheduled.cadence import Cadence, next_run_iso  # noqa: F401 - re-exported
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
-class _Job(threading.Thread):
-    """Individual scheduled job execution thread"""
-
-    daemon = True
-
-    def __init__(self, name: str, period_s: int, cmd: str, timeout: int = 300,
-                 max_retries: int = 3, enabled: bool = True):
-        super().__init__(name=name)
-        self.period_s = period_s
-        self.cmd = cmd
-        self.timeout = timeout
-        self.max_retries = max_retries
-        self.enabled = enabled
-        self._stop = False
-        self.last_run: Optional[float] = None
-        self.last_success: Optional[float] = None
-        self.failure_count = 0
-        self.execution_count = 0
-        self.logger = logging.getLogger(f"{__name__}.{name}")
-
-    def run(self):
-        """Main job execution loop"""
-        self.logger.info(f"Job {self.name} started - interval: {self.period_s}s")
-
-        while not self._stop:
-            # Skip execution if disabled
-            if not self.enabled:
-                self.logger.debug(f"Job {self.name} disabled, skipping execution")
-                time.sleep(1)
-                continue
+MISFIRE_POLICIES = ("run_once", "skip", "catch_up")
 
-            try:
-                start_time = time.time()
 
-                # Execute with retry logic
-                success = self._execute_with_retries()
+@dataclass
+class JobSpec:
+    """Scheduled job definition; exactly one of ``cmd`` or ``target`` is set."""
 
-                # Update statistics
-                execution_time = time.time() - start_time
-                self.execution_count += 1
-                self.last_run = start_time
+    name: str
+    cadence: Cadence
+    cmd: Optional[str] = None
+    target: Optional[Callable[[], Any]] = None
+    job_class: str = "default"
+    timeout: int = 300
+    max_retries: int = 3
+    retry_backoff_s: float = 2.0
+    jitter_s: float = 0.0
+    misfire: str = "run_once"
+    misfire_grace_s: float = 60.0
+    enabled: bool = True
+    stats: Dict[str, Any] = field(default_factory=dict)
 
-                if success:
-                    self.last_success = start_time
-                    self.failure_count = 0  # Reset failure counter
-                    self.logger.info("03d")
-                else:
-                    self.failure_count += 1
-                    if self.failure_count >= self.max_retries:
-                        self.logger.error(f"Job {self.name} failed after {self.failure_count} attempts, disabling")
-                        self.enabled = False
-                    else:
-                        self.logger.warning(f"Job {self.name} failed (attempt {self.failure_count}/{self.max_retries})")
-
-            except Exception as e:
-                self.logger.error(f"Unexpected error in job {self.name}: {e}")
-                self.failure_count += 1
-
-            # Wait for next execution cycle
-            for _ in range(self.period_s):
-                if self._stop:
-                    break
-                time.sleep(1)
-
-        self.logger.info(f"Job {self.name} stopped")
-
-    def _execute_with_retries(self) -> bool:
-        """Execute command with retry logic"""
-        for attempt in range(self.max_retries):
-            try:
-                self.logger.debug(f"Executing job {self.name}: {self.cmd[:50]}..." if len(self.cmd) > 50 else f"Executing: {self.cmd}")
-
-                # Execute with timeout
-                result = subprocess.run(
-                    shlex.split(self.cmd),
-                    capture_output=True,
-                    text=True,
-                    timeout=self.timeout,
-                    check=False
-                )
-
-                if result.returncode == 0:
-                    self.logger.debug(f"Job {self.name} completed successfully")
-                    return True
-                else:
-                    error_msg = f"Job {self.name} failed with return code {result.returncode}"
-                    if result.stderr:
-                        error_msg += f": {result.stderr.strip()}"
-                    self.logger.warning(error_msg)
 
-                    # Don't retry certain types of errors immediately
-                    if result.returncode in [2, 127]:  # Command not found, permission denied
-                        break
+class _StateFile:
+    """JSON job state written atomically after every claim and completion."""
 
-            except subprocess.TimeoutExpired:
-                self.logger.error(f"Job {self.name} timed out after {self.timeout}s")
-                continue
-            except (FileNotFoundError, OSError) as e:
-                self.logger.error(f"Execution error for job {self.name}: {e}")
-                break
-            except Exception as e:
-                self.logger.error(f"Unexpected execution error for job {self.name}: {e}")
-                break
-
-            if attempt < self.max_retries - 1 and not self._stop:
-                time.sleep(min(2 ** attempt, 30))  # Exponential backoff, max 30s
-
-        return False
-
-    def stop(self):
-        """Stop the job execution"""
-        self.logger.info(f"Stopping job {self.name}")
-        self._stop = True
-
-    def get_stats(self) -> Dict[str, Any]:
-        """Get job statistics"""
-        return {
-            "name": self.name,
-            "enabled": self.enabled,
-            "execution_count": self.execution_count,
-            "failure_count": self.failure_count,
-            "last_run": self.last_run,
-            "last_success": self.last_success,
-            "success_rate": (self.execution_count - self.failure_count) / max(self.execution_count, 1)
-        }
-
-class Scheduler:
-    """Enterprise-grade job scheduler with comprehensive monitoring"""
+    def __init__(self, path: Optional[str]):
+        self.path = Path(path) if path else None
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        if self.path and self.path.exists():
+            try:
+                self.jobs = dict(json.loads(self.path.read_text(encoding="utf-8")).get("jobs", {}))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Scheduler state {self.path} unreadable, starting fresh: {e}")
 
-    def __init__(self, cfg_path: str = "runtime/config/automation.yaml"):
-        self.jobs: List[_Job] = []
-        self.logger = logging.getLogger(__name__)
+    def save(self):
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps({"version": 1, "jobs": self.jobs}, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+class TimerScheduler:
+    """Single event-loop scheduler: a heap of due times dispatching to a bounded executor.
+
+    A fire is claimed in the state file (next_run_at advanced, in_flight_since set) before
+    the job is submitted, so a restart never repeats a completed run; a run that was still in
+    flight when the process died is treated as missed and handled by the job's misfire policy.
+    """
+
+    def __init__(self, *, state_path: Optional[str] = None, max_workers: int = 4,
+                 class_limits: Optional[Dict[str, int]] = None, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self.max_workers = max(int(max_workers), 1)
+        self.class_limits = {name: max(int(limit), 1) for name, limit in (class_limits or {}).items()}
+        self.state = _StateFile(state_path)
+        self.specs: Dict[str, JobSpec] = {}
         self.metrics = {
             "jobs_enabled": 0,
             "jobs_total": 0,
             "successful_executions": 0,
             "failed_executions": 0,
-            "runtime_errors": 0
+            "runtime_errors": 0,
+            "coalesced": 0,
+            "deferred_by_class_limit": 0,
+            "misfires": 0,
         }
+        self._heap: List[tuple] = []
+        self._tokens: Dict[str, int] = {}
+        self._counter = itertools.count()
+        self._in_flight: Dict[str, float] = {}
+        self._deferred: set = set()
+        self._class_running: Dict[str, int] = {}
+        self._cond = threading.Condition()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._start_time: Optional[float] = None
+        self.logger = logging.getLogger(__name__)
+
+    # -- registration -------------------------------------------------------------------
+
+    def add_job(self, spec: JobSpec) -> JobSpec:
+        if spec.misfire not in MISFIRE_POLICIES:
+            raise ValueError(f"misfire policy must be one of {MISFIRE_POLICIES}")
+        with self._cond:
+            self.specs[spec.name] = spec
+            spec.stats.setdefault("execution_count", 0)
+            spec.stats.setdefault("failure_count", 0)
+            self.metrics["jobs_total"] = len(self.specs)
+            self.metrics["jobs_enabled"] = sum(1 for item in self.specs.values() if item.enabled)
+            if spec.enabled:
+                self._schedule_initial(spec)
+            self._cond.notify()
+        return spec
+
+    def remove_job(self, name: str) -> bool:
+        with self._cond:
+            spec = self.specs.pop(name, None)
+            self._tokens.pop(name, None)
+            self.metrics["jobs_total"] = len(self.specs)
+            self.metrics["jobs_enabled"] = sum(1 for item in self.specs.values() if item.enabled)
+            self._cond.notify()
+        return spec is not None
+
+    def _schedule_initial(self, spec: JobSpec):
+        now = self.clock()
+        saved = self.state.jobs.setdefault(spec.name, {})
+        spec.stats.update({key: saved[key] for key in ("execution_count", "failure_count", "last_run", "last_success") if key in saved})
+        if saved.get("in_flight_since") is not None:
+            # died mid-run: the claimed fire never completed
+            self.metrics["misfires"] += 1
+            saved.pop("in_flight_since", None)
+            if spec.misfire == "skip":
+                base = due = spec.cadence.next_after(now)
+            else:
+                base, due = float(saved.get("claimed_due", now)), now
+        elif saved.get("next_run_at") is not None:
+            base = due = float(saved["next_run_at"])
+            if due < now - spec.misfire_grace_s:
+                self.metrics["misfires"] += 1
+                if spec.misfire == "skip":
+                    base = due = spec.cadence.next_after(now)
+                elif spec.misfire == "run_once":
+                    due = now
+        else:
+            base = due = spec.cadence.next_after(now)
+        saved["next_run_at"] = due if due >= now else base
+        self.state.save()
+        self._push(spec.name, due + self._jitter(spec), "run", base)
+
+    def _jitter(self, spec: JobSpec) -> float:
+        return random.uniform(0.0, spec.jitter_s) if spec.jitter_s > 0 else 0.0
+
+    def _push(self, name: str, due: float, kind: str, base: float, attempt: int = 0):
+        token = next(self._counter)
+        if kind == "run":
+            self._tokens[name] = token
+        heapq.heappush(self._heap, (due, token, name, kind, base, attempt))
+
+    # -- event loop ---------------------------------------------------------------------
+
+    def start(self):
+        """Start the dispatch loop (one thread) and the bounded executor"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._start_time = time.time()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scheduler-job")
+        self._thread = threading.Thread(target=self._loop, name="scheduler-loop", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Scheduler started with {len(self.specs)} jobs, {self.max_workers} workers")
+
+    def stop(self, timeout: float = 10.0):
+        """Stop dispatching and wait for running jobs"""
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self.logger.info("Scheduler stopped")
+
+    def _loop(self):
+        while not self._stop.is_set():
+            with self._cond:
+                entry = self._pop_due()
+                if entry is None:
+                    wait_for = (self._heap[0][0] - self.clock()) if self._heap else 60.0
+                    self._cond.wait(timeout=max(min(wait_for, 60.0), 0.01))
+                    continue
+                self._dispatch(entry)
+
+    def run_pending(self) -> int:
+        """Dispatch everything already due; for callers driving the clock themselves"""
+        fired = 0
+        with self._cond:
+            while True:
+                entry = self._pop_due()
+                if entry is None:
+                    return fired
+                fired += int(self._dispatch(entry))
+
+    def _pop_due(self) -> Optional[tuple]:
+        now = self.clock()
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            _, token, name, kind, _, _ = entry
+            spec = self.specs.get(name)
+            if spec is None or not spec.enabled:
+                continue
+            if kind == "run" and self._tokens.get(name) != token:
+                continue  # superseded by a reschedule
+            return entry
+        return None
+
+    def _dispatch(self, entry: tuple) -> bool:
+        """Called with the condition held"""
+        due, _, name, kind, base, attempt = entry
+        spec = self.specs[name]
+        now = self.clock()
+        if kind == "run":
+            next_base = spec.cadence.next_after(base)
+            if next_base <= now and spec.misfire != "catch_up":
+                next_base = spec.cadence.next_after(now)
+            self._push(name, next_base + self._jitter(spec), "run", next_base)
+            self.state.jobs.setdefault(name, {})["next_run_at"] = next_base
+        if name in self._in_flight or (kind == "run" and name in self._deferred):
+            # a retry or deferred fire never overlaps a run of the same job; the run in flight covers it
+            self.metrics["coalesced"] += 1
+            self.state.save()
+            return False
+        self._deferred.discard(name)
+        limit = self.class_limits.get(spec.job_class)
+        if limit is not None and self._class_running.get(spec.job_class, 0) >= limit:
+            # retry the same fire shortly instead of queueing unbounded work
+            self.metrics["deferred_by_class_limit"] += 1
+            self._deferred.add(name)
+            heapq.heappush(self._heap, (now + 1.0, next(self._counter), name, "retry", base, attempt))
+            self.state.save()
+            return False
+        self._in_flight[name] = now
+        self._class_running[spec.job_class] = self._class_running.get(spec.job_class, 0) + 1
+        saved = self.state.jobs.setdefault(name, {})
+        saved["in_flight_since"] = now
+        saved["claimed_due"] = base
+        self.state.save()
+        if self._executor is None:
+            self._cond.release()
+            try:
+                self._execute(spec, base, attempt)
+            finally:
+                self._cond.acquire()
+        else:
+            self._executor.submit(self._execute, spec, base, attempt)
+        return True
+
+    def _execute(self, spec: JobSpec, base: float, attempt: int):
+        started = self.clock()
+        crashed = False
+        try:
+            success = self._invoke(spec)
+        except Exception as e:
+            self.logger.error(f"Unexpected error in job {spec.name}: {e}")
+            crashed, success = True, False
+        with self._cond:
+            self.metrics["runtime_errors"] += int(crashed)
+            self._in_flight.pop(spec.name, None)
+            self._class_running[spec.job_class] = max(self._class_running.get(spec.job_class, 1) - 1, 0)
+            saved = self.state.jobs.setdefault(spec.name, {})
+            saved.pop("in_flight_since", None)
+            saved.pop("claimed_due", None)
+            spec.stats["execution_count"] = spec.stats.get("execution_count", 0) + 1
+            spec.stats["last_run"] = started
+            if success:
+                spec.stats["last_success"] = started
+                spec.stats["failure_count"] = 0
+                self.metrics["successful_executions"] += 1
+            else:
+                spec.stats["failure_count"] = spec.stats.get("failure_count", 0) + 1
+                self.metrics["failed_executions"] += 1
+                if attempt + 1 < spec.max_retries and not self._stop.is_set():
+                    backoff = min(spec.retry_backoff_s * (2 ** attempt), 30.0)
+                    heapq.heappush(self._heap, (self.clock() + backoff, next(self._counter), spec.name, "retry", base, attempt + 1))
+                    self.logger.warning(f"Job {spec.name} failed (attempt {attempt + 1}/{spec.max_retries})")
+                else:
+                    self.logger.error(f"Job {spec.name} failed after {attempt + 1} attempts")
+            saved.update({key: spec.stats.get(key) for key in ("execution_count", "failure_count", "last_run", "last_success")})
+            saved["last_status"] = "ok" if success else "failed"
+            self.state.save()
+            self._cond.notify()
+
+    def _invoke(self, spec: JobSpec) -> bool:
+        if spec.target is not None:
+            result = spec.target()
+            return result is not False
+        try:
+            result = subprocess.run(
+                shlex.split(spec.cmd or ""),
+                capture_output=True,
+                text=True,
+                timeout=spec.timeout,
+                check=False
+            )
+        except subprocess.TimeoutExpired:
+            self.logger.error(f"Job {spec.name} timed out after {spec.timeout}s")
+            return False
+        except (FileNotFoundError, OSError) as e:
+            self.logger.error(f"Execution error for job {spec.name}: {e}")
+            return False
+        if result.returncode != 0:
+            error_msg = f"Job {spec.name} failed with return code {result.returncode}"
+            if result.stderr:
+                error_msg += f": {result.stderr.strip()}"
+            self.logger.warning(error_msg)
+            return False
+        self.logger.debug(f"Job {spec.name} completed successfully")
+        return True
+
+    # -- status -------------------------------------------------------------------------
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get comprehensive scheduler status"""
+        with self._cond:
+            jobs = []
+            for spec in self.specs.values():
+                saved = self.state.jobs.get(spec.name, {})
+                executions = spec.stats.get("execution_count", 0)
+                jobs.append({
+                    "name": spec.name,
+                    "enabled": spec.enabled,
+                    "job_class": spec.job_class,
+                    "cadence": spec.cadence.spec,
+                    "running": spec.name in self._in_flight,
+                    "next_run_at": saved.get("next_run_at"),
+                    "execution_count": executions,
+                    "failure_count": spec.stats.get("failure_count", 0),
+                    "last_run": spec.stats.get("last_run"),
+                    "last_success": spec.stats.get("last_success"),
+                    "success_rate": (executions - spec.stats.get("failure_count", 0)) / max(executions, 1),
+                })
+            return {
+                "scheduler": {
+                    "active": self._thread is not None and self._thread.is_alive(),
+                    "metrics": dict(self.metrics),
+                    "uptime_seconds": time.time() - (self._start_time or time.time()),
+                    "max_workers": self.max_workers,
+                    "class_limits": dict(self.class_limits),
+                    "queued_timers": len(self._heap),
+                },
+                "jobs": jobs,
+            }
+
+
+class Scheduler(TimerScheduler):
+    """Enterprise-grade job scheduler with comprehensive monitoring"""
 
+    def __init__(self, cfg_path: str = "runtime/config/automation.yaml", *, state_path: Optional[str] = None,
+                 clock: Callable[[], float] = time.time):
+        self.cfg_path = cfg_path
+        cfg = self._read(cfg_path)
+        sc = cfg.get("scheduler", {}) or {}
+        super().__init__(
+            state_path=state_path or sc.get("state_path", "runtime/state/scheduler.json"),
+            max_workers=int(sc.get("max_workers", 4)),
+            class_limits=sc.get("class_limits") or {},
+            clock=clock,
+        )
         try:
-            self._load_configuration(cfg_path)
-            self.logger.info(f"Scheduler initialized with {len(self.jobs)} jobs")
+            self._load_configuration(cfg)
+            self.logger.info(f"Scheduler initialized with {len(self.specs)} jobs")
         except Exception as e:
             self.logger.error(f"Failed to initialize scheduler: {e}")
-            # Create minimal working configuration
-            self.jobs = []
 
-    def _load_configuration(self, cfg_path: str):
-        """Load scheduler configuration with validation"""
+    def _read(self, cfg_path: str) -> Dict[str, Any]:
         try:
             with open(cfg_path, "r", encoding="utf-8") as f:
-                cfg = yaml.safe_load(f) or {}
+                return yaml.safe_load(f) or {}
         except (FileNotFoundError, yaml.YAMLError) as e:
-            self.logger.warning(f"Configuration file {cfg_path} not found or invalid: {e}")
-            cfg = {}
+            logger.warning(f"Configuration file {cfg_path} not found or invalid: {e}")
+            return {}
 
-        sc = cfg.get("scheduler", {})
-        defaults = {
-            "enabled": True,
-            "jobs": []
-        }
-
-        if not sc.get("enabled", defaults["enabled"]):
+    def _load_configuration(self, cfg: Dict[str, Any]):
+        """Load scheduler configuration with validation"""
+        sc = cfg.get("scheduler", {}) or {}
+        if not sc.get("enabled", True):
             self.logger.info("Scheduler disabled in configuration")
             return
 
-        jobs_config = sc.get("jobs", defaults["jobs"])
+        jobs_config = list(sc.get("jobs", []) or []) + list(cfg.get("jobs", []) or [])
         if not jobs_config:
             self.logger.warning("No jobs configured in scheduler section")
 
         for i, job_config in enumerate(jobs_config):
             try:
-                # Validate required fields
                 name = job_config.get("name", f"job_{i}")
                 cmd = job_config.get("cmd")
                 if not cmd:
                     self.logger.error(f"Job {name} missing required 'cmd' field, skipping")
                     continue
-
-                # Create job with defaults
-                job = _Job(
+                cadence = job_config.get("cron") or job_config.get("cadence") or int(job_config.get("every_minutes", 60))
+                self.add_job(JobSpec(
                     name=name,
-                    period_s=int(job_config.get("every_minutes", 60)) * 60,
+                    cadence=Cadence(cadence),
                     cmd=cmd,
+                    job_class=str(job_config.get("job_class", "default")),
                     timeout=int(job_config.get("timeout_seconds", 300)),
                     max_retries=int(job_config.get("max_retries", 3)),
-                    enabled=job_config.get("enabled", True)
-                )
-
-                if job.enabled:
-                    self.metrics["jobs_enabled"] += 1
-                    self.logger.info(f"Enabled scheduled job: {name}")
-                else:
-                    self.logger.info(f"Disabled scheduled job: {name}")
-
+                    jitter_s=float(job_config.get("jitter_seconds", sc.get("jitter_seconds", 0))),
+                    misfire=str(job_config.get("misfire", sc.get("misfire", "run_once"))),
+                    misfire_grace_s=float(job_config.get("misfire_grace_seconds", 60)),
+                    enabled=bool(job_config.get("enabled", True)),
+                ))
+                self.logger.info(f"{'Enabled' if job_config.get('enabled', True) else 'Disabled'} scheduled job: {name}")
             except (ValueError, TypeError) as e:
                 self.logger.error(f"Invalid job configuration at index {i}: {e}")
                 continue
 
-        self.metrics["jobs_total"] = len(self.jobs)
-
-    def start(self):
-        """Start all enabled jobs"""
-        started_count = 0
-        for job in self.jobs:
-            if job.enabled:
-                try:
-                    job.start()
-                    started_count += 1
-                except Exception as e:
-                    self.metrics["runtime_errors"] += 1
-                    self.logger.error(f"Failed to start job {job.name}: {e}")
-
-        self.logger.info(f"Started {started_count}/{len(self.jobs)} scheduled jobs")
-
-    def stop(self):
-        """Stop all jobs gracefully"""
-        self.logger.info("Stopping all scheduled jobs")
-        stopped_count = 0
-
-        for job in self.jobs:
-            try:
-                job.stop()
-                job.join(timeout=10)  # Wait up to 10 seconds for graceful shutdown
-                stopped_count += 1
-            except Exception as e:
-                self.logger.error(f"Error stopping job {job.name}: {e}")
-
-        self.logger.info(f"Successfully stopped {stopped_count}/{len(self.jobs)} jobs")
-
-    def get_status(self) -> Dict[str, Any]:
-        """Get comprehensive scheduler status"""
-        job_stats = [job.get_stats() for job in self.jobs]
-
-        return {
-            "scheduler": {
-                "active": any(not job._stop for job in self.jobs if hasattr(job, '_stop')),
-                "metrics": self.metrics,
-                "uptime_seconds": time.time() - getattr(self, '_start_time', time.time())
-            },
-            "jobs": job_stats
-        }
-
-    def reload_configuration(self, cfg_path: str = "runtime/config/automation.yaml"):
-        """Reload scheduler configuration (needs restart to take effect for active jobs)"""
-        self.logger.info("Configuration reload requested - restart required for active jobs")
-        old_jobs = self.jobs
-
+    def reload_configuration(self, cfg_path: Optional[str] = None):
+        """Reload jobs; persisted next-run state carries over for jobs that keep their name"""
+        cfg_path = cfg_path or self.cfg_path
         try:
-            self._load_configuration(cfg_path)
-            self.logger.info(f"Configuration reloaded: {len(self.jobs)} jobs configured")
+            cfg = self._read(cfg_path)
+            for name in list(self.specs):
+                self.remove_job(name)
+            self._load_configuration(cfg)
+            self.logger.info(f"Configuration reloaded: {len(self.specs)} jobs configured")
             return True
         except Exception as e:
             self.logger.error(f"Failed to reload configuration: {e}")
-            self.jobs = old_jobs  # Restore previous configuration
             return False
 
+
 def validate_scheduler_config(config: Dict[str, Any]) -> List[str]:
     """Validate scheduler configuration and return issues"""
     issues = []
@@ -290,7 +457,14 @@ def validate_scheduler_config(config: Dict[str, Any]) -> List[str]:
         for i, job in enumerate(jobs):
             if not job.get("cmd"):
                 issues.append(f"Job at index {i}: missing required 'cmd' field")
-            if job.get("every_minutes", 0) <= 0:
+            if "cron" in job or "cadence" in job:
+                try:
+                    Cadence(job.get("cron") or job.get("cadence"))
+                except ValueError as e:
+                    issues.append(f"Job at index {i}: {e}")
+            elif job.get("every_minutes", 0) <= 0:
                 issues.append(f"Job at index {i}: 'every_minutes' must be positive")
+            if job.get("misfire", "run_once") not in MISFIRE_POLICIES:
+                issues.append(f"Job at index {i}: 'misfire' must be one of {', '.join(MISFIRE_POLICIES)}")
 
     return issues
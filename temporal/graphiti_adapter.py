@@ -19,6 +19,14 @@ class GraphitiTKG:
             self._g.add_edge(s, p, o, {"src":source,"vf":vf,"vt":vt,"prov":provenance})
         else:
             self._emu.append((s,p,o,{"src":source,"vf":vf,"vt":vt,"prov":provenance}))
+    def retract_source(self, source, at_ts):
+        n=0
+        edges = self._g.edges() if self._g else self._emu
+        for (s,p,o,data) in edges:
+            if data.get("src")==source and data.get("vt", 2**31-1) > at_ts:
+                data["vt"]=at_ts
+                n+=1
+        return n
     def as_of(self, ts: int):
         if self._g:
             out=[]
@@ -29,6 +29,17 @@ def upsert_fact(subj:str, pred:str, obj:str, source:str, valid_from:int, valid_t
     idx = len(_DB)-1
     _INDEX_SUBJ.setdefault(cs, []).append(idx)
 
+def retract_source(source:str, at_ts:int) -> int:
+    "Close the validity window of every open fact ingested from `source` (tombstone, history is kept)."
+    g = _ensure_graph()
+    if g: return g.retract_source(source, at_ts)
+    n = 0
+    for r in _DB:
+        if r["src"] == source and r["vt"] > at_ts:
+            r["vt"] = at_ts
+            n += 1
+    return n
+
 def as_of(ts:int) -> List[Dict[str,Any]]:
     g = _ensure_graph()
     if g: return g.as_of(ts)
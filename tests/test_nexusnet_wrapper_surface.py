@@ -90,3 +90,36 @@ def test_wrapper_surface_and_brain_api_endpoints(tmp_path: Path):
     assert eval_report.status_code == 200
     report_payload = eval_report.json()
     assert Path(report_payload["artifacts"]["report"]).exists()
+
+
+def test_wrapper_surface_change_feed_pushes_store_deltas(tmp_path: Path):
+    project_root = make_project(tmp_path)
+    services = build_services(str(project_root))
+    feed = services.brain_ui_surface.change_feed
+
+    initial = feed.delta("feed-session")
+    assert initial["delta"]["full"] is True
+    assert feed.delta("feed-session", since=initial["version"]) is None
+
+    before = services.store.change_sequences().get("execution_traces", 0)
+    services.brain.generate(
+        session_context=SessionContext(session_id="feed-session", expert="researcher", use_retrieval=False),
+        prompt="Record a trace so the change feed advances.",
+    )
+    assert services.store.change_sequences()["execution_traces"] > before
+
+    update = feed.delta("feed-session", since=initial["version"])
+    assert update is not None
+    assert "execution_traces" in update["changed_tables"]
+    assert update["delta"]["full"] is False
+    assert "recent_trace" in update["delta"]["changed"]
+
+    client = TestClient(create_app(str(project_root)))
+    stream = client.get("/ops/brain/wrapper-surface/stream", params={"session_id": "feed-session", "max_events": 1})
+    assert stream.status_code == 200
+    assert stream.headers["content-type"].startswith("text/event-stream")
+    assert stream.text.startswith("event: delta")
+    delta = client.get("/ops/brain/visualizer/delta", params={"session_id": "feed-session"}).json()
+    assert delta["delta"]["full"] is True
+    unchanged = client.get("/ops/brain/visualizer/delta", params={"session_id": "feed-session", "since": delta["version"]}).json()
+    assert unchanged["unchanged"] is True
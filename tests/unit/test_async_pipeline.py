@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from nexus.async_exec import AsyncChatPipeline, PipelineSaturated, RuntimeCall, StepsCancelled, drive
+
+
+class _SlowRemote:
+    """Stands in for an HTTP runtime: 0.2s per call, no thread held while waiting."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, *, session_context, prompt, messages):
+        raise AssertionError("async path must not call the blocking generate")
+
+    async def agenerate(self, *, session_context, prompt, messages, executor=None):
+        self.calls += 1
+        await asyncio.sleep(0.2)
+        if prompt == "boom":
+            raise RuntimeError("runtime down")
+        return prompt.upper()
+
+
+class _BlockingOnly:
+    def generate(self, *, session_context, prompt, messages):
+        time.sleep(0.01)
+        return f"blocking:{threading.current_thread().name.split('_')[0]}"
+
+
+class _Kernel:
+    def __init__(self, adapter):
+        self.adapter = adapter
+        self.stage_threads: set[str] = set()
+
+    def execute_chat_steps(self, request):
+        self.stage_threads.add(threading.current_thread().name.split("_")[0])
+        try:
+            output = yield RuntimeCall(self.adapter, None, request.prompt, [])
+        except RuntimeError as exc:
+            output = f"fallback after {exc}"
+        self.stage_threads.add(threading.current_thread().name.split("_")[0])
+        return SimpleNamespace(output=output, session_id=request.session_id)
+
+
+def test_hundreds_of_concurrent_chats_share_a_small_cpu_pool():
+    kernel = _Kernel(_SlowRemote())
+    entered: list[str] = []
+    submitted: list[str] = []
+
+    @contextmanager
+    def use_bundle(bundle):
+        entered.append(bundle)
+        yield bundle
+
+    store = SimpleNamespace(open_bundle=lambda session_id: session_id, use_bundle=use_bundle, submit_bundle=submitted.append)
+    pipeline = AsyncChatPipeline(kernel=kernel, store=store, config={"cpu_workers": 4, "max_in_flight": 400})
+
+    async def main():
+        requests = [SimpleNamespace(session_id=f"s{i}", prompt="boom" if i == 0 else f"hi {i}") for i in range(300)]
+        return await asyncio.gather(*(pipeline.execute_chat(request) for request in requests))
+
+    started = time.perf_counter()
+    results = asyncio.run(main())
+    elapsed = time.perf_counter() - started
+    pipeline.close()
+
+    assert elapsed < 2.0  # 300 x 0.2s serially would be a minute
+    assert results[0].output == "fallback after runtime down"
+    assert results[7].output == "HI 7"
+    assert kernel.stage_threads == {"nexus-cpu"}
+    # one write-behind bundle per request, entered by each of its synchronous stages
+    assert sorted(submitted) == sorted(f"s{i}" for i in range(300))
+    assert len(entered) == 600 and set(entered) == set(submitted)
+    summary = pipeline.summary()
+    assert summary["completed"] == 300 and summary["runtime_calls"] == 300
+    assert summary["peak_in_flight"] > 100 and summary["in_flight"] == 0
+
+
+def test_admission_queue_limits_and_blocking_runtime_fallback():
+    pipeline = AsyncChatPipeline(kernel=_Kernel(_SlowRemote()), config={"cpu_workers": 2, "max_in_flight": 2, "max_queue": 2})
+
+    async def main():
+        requests = [SimpleNamespace(session_id="s", prompt=f"p{i}") for i in range(8)]
+        return await asyncio.gather(*(pipeline.execute_chat(request) for request in requests), return_exceptions=True)
+
+    outcomes = asyncio.run(main())
+    assert sum(isinstance(item, PipelineSaturated) for item in outcomes) == 4
+    summary = pipeline.summary()
+    assert summary["peak_in_flight"] == 2 and summary["peak_queued"] == 2 and summary["rejected"] == 4
+    assert summary["queue_wait_ms_p95"] >= 150
+    pipeline.close()
+
+    blocking = _Kernel(_BlockingOnly())
+    request = SimpleNamespace(session_id="s", prompt="x")
+    assert drive(blocking.execute_chat_steps(request)).output == "blocking:MainThread"
+    pipeline = AsyncChatPipeline(kernel=blocking, config={"cpu_workers": 1})
+    assert asyncio.run(pipeline.execute_chat(request)).output == "blocking:nexus-runtime"
+    pipeline.close()
+
+    # errors from a model call surface inside the step generator, as in the synchronous code
+    failing = SimpleNamespace(generate=lambda **_: (_ for _ in ()).throw(RuntimeError("offline")))
+    assert drive(_Kernel(failing).execute_chat_steps(request)).output == "fallback after offline"
+    failing = SimpleNamespace(generate=lambda **_: (_ for _ in ()).throw(ValueError("bad")))
+    with pytest.raises(ValueError):
+        drive(_Kernel(failing).execute_chat_steps(request))
+
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(StepsCancelled):
+        drive(_Kernel(_BlockingOnly()).execute_chat_steps(request), cancel=cancel)
+
+
+def test_cancelled_request_still_submits_its_bundle():
+    submitted: list[str] = []
+
+    @contextmanager
+    def use_bundle(bundle):
+        yield bundle
+
+    store = SimpleNamespace(open_bundle=lambda session_id: session_id, use_bundle=use_bundle, submit_bundle=submitted.append)
+    pipeline = AsyncChatPipeline(kernel=_Kernel(_SlowRemote()), store=store, config={"cpu_workers": 1})
+    release = threading.Event()
+
+    async def main():
+        task = asyncio.create_task(pipeline.execute_chat(SimpleNamespace(session_id="s", prompt="hi")))
+        await asyncio.sleep(0.05)  # parked on the runtime call
+        pipeline.cpu_executor.submit(release.wait)  # the submit queues behind this
+        task.cancel()
+        await asyncio.sleep(0.05)
+        task.cancel()  # cancelled again while waiting on the submit
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        release.set()
+        await pipeline.offload(lambda: None)
+
+    asyncio.run(main())
+    pipeline.close()
+    assert submitted == ["s"]
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import time
+
+from training.eval.code_eval import CodeEvalPool
+
+TEST = "from solution import add\n\ndef test_add():\n    assert add(2, 3) == 5\n"
+
+
+def test_pool_scores_batches_in_isolated_workers_and_caches_results():
+    pool = CodeEvalPool(workers=2, batch_size=8)
+    try:
+        good = "def add(a, b):\n    return a + b\n"
+        bad = "def add(a, b):\n    return a - b\n"
+        leaky = "import builtins\nbuiltins.LEAK = 1\nopen('marker', 'w').write('x')\ndef add(a, b):\n    return a + b\n"
+        probe = "import builtins, os\nassert not hasattr(builtins, 'LEAK') and not os.path.exists('marker')\ndef add(a, b):\n    return a + b\n"
+        hang = "import time\ntime.sleep(30)\ndef add(a, b):\n    return a + b\n"
+        pairs = [(good, TEST), (bad, TEST), (leaky, TEST), (probe, TEST), (hang, TEST)]
+        pairs += [(f"def add(a, b):\n    return a + b + {i % 2}\n", TEST) for i in range(40)]
+
+        started = time.perf_counter()
+        results = pool.evaluate(pairs, timeout=2)
+        assert time.perf_counter() - started < 15
+        assert [r["ok"] for r in results[:5]] == [True, False, True, True, False]
+        assert results[4]["timed_out"]
+        assert "assert -1 == 5" in results[1]["output"]
+        assert [r["ok"] for r in results[5:]] == [i % 2 == 0 for i in range(40)]
+        assert pool.stats["evaluated"] == 7  # the 40 variants are two distinct programs
+
+        again = pool.evaluate([(good, TEST), (hang, TEST)], timeout=1)
+        assert again[0]["cached"] and not again[1]["cached"]
+    finally:
+        pool.close()
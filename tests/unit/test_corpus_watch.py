@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from connectors.corpus_watch import IncrementalIngestDaemon, RetrievalSink, TemporalSink
+from nexus.config import build_paths
+from nexus.retrieval import RetrievalService
+from nexus.schemas import RetrievalRequest
+from nexus.storage import NexusStore
+
+
+class _Graph:
+    def __init__(self):
+        self.facts: list[dict] = []
+
+    def upsert_fact(self, s, p, o, source, vf, vt, provenance=""):
+        self.facts.append({"s": s, "p": p, "o": o, "src": source, "vf": vf, "vt": vt})
+
+    def retract_source(self, source, at_ts):
+        n = 0
+        for fact in self.facts:
+            if fact["src"] == source and fact["vt"] > at_ts:
+                fact["vt"] = at_ts
+                n += 1
+        return n
+
+
+class _Counting:
+    def __init__(self, sink):
+        self.sink = sink
+        self.calls: list[tuple[str, str]] = []
+
+    def upsert(self, path, text):
+        self.calls.append(("upsert", path))
+        self.sink.upsert(path, text)
+
+    def delete(self, path):
+        self.calls.append(("delete", path))
+        self.sink.delete(path)
+
+
+def test_daemon_only_reingests_changed_files_and_tombstones_deletes(tmp_path: Path):
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    for index in range(5):
+        (corpus / f"doc{index}.txt").write_text(f"alpha provenance item {index}", encoding="utf-8")
+    paths = build_paths(tmp_path / "workspace")
+    retrieval = RetrievalService(paths, NexusStore(paths), retrieval_config={"stage2": {"enabled": False}})
+    graph = _Graph()
+    sink = _Counting(RetrievalSink(retrieval))
+    clock = iter(range(1_000, 2_000))
+    daemon = IncrementalIngestDaemon(
+        corpus,
+        manifest_path=tmp_path / "manifest.json",
+        sinks=[sink, TemporalSink(graph, extract=lambda text: [], clock=lambda: next(clock))],
+        use_watchdog=False,
+    )
+
+    assert daemon.run_once()["changes"] == 5
+    assert len(sink.calls) == 5
+    assert daemon.run_once()["changes"] == 0
+
+    sink.calls.clear()
+    changed = corpus / "doc2.txt"
+    changed.write_text("beta rewritten document", encoding="utf-8")
+    os.utime(changed, ns=(1, 1))
+    (corpus / "doc4.txt").unlink()
+    touched = corpus / "doc0.txt"
+    os.utime(touched, ns=(2, 2))
+
+    report = daemon.run_once()
+    assert report["changes"] == 3
+    assert sorted(sink.calls) == [("delete", str(corpus / "doc4.txt")), ("upsert", str(corpus / "doc2.txt"))]
+    assert report["unchanged"] == 1
+
+    sources = {chunk["source"] for chunk in retrieval.store.list_retrieval_chunks()}
+    assert str(corpus / "doc4.txt") not in sources
+    hits = retrieval.query(RetrievalRequest(query="beta rewritten", top_k=3))
+    assert hits[0].source == str(corpus / "doc2.txt")
+    assert all("alpha" not in chunk["content"] for chunk in retrieval.store.list_retrieval_chunks() if chunk["source"] == str(corpus / "doc2.txt"))
+    open_facts = {fact["src"] for fact in graph.facts if fact["vt"] > 10_000}
+    assert str(corpus / "doc4.txt") not in open_facts
+    assert str(corpus / "doc2.txt") in open_facts
+
+    reloaded = IncrementalIngestDaemon(corpus, manifest_path=tmp_path / "manifest.json", sinks=[], use_watchdog=False)
+    assert reloaded.scan() == []
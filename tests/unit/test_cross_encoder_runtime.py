@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import sys
+import threading
+
+from nexus.schemas import RetrievalHit
+from nexusnet.retrieval.rerank import CrossEncoderStageTwoReranker
+
+
+class _Model:
+    def __init__(self):
+        self.calls: list[int] = []
+
+    def predict(self, pairs, batch_size=32, convert_to_tensor=False, show_progress_bar=False):
+        self.calls.append(len(pairs))
+        return [float(len(passage)) for _, passage in pairs]
+
+
+def _hits(prefix: str, count: int) -> list[RetrievalHit]:
+    return [
+        RetrievalHit(chunk_id=f"{prefix}{index}", doc_id=prefix, source="s", content="x" * (index + 1), score=0.1)
+        for index in range(count)
+    ]
+
+
+def test_reranker_caches_load_failure_and_falls_back(monkeypatch):
+    monkeypatch.setitem(sys.modules, "sentence_transformers", None)
+    reranker = CrossEncoderStageTwoReranker(model_name="missing/model", micro_batch_window_ms=0)
+    result = reranker.rerank(query="q", candidates=_hits("a", 2), top_k=2)
+    assert result.provider_name == reranker.fallback_provider
+    failed_at = reranker._load_failed_at
+    assert reranker.model_state()["state"] == "unavailable"
+
+    reranker.rerank(query="q", candidates=_hits("b", 2), top_k=2)
+    assert reranker._load_failed_at == failed_at
+
+
+def test_reranker_micro_batches_concurrent_queries_and_truncates():
+    reranker = CrossEncoderStageTwoReranker(
+        model_name="stub",
+        pair_cache_size=0,
+        max_passage_chars=3,
+        micro_batch_window_ms=50,
+    )
+    reranker._model = _Model()
+    results = {}
+    threads = [
+        threading.Thread(target=lambda key=key: results.__setitem__(key, reranker.rerank(query=key, candidates=_hits(key, 5), top_k=5)))
+        for key in ("a", "b", "c", "d")
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(reranker._model.calls) == 20
+    assert len(reranker._model.calls) < 4
+    assert all(hit.score <= 3.0 for result in results.values() for hit in result.hits)
@@ -18,3 +18,91 @@ def test_select_engine_respects_policy(tmp_path):
         assert isinstance(pol, dict)
     finally:
         os.chdir(cwd)
+
+
+def test_balancer_prefers_fast_idle_engines_and_keeps_sticky_sessions():
+    import random
+    from core.engines.selector import Balancer, sticky_for_session
+
+    b = Balancer(["fast", "slow"], rng=random.Random(0))
+    for _ in range(30):
+        b.record("fast", 0.05)
+        b.record("slow", 0.5)
+    assert {b.choose() for _ in range(20)} == {"fast"}
+    b.stats["fast"].in_flight = 20  # a busy fast engine loses to an idle slow one
+    assert b.choose() == "slow"
+    b.stats["fast"].in_flight = 0
+
+    sticky_for_session("sess-slow", "slow")
+    assert b.choose(session_id="sess-slow") == "slow"
+    snap = b.snapshot()["engines"]["fast"]
+    assert snap["count"] == 30 and abs(snap["p95"] - 0.05) < 1e-9
+
+
+def test_hedged_request_wins_on_second_engine_and_cancels_loser():
+    import threading, time
+    from core.engines.selector import Balancer
+
+    b = Balancer(["a", "b"], hedge={"min_samples": 5, "min_delay_ms": 10, "max_ratio": 1.0})
+    for _ in range(10):
+        b.record("a", 0.02)
+        b.record("b", 0.03)
+    aborted = threading.Event()
+
+    def call(engine, cancelled):
+        if engine == "a":  # primary stalls well past its p95
+            if cancelled.wait(2.0):
+                aborted.set()
+                raise RuntimeError("cancelled")
+            return "late"
+        time.sleep(0.01)
+        return "from-b"
+
+    started = time.perf_counter()
+    result, engine = b.run(call)
+    assert (result, engine) == ("from-b", "b")
+    assert time.perf_counter() - started < 0.5
+    assert aborted.wait(1.0)
+    snap = b.snapshot()
+    assert snap["hedges"] == 1 and snap["hedge_wins"] == 1
+    assert snap["engines"]["a"]["errors"] == 0  # the cancelled loser is not counted against "a"
+
+    def flaky(engine, cancelled):
+        if engine == "b":
+            raise ConnectionError("down")
+        return "ok"
+
+    b.stats["a"].in_flight = 50  # force "b" as primary
+    assert b.run(flaky, hedge=False)[1] == "a"
+    assert b.snapshot()["failovers"] == 1
+
+
+def test_policy_weights_break_latency_ties_and_engine_calls_receive_cancel():
+    import random, threading
+    from core.engines import selector
+
+    b = selector.Balancer(["cheap", "costly"], rng=random.Random(0))
+    for _ in range(30):
+        b.record("cheap", 0.1)
+        b.record("costly", 0.1)
+    assert {b.choose(weights={"cheap": 0.9, "costly": 0.3}) for _ in range(20)} == {"cheap"}
+
+    # latency enters once, through the expected latency; the policy weights leave it out
+    with_latency, weights = selector.score_engines(), selector.score_engines(include_latency=False)
+    for eng in selector.ENGINES:
+        lat = max(0.0, min(1.0, 1.0 - selector.balancer().stats[eng].ewma))
+        assert abs(with_latency[eng] - weights[eng] - selector._load_policy()["weights"]["latency"] * lat) < 1e-9
+
+    seen = []
+
+    class _Engine:
+        def generate(self, prompt, **kw):
+            seen.append(kw.get("cancelled"))
+            return prompt
+
+    selector._instances["transformers"] = _Engine()
+    try:
+        assert selector.generate("hi")[0] == "hi"
+    finally:
+        selector._instances.pop("transformers", None)
+    assert isinstance(seen[0], threading.Event)
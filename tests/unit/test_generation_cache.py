@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from nexusnet.core.generation_cache import GenerationCache
+
+
+def _key(cache: GenerationCache, prompt: str, **sampling) -> str:
+    return cache.key(model_id="mock/default", runtime_name="mock", prompt=prompt, context="ctx", sampling=sampling)
+
+
+def test_generation_cache_normalizes_prompt_and_separates_sampling(tmp_path: Path):
+    cache = GenerationCache(enabled=True, db_path=tmp_path / "cache.sqlite")
+    assert _key(cache, "hello   world\n") == _key(cache, " hello world")
+    assert _key(cache, "hello world", temperature=0.0) != _key(cache, "hello world", temperature=0.7)
+
+    key = _key(cache, "hello world")
+    assert cache.get(key) == (None, None)
+    cache.put(key, {"output": "hi", "latency_ms": 40})
+    cached, tier = cache.get(key)
+    assert (cached["output"], tier) == ("hi", "memory")
+
+    reopened = GenerationCache(enabled=True, db_path=tmp_path / "cache.sqlite")
+    cached, tier = reopened.get(key)
+    assert (cached["output"], tier) == ("hi", "sqlite")
+    assert reopened.stats()["sqlite_hits"] == 1
+
+
+def test_generation_cache_lru_ttl_and_modes(tmp_path: Path):
+    now = [1000.0]
+    cache = GenerationCache(enabled=False, max_entries=2, ttl_seconds=10, task_modes={"benchmark": "reuse"}, clock=lambda: now[0])
+    for prompt in ("a", "b", "c"):
+        cache.put(_key(cache, prompt), {"output": prompt})
+    assert cache.get(_key(cache, "a")) == (None, None)
+    assert cache.get(_key(cache, "c"))[1] == "memory"
+    now[0] += 11
+    assert cache.get(_key(cache, "c")) == (None, None)
+    assert cache.stats()["expired"] == 1
+
+    assert cache.resolve_mode(task_type="chat", metadata={}) == "bypass"
+    assert cache.resolve_mode(task_type="benchmark", metadata={}) == "reuse"
+    assert cache.resolve_mode(task_type="benchmark", metadata={"generation_cache": "refresh"}) == "refresh"
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import pytest
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+
+from training.backends.hf import HFBackend, HFConfig
+
+
+class _CharTokenizer:
+    pad_token_id, bos_token_id, eos_token_id = 0, 1, 2
+
+    def __call__(self, texts, add_special_tokens=True, return_tensors=None):
+        ids = [([self.bos_token_id] if add_special_tokens else []) + [3 + ord(ch) % 60 for ch in text] for text in texts]
+        return {"input_ids": ids}
+
+
+def _backend(micro_batch_size: int) -> HFBackend:
+    torch.manual_seed(0)
+    model = transformers.GPT2LMHeadModel(transformers.GPT2Config(vocab_size=64, n_positions=64, n_embd=16, n_layer=1, n_head=2))
+    model.eval()
+    backend = HFBackend.__new__(HFBackend)
+    backend.cfg = HFConfig(model_id="tiny-random", micro_batch_size=micro_batch_size)
+    backend.shared, backend.adapter, backend._trainable = None, None, None
+    backend.tok, backend.m = _CharTokenizer(), model
+    return backend
+
+
+def test_batched_logprobs_match_per_item_scoring():
+    prompts = ["2+2=", "the capital of france is", "", "q"]
+    completions = ["4", " paris", "hello", " a longer completion than the rest"]
+    batched = _backend(micro_batch_size=32).logprobs(prompts, completions)
+    single = _backend(micro_batch_size=1).logprobs(prompts, completions)
+    assert batched == pytest.approx(single, abs=1e-4)
+    assert all(value < 0 for value in batched)
+
+
+def test_roles_share_one_base_and_adapter_switches_do_not_leak():
+    pytest.importorskip("peft")
+    from training.backends.hf import AdapterConfig, SharedHFBase
+
+    reference = _backend(micro_batch_size=8)
+    shared = SharedHFBase.__new__(SharedHFBase)
+    shared.cfg = reference.cfg
+    shared.adapter_cfg = AdapterConfig(r=4, alpha=8, target_modules=["c_attn"])
+    shared.tok, shared.base = reference.tok, reference.m
+    shared.base.requires_grad_(False)
+    shared.m, shared.active = None, None
+    challenger, solver = shared.role("challenger"), shared.role("solver")
+
+    assert challenger.m is solver.m
+    ours, theirs = challenger.trainable_parameters(), solver.trainable_parameters()
+    assert ours and theirs and not {id(p) for p in ours} & {id(p) for p in theirs}
+    assert sum(p.numel() for p in shared.m.parameters()) < 2 * sum(p.numel() for p in shared.base.parameters())
+
+    prompts, completions = ["2+2="], ["4"]
+    before = solver.logprobs(prompts, completions)
+    with torch.no_grad():
+        for p in ours:
+            p.add_(0.5)
+    tuned = challenger.logprobs(prompts, completions)
+    assert tuned != pytest.approx(before, abs=1e-6)
+    assert solver.logprobs(prompts, completions) == pytest.approx(before, abs=1e-6)
+    assert challenger.logprobs(prompts, completions) == pytest.approx(tuned, abs=1e-6)
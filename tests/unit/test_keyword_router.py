@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from nexus.keywords import CompiledKeywordMap, KeywordAutomaton
+from nexus.operator.routing import ExpertSelector
+
+
+def _configs(keyword_map: dict) -> dict:
+    capsules = {name: {"enabled": True} for name in [*keyword_map, "coder", "researcher"]}
+    return {"experts": {"capsules": capsules}, "router": {"default_expert": "conversationalist", "keyword_map": keyword_map}}
+
+
+def test_automaton_counts_overlapping_substrings_like_in_checks():
+    automaton = KeywordAutomaton({"a": ["he", "she", "hers"], "b": ["his", "she"], "c": ["zzz"]})
+    text = "Ushers and SHE said his"
+    hits = automaton.scan(text)
+
+    assert hits == {"a": {"she": 2, "he": 2, "hers": 1}, "b": {"she": 2, "his": 1}}
+    for group, keywords in hits.items():
+        for keyword in keywords:
+            assert keyword in text.lower()
+    assert [item["capsule"] for item in automaton.rank(text)] == ["a", "b"]
+
+
+def test_selector_ranks_by_match_count_and_rebuilds_on_config_change():
+    configs = _configs({"coder": ["code", "compile"], "builder": ["build", "deploy", "compile"]})
+    selector = ExpertSelector(configs)
+
+    assert selector.select("please compile this code") == "coder"
+    ranked = selector.rank("build it, deploy it, then compile")
+    assert [(item["capsule"], item["matches"]) for item in ranked] == [("builder", 3), ("coder", 1)]
+
+    configs["experts"]["capsules"]["builder"]["enabled"] = False
+    assert selector.select("build it, deploy it, then compile") == "coder"
+
+    configs["router"]["keyword_map"]["linguist"] = ["translate"]
+    configs["experts"]["capsules"]["linguist"] = {"enabled": True}
+    assert selector.select("translate this " + "padding " * 5000) == "linguist"
+    assert selector._matcher.builds == 2
+
+    assert selector.select("Traceback (most recent call last)") == "coder"
+    assert selector.select("why is the sky blue", use_retrieval=True) == "researcher"
+    assert selector.select("hello there") == "conversationalist"
+
+
+def test_compiled_map_reuses_the_automaton_until_the_map_changes():
+    keyword_map = {"coder": ["code"], "builder": ["build"]}
+    compiled = CompiledKeywordMap()
+    automaton = compiled.get(keyword_map)
+    assert compiled.get(keyword_map) is automaton and compiled.get(dict(keyword_map)) is automaton
+    keyword_map["coder"].append("compile")
+    assert compiled.get(keyword_map).scan("compile")["coder"] == {"compile": 1}
+    assert compiled.builds == 2
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from core.engines.llamacpp_engine import PrefixStateCache
+
+
+class _FakeLlama:
+    """Tracks the evaluated context the way llama-cpp-python does; counts prompt tokens actually evaluated."""
+
+    def __init__(self):
+        self.input_ids: list[int] = []
+        self.n_tokens = 0
+        self.evaluated = 0
+
+    def __call__(self, tokens, completion=(7, 7)):
+        keep = 0
+        while keep < min(self.n_tokens, len(tokens)) and self.input_ids[keep] == tokens[keep]:
+            keep += 1
+        self.evaluated += len(tokens) - keep
+        self.input_ids = list(tokens) + list(completion)
+        self.n_tokens = len(self.input_ids)
+
+    def save_state(self):
+        return SimpleNamespace(input_ids=list(self.input_ids), n_tokens=self.n_tokens, llama_state_size=self.n_tokens * 1024)
+
+    def load_state(self, state):
+        self.input_ids, self.n_tokens = list(state.input_ids), state.n_tokens
+
+
+def _run(cache, llm, tokens):
+    reused = cache.restore(llm, tokens)
+    llm(tokens)
+    cache.save(llm, len(tokens) - reused)
+    return reused
+
+
+def test_longest_shared_prefix_is_restored_and_only_the_suffix_evaluated():
+    preamble = list(range(1000, 1100))
+    cache = PrefixStateCache(capacity_mb=1, min_prefix_tokens=16)
+    llm = _FakeLlama()
+
+    assert _run(cache, llm, preamble + [1, 2, 3]) == 0
+    other = [5] * 80
+    assert _run(cache, llm, other) == 0  # unrelated prompt replaces the live context
+    evaluated = llm.evaluated
+    assert _run(cache, llm, preamble + [9, 9]) == 100
+    assert llm.evaluated - evaluated == 2
+    assert _run(cache, llm, preamble + [9, 9, 4]) == 102  # live context already holds the longer prefix
+
+    stats = cache.summary()
+    assert stats["prefix_hits"] == 1 and stats["live_hits"] == 1 and stats["misses"] == 2
+    assert stats["reuse_ratio"] > 0.5
+
+
+def test_memory_bound_evicts_lru_and_spills_to_disk(tmp_path):
+    # each state is ~100 KiB; room for two in memory
+    cache = PrefixStateCache(capacity_mb=0.2, disk_dir=str(tmp_path), disk_capacity_mb=1, min_prefix_tokens=16)
+    llm = _FakeLlama()
+    prompts = [[k] * 98 for k in range(1, 5)]
+    for prompt in prompts:
+        _run(cache, llm, prompt)
+
+    stats = cache.summary()
+    assert stats["entries"] == 2 and stats["bytes"] <= cache.capacity_bytes
+    assert stats["disk_entries"] == 2 and len(list(tmp_path.glob("*.llstate"))) == 2
+
+    evaluated = llm.evaluated
+    assert _run(cache, llm, prompts[0] + [8]) == 98
+    assert llm.evaluated - evaluated == 1
+    assert cache.summary()["disk_hits"] == 1
+
+
+def test_restart_removes_only_its_own_spilled_states(tmp_path):
+    foreign = tmp_path / "keep.llstate"
+    foreign.write_bytes(b"not ours")
+    cache = PrefixStateCache(capacity_mb=0.1, disk_dir=str(tmp_path), disk_capacity_mb=1, min_prefix_tokens=16)
+    llm = _FakeLlama()
+    for k in range(1, 4):
+        _run(cache, llm, [k] * 98)
+    assert len(list(tmp_path.glob("*.llstate"))) == 3
+
+    PrefixStateCache(disk_dir=str(tmp_path))
+    assert [path.name for path in tmp_path.glob("*.llstate")] == ["keep.llstate"]
+
+
+def test_relative_disk_dir_resolves_under_the_project_root(tmp_path, monkeypatch):
+    import core.engines.llamacpp_engine as engine
+
+    monkeypatch.setattr(engine, "_PROJECT_ROOT", str(tmp_path))
+    monkeypatch.chdir(tmp_path.parent)
+    cache = PrefixStateCache(disk_dir="runtime/cache/llamacpp_prefix")
+    assert cache.disk_dir == str(tmp_path / "runtime" / "cache" / "llamacpp_prefix")
+    assert (tmp_path / "runtime" / "cache" / "llamacpp_prefix").is_dir()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from nexus.config import build_paths
+from nexus.memory import MemoryService, SessionHotCache
+from nexus.schemas import MemoryQuery, Message
+from nexus.storage import NexusStore
+
+
+def _service(tmp_path: Path, **cache) -> tuple[MemoryService, list]:
+    store = NexusStore(build_paths(tmp_path / "workspace"))
+    reads: list = []
+    listing = store.list_memory_records
+
+    def counted(*args, **kwargs):
+        reads.append(args)
+        return listing(*args, **kwargs)
+
+    store.list_memory_records = counted
+    return MemoryService(store.paths, store, SessionHotCache(**cache)), reads
+
+
+def test_hot_session_reads_skip_the_store_and_return_the_newest_turns(tmp_path: Path):
+    memory, reads = _service(tmp_path)
+    memory.recent_messages("s1")
+    memory.append_messages("s1", [Message(role="user", content=f"turn {i}") for i in range(10)])
+    memory.record_semantic("s1", "fact", "test")
+    reads.clear()
+
+    assert [m.content for m in memory.recent_messages("s1", limit=3)] == ["turn 7", "turn 8", "turn 9"]
+    assert [r.content["text"] for r in memory.query(MemoryQuery(session_id="s1", plane="working", limit=2))] == ["turn 0", "turn 1"]
+    assert len(memory.query(MemoryQuery(session_id="s1", limit=50))) == 11
+    assert reads == []
+
+    memory.invalidate("s1")
+    assert [m.content for m in memory.recent_messages("s1", limit=2)] == ["turn 8", "turn 9"]
+    assert len(reads) == 1
+
+
+def test_overflowed_ring_falls_back_for_older_records_and_migrates_once(tmp_path: Path):
+    memory, reads = _service(tmp_path, records_per_session=4)
+    legacy = memory.paths.legacy_sessions_dir / "old.jsonl"
+    legacy.parent.mkdir(parents=True, exist_ok=True)
+    legacy.write_text("\n".join(json.dumps({"role": "user", "content": f"legacy {i}"}) for i in range(6)), encoding="utf-8")
+
+    assert [m.content for m in memory.recent_messages("old", limit=2)] == ["legacy 4", "legacy 5"]
+    assert [m.content for m in memory.recent_messages("old", limit=5)][0] == "legacy 1"  # beyond the ring: store
+    first = memory.query(MemoryQuery(session_id="old", limit=1))
+    assert first[0].content["text"] == "legacy 0"
+    assert len(memory.store.list_memory_records("old", limit=100)) == 6  # migrated exactly once
+    assert memory.hot_cache.summary()["fallbacks"] == 2
+
+
+def test_first_writes_under_write_behind_reach_the_ring(tmp_path: Path):
+    from nexus.write_behind import WriteBehindWriter
+
+    memory, _ = _service(tmp_path)
+    memory.store.attach_write_behind(WriteBehindWriter(memory.store, barrier_timeout_seconds=10))
+    with memory.store.write_behind_scope("s1"):
+        memory.append_messages("s1", [Message(role="user", content="queued")])
+        assert [m.content for m in memory.recent_messages("s1")] == ["queued"]
+    memory.store.write_behind.barrier()
+    assert [m.content for m in memory.recent_messages("s1")] == ["queued"]
+    assert len(memory.query(MemoryQuery(session_id="s1"))) == len(memory.store.list_memory_records("s1")) == 1
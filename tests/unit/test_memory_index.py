@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from nexus.config import build_paths
+from nexus.memory import MemoryService
+from nexus.memory.index import MemoryIndex
+from nexus.schemas import Message
+from nexus.storage import NexusStore
+
+
+def _record(memory_id: str, text: str, plane: str = "working", created_at: str = "2026-01-01T00:00:00+00:00") -> dict:
+    return {"memory_id": memory_id, "session_id": "s", "plane": plane, "content": {"text": text}, "created_at": created_at}
+
+
+def test_bm25_ranks_rare_terms_filters_planes_and_prefers_recent_ties():
+    records = [
+        _record("old", "the deploy uses the blue cluster", created_at="2026-01-01T00:00:00+00:00"),
+        _record("new", "the deploy uses the blue cluster", created_at="2026-01-09T00:00:00+00:00"),
+        _record("rare", "kubernetes ingress certificate rotation", plane="semantic"),
+        *[_record(f"noise-{i}", f"the the deploy note {i}") for i in range(20)],
+    ]
+    index = MemoryIndex(lambda session_id: records, half_life_hours=24)
+    now = 1767916800.0  # 2026-01-09
+
+    ranked = [r["memory_id"] for r, _ in index.search("s", "certificate for the deploy", top_k=3, now=now)]
+    assert ranked[0] == "rare"
+    assert [r["memory_id"] for r, _ in index.search("s", "blue cluster", top_k=2, now=now)] == ["new", "old"]
+    assert index.search("s", "certificate", planes=["working"], now=now) == []
+
+    index.add(_record("later", "certificate renewal reminder", plane="working"))
+    assert [r["memory_id"] for r, _ in index.search("s", "certificate", planes=["working"], now=now)] == ["later"]
+    assert index.summary()["builds"] == 1 and index.summary()["adds"] == 1
+
+
+def test_memory_service_searches_whole_history_and_replays_unflushed_writes(tmp_path: Path):
+    store = NexusStore(build_paths(tmp_path / "workspace"))
+    memory = MemoryService(store.paths, store)
+    memory.append_messages("s", [Message(role="user", content="my locker code is 4417")])
+    memory.append_messages("s", [Message(role="user", content=f"small talk {i}") for i in range(200)])
+
+    (record, _), = memory.search("s", "what was the locker code", top_k=1)
+    assert record.content["text"] == "my locker code is 4417"
+
+    # a write the store has not seen yet (e.g. still in a write-behind bundle) is searchable once added
+    memory.invalidate("s")
+    memory.index.add({**_record("pending", "parking spot B12"), "session_id": "s"})
+    assert memory.search("s", "parking spot", top_k=1)[0][0].memory_id == "pending"
+
+
+def test_writes_to_unsearched_sessions_are_bounded_in_total():
+    index = MemoryIndex(lambda session_id: [], max_pending_records=5)
+    for i in range(40):
+        index.add({**_record(f"m{i}", f"note {i}"), "session_id": f"s{i % 8}"})
+    assert index.summary()["pending_records"] == 5
+    assert [r["memory_id"] for r, _ in index.search("s7", "note", top_k=5)] == ["m39"]
+    assert index.summary()["pending_records"] == 4
+
+
+def test_memory_service_reads_known_index_keys_and_ignores_the_rest(tmp_path: Path):
+    store = NexusStore(build_paths(tmp_path / "workspace"))
+    config = {"max_sessions": "8", "half_life_hours": 12, "max_records_per_session": 10, "enabled": True}
+    memory = MemoryService(store.paths, store, index_config=config)
+    assert memory.index.max_sessions == 8 and memory.index.half_life_seconds == 12 * 3600.0
+    assert memory.max_indexed_records == 10
+    assert config == {"max_sessions": "8", "half_life_hours": 12, "max_records_per_session": 10, "enabled": True}
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+
+from nexus.neardup import NearDuplicateIndex, jaccard, near_duplicate_pairs, tokens
+from training.rzero.labeling import dedup_curated
+from training.rzero.rewards import repetition_penalty
+
+
+def _pool(size: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    vocab = [f"w{i}" for i in range(5000)]
+    texts = []
+    for _ in range(size):
+        if texts and rng.random() < 0.3:
+            words = rng.choice(texts).split()
+            words[rng.randrange(len(words))] = rng.choice(vocab)  # one-word edit
+            texts.append(" ".join(words))
+        else:
+            texts.append(" ".join(rng.sample(vocab, 30)))
+    return texts
+
+
+def _exact_pairs(texts: list[str], threshold: float) -> set[tuple[int, int]]:
+    sets = [tokens(text) for text in texts]
+    return {
+        (i, j)
+        for i in range(len(sets))
+        for j in range(i + 1, len(sets))
+        if jaccard(sets[i], sets[j]) >= threshold
+    }
+
+
+def test_lsh_pairs_match_exact_jaccard_with_far_fewer_comparisons():
+    texts = _pool(1000)
+    expected = _exact_pairs(texts, 0.85)
+    index = NearDuplicateIndex(0.85)
+    found = set()
+    for i, text in enumerate(texts):
+        found.update((j, i) for j, _ in index.query(text))
+        index.add(i, text)
+
+    assert expected and found == expected
+    assert index.comparisons < len(texts) * (len(texts) - 1) / 2 / 10
+    assert {(i, j) for i, j, _ in near_duplicate_pairs(texts, 0.85)} == expected
+
+
+def test_repetition_penalty_and_curated_dedup(tmp_path: Path):
+    questions = ["what is two plus two", "What is two plus two", "name a prime", "what is two plus two ?"]
+    assert repetition_penalty(questions, threshold=0.8, strength=0.2) == [0.4, 0.4, 0.0, 0.4]
+
+    earlier = tmp_path / "curated-exp-1.jsonl"
+    earlier.write_text(json.dumps({"question": "solve x plus one equals three"}) + "\n", encoding="utf-8")
+    curated = [
+        {"question": "Solve x plus one equals three"},
+        {"question": "list three primes"},
+        {"question": "list three primes please"},
+        {"question": "list three primes"},
+    ]
+    kept, dropped = dedup_curated(curated, str(tmp_path), "exp", threshold=0.9)
+    assert [item["question"] for item in kept] == ["list three primes", "list three primes please"]
+    assert dropped == 2
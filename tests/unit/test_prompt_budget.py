@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import sys
+import types
+
+from core.engines import token_counters
+from nexusnet.memory.budget import pack_prompt
+from nexusnet.memory.cortex import NeuralMemoryCortex
+
+
+class _WhitespaceTokenizer:
+    def encode(self, text, add_special_tokens=False):
+        return text.split()
+
+    def decode(self, ids, skip_special_tokens=True):
+        return " ".join(ids)
+
+
+PROMPT = "\n".join(
+    [
+        "NexusNet wrapper context:",
+        "- expert=general",
+        "- task_type=chat",
+        "Memory:",
+        "- user: we talked about sourdough starters and hydration yesterday",
+        "- assistant: the vacuum pump needs a new gasket before the next run",
+        "Retrieved context:",
+        "- (memory) we talked about sourdough starters and hydration yesterday",
+        "- (docs) sourdough hydration above 75 percent makes shaping harder",
+        "- (docs) quarterly revenue grew in the northern region " + "filler " * 30,
+        "User request: how does hydration change sourdough shaping",
+    ]
+)
+
+
+def test_packs_to_the_exact_token_budget_by_relevance(monkeypatch):
+    monkeypatch.setitem(token_counters._tok_cache, "ws-test", _WhitespaceTokenizer())
+    full = token_counters.count_tokens(PROMPT, "ws-test")
+    packed = pack_prompt(PROMPT, 50, model_id="ws-test")
+
+    assert packed.tokens_before == full > 50 >= packed.tokens_after
+    assert packed.tokens_after == len(packed.text.split())
+    assert packed.text.endswith("User request: how does hydration change sourdough shaping")
+    assert "percent makes shaping harder" in packed.text and "quarterly revenue" not in packed.text
+    assert packed.text.count("sourdough starters") == 1 and packed.duplicates == 1
+    assert "expert=general" in packed.text
+
+
+def test_cortex_reports_token_counts_and_leaves_fitting_prompts_alone(monkeypatch):
+    monkeypatch.setitem(token_counters._tok_cache, "ws-test", _WhitespaceTokenizer())
+    cortex = NeuralMemoryCortex(memory=None, store=None)
+    assert cortex.compress_prompt(PROMPT, target_tokens=500, model_id="ws-test") == (PROMPT, None)
+
+    text, trace = cortex.compress_prompt(PROMPT, target_tokens=30, model_id="ws-test")
+    assert trace.strategy == "token-budget-pack" and trace.tokenizer == "ws-test"
+    assert trace.estimated_tokens_after == len(text.split()) <= 30
+    assert trace.dropped_segments > 0 and trace.summary == text
+
+
+def test_only_prompt_segments_are_cached_and_tokenizers_load_from_disk(monkeypatch):
+    monkeypatch.setitem(token_counters._tok_cache, "ws-test", _WhitespaceTokenizer())
+    token_counters.count_segment_tokens.cache_clear()
+    pack_prompt(PROMPT, 50, model_id="ws-test")
+    assert 0 < token_counters.count_segment_tokens.cache_info().currsize < len(PROMPT.splitlines())
+
+    calls = []
+    fake = types.ModuleType("transformers")
+    fake.AutoTokenizer = types.SimpleNamespace(from_pretrained=lambda name, **kw: calls.append((name, kw)) or _WhitespaceTokenizer())
+    monkeypatch.setitem(sys.modules, "transformers", fake)
+    monkeypatch.delitem(token_counters._tok_cache, "org/model", raising=False)
+    assert token_counters.count_tokens("a b c", "org/model") == 3
+    assert calls == [("org/model", {"local_files_only": True})]
+
+
+def test_racing_threads_load_a_tokenizer_once(monkeypatch):
+    import threading
+    import time
+
+    calls = []
+
+    def slow_load(name, **kw):
+        calls.append(name)
+        time.sleep(0.05)
+        return _WhitespaceTokenizer()
+
+    fake = types.ModuleType("transformers")
+    fake.AutoTokenizer = types.SimpleNamespace(from_pretrained=slow_load)
+    monkeypatch.setitem(sys.modules, "transformers", fake)
+    monkeypatch.delitem(token_counters._tok_cache, "org/racy", raising=False)
+    threads = [threading.Thread(target=token_counters.count_tokens, args=("a b", "org/racy")) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert calls == ["org/racy"]
+    token_counters._tok_cache.pop("org/racy", None)
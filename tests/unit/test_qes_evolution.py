@@ -0,0 +1,34 @@
+from __future__ import annotations
+import json
+from quantlab.qes import manager
+from quantlab.qes.evolution import mutate
+from quantlab.qes.fitness import dominates
+
+
+def _paths(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)  # trial records land under ./runtime/qes
+    for name in ("POLICY_PATH", "PARETO_PATH", "CACHE_PATH"):
+        monkeypatch.setattr(manager, name, str(tmp_path / "quantlab" / getattr(manager, name).rsplit("/", 1)[-1]))
+    monkeypatch.setattr(manager, "POLICY_DIR", str(tmp_path / "quantlab" / "policies"))
+
+
+def test_mutation_stays_inside_the_search_space():
+    c = manager.sample_candidate()
+    for _ in range(200):
+        c = mutate(c, manager.SPACE)
+        assert all(c[k] in v for k, v in manager.SPACE.items())
+
+
+def test_measured_search_persists_front_and_memoises_configs(monkeypatch, tmp_path):
+    _paths(monkeypatch, tmp_path)
+    pol = manager.run_evolution("cap", budget_trials=6, workers=1, population=4, min_quality=0.0, seed=3)
+    assert pol["quant"] == f"int{pol['qes']['candidate']['bits']}" and pol["qes"]["trials"] == 6
+    front = json.load(open(manager.PARETO_PATH))["front"]
+    assert front and not any(dominates(a["fitness"], b["fitness"]) for a in front for b in front)
+    assert len(list((tmp_path / "runtime" / "qes" / "trials").glob("*.json"))) == 6
+    cached = json.load(open(manager.CACHE_PATH))["entries"].values()
+    assert cached and not any(fit["pruned"] for fit in cached)  # screens are never memoised across runs
+
+    again = manager.run_evolution(None, budget_trials=2, workers=1, population=4, min_quality=0.0, seed=3)
+    assert again["qes"]["cache_hits"] >= 1 and again["qes"]["trials"] == 2
+    assert manager.current_policy("cap") == pol
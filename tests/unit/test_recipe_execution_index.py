@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from nexusnet.recipes.execution_store import RecipeExecutionStore
+
+
+def test_listing_is_served_from_the_index_with_filters_and_pages(tmp_path: Path):
+    store = RecipeExecutionStore(artifacts_dir=tmp_path)
+    ids = []
+    for i in range(6):
+        record = store.record(
+            recipe_id="alpha" if i % 2 == 0 else "beta",
+            execution_kind="recipe",
+            status="success" if i < 5 else "failed",
+            schedule_id="nightly" if i == 3 else None,
+            started_at=f"2026-03-0{i + 1}T00:00:00+00:00",
+        )
+        ids.append(record["execution_id"])
+
+    assert [r["execution_id"] for r in store.list_executions(limit=2)] == ids[::-1][:2]
+    assert [r["execution_id"] for r in store.list_executions(limit=2, offset=2)] == ids[::-1][2:4]
+    assert [r["execution_id"] for r in store.list_executions(recipe_id="alpha")] == [ids[4], ids[2], ids[0]]
+    assert [r["execution_id"] for r in store.list_executions(status="failed")] == [ids[5]]
+    assert [r["execution_id"] for r in store.list_executions(flow_family="scheduled")] == [ids[3]]
+    assert store.count_executions(started_after="2026-03-03", started_before="2026-03-05") == 2
+    assert store.get(ids[0])["recipe_id"] == "alpha"
+    assert store.compare(ids[0], ids[5])["diff"]["status_changed"] is True
+
+
+def test_new_store_backfills_files_written_before_the_index(tmp_path: Path):
+    legacy_dir = tmp_path / "recipes" / "executions"
+    legacy_dir.mkdir(parents=True)
+    (legacy_dir / "recipeexec_old.json").write_text(
+        json.dumps({"execution_id": "recipeexec_old", "recipe_id": "legacy", "execution_kind": "runbook", "status": "success"}),
+        encoding="utf-8",
+    )
+    (legacy_dir / "broken.json").write_text("{", encoding="utf-8")
+
+    store = RecipeExecutionStore(artifacts_dir=tmp_path)
+    (old,) = store.list_executions(recipe_id="legacy")
+    assert old["flow_families"] == ["runbook-driven"]
+    assert store.list_executions(flow_family="runbook-driven")[0]["execution_id"] == "recipeexec_old"
+
+    (legacy_dir / "recipeexec_old.json").unlink()
+    assert RecipeExecutionStore(artifacts_dir=tmp_path).count_executions() == 0
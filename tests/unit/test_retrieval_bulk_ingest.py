@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from nexus.config import build_paths
+from nexus.retrieval import RetrievalService
+from nexus.schemas import RetrievalIngestRequest, RetrievalRequest
+from nexus.storage import NexusStore
+
+
+def _service(tmp_path: Path) -> RetrievalService:
+    paths = build_paths(tmp_path / "workspace")
+    return RetrievalService(paths, NexusStore(paths), retrieval_config={"stage2": {"enabled": False}})
+
+
+def test_bulk_ingest_batches_documents_and_indexes_postings(tmp_path: Path):
+    retrieval = _service(tmp_path)
+    documents = [
+        {"source": f"bulk::{index}", "title": f"Doc {index}", "text": f"brain first retrieval provenance item {index} " * 20}
+        for index in range(40)
+    ]
+    report = retrieval.bulk_ingest(documents, batch_size=16, artifact_mode="content-addressed")
+
+    assert report["document_count"] == 40
+    assert report["batch_count"] == 3
+    assert report["chunk_count"] >= 40
+    assert report["docs_per_second"] > 0
+    assert report["chunks_per_second"] > 0
+    assert report["artifacts_written"] == 40
+
+    again = retrieval.bulk_ingest(documents[:5], artifact_mode="content-addressed")
+    assert again["artifacts_deduplicated"] == 5
+    assert again["doc_ids"] == report["doc_ids"][:5]
+
+    hits = retrieval.query(RetrievalRequest(query="provenance item 7", top_k=3))
+    assert hits
+    assert hits[0].source == "bulk::7"
+
+
+def test_single_document_ingest_matches_bulk_ids(tmp_path: Path):
+    retrieval = _service(tmp_path)
+    request = RetrievalIngestRequest(documents=[{"source": "spec", "title": "Phase1", "text": "doctor checks and manifests"}])
+    doc_ids = retrieval.ingest(request)
+    assert retrieval.bulk_ingest(request.documents, artifact_mode="none")["doc_ids"] == doc_ids
+    assert retrieval.query(RetrievalRequest(query="doctor checks", top_k=3))[0].doc_id == doc_ids[0]
+
+
+def test_query_cache_reuses_results_until_corpus_generation_changes(tmp_path: Path):
+    retrieval = _service(tmp_path)
+    retrieval.bulk_ingest([{"source": "a", "title": "A", "text": "cache aware retrieval answers"}], artifact_mode="none")
+    request = RetrievalRequest(query="cache   aware retrieval", top_k=3)
+
+    first = retrieval.query_with_policy(request)
+    second = retrieval.query_with_policy(RetrievalRequest(query="cache aware retrieval", top_k=3))
+    assert first["retrieval_cache"]["hit"] is False
+    assert second["retrieval_cache"]["hit"] is True
+    assert [hit.chunk_id for hit in second["hits"]] == [hit.chunk_id for hit in first["hits"]]
+
+    retrieval.bulk_ingest([{"source": "b", "title": "B", "text": "cache aware retrieval answers again"}], artifact_mode="none")
+    third = retrieval.query_with_policy(request)
+    assert third["retrieval_cache"]["hit"] is False
+    assert {hit.source for hit in third["hits"]} == {"a", "b"}
+    assert retrieval.query_with_policy(request, use_cache=False).get("retrieval_cache") is None
+
+
+def test_query_cache_hands_out_copies_and_skips_configured_pgvector(tmp_path: Path):
+    retrieval = _service(tmp_path)
+    retrieval.bulk_ingest([{"source": "a", "title": "A", "text": "cache aware retrieval answers"}], artifact_mode="none")
+    request = RetrievalRequest(query="cache aware retrieval", top_k=3)
+    first = retrieval.query_with_policy(request)
+    first["hits"][0].metadata["mutated"] = True
+    first["hits"][0].score = -1.0
+    again = retrieval.query_with_policy(request)["hits"][0]
+    assert "mutated" not in again.metadata and again.score != -1.0
+
+    retrieval.retrieval_config = {**retrieval.retrieval_config, "stage1": {"sources": {"pgvector": True}}}
+    assert retrieval.query_with_policy(request).get("retrieval_cache") is None
+
+
+def test_bulk_ingest_rejects_and_caps_worker_counts(tmp_path: Path):
+    paths = build_paths(tmp_path / "workspace")
+    retrieval = RetrievalService(paths, NexusStore(paths), retrieval_config={"stage2": {"enabled": False}, "ingest": {"max_workers": 1}})
+    documents = [{"source": "w", "title": "W", "text": "worker bounds"}]
+    with pytest.raises(ValueError):
+        retrieval.bulk_ingest(documents, workers=0)
+    assert retrieval.bulk_ingest(documents, workers=64, artifact_mode="none")["workers"] == 1
+
+
+def test_query_cache_keys_fallback_results_by_reranker_state(tmp_path: Path):
+    paths = build_paths(tmp_path / "workspace")
+    retrieval = RetrievalService(
+        paths,
+        NexusStore(paths),
+        retrieval_config={"stage2": {"enabled": True, "provider": "missing/cross-encoder", "warm_load": False}},
+    )
+    retrieval.bulk_ingest([{"source": "a", "title": "A", "text": "cache aware retrieval answers"}], artifact_mode="none")
+    request = RetrievalRequest(query="cache aware retrieval", top_k=3)
+
+    first = retrieval.query_with_policy(request)
+    assert first["reranker"]["fallback_used"] is True
+    assert retrieval.reranker.model_state()["state"] == "unavailable"
+    assert retrieval.query_with_policy(request)["retrieval_cache"]["hit"] is True
+
+    retrieval.reranker._load_failed_at = None  # retry window over: the model is cold again
+    assert retrieval.query_with_policy(request)["retrieval_cache"]["hit"] is False
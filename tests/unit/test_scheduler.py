@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from services.scheduler import Cadence, JobSpec, TimerScheduler, validate_scheduler_config
+
+
+class _Clock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _ts(text: str) -> float:
+    return datetime.fromisoformat(text).replace(tzinfo=timezone.utc).timestamp()
+
+
+def test_cadence_parses_intervals_and_cron():
+    assert Cadence("every-30m").next_after(0) == 1800
+    assert Cadence("every-2h").next_after(0) == 7200
+    assert Cadence(5).next_after(100) == 400
+    assert Cadence("daily").next_after(0) == 86400
+    # Monday 03:00, from a Wednesday and from exactly the fire time
+    assert Cadence("0 3 * * 1").next_after(_ts("2026-10-14T12:00:00")) == _ts("2026-10-19T03:00:00")
+    assert Cadence("0 3 * * 1").next_after(_ts("2026-10-19T03:00:00")) == _ts("2026-10-26T03:00:00")
+    assert Cadence("*/15 9-10 * * *").next_after(_ts("2026-10-14T10:50:00")) == _ts("2026-10-15T09:00:00")
+    with pytest.raises(ValueError):
+        Cadence("61 * * * *")
+    assert validate_scheduler_config({"scheduler": {"jobs": [{"cmd": "x", "cron": "bad"}]}})
+
+
+def test_persisted_schedule_survives_restart_without_double_firing(tmp_path: Path):
+    state = tmp_path / "scheduler.json"
+    clock = _Clock(1000.0)
+    calls: list[float] = []
+
+    def build(misfire: str = "run_once") -> TimerScheduler:
+        scheduler = TimerScheduler(state_path=str(state), clock=clock)
+        scheduler.add_job(JobSpec(name="tick", cadence=Cadence("every-1m"), target=lambda: calls.append(clock.now), misfire=misfire))
+        return scheduler
+
+    scheduler = build()
+    assert scheduler.run_pending() == 0
+    clock.now = 1060.0
+    assert scheduler.run_pending() == 1
+    assert json.loads(state.read_text())["jobs"]["tick"]["next_run_at"] == 1120.0
+
+    # restart at the same instant: the 1060 fire is already claimed
+    assert build().run_pending() == 0
+    clock.now = 1120.0
+    assert build().run_pending() == 1
+
+    # down for five intervals: run_once fires a single make-up run, catch_up replays each
+    clock.now = 1450.0
+    assert build("run_once").run_pending() == 1
+    assert json.loads(state.read_text())["jobs"]["tick"]["next_run_at"] == 1510.0
+    clock.now = 1720.0
+    assert build("catch_up").run_pending() == 4
+    assert build("skip").run_pending() == 0
+
+    # a run that was in flight when the process died is not lost
+    payload = json.loads(state.read_text())
+    payload["jobs"]["tick"]["in_flight_since"] = clock.now
+    state.write_text(json.dumps(payload))
+    before = len(calls)
+    assert build("skip").run_pending() == 0
+    payload["jobs"]["tick"]["in_flight_since"] = clock.now
+    state.write_text(json.dumps(payload))
+    assert build().run_pending() == 1
+    assert len(calls) == before + 1
+
+
+def test_single_loop_dispatches_to_bounded_pool_with_class_limits():
+    scheduler = TimerScheduler(max_workers=4, class_limits={"heavy": 1})
+    lock = threading.Lock()
+    running = {"heavy": 0, "light": 0}
+    peak = {"heavy": 0, "light": 0}
+    done = {"heavy": 0, "light": 0}
+
+    def job(job_class: str):
+        def run():
+            with lock:
+                running[job_class] += 1
+                peak[job_class] = max(peak[job_class], running[job_class])
+            time.sleep(0.05)
+            with lock:
+                running[job_class] -= 1
+                done[job_class] += 1
+        return run
+
+    for index in range(20):
+        job_class = "heavy" if index % 2 else "light"
+        scheduler.add_job(JobSpec(name=f"job-{index}", cadence=Cadence("every-0.02s"), target=job(job_class), job_class=job_class))
+    threads_before = threading.active_count()
+    scheduler.start()
+    try:
+        time.sleep(0.6)
+        assert threading.active_count() - threads_before <= 1 + scheduler.max_workers
+    finally:
+        scheduler.stop()
+
+    assert peak["heavy"] == 1
+    assert peak["light"] > 1
+    assert done["heavy"] >= 3 and done["light"] >= 3
+    status = scheduler.get_status()
+    assert status["scheduler"]["metrics"]["deferred_by_class_limit"] > 0
+    assert status["scheduler"]["metrics"]["coalesced"] > 0
+
+
+def test_step_crons_and_enabled_count_on_removal():
+    assert Cadence("5/15 * * * *").cron[0] == [5, 20, 35, 50]
+    assert Cadence("0 1/6 * * *").next_after(_ts("2026-10-14T08:00:00")) == _ts("2026-10-14T13:00:00")
+    scheduler = TimerScheduler()
+    scheduler.add_job(JobSpec(name="a", cadence=Cadence("hourly"), target=lambda: None))
+    scheduler.add_job(JobSpec(name="b", cadence=Cadence("hourly"), target=lambda: None, enabled=False))
+    assert scheduler.remove_job("a")
+    assert scheduler.get_status()["scheduler"]["metrics"]["jobs_enabled"] == 0
+
+
+def test_retries_never_overlap_a_run_of_the_same_job():
+    scheduler = TimerScheduler(max_workers=4)
+    lock = threading.Lock()
+    running = {"now": 0, "peak": 0, "calls": 0}
+
+    def flaky():
+        with lock:
+            running["now"] += 1
+            running["calls"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+        time.sleep(0.03)
+        with lock:
+            running["now"] -= 1
+        return False
+
+    scheduler.add_job(JobSpec(name="flaky", cadence=Cadence("every-0.01s"), target=flaky, retry_backoff_s=0.005, max_retries=5))
+    scheduler.start()
+    try:
+        time.sleep(0.4)
+    finally:
+        scheduler.stop()
+    assert running["calls"] >= 3
+    assert running["peak"] == 1
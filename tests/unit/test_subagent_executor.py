@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+from nexusnet.agents.subagents import SubagentExecutionService, WorkerCancelled
+
+
+def _service(tmp_path: Path, runner, **config) -> SubagentExecutionService:
+    return SubagentExecutionService(
+        artifacts_dir=tmp_path,
+        runtime_configs={"goose_lane": {"subagents": {"max_parallel": 4, **config}}},
+        runner=runner,
+    )
+
+
+def _sleeper(durations: dict[str, float]):
+    def run(worker, *, upstream, cancel):
+        if cancel.wait(durations[worker["subagent_id"]]):
+            raise WorkerCancelled("stopped")
+        return {"output": f"{worker['subagent_id']}<{','.join(sorted(upstream))}>"}
+
+    return run
+
+
+def test_parallel_run_finishes_in_critical_path_time_and_honours_dependencies(tmp_path: Path):
+    durations = {"a": 0.2, "b": 0.2, "c": 0.2, "d": 0.1}
+    service = _service(tmp_path, _sleeper(durations))
+    workers = [
+        {"subagent_id": "a", "task": "a"},
+        {"subagent_id": "b", "task": "b"},
+        {"subagent_id": "c", "task": "c"},
+        {"subagent_id": "d", "task": "merge", "depends_on": ["a", "b", "c"]},
+    ]
+
+    started = time.perf_counter()
+    run = service.execute(parent_task="p", workers=workers, mode="parallel", dispatch=True)
+    elapsed = time.perf_counter() - started
+
+    assert run["execution_state"] == "completed"
+    assert [worker["status"] for worker in run["workers"]] == ["completed"] * 4
+    assert run["workers"][3]["output"] == "d<a,b,c>"
+    assert elapsed < 0.55  # serial would be 0.7s
+    assert 250 <= run["critical_path_ms"] < 550
+    persisted = json.loads(Path(run["artifact_path"]).read_text(encoding="utf-8"))
+    assert persisted["execution_state"] == "completed"
+    assert [event["status"] for event in persisted["events"]].count("completed") == 4
+
+
+def test_timeouts_skip_dependents_and_cancel_stops_pending_workers(tmp_path: Path):
+    service = _service(tmp_path, _sleeper({"slow": 5.0, "after": 0.0, "solo": 0.0}))
+    run = service.execute(
+        parent_task="p",
+        workers=[
+            {"subagent_id": "slow", "timeout_seconds": 0.1},
+            {"subagent_id": "after", "depends_on": ["slow"]},
+            {"subagent_id": "solo"},
+        ],
+        mode="parallel",
+        dispatch=True,
+    )
+    assert {worker["subagent_id"]: worker["status"] for worker in run["workers"]} == {
+        "slow": "timeout",
+        "after": "skipped",
+        "solo": "completed",
+    }
+
+    service = _service(tmp_path, _sleeper({"one": 5.0, "two": 0.0}))
+    run = service.execute(
+        parent_task="p",
+        workers=[{"subagent_id": "one"}, {"subagent_id": "two"}],
+        mode="sequential",
+        dispatch=True,
+        wait=False,
+    )
+    assert run["execution_state"] == "running"
+    deadline = time.monotonic() + 2.0
+    while service.get_run(run["run_id"])["workers"][0]["status"] != "running" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert service.cancel(run["run_id"])
+    deadline = time.monotonic() + 2.0
+    while service.get_run(run["run_id"]).get("execution_state") == "running" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert run["execution_state"] == "running" and "completed_at" not in run  # the returned run is a snapshot
+    run = service.get_run(run["run_id"])
+    assert [worker["status"] for worker in run["workers"]] == ["cancelled", "cancelled"]
+    assert run["execution_state"] == "cancelled"
+
+
+def test_dependency_cycles_fail_the_plan_instead_of_raising(tmp_path: Path):
+    service = _service(tmp_path, _sleeper({"a": 0.0, "b": 0.0}))
+    run = service.execute(
+        parent_task="p",
+        workers=[{"subagent_id": "a", "depends_on": ["b"]}, {"subagent_id": "b", "depends_on": ["a"]}],
+        mode="parallel",
+        dispatch=True,
+    )
+    assert run["execution_state"] == "failed" and "cycle" in run["error"]
+    assert [worker["status"] for worker in run["workers"]] == ["planned", "planned"]
+
+
+def test_abandoned_threads_hold_their_slot_and_deadlines_start_when_work_starts(tmp_path: Path):
+    started: dict[str, float] = {}
+
+    def run(worker, *, upstream, cancel):
+        started[worker["subagent_id"]] = time.monotonic()
+        if worker["subagent_id"] == "stuck":
+            time.sleep(0.5)  # ignores cancel
+        return {"output": worker["subagent_id"]}
+
+    service = _service(tmp_path, run, max_parallel=1)
+    begin = time.monotonic()
+    result = service.execute(
+        parent_task="p",
+        workers=[{"subagent_id": "stuck", "timeout_seconds": 0.1}, {"subagent_id": "next", "timeout_seconds": 0.2}],
+        mode="parallel",
+        dispatch=True,
+    )
+    assert [worker["status"] for worker in result["workers"]] == ["timeout", "completed"]
+    assert started["next"] - begin >= 0.45  # waited for the abandoned thread, not queued behind it
+    assert result["workers"][1]["duration_ms"] < 150
+
+    snapshot = service.get_run(result["run_id"])
+    snapshot["workers"][0]["status"] = "edited"
+    assert service.get_run(result["run_id"])["workers"][0]["status"] == "timeout"
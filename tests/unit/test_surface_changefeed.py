@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from nexus.config import build_paths
+from nexus.storage import NexusStore
+from nexusnet.ui_surface.changefeed import SurfaceChangeFeed
+
+
+def _feed(tmp_path: Path):
+    store = NexusStore(build_paths(tmp_path / "workspace"))
+    builds: list[str | None] = []
+
+    def snapshot(session_id=None):
+        builds.append(session_id)
+        return {"traces": [trace["trace_id"] for trace in store.list_traces(limit=5)]}
+
+    return store, SurfaceChangeFeed(store=store, snapshot_provider=snapshot, refresh_interval_seconds=60, tables=["execution_traces"]), builds
+
+
+def test_writes_outside_the_surface_tables_do_not_rebuild(tmp_path: Path):
+    store, feed, builds = _feed(tmp_path)
+    first = feed.current()
+    store.save_memory_analytics("s1", {"total_records": 1}, "2026-01-01T00:00:00")
+    assert feed.delta(since=first["version"]) is None and len(builds) == 1
+
+    store.save_trace("trace-1", "s1", "ok", {"trace_id": "trace-1"}, "2026-01-01T00:00:00")
+    update = feed.delta(since=first["version"])
+    assert update["changed_tables"] == ["execution_traces"] and update["delta"]["changed"] == {"traces": ["trace-1"]}
+
+
+def test_stream_awaits_between_polls_and_stops_on_disconnect(tmp_path: Path):
+    store, feed, _ = _feed(tmp_path)
+    checks = []
+
+    async def disconnected():
+        checks.append(True)
+        return len(checks) > 3
+
+    async def collect():
+        return [event async for event in feed.stream(poll_interval_seconds=0.01, is_disconnected=disconnected)]
+
+    events = asyncio.run(collect())
+    assert [event["event"] for event in events] == ["delta"]
+    assert len(checks) == 4
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+
+from nexus.config import build_paths
+from nexus.storage import NexusStore
+from nexus.trace_store import LazyTrace
+
+
+def _trace(index: int) -> dict:
+    policy = {"policy_id": "policy::default", "reasons": [f"reason {n} for the shared execution policy" for n in range(12)]}
+    return {
+        "trace_id": f"trace-{index}",
+        "session_id": "session-a",
+        "status": "ok",
+        "metrics": {"core_execution": {"execution_policy": policy, "latency_ms": index}},
+        "retrieval_policy_decision": {"candidates": [{"chunk_id": f"chunk-{n}", "score": 0.5} for n in range(10)]},
+    }
+
+
+def test_traces_round_trip_and_share_repeated_blobs(tmp_path: Path):
+    store = NexusStore(build_paths(tmp_path / "workspace"))
+    for index in range(20):
+        store.save_trace(f"trace-{index}", "session-a", "ok", _trace(index), f"2026-01-01T00:00:{index:02d}")
+
+    assert store.get_trace("trace-7") == _trace(7)
+    stats = store.trace_storage_stats()
+    assert stats["traces"] == 20
+    # the policy and candidate snapshots are stored once, not per trace
+    assert stats["blobs"] < 20 + 5
+    assert stats["stored_bytes"] < stats["raw_bytes"] / 3
+
+    traces = store.list_traces(limit=5)
+    assert isinstance(traces[0], LazyTrace)
+    assert traces[0]["trace_id"] == "trace-19" and not traces[0].loaded
+    assert traces[0]["metrics"]["core_execution"]["latency_ms"] == 19
+    assert json.loads(json.dumps(traces[1])) == _trace(18)
+    assert {**traces[2]} == _trace(17)
+
+
+def test_compaction_migrates_legacy_rows_and_applies_retention(tmp_path: Path):
+    store = NexusStore(build_paths(tmp_path / "workspace"))
+    with sqlite3.connect(store.paths.database_path) as conn:
+        conn.execute(
+            "insert into execution_traces(trace_id, session_id, status, trace_json, created_at) values (?, ?, ?, ?, ?)",
+            ("legacy", "session-a", "warning", json.dumps(_trace(0)), "2026-01-01T00:00:00"),
+        )
+    store.save_trace("trace-1", "session-a", "ok", _trace(1), "2026-01-02T00:00:00")
+    assert [trace["trace_id"] for trace in store.list_traces(status="warning")] == ["trace-0"]
+
+    report = store.compact_traces(max_traces=1)
+
+    assert report["migrated"] == 1
+    assert report["expired"] == 1
+    assert report["blobs_removed"] > 0
+    assert store.get_trace("legacy") is None
+    assert store.get_trace("trace-1") == _trace(1)
+    assert store.trace_storage_stats()["legacy_traces"] == 0
+
+
+def test_listing_decodes_all_bodies_on_first_read(tmp_path: Path):
+    store = NexusStore(build_paths(tmp_path / "workspace"))
+    for index in range(10):
+        store.save_trace(f"trace-{index}", "session-a", "ok", _trace(index), f"2026-01-01T00:00:{index:02d}")
+    traces = store.list_traces(limit=10)
+    connects = []
+    connect = store._connect
+    store._connect = lambda *args: connects.append(args) or connect(*args)
+
+    assert [trace["metrics"]["core_execution"]["latency_ms"] for trace in traces] == list(range(9, -1, -1))
+    assert len(connects) == 1
+    traces[0]["metrics"]["core_execution"]["execution_policy"]["policy_id"] = "mutated"
+    assert traces[1]["metrics"]["core_execution"]["execution_policy"]["policy_id"] == "policy::default"
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from core.inference.transformers import ContinuousBatcher, TransformersEngine
+
+
+class _CountingStepper:
+    """Emits prompt[0] + 1, + 2, ... and records which requests shared each decode step."""
+
+    def __init__(self, model=None, device="cpu"):
+        self.batches: list[list[int]] = []
+
+    def prefill(self, req):
+        req.state = req.prompt_ids[0]
+        return req.state + 1
+
+    def decode(self, reqs):
+        self.batches.append([req.prompt_ids[0] for req in reqs])
+        return [req.tokens[-1] + 1 for req in reqs]
+
+
+def test_requests_join_and_leave_the_running_batch_between_steps():
+    stepper = _CountingStepper()
+    batcher = ContinuousBatcher(stepper, max_batch=2)
+    a = batcher.submit([100], max_new_tokens=4)
+    batcher.step()
+    b = batcher.submit([200], max_new_tokens=2)
+    c = batcher.submit([300], max_new_tokens=3, stop_ids=frozenset({302}))
+    while batcher.step():
+        pass
+
+    assert a.tokens == [101, 102, 103, 104] and b.tokens == [201, 202] and c.tokens == [301, 302]
+    # b joins a's second step; c takes b's slot as soon as b retires, while a is still running
+    assert stepper.batches == [[100], [100, 200], [100, 300]]
+    assert all(req.done.is_set() and req.state is None for req in (a, b, c))
+    assert batcher.summary()["peak_batch"] == 2 and batcher.stats["completed"] == 3
+
+
+def test_engine_loads_each_model_once_and_serves_concurrent_callers():
+    loads = []
+
+    def loader(model_id, quant, device, dtype):
+        loads.append((model_id, quant))
+        return _Tok(), object()
+
+    class _SlowStepper(_CountingStepper):
+        def decode(self, reqs):
+            time.sleep(0.02)  # a forward pass; callers arriving meanwhile join the next step
+            return super().decode(reqs)
+
+    engine = TransformersEngine(capacity=1, max_batch=8, device="cpu", loader=loader, stepper=_SlowStepper)
+    results: dict[int, str] = {}
+
+    def call(i):
+        results[i] = engine.generate(f"{i * 10}", model_id="tiny", max_new_tokens=3, timeout=5)
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(1, 13)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert loads == [("tiny", "auto")]
+    assert results[3] == "31 32 33"
+    (stats,) = engine.summary()["models"]
+    assert stats["completed"] == 12 and stats["peak_batch"] > 1
+
+    engine.get("other", "int8")
+    assert loads[-1] == ("other", "int8") and engine.stats["evictions"] == 1
+    assert [m["model_id"] for m in engine.summary()["models"]] == ["other"]
+    engine.close()
+
+
+def test_timed_out_requests_stop_decoding():
+    class _SlowStepper(_CountingStepper):
+        def decode(self, reqs):
+            time.sleep(0.01)
+            return super().decode(reqs)
+
+    batcher = ContinuousBatcher(_SlowStepper(), max_batch=4)
+    try:
+        batcher.generate_ids([100], timeout=0.05, max_new_tokens=10_000)
+    except TimeoutError:
+        pass
+    deadline = time.time() + 2
+    while batcher.summary()["running"] and time.time() < deadline:
+        time.sleep(0.01)
+    steps = batcher.stats["steps"]
+    time.sleep(0.05)
+    assert batcher.stats["cancelled"] == 1 and batcher.summary()["running"] == 0
+    assert batcher.stats["steps"] == steps
+    batcher.stop()
+
+
+def test_evicting_a_model_lets_its_in_flight_requests_finish():
+    gate = threading.Event()
+
+    class _GatedStepper(_CountingStepper):
+        def decode(self, reqs):
+            gate.wait(5)
+            return super().decode(reqs)
+
+    engine = TransformersEngine(capacity=1, device="cpu", loader=lambda *args: (_Tok(), object()), stepper=_GatedStepper)
+    result: dict[str, str] = {}
+    caller = threading.Thread(target=lambda: result.update(text=engine.generate("30", model_id="tiny", max_new_tokens=3, timeout=5)))
+    caller.start()
+    while not engine.summary()["models"] or not engine.summary()["models"][0]["running"]:
+        time.sleep(0.005)
+    engine.get("other")  # evicts "tiny" mid-generation
+    gate.set()
+    caller.join(5)
+
+    assert result == {"text": "31 32 33"}
+    assert engine.stats["evictions"] == 1
+    engine.close()
+
+
+class _Tok:
+    eos_token_id = None
+    bos_token_id = 1
+
+    def __call__(self, text):
+        return {"input_ids": [int(text)]}
+
+    def decode(self, ids, skip_special_tokens=True):
+        return " ".join(map(str, ids))
+
+
+def test_adapter_serves_the_requested_model_and_falls_back_to_config():
+    from nexus.runtimes.registry import TransformersRuntimeAdapter
+
+    adapter = TransformersRuntimeAdapter({"model": "cfg/model"})
+    assert adapter.hf_model_id("transformers/TinyLlama/TinyLlama-1.1B-Chat-v1.0") == "TinyLlama/TinyLlama-1.1B-Chat-v1.0"
+    assert adapter.hf_model_id("Qwen/Qwen2-0.5B") == "Qwen/Qwen2-0.5B"
+    assert adapter.hf_model_id("transformers/") == adapter.hf_model_id("mock/default") == "cfg/model"
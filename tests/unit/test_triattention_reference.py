@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from research.attention_providers.triattention import KVCompressionPolicy, TriAttentionProviderCard
+from research.attention_providers.triattention.reference import attention, compress, measure, sweep, synthetic_kv
+
+
+def test_compression_keeps_sinks_recent_window_and_budget_per_head():
+    data = synthetic_kv(2048)
+    policy = KVCompressionPolicy(compression_ratio=0.25, sink_tokens=4, recent_tokens=128)
+    packed = compress(data["keys"], data["values"], data["prompt_queries"], policy)
+    index = packed["index"]
+    assert index.shape == (4, 512) and packed["keys"].shape == (4, 512, 64)
+    assert (index[:, :4] == np.arange(4)).all() and (index[:, -128:] == np.arange(1920, 2048)).all()
+    assert packed["bytes"] == 512 * 4 * 64 * 2 * 2
+
+    # keeping everything reproduces full attention exactly
+    full = compress(data["keys"], data["values"], data["prompt_queries"], KVCompressionPolicy(compression_ratio=1.0))
+    out, _ = attention(data["decode_queries"], full["keys"], full["values"])
+    ref, _ = attention(data["decode_queries"], data["keys"], data["values"])
+    assert np.allclose(out, ref)
+
+
+def test_measured_error_falls_with_budget_and_feeds_provider_estimate():
+    runs = sweep(2048, [0.1, 0.25, 0.5])
+    errors = [run["output_relative_error"] for run in runs]
+    assert errors == sorted(errors, reverse=True) and errors[-1] < 0.1
+    assert all(run["compressed"]["kv_bytes"] < run["dense"]["kv_bytes"] for run in runs)
+
+    measured = measure(2048, KVCompressionPolicy(kv_bits=8))
+    assert measured["compressed"]["kv_bytes"] < measured["dense"]["kv_bytes"] * 0.25 * 0.6
+    assert measured["dense"]["attention_ms"] > 0 and measured["dense"]["peak_memory_mb"] > 0
+
+    estimate = TriAttentionProviderCard().estimate(context_tokens=2048)
+    assert estimate["measurement_mode"] == "numpy-reference"
+    assert estimate["long_context_regression"] == estimate["measurement"]["output_relative_error"]
+    assert estimate["kv_memory_mb"] == pytest.approx(estimate["measurement"]["dense"]["kv_memory_mb"] * 0.25, rel=1e-3)
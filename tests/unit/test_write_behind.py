@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+from nexus.config import build_paths
+from nexus.governance import GovernanceService
+from nexus.memory import MemoryService
+from nexus.schemas import Message
+from nexus.storage import NexusStore
+from nexus.write_behind import WriteBehindWriter
+
+
+def _store(tmp_path: Path) -> NexusStore:
+    store = NexusStore(build_paths(tmp_path / "workspace"))
+    store.attach_write_behind(WriteBehindWriter(store, barrier_timeout_seconds=10))
+    return store
+
+
+def test_scope_bundles_writes_and_collapses_repeated_trace_saves(tmp_path: Path):
+    store = _store(tmp_path)
+    memory = MemoryService(store.paths, store)
+    before = store.change_sequences()
+
+    with store.write_behind_scope("session-a") as bundle:
+        store.save_trace("trace-1", "session-a", "running", {"status": "running"}, "2026-01-01T00:00:00")
+        memory.append_messages("session-a", [Message(role="user", content="hello")])
+        memory.append_messages("session-a", [Message(role="assistant", content="hi")])
+        store.save_trace("trace-1", "session-a", "ok", {"status": "ok"}, "2026-01-01T00:00:00")
+        path = store.write_artifact("core/trace-1.json", "{}")
+        # trace x1, two records, analytics x1, artifact
+        assert len(bundle) == 5
+        assert bundle.superseded == 2
+
+    assert store.get_trace("trace-1") == {"status": "ok"}
+    assert Path(path).read_text(encoding="utf-8") == "{}"
+    assert [m.content for m in memory.recent_messages("session-a")] == ["hello", "hi"]
+    assert store.get_memory_analytics("session-a")["total_records"] == 2
+    after = store.change_sequences()
+    assert after["execution_traces"] - before.get("execution_traces", 0) == 1
+    summary = store.write_behind.summary()
+    assert summary["pending"] == 0
+    assert summary["bundles"] == 1
+    assert summary["transactions"] == 1
+
+
+def test_scope_submits_partial_bundle_when_body_raises(tmp_path: Path):
+    store = _store(tmp_path)
+    governance = GovernanceService(store.paths, store)
+    try:
+        with store.write_behind_scope("session-b"):
+            governance.record_event("chat.executed", {"trace_id": "trace-2"})
+            raise RuntimeError("generation failed")
+    except RuntimeError:
+        pass
+
+    events = governance.list_audit()
+    assert [event["action"] for event in events] == ["chat.executed"]
+    assert governance.audit_log_path.read_text(encoding="utf-8").count("chat.executed") == 1
+
+
+def test_failed_bundle_does_not_drop_neighbours(tmp_path: Path):
+    store = _store(tmp_path)
+    with store.write_behind_scope("bad"):
+        store.defer(lambda: (_ for _ in ()).throw(ValueError("boom")))
+    with store.write_behind_scope("good"):
+        store.save_trace("trace-3", "good", "ok", {"status": "ok"}, "2026-01-01T00:00:00")
+
+    assert store.get_trace("trace-3") == {"status": "ok"}
+    assert store.write_behind.summary()["errors"] == 1
+
+
+def test_retried_batch_appends_file_lines_once_and_keeps_deferred_payloads(tmp_path: Path):
+    store = _store(tmp_path)
+    governance = GovernanceService(store.paths, store)
+    gate = threading.Event()
+    with store.write_behind_scope("blocker"):
+        store.defer(gate.wait)
+    with store.write_behind_scope("bad"):
+        store.defer(lambda: (_ for _ in ()).throw(ValueError("boom")))
+    payload = {"status": "ok"}
+    with store.write_behind_scope("good"):
+        governance.record_event("chat.executed", {"trace_id": "trace-4"})
+        store.save_trace("trace-4", "good", "ok", payload, "2026-01-01T00:00:00")
+    payload["status"] = "mutated after defer"
+    gate.set()
+
+    assert store.write_behind.barrier()
+    assert store.get_trace("trace-4") == {"status": "ok"}
+    assert governance.audit_log_path.read_text(encoding="utf-8").count("trace-4") == 1
+
+
+def test_bundle_shared_across_threads_is_submitted_once(tmp_path: Path):
+    store = _store(tmp_path)
+    bundle = store.open_bundle("session-c")
+
+    def stage(index: int) -> None:
+        with store.use_bundle(bundle):
+            store.save_trace(f"trace-c{index}", "session-c", "ok", {"status": index}, "2026-01-01T00:00:00")
+
+    for index in range(2):
+        worker = threading.Thread(target=stage, args=(index,))
+        worker.start()
+        worker.join()
+    assert len(bundle) == 2 and store.write_behind.summary()["bundles"] == 0
+    store.submit_bundle(bundle)
+    assert store.write_behind.barrier()
+    assert store.get_trace("trace-c1") == {"status": 1}
+    assert store.write_behind.summary()["bundles"] == 1
+
+
+def test_trace_reads_see_the_pending_bundle_and_acks_cross_threads(tmp_path: Path):
+    store = _store(tmp_path)
+    store.save_trace("trace-old", "session-d", "ok", {"status": "old"}, "2026-01-01T00:00:00")
+    bundle = store.open_bundle("session-d")
+    with store.use_bundle(bundle):
+        store.save_trace("trace-d", "session-d", "running", {"status": "running"}, "2026-01-02T00:00:00")
+        assert store.get_trace("trace-d") == {"status": "running"}
+        assert [trace["status"] for trace in store.list_traces(limit=1, status="running")] == ["running"]
+        assert [trace["status"] for trace in store.list_traces()] == ["running", "old"]
+
+    acks = []
+    submitter = threading.Thread(target=lambda: acks.append(store.submit_bundle(bundle)))
+    submitter.start()
+    submitter.join()
+    assert store.write_behind.wait_for(ack=acks[0])
+    assert store.get_trace("trace-d") == {"status": "running"}
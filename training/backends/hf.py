@@ -1,7 +1,7 @@
 
 import torch
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 from transformers import AutoTokenizer, AutoModelForCausalLM
 
 @dataclass
@@ -13,53 +13,135 @@ class HFConfig:
     top_p: float = 0.95
     top_k: int = 50
     do_sample: bool = True
+    micro_batch_size: int = 32  # sequences per forward pass
+    bucket_by_length: bool = True
+
+@dataclass
+class AdapterConfig:
+    r: int = 16
+    alpha: int = 32
+    dropout: float = 0.0
+    target_modules: Optional[List[str]] = None  # None lets peft pick the architecture's attention projections
+
+def _load_tokenizer(cfg: HFConfig):
+    tok = AutoTokenizer.from_pretrained(cfg.model_id)
+    if tok.pad_token_id is None: tok.pad_token_id = tok.eos_token_id
+    tok.padding_side = "left"  # decoder-only generation continues from the right edge
+    return tok
+
+class SharedHFBase:
+    """One frozen copy of the base weights and tokenizer; each role is a named LoRA adapter on it."""
+    def __init__(self, cfg: HFConfig, adapter: Optional[AdapterConfig] = None):
+        self.cfg = cfg
+        self.adapter_cfg = adapter or AdapterConfig()
+        self.tok = _load_tokenizer(cfg)
+        self.base = AutoModelForCausalLM.from_pretrained(cfg.model_id)
+        self.base.requires_grad_(False)
+        self.m = None
+        self.active: Optional[str] = None
+
+    def role(self, name: str) -> "HFBackend":
+        from peft import LoraConfig, get_peft_model
+        lora = LoraConfig(r=self.adapter_cfg.r, lora_alpha=self.adapter_cfg.alpha, lora_dropout=self.adapter_cfg.dropout,
+                          target_modules=self.adapter_cfg.target_modules, task_type="CAUSAL_LM")
+        if self.m is None:
+            self.m = get_peft_model(self.base, lora, adapter_name=name)
+            self.m.to(self.cfg.device); self.m.eval()
+        else:
+            self.m.add_adapter(name, lora); self.m.to(self.cfg.device)
+        self.active = None
+        return HFBackend(self.cfg, shared=self, adapter=name)
+
+    def activate(self, name: str):
+        if self.active != name:
+            self.m.set_adapter(name); self.active = name
+
+    def adapter_parameters(self, name: str) -> List[torch.nn.Parameter]:
+        return [p for n, p in self.m.named_parameters() if f".{name}." in n]
 
 class HFBackend:
-    def __init__(self, cfg: HFConfig):
+    def __init__(self, cfg: HFConfig, shared: Optional[SharedHFBase] = None, adapter: Optional[str] = None):
         self.cfg = cfg
-        self.tok = AutoTokenizer.from_pretrained(cfg.model_id)
-        self.m = AutoModelForCausalLM.from_pretrained(cfg.model_id)
-        self.m.to(cfg.device); self.m.eval()
-        if self.tok.pad_token_id is None: self.tok.pad_token_id = self.tok.eos_token_id
+        self.shared, self.adapter = shared, adapter
+        if shared is not None:
+            self.tok, self.m = shared.tok, shared.m
+            # set_adapter only flips requires_grad on the active adapter, so keep our own handle
+            self._trainable = shared.adapter_parameters(adapter)
+            for p in self._trainable: p.requires_grad_(True)
+        else:
+            self.tok = _load_tokenizer(cfg)
+            self.m = AutoModelForCausalLM.from_pretrained(cfg.model_id)
+            self.m.to(cfg.device); self.m.eval()
+            self._trainable = None
+
+    def _activate(self):
+        if self.shared is not None: self.shared.activate(self.adapter)
+
+    def trainable_parameters(self) -> List[torch.nn.Parameter]:
+        """Only this role's adapter weights when sharing a base; optimizers should hold nothing else."""
+        return self._trainable if self._trainable is not None else list(self.m.parameters())
+
+    def _buckets(self, lengths: List[int], per_batch: int) -> List[List[int]]:
+        """Index groups of at most per_batch items; similar lengths share a batch to limit padding."""
+        order = sorted(range(len(lengths)), key=lengths.__getitem__) if self.cfg.bucket_by_length else list(range(len(lengths)))
+        per_batch = max(1, per_batch)
+        return [order[i:i + per_batch] for i in range(0, len(order), per_batch)]
 
-    def generate(self, prompts: List[str]) -> List[str]:
-        outs = []
-        for p in prompts:
-            x = self.tok(p, return_tensors="pt").to(self.cfg.device)
+    def generate(self, prompts: List[str], num_return_sequences: int = 1) -> List[str]:
+        """Decoded prompt+completion texts, num_return_sequences per prompt, grouped by prompt."""
+        self._activate()
+        n = max(1, int(num_return_sequences))
+        # greedy decoding gives identical samples, so decode once and repeat
+        draws = n if self.cfg.do_sample else 1
+        ids = self.tok(list(prompts))["input_ids"]
+        outs: List[List[str]] = [[] for _ in prompts]
+        for idx in self._buckets([len(x) for x in ids], self.cfg.micro_batch_size // draws):
+            x = self.tok.pad({"input_ids": [ids[i] for i in idx]}, return_tensors="pt").to(self.cfg.device)
             with torch.no_grad():
                 y = self.m.generate(**x, max_new_tokens=self.cfg.max_new_tokens,
                                     temperature=self.cfg.temperature, top_p=self.cfg.top_p,
                                     top_k=self.cfg.top_k, do_sample=self.cfg.do_sample,
-                                    pad_token_id=self.tok.pad_token_id)
-            outs.append(self.tok.decode(y[0], skip_special_tokens=True))
-        return outs
+                                    num_return_sequences=draws, pad_token_id=self.tok.pad_token_id)
+            texts = self.tok.batch_decode(y, skip_special_tokens=True)
+            for row, i in enumerate(idx):
+                outs[i] = texts[row * draws:(row + 1) * draws] * (n // draws)
+        return [t for group in outs for t in group]
 
     def logprobs(self, prompts: List[str], completions: List[str]) -> List[float]:
-        logps = []
-        for p, c in zip(prompts, completions):
-            full = p + c
-            xf = self.tok(full, return_tensors="pt").to(self.cfg.device)
-            xp = self.tok(p, return_tensors="pt").to(self.cfg.device)
+        """Summed log-probability of each completion given its prompt, scored in padded micro-batches."""
+        self._activate()
+        # tokenize prompt+completion jointly, as the unbatched scorer did: merges across the seam must match
+        seqs = self.tok([p + c for p, c in zip(prompts, completions)])["input_ids"]
+        p_lens = [max(len(x), 1) for x in self.tok(list(prompts))["input_ids"]]
+        logps = [0.0] * len(seqs)
+        for idx in self._buckets([len(s) for s in seqs], self.cfg.micro_batch_size):
+            width = max(len(seqs[i]) for i in idx)
+            input_ids = torch.full((len(idx), width), self.tok.pad_token_id, dtype=torch.long)
+            attn = torch.zeros((len(idx), width), dtype=torch.long)
+            target = torch.zeros((len(idx), width - 1), dtype=torch.float32)
+            for row, i in enumerate(idx):  # right-padded, so position ids need no adjustment
+                input_ids[row, :len(seqs[i])] = torch.tensor(seqs[i], dtype=torch.long)
+                attn[row, :len(seqs[i])] = 1
+                target[row, p_lens[i] - 1:len(seqs[i]) - 1] = 1.0
+            input_ids, attn, target = (t.to(self.cfg.device) for t in (input_ids, attn, target))
             with torch.no_grad():
-                out = self.m(**xf, labels=xf["input_ids"])
-                logits = out.logits[:, :-1, :]
-                labels = xf["input_ids"][:, 1:]
-                prompt_len = xp["input_ids"].shape[1]
-                mask = torch.zeros_like(labels, dtype=torch.float32).to(self.cfg.device)
-                mask[:, prompt_len-1:] = 1.0
-                logsoft = logits.log_softmax(dim=-1)
-                token_logp = logsoft.gather(-1, labels.unsqueeze(-1)).squeeze(-1)
-                logps.append((token_logp * mask).sum().item())
+                logits = self.m(input_ids=input_ids, attention_mask=attn).logits[:, :-1, :]
+                token_logp = logits.float().log_softmax(dim=-1).gather(-1, input_ids[:, 1:].unsqueeze(-1)).squeeze(-1)
+                sums = (token_logp * target).sum(dim=-1).tolist()
+            for row, i in enumerate(idx):
+                logps[i] = sums[row]
         return logps
 
     def sft_step(self, prompts: List[str], targets: List[str], lr: float = 5e-6):
-        self.m.train(); opt = torch.optim.AdamW(self.m.parameters(), lr=lr)
+        self._activate()
+        params = self.trainable_parameters()
+        self.m.train(); opt = torch.optim.AdamW(params, lr=lr)
         tot = 0.0
         for p, y in zip(prompts, targets):
             xy = self.tok(p + y, return_tensors="pt").to(self.cfg.device)
             out = self.m(**xy, labels=xy["input_ids"])
             tot += float(out.loss.detach().cpu().item())
             out.loss.backward()
-        torch.nn.utils.clip_grad_norm_(self.m.parameters(), 1.0)
+        torch.nn.utils.clip_grad_norm_(params, 1.0)
         opt.step(); opt.zero_grad(set_to_none=True); self.m.eval()
         return {"sft_loss": tot / max(1, len(prompts))}
@@ -1,8 +1,123 @@
 
-import tempfile, os, subprocess
+import hashlib, itertools, json, os, queue, subprocess, sys, threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+_WORKER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sandbox_worker.py")
+
+
+class _Worker:
+    def __init__(self, memory_mb: int):
+        env = dict(os.environ, CODE_EVAL_MEMORY_MB=str(memory_mb), PYTHONDONTWRITEBYTECODE="1", PYTEST_DISABLE_PLUGIN_AUTOLOAD="1")
+        self.p = subprocess.Popen([sys.executable, _WORKER], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                  stderr=subprocess.DEVNULL, text=True, bufsize=1, env=env)
+
+    def run(self, batch_id: int, jobs: List[Dict]) -> List[Dict]:
+        self.p.stdin.write(json.dumps({"id": batch_id, "jobs": jobs}) + "\n"); self.p.stdin.flush()
+        line = self.p.stdout.readline()
+        if not line: raise RuntimeError(f"sandbox worker exited with {self.p.poll()}")
+        return json.loads(line)["results"]
+
+    def close(self):
+        try:
+            self.p.stdin.close(); self.p.wait(timeout=5)
+        except Exception:
+            self.p.kill()
+
+
+class CodeEvalPool:
+    """Pre-warmed sandbox workers that run (code, test) batches over a pipe, with a result cache.
+
+    Each worker imports pytest once, then forks an isolated, resource-limited child per
+    candidate, so the per-sample cost is a fork and a one-file collection instead of an
+    interpreter start. Results are cached by (code hash, test hash).
+    """
+
+    def __init__(self, workers: Optional[int] = None, batch_size: int = 16, memory_mb: int = 1024, cache_size: int = 10000):
+        self.n_workers = max(1, workers or os.cpu_count() or 1)
+        self.batch_size = max(1, batch_size)
+        self.memory_mb = memory_mb
+        self.cache_size = cache_size
+        self.cache: "OrderedDict[Tuple[str, str], Dict]" = OrderedDict()
+        self.stats = {"evaluated": 0, "cache_hits": 0, "worker_restarts": 0}
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._workers: List[_Worker] = []
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._lock:
+            while len(self._workers) < self.n_workers:
+                w = _Worker(self.memory_mb); self._workers.append(w); self._idle.put(w)
+
+    @staticmethod
+    def key(code: str, test: str) -> Tuple[str, str]:
+        return hashlib.sha256(code.encode("utf-8")).hexdigest(), hashlib.sha256(test.encode("utf-8")).hexdigest()
+
+    def _run_batch(self, jobs: List[Dict]) -> List[Dict]:
+        w = self._idle.get()
+        try:
+            return w.run(next(self._ids), jobs)
+        except (OSError, ValueError, RuntimeError) as e:
+            with self._lock:
+                self.stats["worker_restarts"] += 1
+                self._workers.remove(w); w.close()
+                w = _Worker(self.memory_mb); self._workers.append(w)
+            return [{"ok": False, "output": f"sandbox worker failed: {e}", "timed_out": False, "worker_error": True} for _ in jobs]
+        finally:
+            self._idle.put(w)
+
+    def evaluate(self, pairs: List[Tuple[str, str]], timeout: float = 5) -> List[Dict]:
+        """One result dict (ok, output, timed_out, duration_ms, cached) per (code, test) pair."""
+        results: List[Optional[Dict]] = [None] * len(pairs)
+        pending: Dict[Tuple[str, str], List[int]] = {}
+        with self._lock:
+            for i, (code, test) in enumerate(pairs):
+                k = self.key(code, test)
+                if k in self.cache:
+                    self.cache.move_to_end(k); self.stats["cache_hits"] += 1
+                    results[i] = dict(self.cache[k], cached=True)
+                else:
+                    pending.setdefault(k, []).append(i)
+        if pending:
+            self._ensure_started()
+            keys = list(pending)
+            jobs = [{"code": pairs[pending[k][0]][0], "test": pairs[pending[k][0]][1], "timeout": timeout} for k in keys]
+            batches = [list(range(s, min(s + self.batch_size, len(jobs)))) for s in range(0, len(jobs), self.batch_size)]
+            with ThreadPoolExecutor(max_workers=self.n_workers) as ex:
+                outs = list(ex.map(lambda b: self._run_batch([jobs[j] for j in b]), batches))
+            with self._lock:
+                for b, out in zip(batches, outs):
+                    for j, res in zip(b, out):
+                        k = keys[j]
+                        if not (res.get("worker_error") or res["timed_out"]):  # both depend on more than the key
+                            self.cache[k] = res
+                        for i in pending[k]: results[i] = dict(res, cached=False)
+                self.stats["evaluated"] += len(jobs)
+                while len(self.cache) > self.cache_size: self.cache.popitem(last=False)
+        return results
+
+    def close(self):
+        with self._lock:
+            for w in self._workers: w.close()
+            self._workers.clear()
+            self._idle = queue.Queue()
+
+
+_default_pool: Optional[CodeEvalPool] = None
+
+
+def default_pool() -> CodeEvalPool:
+    global _default_pool
+    if _default_pool is None: _default_pool = CodeEvalPool()
+    return _default_pool
+
+
 def run_unit(code: str, test: str, timeout: int = 5):
-    with tempfile.TemporaryDirectory() as d:
-        cp, tp = os.path.join(d,"solution.py"), os.path.join(d,"test_solution.py")
-        open(cp,"w").write(code); open(tp,"w").write(test)
-        p = subprocess.run(["pytest","-q"], cwd=d, capture_output=True, text=True, timeout=timeout)
-        return p.returncode==0, p.stdout + "\n" + p.stderr
+    r = default_pool().evaluate([(code, test)], timeout=timeout)[0]
+    return r["ok"], r["output"]
+
+
+def run_units(pairs: List[Tuple[str, str]], timeout: int = 5) -> List[Tuple[bool, str]]:
+    return [(r["ok"], r["output"]) for r in default_pool().evaluate(pairs, timeout=timeout)]
@@ -0,0 +1,100 @@
+"""
+Pre-warmed code-eval worker: reads JSON batches on stdin, writes one JSON result line per batch.
+
+Each job runs in a forked child with its own temp directory and resource limits, so pytest is
+imported once per worker while candidates still never share interpreter state.
+"""
+import json, os, shutil, signal, sys, tempfile, time
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - non-POSIX
+    resource = None
+
+import pytest  # imported before any fork so children inherit it warm
+
+_OUTPUT_LIMIT = 64 * 1024
+# per-run plugin setup dominates a one-test session; candidates need none of these
+_PYTEST_ARGS = ["-q", "-p", "no:cacheprovider", "-p", "no:unraisableexception", "-p", "no:threadexception"]
+
+
+def _limit(timeout: float, memory_mb: int):
+    if resource is None: return
+    cpu = int(timeout) + 1
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu))
+    resource.setrlimit(resource.RLIMIT_FSIZE, (16 << 20, 16 << 20))
+    if memory_mb:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_mb << 20, memory_mb << 20))
+
+
+def _run_forked(d: str, log: str, timeout: float, memory_mb: int):
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            os.setsid()
+            fd = os.open(log, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            os.dup2(fd, 1); os.dup2(fd, 2); os.close(fd)
+            os.chdir(d)
+            _limit(timeout, memory_mb)
+            code = int(pytest.main([*_PYTEST_ARGS, d]))
+        finally:
+            sys.stdout.flush(); sys.stderr.flush()
+            os._exit(code)
+    deadline = time.monotonic() + timeout
+    while True:
+        done, status = os.waitpid(pid, os.WNOHANG)
+        if done:
+            return os.waitstatus_to_exitcode(status), False
+        if time.monotonic() >= deadline:
+            try: os.killpg(pid, signal.SIGKILL)
+            except ProcessLookupError: pass
+            os.waitpid(pid, 0)
+            return None, True
+        time.sleep(0.002)
+
+
+def _run_subprocess(d: str, log: str, timeout: float, memory_mb: int):
+    import subprocess
+    try:
+        p = subprocess.run([sys.executable, "-m", "pytest", *_PYTEST_ARGS, d], cwd=d,
+                           capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return None, True
+    with open(log, "w", encoding="utf-8") as f: f.write(p.stdout + "\n" + p.stderr)
+    return p.returncode, False
+
+
+def run_job(job: dict, memory_mb: int) -> dict:
+    timeout = float(job.get("timeout", 5))
+    d = tempfile.mkdtemp(prefix="code-eval-")
+    try:
+        with open(os.path.join(d, "solution.py"), "w", encoding="utf-8") as f: f.write(job["code"])
+        with open(os.path.join(d, "test_solution.py"), "w", encoding="utf-8") as f: f.write(job["test"])
+        log = os.path.join(d, ".output")
+        runner = _run_forked if hasattr(os, "fork") else _run_subprocess
+        started = time.perf_counter()
+        code, timed_out = runner(d, log, timeout, memory_mb)
+        output = ""
+        if os.path.exists(log):
+            with open(log, "r", encoding="utf-8", errors="replace") as f: output = f.read(_OUTPUT_LIMIT)
+        if timed_out: output += f"\nTIMEOUT after {timeout}s"
+        return {"ok": code == 0, "output": output, "timed_out": timed_out,
+                "duration_ms": round((time.perf_counter() - started) * 1000.0, 3)}
+    finally:
+        shutil.rmtree(d, ignore_errors=True)
+
+
+def main():
+    memory_mb = int(os.environ.get("CODE_EVAL_MEMORY_MB", "0") or 0)
+    out = sys.stdout
+    sys.stdout = sys.stderr  # stray prints must not corrupt the result pipe
+    for line in sys.stdin:
+        if not line.strip(): continue
+        batch = json.loads(line)
+        results = [run_job(job, memory_mb) for job in batch.get("jobs", [])]
+        out.write(json.dumps({"id": batch.get("id"), "results": results}) + "\n"); out.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -7,10 +7,15 @@ class RZeroConfig:
     k_samples: int = 6
     informative_band: Tuple[int, int] = (2, 4)
     max_len: int = 512
+    micro_batch_size: int = 32
+    shared_base: bool = True  # one base model, challenger/solver as LoRA adapters
+    adapter_rank: int = 16
+    adapter_alpha: int = 32
     grpo_lr: float = 1e-6
     grpo_kl_coef: float = 0.02
     repetition_bleu_threshold: float = 0.85
     repetition_penalty_strength: float = 0.2
+    dedup_threshold: float = 0.9
     format_required_tags: List[str] = ("<question>", "</question>", "<answer>", "</answer>")
     out_dir: str = "data/rzero"
     experiment: str = "default"
@@ -1,25 +1,39 @@
 
-import json
+import json, warnings
 from typing import List, Dict
 from .cfg import RZeroConfig
 from .policies import Policy
+from ..backends.hf import AdapterConfig, HFConfig, SharedHFBase
 from .rewards import composite_reward
-from .labeling import filter_informative_band, write_curated_jsonl
+from .labeling import dedup_curated, filter_informative_band, write_curated_jsonl
 from .format import format_ok
 
 class RZeroEngine:
     def __init__(self, base_model_id: str, cfg: RZeroConfig, device: str = "cpu"):
         self.cfg = cfg
-        self.challenger = Policy.load(base_model_id, "challenger", device=device)
-        self.solver = Policy.load(base_model_id, "solver", device=device)
+        self.shared = None
+        if cfg.shared_base:
+            try:
+                import peft  # noqa: F401  (requirements-train.txt)
+            except ImportError:
+                warnings.warn("peft not installed; loading separate challenger and solver models")
+            else:
+                self.shared = SharedHFBase(HFConfig(model_id=base_model_id, device=device, micro_batch_size=cfg.micro_batch_size),
+                                           AdapterConfig(r=cfg.adapter_rank, alpha=cfg.adapter_alpha))
+        if self.shared is not None:
+            self.challenger = Policy.from_shared(self.shared, "challenger")
+            self.solver = Policy.from_shared(self.shared, "solver")
+        else:
+            self.challenger = Policy.load(base_model_id, "challenger", device=device, micro_batch_size=cfg.micro_batch_size)
+            self.solver = Policy.load(base_model_id, "solver", device=device, micro_batch_size=cfg.micro_batch_size)
 
     def challenger_phase(self, seeds: List[str]) -> Dict:
         questions = self.challenger.generate_questions(seeds, n=self.cfg.n_candidates)
         evals, items = [], []
         from collections import Counter
-        for q in questions:
+        answers = self.solver.answer_batch(questions, k=self.cfg.k_samples)
+        for q, samples in zip(questions, answers):
             fmt = format_ok(q)
-            samples = self.solver.answer(q, k=self.cfg.k_samples)
             c = Counter(samples); _, votes = c.most_common(1)[0]
             correct_rate = votes / max(1, len(samples))
             evals.append({"correct_rate": correct_rate, "format_ok": fmt})
@@ -27,8 +41,9 @@ class RZeroEngine:
         rewards = composite_reward(evals, questions, self.cfg.repetition_bleu_threshold, self.cfg.repetition_penalty_strength)
         ch = self.challenger.update_grpo(questions, rewards)
         curated = filter_informative_band(items, *self.cfg.informative_band)
+        curated, n_dup = dedup_curated(curated, self.cfg.out_dir, self.cfg.experiment, self.cfg.dedup_threshold)
         path = write_curated_jsonl(curated, self.cfg.out_dir, self.cfg.experiment)
-        return {"curated_path": path, "n_candidates": len(questions), "n_curated": len(curated), "challenger_metrics": ch}
+        return {"curated_path": path, "n_candidates": len(questions), "n_curated": len(curated), "n_duplicates": n_dup, "challenger_metrics": ch}
 
     def solver_phase(self, curated_path: str) -> Dict:
         lines = [json.loads(x) for x in open(curated_path, "r", encoding="utf-8")]
@@ -12,7 +12,8 @@ class GRPOTrainer:
     def __init__(self, backend, cfg: GRPOConfig):
         self.backend = backend
         self.cfg = cfg
-        self.opt = torch.optim.AdamW(self.backend.m.parameters(), lr=cfg.lr)
+        self.params = backend.trainable_parameters() if hasattr(backend, "trainable_parameters") else list(backend.m.parameters())
+        self.opt = torch.optim.AdamW(self.params, lr=cfg.lr)
 
     def step(self, prompts: List[str], completions: List[str], rewards: List[float]) -> Dict:
         R = torch.tensor(rewards, dtype=torch.float32, device=self.backend.m.device if hasattr(self.backend.m, 'device') else 'cpu')
@@ -23,6 +24,6 @@ class GRPOTrainer:
         kl = (logps_t ** 2).mean()
         loss = pg + self.cfg.kl_coef * kl
         self.opt.zero_grad(set_to_none=True); loss.backward()
-        torch.nn.utils.clip_grad_norm_(self.backend.m.parameters(), 1.0)
+        torch.nn.utils.clip_grad_norm_(self.params, 1.0)
         self.opt.step()
         return {"loss": float(loss.detach().cpu().item()), "pg": float(pg.detach().cpu().item()), "kl": float(kl.detach().cpu().item()), "R": float(R.mean().item())}
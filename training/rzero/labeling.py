@@ -1,7 +1,8 @@
 
 from typing import List, Dict, Tuple
 from collections import Counter
-import os, json, time
+import os, json, time, glob
+from nexus.neardup import NearDuplicateIndex, dedup
 def majority_vote(samples: List[str]) -> Tuple[str, int]:
     c = Counter(samples); label, votes = c.most_common(1)[0]; return label, votes
 def filter_informative_band(items: List[Dict], low: int, high: int) -> List[Dict]:
@@ -18,3 +19,12 @@ def write_curated_jsonl(curated: List[Dict], out_dir: str, experiment: str) -> s
     with open(path, "w", encoding="utf-8") as f:
         for ex in curated: f.write(json.dumps(ex, ensure_ascii=False) + "\n")
     return path
+def dedup_curated(curated: List[Dict], out_dir: str, experiment: str, threshold: float = 0.9) -> Tuple[List[Dict], int]:
+    """Drop questions that near-duplicate each other or any earlier curated-{experiment} shard."""
+    index = NearDuplicateIndex(threshold)
+    for path in sorted(glob.glob(os.path.join(out_dir, f"curated-{experiment}-*.jsonl"))):
+        with open(path, "r", encoding="utf-8") as f:
+            for n, line in enumerate(f):
+                if line.strip(): index.add((path, n), json.loads(line).get("question", ""))
+    kept, dropped = dedup(curated, text=lambda ex: ex["question"], index=index)
+    return kept, len(dropped)
@@ -1,18 +1,23 @@
 
-from typing import List, Dict
+from typing import List, Dict, Optional
 from .grpo import GRPOTrainer, GRPOConfig
-from ..backends.hf import HFBackend, HFConfig
+from ..backends.hf import HFBackend, HFConfig, SharedHFBase
 from .format import extract_between, format_ok
 
 class Policy:
-    def __init__(self, model_id: str, role: str, device: str = "cpu"):
+    def __init__(self, model_id: str, role: str, device: str = "cpu", micro_batch_size: int = 32, backend: Optional[HFBackend] = None):
         self.role = role
-        self.backend = HFBackend(HFConfig(model_id=model_id, device=device))
+        self.backend = backend or HFBackend(HFConfig(model_id=model_id, device=device, micro_batch_size=micro_batch_size))
         self.grpo = GRPOTrainer(self.backend, GRPOConfig())
 
     @classmethod
-    def load(cls, model_id: str, role: str, device: str = "cpu"):
-        return cls(model_id, role, device)
+    def load(cls, model_id: str, role: str, device: str = "cpu", micro_batch_size: int = 32):
+        return cls(model_id, role, device, micro_batch_size)
+
+    @classmethod
+    def from_shared(cls, shared: SharedHFBase, role: str):
+        """A role-specific adapter on an already loaded base; no weights are copied."""
+        return cls(shared.cfg.model_id, role, shared.cfg.device, shared.cfg.micro_batch_size, backend=shared.role(role))
 
     def generate_questions(self, seeds: List[str], n: int) -> List[str]:
         prompts = []
@@ -30,12 +35,14 @@ class Policy:
         return fixed
 
     def answer(self, question: str, k: int) -> List[str]:
-        prompt = f"Solve the problem. Output only inside <answer> tags.\n{question}"
-        outs = self.backend.generate([prompt]*k)
+        return self.answer_batch([question], k)[0]
+
+    def answer_batch(self, questions: List[str], k: int) -> List[List[str]]:
+        prompts = [f"Solve the problem. Output only inside <answer> tags.\n{q}" for q in questions]
+        outs = self.backend.generate(prompts, num_return_sequences=k)
         ans = []
-        for t in outs:
-            a = extract_between(t, "<answer>", "</answer>") or t.strip()
-            ans.append(a)
+        for i in range(len(questions)):
+            ans.append([extract_between(t, "<answer>", "</answer>") or t.strip() for t in outs[i*k:(i+1)*k]])
         return ans
 
     def update_grpo(self, inputs: List[str], rewards: List[float] = None):
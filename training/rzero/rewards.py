@@ -1,20 +1,16 @@
 
 from typing import List, Dict
+from nexus.neardup import near_duplicate_pairs
 def jaccard(a: str, b: str) -> float:
     sa, sb = set(a.lower().split()), set(b.lower().split())
     if not sa and not sb: return 1.0
     inter = len(sa & sb); union = len(sa | sb) or 1
     return inter / union
 def repetition_penalty(questions: List[str], threshold: float = 0.85, strength: float = 0.2) -> List[float]:
-    n = len(questions); penalties = [0.0] * n
-    for i in range(n):
-        sim_count = 0
-        for j in range(n):
-            if i == j: continue
-            if jaccard(questions[i], questions[j]) >= threshold:
-                sim_count += 1
-        if sim_count: penalties[i] = min(1.0, strength * sim_count)
-    return penalties
+    n = len(questions); sim_counts = [0] * n
+    for i, j, _ in near_duplicate_pairs(questions, threshold):
+        sim_counts[i] += 1; sim_counts[j] += 1
+    return [min(1.0, strength * c) if c else 0.0 for c in sim_counts]
 def uncertainty_reward(correct_rate: float) -> float:
     return 1.0 - 2.0 * abs(correct_rate - 0.5)
 def composite_reward(evals: List[Dict], questions: List[str], rep_threshold: float, rep_strength: float) -> List[float]:
@@ -2,12 +2,15 @@
 from __future__ import annotations
 import json, time, urllib.request
 
-def post_json(url: str, body: dict, timeout: float = 2.0, retries: int = 1, headers: dict | None = None):
+def post_json(url: str, body: dict, timeout: float = 2.0, retries: int = 1, headers: dict | None = None, cancelled=None):
+    # cancelled: optional threading.Event; once set, no further attempt is made
     data = json.dumps(body).encode("utf-8")
     hdrs = {"Content-Type":"application/json"}
     if headers: hdrs.update(headers)
     last = None
     for i in range(max(1, retries)):
+        if cancelled is not None and cancelled.is_set():
+            return {"_error": "cancelled"}
         try:
             req = urllib.request.Request(url, method="POST", data=data, headers=hdrs)
             with urllib.request.urlopen(req, timeout=timeout) as resp: